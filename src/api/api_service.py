@@ -7,52 +7,198 @@ Provides a unified interface that can switch between mock and real JIRA implemen
 import os
 import sys
 import json
-from typing import Dict, List, Optional
+import uuid
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
 
 # Add the current directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from jira_api import JiraAPIService
-    JIRA_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️  Real JIRA API not available: {e}")
-    JIRA_AVAILABLE = False
+# Enabled first so the imports below show up in the startup report
+from startup_profiler import PROFILER
+PROFILER.enable_if_requested()
 
-from mock_jira_api import MockJiraAPI
+with PROFILER.phase("imports"):
+    from jira_api import WORKLOAD_MAX_AGE, JiraAPIService, jira_library_available
+    from mock_jira_api import MockJiraAPI
+    from sqlite_store import SQLiteTaskStore
+    from event_bus import EventBus, TASK_ASSIGNED, WORKLOAD_CHANGED, NEW_UNASSIGNED_TASK
+    from json_stream import iter_json_list_response
+    from task_query import InvalidQueryError, QUERY_PARAMS
+    from recommendation_engine import RecommendationEngine
+    from decision_log import DecisionLog
+    from metrics import METRICS, REQUEST_EXCEPTIONS, track_request
+    from tracing import TRACER, trace_forced
+    from profiling import PROFILING, stage
+    from jira_scheduler import BACKGROUND, JiraRateLimitError, call_priority
+    from swr_cache import BackendUnavailableError, StaleWhileRevalidateAPI, StaleWhileRevalidateCache, track_freshness
+
+# jira_api only imports the jira package once a JiraAPIService connects, since
+# it takes far longer to import than the rest of the service put together
+JIRA_AVAILABLE = jira_library_available()
+if not JIRA_AVAILABLE:
+    print("⚠️  Real JIRA API not available: No module named 'jira'")
+
+# Default location of the SQLite backend's database file
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../data/taskflow.db')
+
+# Most tasks whose last recommendation is remembered for assignment feedback
+MAX_PENDING_RECOMMENDATIONS = 1000
+
+# Seconds between checks of a shared service's config file for changes
+CONFIG_CHECK_INTERVAL = 1.0
 
 class TaskFlowAPIService:
-    def __init__(self, use_real_jira=True, config_file=None):
+    BACKEND_NAMES = {'jira': 'Real JIRA', 'mock': 'Mock JIRA', 'sqlite': 'SQLite'}
+    
+    def __init__(self, use_real_jira=True, config_file=None, backend=None, db_path=None,
+                 decision_log_dir=None, prewarm=False, capacity_ceiling=None):
         """
         Initialize API service
         
+        The backend is not created here: it is built (and JIRA connected to)
+        on first use of ``api``, so mock-only callers and /api/info never
+        import the jira package. Pass ``prewarm=True`` to build it on a
+        background thread right away instead.
+        
         Args:
             use_real_jira (bool): If True, use real JIRA API. If False, use mock.
             config_file (str): Path to JIRA configuration file
+            backend (str): 'jira', 'mock' or 'sqlite'. Defaults to 'jira' or
+                'mock' based on use_real_jira. The SQLite backend serves reads
+                from a local indexed store, seeded on first start from JIRA
+                (when use_real_jira) or the mock data.
+            db_path (str): SQLite database path (default: $TASKFLOW_DB_PATH
+                or src/data/taskflow.db)
+            decision_log_dir (str): Directory for the recommendation decision
+                log (default: $TASKFLOW_DECISION_LOG_DIR; logging is off if neither is set)
+            prewarm (bool): Build the backend on a background thread now
+            capacity_ceiling (float): Reject assignments that would put the
+                assignee above this fraction of their sprint capacity, e.g.
+                1.0 (default: $TASKFLOW_CAPACITY_CEILING; no ceiling if neither is set)
         """
         self.use_real_jira = use_real_jira and JIRA_AVAILABLE
         self.config_file = config_file
+        self.db_path = db_path
+        self.backend = backend or ('jira' if self.use_real_jira else 'mock')
+        self.upstream = None
+        if capacity_ceiling is None and os.getenv('TASKFLOW_CAPACITY_CEILING'):
+            capacity_ceiling = float(os.getenv('TASKFLOW_CAPACITY_CEILING'))
+        self.capacity_ceiling = capacity_ceiling
+        self._api = None
+        self._api_lock = threading.Lock()
         
-        if self.use_real_jira:
+        if self.backend not in self.BACKEND_NAMES:
+            raise ValueError(f"Unknown backend '{backend}' (use one of {', '.join(self.BACKEND_NAMES)})")
+        if self.backend == 'jira' and not self.use_real_jira:
+            self.backend = 'mock'
+        
+        # Dataset revisions back the web API's ETags; instance_id keeps them
+        # from matching across restarts, where revisions start over at zero
+        self.instance_id = uuid.uuid4().hex[:8]
+        self._revisions = {"users": 0, "tasks": 0}
+        self._revision_lock = threading.Lock()
+        self._users_fingerprint = None
+        
+        # Change events for dashboards; the task snapshot is what sync() diffs against
+        self.events = EventBus()
+        self._task_snapshot = {}
+        self._snapshot_primed = False
+        self._sync_lock = threading.Lock()
+        self._sync_stop = threading.Event()
+        self._sync_thread = None
+        self.sync_interval = None
+        
+        # Recommendations and the assignments that follow them go to the decision log
+        self.recommender = RecommendationEngine()
+        decision_log_dir = decision_log_dir or os.getenv('TASKFLOW_DECISION_LOG_DIR')
+        self.decision_log = DecisionLog(decision_log_dir) if decision_log_dir else None
+        self._pending_recommendations = OrderedDict()
+        self._pending_lock = threading.Lock()
+        
+        if prewarm:
+            self.prewarm()
+    
+    @property
+    def api(self):
+        """The backend, created on first access"""
+        api = self._api
+        if api is None:
+            with self._api_lock:
+                if self._api is None:
+                    with PROFILER.phase("backend_init"):
+                        self._api = self._create_backend()
+                api = self._api
+        return api
+    
+    def prewarm(self) -> threading.Thread:
+        """Create the backend (and connect to JIRA) on a background thread"""
+        thread = threading.Thread(target=lambda: self.api, name="taskflow-prewarm", daemon=True)
+        thread.start()
+        return thread
+    
+    def _create_backend(self):
+        """Build the configured backend, falling back to mock if JIRA is unreachable"""
+        if self.backend == 'sqlite':
+            print("🗄️  Initializing SQLite API Service...")
+            with PROFILER.phase("sqlite_open"):
+                api = SQLiteTaskStore(self.db_path or os.getenv('TASKFLOW_DB_PATH', DEFAULT_DB_PATH))
+            self.upstream = self._connect_upstream()
+            if api.is_empty():
+                print("📥 Seeding SQLite store from upstream...")
+                with PROFILER.phase("sqlite_seed"):
+                    api.replace_all(self.upstream.get_users(), self.upstream.get_tasks())
+        elif self.use_real_jira:
             print("🔗 Initializing Real JIRA API Service...")
-            self.api = JiraAPIService(config_file)
-            if not self.api.is_connected():
+            api = JiraAPIService(self.config_file)
+            if not api.is_connected():
                 print("⚠️  Failed to connect to real JIRA, falling back to mock...")
                 self.use_real_jira = False
-                self.api = MockJiraAPI()
+                self.backend = 'mock'
+                api = MockJiraAPI()
+            else:
+                cache = StaleWhileRevalidateCache.from_config(api.config)
+                if cache:
+                    print("♻️  Serving JIRA reads stale-while-revalidate")
+                    api = StaleWhileRevalidateAPI(api, cache)
         else:
             print("🎭 Initializing Mock JIRA API Service...")
-            self.api = MockJiraAPI()
+            api = MockJiraAPI()
         
-        print(f"✅ API Service initialized ({'Real JIRA' if self.use_real_jira else 'Mock JIRA'})")
+        print(f"✅ API Service initialized ({self.BACKEND_NAMES[self.backend]})")
+        return api
+    
+    def _connect_upstream(self):
+        """Connect the source the SQLite store is seeded and synced from"""
+        if self.use_real_jira:
+            upstream = JiraAPIService(self.config_file)
+            if upstream.is_connected():
+                return upstream
+            print("⚠️  Failed to connect to real JIRA, seeding from mock data...")
+            self.use_real_jira = False
+        return MockJiraAPI()
     
     def get_api_info(self) -> Dict:
-        """Get information about the current API configuration"""
-        return {
-            "type": "real" if self.use_real_jira else "mock",
-            "connected": self.api.is_connected() if hasattr(self.api, 'is_connected') else True,
+        """Get information about the current API configuration (without creating the backend)"""
+        api = self._api
+        if api is None:
+            # Local backends always come up; JIRA is unknown until the first real request
+            connected = self.backend != 'jira'
+        else:
+            connected = api.is_connected() if hasattr(api, 'is_connected') else True
+        info = {
+            "type": {'jira': 'real', 'mock': 'mock', 'sqlite': 'sqlite'}[self.backend],
+            "connected": connected,
+            "initialized": api is not None,
             "jira_available": JIRA_AVAILABLE
         }
+        if isinstance(api, StaleWhileRevalidateAPI):
+            info["staleWhileRevalidate"] = {"circuit": api.cache.breaker.state}
+        return info
     
     def get_users(self) -> List[Dict]:
         """Get all users"""
@@ -64,18 +210,128 @@ class TaskFlowAPIService:
     
     def get_tasks(self, project_key: str = None, assignee: str = None, status: str = None) -> List[Dict]:
         """Get tasks with optional filtering"""
-        if self.use_real_jira:
-            return self.api.get_tasks(project_key, assignee, status)
-        else:
-            return self.api.get_tasks(project_key, assignee)
+        return self.api.get_tasks(project_key, assignee, status)
+    
+    def iter_tasks(self, project_key: str = None, assignee: str = None, status: str = None) -> Iterator[Dict]:
+        """Yield tasks one at a time for streaming responses"""
+        return self.api.iter_tasks(project_key, assignee, status)
+    
+    def query_tasks(self, project_key: str = None, assignee: str = None, status: str = None,
+                    labels=None, priorities=None, skills=None, sort: str = None,
+                    cursor: str = None, limit: int = None) -> Dict:
+        """Get one sorted, filtered page of tasks evaluated by the backend"""
+        return self.api.query_tasks(project_key, assignee, status, labels, priorities, skills,
+                                    sort, cursor, limit)
     
     def get_unassigned_tasks(self) -> List[Dict]:
         """Get all unassigned tasks"""
         return self.api.get_unassigned_tasks()
     
-    def assign_task(self, task_key: str, assignee_username: str) -> Dict:
-        """Assign a task to a user"""
-        return self.api.assign_task(task_key, assignee_username)
+    def get_recommendations(self, task_key: str, limit: int = 3, profiler=None) -> Optional[Dict]:
+        """
+        Rank team members for a task
+        
+        Current loads come from the backend's maintained workload totals. The
+        ranking is written to the decision log (when enabled) and remembered
+        so the eventual assignment can be recorded against it.
+        
+        Args:
+            profiler (StageProfiler): Times candidate_generation and the
+                engine's stages when the request is being profiled
+        
+        Returns:
+            Dict: ``taskKey``, ``recommendationId`` and ranked ``candidates``,
+            or None if the task does not exist
+        """
+        with stage(profiler, "candidate_generation"):
+            task = next((t for t in self.api.iter_tasks() if t["key"] == task_key), None)
+            if task is None:
+                return None
+            
+            users = self.api.get_users()
+            current_loads = {}
+            for user in users:
+                workload = self.api.get_user_workload(user["username"])
+                current_loads[user["username"]] = workload.get("totalStoryPoints", 0)
+        
+        candidates = self.recommender.generate_recommendations(users, task, current_loads, limit, profiler)
+        recommendation_id = None
+        if self.decision_log:
+            recommendation_id = self.decision_log.log_recommendation(task_key, candidates)
+            with self._pending_lock:
+                self._pending_recommendations.pop(task_key, None)
+                self._pending_recommendations[task_key] = {"id": recommendation_id, "candidates": candidates}
+                if len(self._pending_recommendations) > MAX_PENDING_RECOMMENDATIONS:
+                    self._pending_recommendations.popitem(last=False)
+        
+        return {
+            "taskKey": task_key,
+            "recommendationId": recommendation_id,
+            "candidates": candidates
+        }
+    
+    def assign_task(self, task_key: str, assignee_username: str, approver: str = None,
+                    expected_version=None) -> Dict:
+        """
+        Assign a task to a user and publish the resulting change events
+        
+        Args:
+            expected_version: ``version`` (or, for JIRA, ``updated``) of the
+                task the caller based this assignment on. If the task has
+                changed since, nothing is written and the result has
+                ``conflict`` set along with the current task.
+        
+        With a ``capacity_ceiling``, assignments that would take the assignee
+        over it are refused with ``overCapacity`` set and their workload.
+        """
+        with self._sync_lock:
+            previous = self._task_snapshot.get(task_key)
+        api = self.api  # Create the backend first: a failed JIRA connect changes use_real_jira
+        
+        ceiling = self.capacity_ceiling
+        if self.backend == 'sqlite' and self.use_real_jira:
+            # The version and loads the caller saw are the local copy's, so vet against it before writing to JIRA
+            rejection = api.check_assignment(task_key, assignee_username, expected_version, ceiling)
+            if rejection and (rejection.get("conflict") or rejection.get("overCapacity")):
+                return rejection
+            
+            # Write through to JIRA first; the local store only mirrors it
+            result = self.upstream.assign_task(task_key, assignee_username)
+            if not result.get("success"):
+                return result
+            expected_version = ceiling = None
+        
+        result = api.assign_task(task_key, assignee_username, expected_version, ceiling)
+        
+        if result.get("success"):
+            self.bump_revision("tasks")
+            task = result.get("task", {})
+            assignee = task.get("assignee", assignee_username)
+            if previous is None:
+                # Not synced yet: use the assignee the backend read before writing
+                previous = {"assignee": result.get("previousAssignee")}
+            previous_assignee = previous.get("assignee")
+            with self._sync_lock:
+                self._task_snapshot[task_key] = {
+                    "assignee": assignee,
+                    "storyPoints": task.get("storyPoints", previous.get("storyPoints", 0)),
+                    "status": task.get("status", previous.get("status")),
+                    "updated": task.get("updated", previous.get("updated"))
+                }
+            self.events.publish(TASK_ASSIGNED, {
+                "taskKey": task_key,
+                "assignee": assignee,
+                "previousAssignee": previous_assignee,
+                "version": task.get("version")
+            })
+            self._publish_workload_changes({assignee, previous_assignee})
+            
+            if self.decision_log:
+                with self._pending_lock:
+                    recommendation = self._pending_recommendations.pop(task_key, None)
+                self.decision_log.log_assignment(task_key, assignee, recommendation, approver)
+        
+        return result
     
     def get_user_workload(self, username: str) -> Dict:
         """Calculate current workload for a user"""
@@ -84,14 +340,315 @@ class TaskFlowAPIService:
     def get_team_capacity_overview(self) -> Dict:
         """Get capacity overview for entire team"""
         return self.api.get_team_capacity_overview()
+    
+    def get_revision(self, dataset: str) -> int:
+        """Get the current revision of a dataset ('users' or 'tasks')"""
+        return self._revisions.get(dataset, 0)
+    
+    def etag_scope(self) -> Optional[str]:
+        """
+        What an ETag must cover besides the dataset revisions, or None if no ETag should be issued
+        
+        Mock and SQLite data only change through this process, and a running
+        sync bumps the revisions for changes made in JIRA, so the revisions
+        alone identify the data (""). Otherwise JIRA edits never move the
+        revisions. ETags then also roll over every workload max age, the same
+        window the JIRA workload totals are rebuilt on, and none are issued
+        when that is 0.
+        """
+        if self.backend != 'jira' or (self._sync_thread is not None and self._sync_thread.is_alive()):
+            return ""
+        max_age = getattr(self._api, 'workload_max_age', WORKLOAD_MAX_AGE) if self._api else WORKLOAD_MAX_AGE
+        if max_age <= 0:
+            return None
+        return f"-w{int(time.time() // max_age)}"
+    
+    def bump_revision(self, *datasets: str):
+        """Mark datasets as changed so cached responses built from them are invalidated"""
+        with self._revision_lock:
+            for dataset in datasets:
+                self._revisions[dataset] = self._revisions.get(dataset, 0) + 1
+    
+    def get_task_changes(self, since: int = 0, client_id: str = None) -> Dict:
+        """Get task upserts and deletions recorded after change-log revision ``since``"""
+        return self.api.change_log.changes_since(since, client_id)
+    
+    def get_task_revision(self) -> int:
+        """Get the current change-log revision to resync from after a full fetch"""
+        return self.api.change_log.revision
+    
+    def get_events(self, since: int = 0, timeout: float = 0) -> Dict:
+        """Get change events published after ``since`` (long-polls up to ``timeout``)"""
+        return self.events.get_events(since, timeout)
+    
+    def sync(self) -> Dict:
+        """
+        Re-read tasks from the backend and publish events for what changed
+        
+        Dataset revisions are bumped whenever users or tasks differ from the
+        previous sync, which invalidates ETags handed out for stale data, and
+        changed or removed tasks are appended to the backend's change log.
+        
+        The first sync only primes the snapshot; later syncs publish
+        ``new_unassigned_task``, ``task_assigned`` and ``workload_changed``
+        events for changes made outside this service (e.g. directly in JIRA).
+        
+        Returns:
+            Dict: Summary with the number of tasks seen and events published
+        """
+        with self._sync_lock:
+            api = self.api
+            if self.backend == 'sqlite' and self.use_real_jira:
+                # Refresh the local store from JIRA; with mock data the store is authoritative
+                api.sync_from(self.upstream.get_users(), self.upstream.get_tasks())
+            
+            first_event_id = self.events.last_id
+            tasks = {task["key"]: task for task in self.api.get_tasks()}
+            if self.backend == 'jira':
+                # Reuse the full fetch to pick up workload changes made directly in JIRA
+                self.api.refresh_workloads(list(tasks.values()))
+            current = {
+                task_key: {
+                    "assignee": task.get("assignee"),
+                    "storyPoints": task.get("storyPoints", 0),
+                    "status": task.get("status"),
+                    "updated": task.get("updated")
+                }
+                for task_key, task in tasks.items()
+            }
+            
+            users_fingerprint = hashlib.sha1(
+                json.dumps(self.api.get_users(), sort_keys=True, default=str).encode()
+            ).hexdigest()
+            if self._users_fingerprint is not None and users_fingerprint != self._users_fingerprint:
+                self.bump_revision("users")
+            self._users_fingerprint = users_fingerprint
+            
+            if current != self._task_snapshot:
+                self.bump_revision("tasks")
+            
+            if self._snapshot_primed:
+                change_log = self.api.change_log
+                for task_key, state in current.items():
+                    if self._task_snapshot.get(task_key) != state:
+                        change_log.record_upsert(tasks[task_key])
+                for task_key in self._task_snapshot:
+                    if task_key not in current:
+                        change_log.record_delete(task_key)
+                
+                changed_users = set()
+                
+                for task_key, state in current.items():
+                    previous = self._task_snapshot.get(task_key)
+                    if previous is None:
+                        if state["assignee"]:
+                            changed_users.add(state["assignee"])
+                        else:
+                            self.events.publish(NEW_UNASSIGNED_TASK, {"taskKey": task_key, "task": tasks[task_key]})
+                    elif previous["assignee"] != state["assignee"]:
+                        self.events.publish(TASK_ASSIGNED, {
+                            "taskKey": task_key,
+                            "assignee": state["assignee"],
+                            "previousAssignee": previous["assignee"]
+                        })
+                        changed_users.update((previous["assignee"], state["assignee"]))
+                    elif previous["storyPoints"] != state["storyPoints"]:
+                        changed_users.add(state["assignee"])
+                
+                for task_key, previous in self._task_snapshot.items():
+                    if task_key not in current:
+                        changed_users.add(previous["assignee"])
+                
+                self._publish_workload_changes(changed_users)
+            
+            self._task_snapshot = current
+            self._snapshot_primed = True
+            
+            return {
+                "tasks": len(current),
+                "eventsPublished": self.events.last_id - first_event_id
+            }
+    
+    def start_background_sync(self, interval: float = 30.0):
+        """Run sync() every ``interval`` seconds on a daemon thread"""
+        if self._sync_thread and self._sync_thread.is_alive():
+            return
+        
+        self._sync_stop.clear()
+        self.sync_interval = interval
+        
+        def run():
+            while not self._sync_stop.is_set():
+                try:
+                    # Queue behind interactive JIRA calls when rate limited
+                    with call_priority(BACKGROUND):
+                        self.sync()
+                except Exception as e:
+                    print(f"❌ Background sync failed: {e}")
+                self._sync_stop.wait(interval)
+        
+        self._sync_thread = threading.Thread(target=run, name="taskflow-sync", daemon=True)
+        self._sync_thread.start()
+    
+    def stop_background_sync(self):
+        """Stop the background sync thread if it is running"""
+        self._sync_stop.set()
+        if self._sync_thread:
+            self._sync_thread.join(timeout=5)
+            self._sync_thread = None
+    
+    def _publish_workload_changes(self, usernames):
+        """Publish a workload_changed event with fresh numbers for each user"""
+        for username in sorted(u for u in usernames if u):
+            workload = self.api.get_user_workload(username)
+            if "error" not in workload:
+                self.events.publish(WORKLOAD_CHANGED, {"username": username, "workload": workload})
+
+# Process-wide services shared by TaskFlowWebAPI instances, keyed by _service_key()
+_shared_services: Dict[tuple, Dict] = {}
+_shared_services_lock = threading.Lock()
+
+def _service_key(use_real_jira, config_file, backend, db_path, decision_log_dir, capacity_ceiling=None) -> tuple:
+    """Registry key: the resolved backend type plus everything it is configured from"""
+    use_real_jira = bool(use_real_jira and JIRA_AVAILABLE)
+    backend = backend or ('jira' if use_real_jira else 'mock')
+    if backend == 'jira' and not use_real_jira:
+        backend = 'mock'
+    return (
+        backend,
+        use_real_jira,
+        os.path.abspath(config_file) if config_file else None,
+        os.path.abspath(db_path) if db_path else None,
+        os.path.abspath(decision_log_dir) if decision_log_dir else None,
+        capacity_ceiling
+    )
+
+def _config_stamp(config_file: Optional[str]) -> Optional[tuple]:
+    """Modification time and size of a config file (None if absent)"""
+    if not config_file:
+        return None
+    try:
+        stat = os.stat(config_file)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def get_shared_service(use_real_jira=True, config_file=None, backend=None, db_path=None,
+                       decision_log_dir=None, prewarm=False, capacity_ceiling=None) -> TaskFlowAPIService:
+    """
+    Get the process-wide service for a configuration, creating it on first use
+    
+    Every caller with the same backend type and configuration gets the same
+    TaskFlowAPIService, and with it one backend, one set of caches and one
+    JIRA connection. If the config file changes on disk, the next call builds
+    a replacement service. The replacement takes over the event bus, decision
+    log and background sync, so subscribers keep their cursors. Requests
+    already running finish on the old service.
+    """
+    key = _service_key(use_real_jira, config_file, backend, db_path, decision_log_dir, capacity_ceiling)
+    now = time.monotonic()
+    
+    entry = _shared_services.get(key)
+    if entry is not None and now - entry["checked"] < CONFIG_CHECK_INTERVAL:
+        return entry["service"]
+    
+    with _shared_services_lock:
+        entry = _shared_services.get(key)
+        stamp = _config_stamp(config_file)
+        
+        if entry is not None and entry["stamp"] == stamp:
+            entry["checked"] = now
+            return entry["service"]
+        
+        service = TaskFlowAPIService(use_real_jira, config_file, backend, db_path, decision_log_dir, prewarm,
+                                     capacity_ceiling)
+        if entry is not None:
+            print(f"🔄 Config {config_file} changed, reinitializing shared service...")
+            old = entry["service"]
+            service.events = old.events
+            if old.decision_log:
+                if service.decision_log:
+                    service.decision_log.close()
+                service.decision_log = old.decision_log
+            if old.sync_interval is not None:
+                old.stop_background_sync()
+                service.start_background_sync(old.sync_interval)
+        
+        _shared_services[key] = {"service": service, "stamp": stamp, "checked": now}
+        return service
+
+def reset_shared_services():
+    """Drop all shared services (for tests and embedding code that needs a fresh state)"""
+    with _shared_services_lock:
+        for entry in _shared_services.values():
+            entry["service"].stop_background_sync()
+            if entry["service"].decision_log:
+                entry["service"].decision_log.close()
+        _shared_services.clear()
 
 class TaskFlowWebAPI:
     """Web API wrapper for TaskFlow that provides HTTP-like responses"""
     
-    def __init__(self, use_real_jira=True, config_file=None):
-        self.service = TaskFlowAPIService(use_real_jira, config_file)
+    # Upper bound for a single /api/events long-poll, in seconds
+    MAX_POLL_TIMEOUT = 30.0
+    
+    # Endpoints served by _route(); anything else is counted as "unmatched" in metrics
+    ENDPOINTS = (
+        '/api/info', '/api/users', '/api/tasks', '/api/tasks/changes', '/api/tasks/unassigned',
+        '/api/assign', '/api/recommendations', '/api/workload', '/api/capacity', '/api/events',
+        '/api/sync', '/api/metrics', '/api/traces'
+    )
+    
+    # Path prefixes _route() serves with a parameter, and the label their metrics share
+    ENDPOINT_TEMPLATES = (
+        ('/api/users/', '/api/users/{username}'),
+    )
+    
+    # List endpoints that stream_request() can encode incrementally
+    STREAMABLE_ENDPOINTS = ('/api/users', '/api/tasks', '/api/tasks/unassigned')
     
-    def handle_request(self, endpoint: str, method: str = 'GET', data: Dict = None) -> Dict:
+    # Datasets whose revisions make up each cacheable endpoint's ETag
+    ETAG_DATASETS = {
+        '/api/users': ('users',),
+        '/api/tasks': ('tasks',),
+        '/api/tasks/unassigned': ('tasks',),
+        '/api/workload': ('users', 'tasks'),
+        '/api/capacity': ('users', 'tasks'),
+    }
+    
+    def __init__(self, use_real_jira=True, config_file=None, backend=None, db_path=None,
+                 decision_log_dir=None, prewarm=False, shared=True, capacity_ceiling=None):
+        """
+        Initialize the web API
+        
+        Args:
+            shared (bool): Use the process-wide service for this configuration
+                (see get_shared_service) instead of building a private one
+            Other arguments are passed to TaskFlowAPIService.
+        """
+        self._service_args = (use_real_jira, config_file, backend, db_path, decision_log_dir)
+        self._capacity_ceiling = capacity_ceiling
+        self._service = None
+        with PROFILER.phase("web_api_init"):
+            if shared:
+                get_shared_service(*self._service_args, prewarm=prewarm, capacity_ceiling=capacity_ceiling)
+            else:
+                self._service = TaskFlowAPIService(*self._service_args, prewarm=prewarm,
+                                                   capacity_ceiling=capacity_ceiling)
+    
+    @property
+    def service(self) -> TaskFlowAPIService:
+        """The service requests are served from (the current shared one unless private)"""
+        if self._service is not None:
+            return self._service
+        return get_shared_service(*self._service_args, capacity_ceiling=self._capacity_ceiling)
+    
+    @service.setter
+    def service(self, service: TaskFlowAPIService):
+        """Pin this web API to a specific service"""
+        self._service = service
+    
+    def handle_request(self, endpoint: str, method: str = 'GET', data: Dict = None, headers: Dict = None) -> Dict:
         """
         Handle API requests in a REST-like manner
         
@@ -99,21 +656,153 @@ class TaskFlowWebAPI:
             endpoint (str): API endpoint (e.g., '/users', '/tasks', '/assign')
             method (str): HTTP method ('GET', 'POST', 'PUT', 'DELETE')
             data (Dict): Request data for POST/PUT requests
+            headers (Dict): Request headers (e.g. 'If-None-Match' for conditional GETs)
         
         Returns:
-            Dict: Response with status, data, and message
+            Dict: Response with status, data, and message. Cacheable GET
+            responses also carry an ``etag``; a matching ``If-None-Match``
+            yields a ``not_modified`` response with no data.
+        
+        Every call is timed and counted per endpoint for /api/metrics, and
+        sampled calls (or ones sent with ``X-TaskFlow-Trace: 1``) are traced.
+        Responses answered from the stale-while-revalidate cache carry a
+        ``cache`` entry with the data's ``ageSeconds`` and whether it is ``stale``.
+        """
+        label = self.metrics_label(endpoint)
+        with track_request(label, method) as outcome, track_freshness() as freshness, \
+                TRACER.trace(f"{method} {label}", force=trace_forced(headers), endpoint=endpoint) as span:
+            # Resolve the shared service once so the whole request sees the same one
+            service = self.service
+            etag = self.get_etag(endpoint, data, service) if method == 'GET' else None
+            
+            if etag and self._etag_matches(etag, headers):
+                outcome["status"] = "not_modified"
+                return {
+                    "status": "not_modified",
+                    "data": None,
+                    "message": "Not modified",
+                    "etag": etag
+                }
+            
+            response = self._route(service, endpoint, method, data, headers)
+            if etag and response and response.get("status") == "success":
+                response["etag"] = etag
+            if freshness["cached"] and response:
+                response["cache"] = {"ageSeconds": freshness["ageSeconds"], "stale": freshness["stale"]}
+            outcome["status"] = response.get("status", "error") if response else "method_not_allowed"
+            if span is not None:
+                span.set(status=outcome["status"])
+            return response
+    
+    def metrics_label(self, endpoint: str) -> str:
+        """Endpoint label for metrics, folding parameters and unknown paths together to bound cardinality"""
+        if endpoint in self.ENDPOINTS:
+            return endpoint
+        for prefix, template in self.ENDPOINT_TEMPLATES:
+            if endpoint.startswith(prefix) and len(endpoint) > len(prefix):
+                return template
+        return "unmatched"
+    
+    def is_not_modified(self, endpoint: str, data: Dict = None, headers: Dict = None,
+                        service: TaskFlowAPIService = None) -> bool:
+        """Check a conditional GET without calling the backend"""
+        etag = self.get_etag(endpoint, data, service)
+        return bool(etag) and self._etag_matches(etag, headers)
+    
+    def get_etag(self, endpoint: str, data: Dict = None, service: TaskFlowAPIService = None) -> Optional[str]:
         """
+        Build the ETag for a list endpoint from the revisions of the datasets it reads
+        
+        This never touches the backend, so checking a conditional request is
+        O(1) regardless of how many users or tasks there are. Callers that
+        already resolved the service for the request pass it in.
+        """
+        datasets = self.ETAG_DATASETS.get(endpoint)
+        if not datasets:
+            return None
+        
+        service = service or self.service
+        scope = service.etag_scope()
+        if scope is None:
+            return None
+        stamp = "-".join(f"{name}.{service.get_revision(name)}" for name in datasets) + scope
+        if data:
+            params = json.dumps(data, sort_keys=True, default=str)
+            stamp += "-" + hashlib.sha1(params.encode()).hexdigest()[:12]
+        return f'"{service.instance_id}-{stamp}"'
+    
+    def stream_request(self, endpoint: str, data: Dict = None,
+                       service: TaskFlowAPIService = None) -> Optional[Iterator[bytes]]:
+        """
+        Stream a list endpoint's JSON response instead of building it in memory
+        
+        Produces the same document handle_request() would return for a GET
+        (including ``etag`` and ``revision``), encoded incrementally as the
+        backend yields records.
+        
+        Returns:
+            Iterator[bytes]: Encoded response chunks, or None if the request
+            is not streamable (including paginated /api/tasks queries)
+        """
+        if endpoint not in self.STREAMABLE_ENDPOINTS:
+            return None
+        
+        # Paginated queries return a single bounded page; no need to stream
+        if endpoint == '/api/tasks' and data and any(data.get(param) for param in QUERY_PARAMS):
+            return None
+        
+        service = service or self.service
+        extra = {}
+        etag = self.get_etag(endpoint, data, service)
+        
+        if endpoint == '/api/users':
+            items = iter(service.get_users())
+            message = "Retrieved {count} users"
+        elif endpoint == '/api/tasks':
+            extra["revision"] = service.get_task_revision()
+            items = service.iter_tasks(
+                data.get('project_key') if data else None,
+                data.get('assignee') if data else None,
+                data.get('status') if data else None
+            )
+            message = "Retrieved {count} tasks"
+        else:
+            items = iter(service.get_unassigned_tasks())
+            message = "Retrieved {count} unassigned tasks"
+        
+        if etag:
+            extra["etag"] = etag
+        return iter_json_list_response(items, message, extra)
+    
+    @staticmethod
+    def _etag_matches(etag: str, headers: Dict = None) -> bool:
+        """Check an If-None-Match header value against the current ETag"""
+        if not headers:
+            return False
+        
+        if_none_match = next((v for k, v in headers.items() if k.lower() == 'if-none-match'), None)
+        if not if_none_match:
+            return False
+        
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or any(
+            (tag[2:] if tag.startswith('W/') else tag) == etag for tag in candidates
+        )
+    
+    def _route(self, service: TaskFlowAPIService, endpoint: str, method: str, data: Dict = None,
+               headers: Dict = None) -> Dict:
+        """Dispatch a request to the matching service call"""
         try:
             if endpoint == '/api/info':
                 return {
                     "status": "success",
-                    "data": self.service.get_api_info(),
+                    "data": service.get_api_info(),
                     "message": "API info retrieved successfully"
                 }
             
             elif endpoint == '/api/users':
                 if method == 'GET':
-                    users = self.service.get_users()
+                    users = service.get_users()
                     return {
                         "status": "success",
                         "data": users,
@@ -123,7 +812,7 @@ class TaskFlowWebAPI:
             elif endpoint.startswith('/api/users/'):
                 username = endpoint.split('/')[-1]
                 if method == 'GET':
-                    user = self.service.get_user(username)
+                    user = service.get_user(username)
                     if user:
                         return {
                             "status": "success",
@@ -144,16 +833,68 @@ class TaskFlowWebAPI:
                     assignee = data.get('assignee') if data else None
                     status = data.get('status') if data else None
                     
-                    tasks = self.service.get_tasks(project_key, assignee, status)
+                    # Read the revision first so a concurrent change is replayed, not missed
+                    revision = service.get_task_revision()
+                    
+                    if data and any(data.get(param) for param in QUERY_PARAMS):
+                        try:
+                            page = service.query_tasks(
+                                project_key, assignee, status,
+                                labels=data.get('labels'),
+                                priorities=data.get('priority'),
+                                skills=data.get('skill'),
+                                sort=data.get('sort'),
+                                cursor=data.get('cursor'),
+                                limit=data.get('limit')
+                            )
+                        except InvalidQueryError as e:
+                            return {
+                                "status": "error",
+                                "data": None,
+                                "message": str(e)
+                            }
+                        return {
+                            "status": "success",
+                            "data": page["tasks"],
+                            "message": f"Retrieved {len(page['tasks'])} of {page['total']} tasks",
+                            "pagination": {
+                                "nextCursor": page["nextCursor"],
+                                "total": page["total"],
+                                "sort": data.get('sort')
+                            },
+                            "revision": revision
+                        }
+                    
+                    tasks = service.get_tasks(project_key, assignee, status)
                     return {
                         "status": "success",
                         "data": tasks,
-                        "message": f"Retrieved {len(tasks)} tasks"
+                        "message": f"Retrieved {len(tasks)} tasks",
+                        "revision": revision
+                    }
+            
+            elif endpoint == '/api/tasks/changes':
+                if method == 'GET':
+                    try:
+                        since = int(data.get('since', 0)) if data else 0
+                    except (TypeError, ValueError):
+                        return {
+                            "status": "error",
+                            "data": None,
+                            "message": f"Invalid since '{data.get('since')}'"
+                        }
+                    client_id = data.get('client_id') if data else None
+                    changes = service.get_task_changes(since, client_id)
+                    return {
+                        "status": "success",
+                        "data": changes,
+                        "message": f"Retrieved {len(changes['upserts'])} upserts and "
+                                   f"{len(changes['deletions'])} deletions since revision {since}"
                     }
             
             elif endpoint == '/api/tasks/unassigned':
                 if method == 'GET':
-                    tasks = self.service.get_unassigned_tasks()
+                    tasks = service.get_unassigned_tasks()
                     return {
                         "status": "success",
                         "data": tasks,
@@ -172,17 +913,62 @@ class TaskFlowWebAPI:
                             "message": "task_key and assignee are required"
                         }
                     
-                    result = self.service.assign_task(task_key, assignee)
-                    return {
+                    result = service.assign_task(task_key, assignee, data.get('approver'),
+                                                      data.get('expected_version'))
+                    response = {
                         "status": "success" if result.get("success") else "error",
                         "data": result,
                         "message": result.get("message", "Assignment completed")
                     }
+                    if result.get("retryAfter") is not None:
+                        response["retryAfter"] = result["retryAfter"]
+                    return response
+            
+            elif endpoint == '/api/recommendations':
+                if method in ('GET', 'POST'):
+                    task_key = (data or {}).get('task_key')
+                    if not task_key:
+                        return {
+                            "status": "error",
+                            "data": None,
+                            "message": "task_key is required"
+                        }
+                    
+                    try:
+                        limit = max(1, int((data or {}).get('limit') or 3))
+                    except (TypeError, ValueError):
+                        return {
+                            "status": "error",
+                            "data": None,
+                            "message": f"Invalid limit '{data.get('limit')}'"
+                        }
+                    
+                    # The name becomes part of a file name in the profile directory
+                    profile_name = "recommendations-" + re.sub(r'[^\w-]', '_', task_key)
+                    profiler = PROFILING.begin(profile_name, headers)
+                    try:
+                        recommendations = service.get_recommendations(task_key, limit, profiler)
+                    finally:
+                        profile = PROFILING.finish(profiler) if profiler else None
+                    if recommendations is None:
+                        return {
+                            "status": "error",
+                            "data": None,
+                            "message": f"Task {task_key} not found"
+                        }
+                    response = {
+                        "status": "success",
+                        "data": recommendations,
+                        "message": f"Ranked {len(recommendations['candidates'])} candidates for {task_key}"
+                    }
+                    if profile and profiler.requested:
+                        response["profile"] = profile
+                    return response
             
             elif endpoint == '/api/workload':
                 if method == 'GET' and data and data.get('username'):
                     username = data.get('username')
-                    workload = self.service.get_user_workload(username)
+                    workload = service.get_user_workload(username)
                     return {
                         "status": "success",
                         "data": workload,
@@ -191,13 +977,68 @@ class TaskFlowWebAPI:
             
             elif endpoint == '/api/capacity':
                 if method == 'GET':
-                    capacity = self.service.get_team_capacity_overview()
+                    capacity = service.get_team_capacity_overview()
                     return {
                         "status": "success",
                         "data": capacity,
                         "message": "Team capacity overview retrieved successfully"
                     }
             
+            elif endpoint == '/api/events':
+                if method == 'GET':
+                    # Long-poll: clients pass the last event id they applied
+                    try:
+                        since = int(data.get('since', 0)) if data else 0
+                        timeout = float(data.get('timeout', 0)) if data else 0
+                    except (TypeError, ValueError):
+                        return {
+                            "status": "error",
+                            "data": None,
+                            "message": f"Invalid since '{data.get('since')}' or timeout '{data.get('timeout')}'"
+                        }
+                    events = service.get_events(since, min(max(timeout, 0), self.MAX_POLL_TIMEOUT))
+                    return {
+                        "status": "success",
+                        "data": events,
+                        "message": f"Retrieved {len(events['events'])} events"
+                    }
+            
+            elif endpoint == '/api/metrics':
+                if method == 'GET':
+                    return {
+                        "status": "success",
+                        "data": METRICS.render(),
+                        "message": "Metrics in Prometheus text format"
+                    }
+            
+            elif endpoint == '/api/traces':
+                if method == 'GET':
+                    try:
+                        limit = int(data['limit']) if data and data.get('limit') else None
+                        if limit is not None and limit < 1:
+                            raise ValueError(limit)
+                    except (TypeError, ValueError):
+                        return {
+                            "status": "error",
+                            "data": None,
+                            "message": f"Invalid limit '{data.get('limit')}'"
+                        }
+                    traces = TRACER.recent(limit)
+                    return {
+                        "status": "success",
+                        "data": traces,
+                        "message": f"Retrieved {len(traces)} traces"
+                    }
+            
+            elif endpoint == '/api/sync':
+                if method == 'POST':
+                    summary = service.sync()
+                    return {
+                        "status": "success",
+                        "data": summary,
+                        "message": f"Synced {summary['tasks']} tasks"
+                    }
+            
             else:
                 return {
                     "status": "error",
@@ -205,15 +1046,45 @@ class TaskFlowWebAPI:
                     "message": f"Endpoint {endpoint} not found"
                 }
         
+        except (JiraRateLimitError, BackendUnavailableError) as e:
+            REQUEST_EXCEPTIONS.inc(self.metrics_label(endpoint), type(e).__name__)
+            return {
+                "status": "error",
+                "data": None,
+                "message": str(e),
+                "retryAfter": e.retry_after
+            }
+        
         except Exception as e:
+            REQUEST_EXCEPTIONS.inc(self.metrics_label(endpoint), type(e).__name__)
             return {
                 "status": "error",
                 "data": None,
                 "message": f"Internal server error: {str(e)}"
             }
 
+def profile_startup(use_real_jira: bool, output_path: str = None):
+    """Cold-start a web API, serve one request and print the startup report"""
+    web_api = TaskFlowWebAPI(use_real_jira=use_real_jira)
+    with PROFILER.phase("first_request"):
+        web_api.handle_request('/api/users')
+    PROFILER.print_report(output_path)
+
 def main():
     """Demo the unified API service"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='TaskFlow unified API service demo')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Profile a cold start instead of running the demo (also: TASKFLOW_PROFILE_STARTUP=1)')
+    parser.add_argument('--mock', action='store_true', help='Profile the mock backend instead of real JIRA')
+    parser.add_argument('--profile-output', help='Write the startup report as JSON to this file')
+    args = parser.parse_args()
+    
+    if PROFILER.enabled:
+        profile_startup(not args.mock, args.profile_output)
+        return
+    
     print("🚀 TaskFlow Unified API Service Demo")
     print("=" * 50)
     
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Change Log
+Append-only log of task upserts and deletions used for delta resyncs
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+class ChangeLog:
+    """Append-only task change log with client-driven compaction"""
+
+    def __init__(self, max_entries: int = 10000, client_ttl: float = 3600.0):
+        """
+        Initialize an empty change log
+
+        Args:
+            max_entries (int): Hard cap on retained entries; the oldest are
+                compacted away even if a slow client still needs them
+            client_ttl (float): Seconds after which a silent client is forgotten
+                and no longer holds back compaction
+        """
+        self.max_entries = max_entries
+        self.client_ttl = client_ttl
+        self._entries: List[Dict] = []
+        self._revisions: List[int] = []
+        self._revision = 0
+        self._floor = 0
+        self._clients: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def revision(self) -> int:
+        """Revision of the most recent change (0 if nothing changed yet)"""
+        return self._revision
+
+    @property
+    def floor(self) -> int:
+        """Oldest revision clients can still resync from"""
+        return self._floor
+
+    def record_upsert(self, task: Dict) -> int:
+        """Record that a task was created or modified; returns the new revision"""
+        return self._append(UPSERT, task["key"], dict(task))
+
+    def record_delete(self, task_key: str) -> int:
+        """Record that a task was removed; returns the new revision"""
+        return self._append(DELETE, task_key, None)
+
+    def changes_since(self, since: int = 0, client_id: Optional[str] = None) -> Dict:
+        """
+        Get the net changes after a revision
+
+        Only the latest change per task is returned, so a task updated many
+        times since ``since`` appears once. Passing ``client_id`` registers the
+        client as having applied everything up to ``since``, which lets the log
+        compact entries every known client has moved past.
+
+        Returns:
+            Dict: ``upserts`` (task dicts), ``deletions`` (task keys), the
+            current ``revision`` to use as the next ``since``, and ``reset``
+            which is True when ``since`` predates the compacted history and the
+            client must reload the full task list.
+        """
+        with self._lock:
+            if client_id:
+                self._clients[client_id] = {"revision": since, "seen": time.time()}
+                self._compact()
+
+            if since < self._floor or since > self._revision:
+                return {
+                    "upserts": [],
+                    "deletions": [],
+                    "revision": self._revision,
+                    "reset": True
+                }
+
+            latest = {}
+            start = bisect.bisect_right(self._revisions, since)
+            for entry in self._entries[start:]:
+                latest[entry["key"]] = entry
+
+            upserts = [e["task"] for e in latest.values() if e["op"] == UPSERT]
+            deletions = [e["key"] for e in latest.values() if e["op"] == DELETE]
+
+            return {
+                "upserts": upserts,
+                "deletions": deletions,
+                "revision": self._revision,
+                "reset": False
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _append(self, op: str, task_key: str, task: Optional[Dict]) -> int:
+        """Append an entry under the lock and return its revision"""
+        with self._lock:
+            self._revision += 1
+            self._entries.append({"revision": self._revision, "op": op, "key": task_key, "task": task})
+            self._revisions.append(self._revision)
+
+            if len(self._entries) > self.max_entries:
+                self._truncate(self._entries[len(self._entries) - self.max_entries - 1]["revision"])
+
+            return self._revision
+
+    def _compact(self):
+        """Drop entries that every live client has already applied"""
+        now = time.time()
+        for client_id in [c for c, state in self._clients.items() if now - state["seen"] > self.client_ttl]:
+            del self._clients[client_id]
+
+        if self._clients:
+            self._truncate(min(state["revision"] for state in self._clients.values()))
+
+    def _truncate(self, revision: int):
+        """Remove entries up to and including ``revision`` and raise the floor"""
+        if revision <= self._floor:
+            return
+        cut = bisect.bisect_right(self._revisions, revision)
+        del self._entries[:cut]
+        del self._revisions[:cut]
+        self._floor = min(revision, self._revision)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Decision Log
+Append-only record of recommendations and the assignments that followed them
+"""
+
+import datetime
+import json
+import os
+import queue
+import threading
+import uuid
+from typing import Dict, Iterator, List, Optional
+
+# Decision logs are kept for 12 months (TECHNICAL_SPEC: Data Retention)
+RETENTION_DAYS = 365
+
+SEGMENT_PREFIX = "decisions-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class DecisionLog:
+    """
+    Daily-segmented JSONL log written by a background thread
+
+    Callers only enqueue entries, so logging costs a dict build and a queue
+    put on the request thread. The writer drains everything queued since its
+    last pass and appends it with a single write and fsync per segment (a
+    group commit). Each UTC day goes to its own file, so retention pruning
+    deletes whole files rather than rewriting one.
+    """
+
+    def __init__(self, log_dir: str, retention_days: int = RETENTION_DAYS, max_queue: int = 10000,
+                 max_batch: int = 1000):
+        """
+        Open a decision log and start its writer thread
+
+        Args:
+            log_dir (str): Directory holding the segment files
+            retention_days (int): Segments older than this are deleted
+            max_queue (int): Entries buffered before new ones are dropped;
+                dropping keeps requests fast if the disk stalls
+            max_batch (int): Most entries written per group commit
+        """
+        self.log_dir = log_dir
+        self.retention_days = retention_days
+        self.max_batch = max_batch
+        self.dropped = 0
+        self._queue = queue.Queue(max_queue)
+        self._pruned_on = None
+
+        os.makedirs(log_dir, exist_ok=True)
+        self._writer = threading.Thread(target=self._run, name="decision-log-writer", daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Recording (request thread)
+    # ------------------------------------------------------------------
+
+    def log_recommendation(self, task_key: str, candidates: List[Dict]) -> str:
+        """
+        Record the candidates offered for a task
+
+        Returns:
+            str: Recommendation id, referenced by the matching assignment entry
+        """
+        recommendation_id = uuid.uuid4().hex
+        self._enqueue({
+            "type": "recommendation",
+            "id": recommendation_id,
+            "taskKey": task_key,
+            "candidates": [
+                {
+                    "username": candidate["username"],
+                    "score": candidate["score"],
+                    "factors": candidate.get("factors", {}),
+                    "excluded": candidate.get("excluded", False)
+                }
+                for candidate in candidates
+            ]
+        })
+        return recommendation_id
+
+    def log_assignment(self, task_key: str, assignee: str, recommendation: Optional[Dict] = None,
+                       approver: Optional[str] = None) -> str:
+        """
+        Record who a task was given to and whether that followed the recommendation
+
+        Args:
+            task_key (str): Assigned task
+            assignee (str): Selected member
+            recommendation (Dict): The last ``{"id", "candidates"}`` offered for
+                the task, if any; feedback is derived by comparing against it
+            approver (str): User who approved the assignment
+        """
+        feedback = None
+        if recommendation:
+            ranked = [c["username"] for c in recommendation["candidates"] if not c.get("excluded")]
+            accepted = bool(ranked) and ranked[0] == assignee
+            if accepted:
+                reason = None
+            elif assignee in ranked:
+                reason = f"Chose candidate ranked #{ranked.index(assignee) + 1}"
+            else:
+                reason = "Chose a member outside the recommendations"
+            feedback = {"accepted": accepted, "reason": reason}
+
+        assignment_id = uuid.uuid4().hex
+        self._enqueue({
+            "type": "assignment",
+            "id": assignment_id,
+            "taskKey": task_key,
+            "recommendationId": recommendation["id"] if recommendation else None,
+            "selectedMember": assignee,
+            "approver": approver,
+            "feedback": feedback
+        })
+        return assignment_id
+
+    def _enqueue(self, entry: Dict):
+        """Timestamp an entry and hand it to the writer without blocking"""
+        entry["timestamp"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything enqueued so far is on disk; False if that took too long"""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """Write out pending entries and stop the writer; False if it did not stop in time"""
+        if self._writer.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                print(f"⚠️  Decision log writer for {self.log_dir} is stuck, closing without it")
+                return False
+            self._writer.join(timeout)
+        return not self._writer.is_alive()
+
+    # ------------------------------------------------------------------
+    # Reading and retention
+    # ------------------------------------------------------------------
+
+    def segments(self) -> List[str]:
+        """Segment file paths, oldest first"""
+        names = sorted(
+            name for name in os.listdir(self.log_dir)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.log_dir, name) for name in names]
+
+    def read(self, start: Optional[datetime.date] = None,
+             end: Optional[datetime.date] = None) -> Iterator[Dict]:
+        """Yield logged entries from the segments between two dates (inclusive)"""
+        for path in self.segments():
+            day = self._segment_date(path)
+            if day is None or (start and day < start) or (end and day > end):
+                continue
+            with open(path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def prune(self, today: Optional[datetime.date] = None) -> int:
+        """Delete segments past the retention window; returns how many were removed"""
+        today = today or datetime.datetime.now(datetime.timezone.utc).date()
+        cutoff = today - datetime.timedelta(days=self.retention_days)
+        removed = 0
+        for path in self.segments():
+            day = self._segment_date(path)
+            if day is not None and day < cutoff:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def segment_path(self, day: datetime.date) -> str:
+        """Path of the segment holding entries logged on ``day``"""
+        return os.path.join(self.log_dir, f"{SEGMENT_PREFIX}{day.isoformat()}{SEGMENT_SUFFIX}")
+
+    @staticmethod
+    def _segment_date(path: str) -> Optional[datetime.date]:
+        """Date encoded in a segment file name"""
+        name = os.path.basename(path)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+        try:
+            return datetime.date.fromisoformat(name)
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        """Block for the next entry, then commit everything queued behind it"""
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            entries = [item for item in batch if isinstance(item, dict)]
+            try:
+                self._write(entries)
+            except OSError as e:
+                print(f"❌ Error writing decision log: {e}")
+
+            for item in batch:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    item.set()
+
+    def _write(self, entries: List[Dict]):
+        """Append a batch, one write and fsync per daily segment"""
+        by_segment = {}
+        for entry in entries:
+            day = datetime.datetime.fromisoformat(entry["timestamp"]).date()
+            by_segment.setdefault(day, []).append(json.dumps(entry, default=str))
+
+        for day, lines in by_segment.items():
+            with open(self.segment_path(day), 'a') as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        if self._pruned_on != today:
+            self._pruned_on = today
+            self.prune(today)
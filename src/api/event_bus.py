@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Event Bus
+In-process publish/subscribe buffer for assignment and capacity change events
+"""
+
+import datetime
+import threading
+from collections import deque
+from typing import Dict, List
+
+# Event types published by the API service
+TASK_ASSIGNED = "task_assigned"
+WORKLOAD_CHANGED = "workload_changed"
+NEW_UNASSIGNED_TASK = "new_unassigned_task"
+
+
+class EventBus:
+    """Bounded, ordered event buffer that supports long-poll consumers"""
+
+    def __init__(self, max_events: int = 1000):
+        """
+        Initialize the event bus
+
+        Args:
+            max_events (int): Number of recent events kept for late consumers
+        """
+        self._events = deque(maxlen=max_events)
+        self._condition = threading.Condition()
+        self._last_id = 0
+
+    @property
+    def last_id(self) -> int:
+        """Id of the most recently published event (0 if none)"""
+        return self._last_id
+
+    def publish(self, event_type: str, data: Dict) -> Dict:
+        """Append an event and wake up any waiting consumers"""
+        with self._condition:
+            self._last_id += 1
+            event = {
+                "id": self._last_id,
+                "type": event_type,
+                "timestamp": datetime.datetime.now().isoformat(),
+                "data": data
+            }
+            self._events.append(event)
+            self._condition.notify_all()
+        return event
+
+    def get_events(self, since: int = 0, timeout: float = 0) -> Dict:
+        """
+        Get events published after a given event id
+
+        Blocks for up to ``timeout`` seconds when no newer events are available,
+        which lets HTTP clients long-poll instead of re-fetching full snapshots.
+
+        Args:
+            since (int): Last event id the consumer has already seen
+            timeout (float): Maximum seconds to wait for a new event
+
+        Returns:
+            Dict: ``events`` after ``since``, the new ``cursor``, and ``reset``
+            which is True when older events were dropped from the buffer and
+            the consumer must reload a full snapshot.
+        """
+        with self._condition:
+            if timeout and self._last_id <= since:
+                self._condition.wait_for(lambda: self._last_id > since, timeout)
+
+            events: List[Dict] = [event for event in self._events if event["id"] > since]
+            oldest_id = self._events[0]["id"] if self._events else self._last_id + 1
+
+            return {
+                "events": events,
+                "cursor": self._last_id,
+                "reset": since < oldest_id - 1 or since > self._last_id
+            }
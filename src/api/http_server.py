@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+TaskFlow HTTP Server
+Serves TaskFlowWebAPI over HTTP with streaming list responses, gzip/deflate
+negotiation, conditional GETs, a Server-Sent Events feed and Prometheus metrics
+"""
+
+import json
+import math
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# Add the current directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api_service import TaskFlowWebAPI
+from startup_profiler import PROFILER
+from json_stream import compress, iter_compressed, negotiate_encoding
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, track_request
+from tracing import TRACER, trace_forced
+from jira_scheduler import JiraRateLimitError
+from swr_cache import BackendUnavailableError, track_freshness
+from profiling import MODES as PROFILE_MODES, PROFILING
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+# Seconds an SSE connection waits for events before sending a keep-alive comment
+SSE_KEEPALIVE = 15.0
+
+
+def freshness_headers(cache: Dict) -> Dict:
+    """Age (and a staleness Warning) for data served from the stale-while-revalidate cache"""
+    headers = {"Age": str(int(cache["ageSeconds"]))}
+    if cache["stale"]:
+        headers["Warning"] = '110 - "Response is Stale"'
+    return headers
+
+
+class TaskFlowRequestHandler(BaseHTTPRequestHandler):
+    """Translates HTTP requests into TaskFlowWebAPI calls"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "TaskFlow/1.0"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients wait out a delayed ACK (~40ms) on every response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path, data = self._parse_url()
+        headers = dict(self.headers.items())
+
+        if path == '/api/events' and 'text/event-stream' in self.headers.get('Accept', ''):
+            self._serve_event_stream(data)
+            return
+
+        web_api = self.server.web_api
+        if path in web_api.STREAMABLE_ENDPOINTS:
+            # These bypass handle_request(), so they are timed here
+            service = web_api.service
+            if web_api.is_not_modified(path, data, headers, service):
+                with track_request(path, 'GET') as outcome:
+                    self._send_not_modified(web_api.get_etag(path, data, service))
+                    outcome["status"] = "not_modified"
+                return
+            try:
+                with track_freshness() as freshness:
+                    chunks = web_api.stream_request(path, data, service)
+            except (JiraRateLimitError, BackendUnavailableError) as e:
+                self._send_response({"status": "error", "data": None, "message": str(e),
+                                     "retryAfter": e.retry_after})
+                return
+            if chunks is not None:
+                with track_request(path, 'GET') as outcome, \
+                        TRACER.trace(f"GET {path}", force=trace_forced(headers), endpoint=path):
+                    self._send_stream(chunks, web_api.get_etag(path, data, service),
+                                      freshness_headers(freshness) if freshness["cached"] else None)
+                    outcome["status"] = "success"
+                return
+
+        response = web_api.handle_request(path, 'GET', data, headers)
+        if path == '/api/metrics' and response and response.get("status") == "success":
+            self._send_text(200, response["data"], METRICS_CONTENT_TYPE)
+            return
+        self._send_response(response)
+
+    def do_POST(self):
+        path, data = self._parse_url()
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            # Without a usable length the body cannot be skipped, so the connection is not reusable
+            self.close_connection = True
+            self._send_json(400, {"status": "error", "data": None, "message": "Invalid Content-Length"})
+            return
+
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = None
+            if not isinstance(body, dict):
+                self._send_json(400, {"status": "error", "data": None, "message": "Invalid JSON body"})
+                return
+            data.update(body)
+
+        self._send_response(self.server.web_api.handle_request(path, 'POST', data, dict(self.headers.items())))
+
+    def log_message(self, format, *args):
+        """Only log requests when the server was started with verbose logging"""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _parse_url(self):
+        """Split the request URL into a path and a flat dict of query parameters"""
+        url = urlsplit(self.path)
+        data = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        return url.path.rstrip('/') or '/', data
+
+    def _send_response(self, response: Optional[Dict]):
+        """Send a handle_request() result with a matching HTTP status code"""
+        if response is None:
+            self._send_json(405, {"status": "error", "data": None, "message": "Method not allowed"})
+            return
+
+        status = response.get("status")
+        if status == "not_modified":
+            self._send_not_modified(response.get("etag"))
+            return
+
+        message = response.get("message") or ""
+        data = response.get("data")
+        headers = None
+        if status == "success":
+            code = 200
+        elif response.get("retryAfter") is not None:
+            # JIRA is rate limiting us; pass its back-off on to the client
+            code = 503
+            headers = {"Retry-After": str(math.ceil(response["retryAfter"]))}
+        elif isinstance(data, dict) and (data.get("conflict") or data.get("overCapacity")):
+            code = 409
+        elif message.startswith("Endpoint ") and message.endswith(" not found"):
+            code = 404
+        elif message.startswith("Internal server error"):
+            code = 500
+        else:
+            code = 400
+
+        if response.get("cache"):
+            headers = dict(headers or {}, **freshness_headers(response["cache"]))
+        self._send_json(code, response, response.get("etag"), headers)
+
+    def _send_json(self, code: int, payload: Dict, etag: Optional[str] = None, headers: Dict = None):
+        """Serialize a whole response, compressing it when the client allows"""
+        body = json.dumps(payload, default=str).encode("utf-8")
+        encoding = negotiate_encoding(self.headers.get('Accept-Encoding'))
+        if encoding and len(body) >= MIN_COMPRESS_SIZE:
+            body = compress(body, encoding)
+        else:
+            encoding = None
+
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, code: int, text: str, content_type: str):
+        """Send a plain-text body (e.g. the Prometheus exposition)"""
+        body = text.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_not_modified(self, etag: Optional[str]):
+        """Send an empty 304 response"""
+        self.send_response(304)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def _send_stream(self, chunks: Iterable[bytes], etag: Optional[str], headers: Dict = None):
+        """Send a streamed response using chunked transfer encoding"""
+        encoding = negotiate_encoding(self.headers.get('Accept-Encoding'))
+        if encoding:
+            chunks = iter_compressed(chunks, encoding)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        try:
+            for chunk in chunks:
+                if chunk:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:
+            # Headers are already sent, so drop the connection without the
+            # terminating chunk; the client sees a truncated response
+            print(f"❌ Error while streaming {self.path}: {e}")
+            self.close_connection = True
+
+    def _serve_event_stream(self, data: Dict):
+        """Push change events to the client as Server-Sent Events"""
+        service = self.server.web_api.service
+        last_event_id = self.headers.get('Last-Event-ID') or data.get('since') or 0
+        try:
+            since = int(last_event_id)
+        except ValueError:
+            self._send_response({"status": "error", "data": None,
+                                 "message": f"Invalid event id '{last_event_id}'"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            while not self.server.shutting_down:
+                result = service.get_events(since, SSE_KEEPALIVE)
+                if result["reset"]:
+                    self.wfile.write(b"event: reset\ndata: {}\n\n")
+                for event in result["events"]:
+                    self.wfile.write(
+                        f"id: {event['id']}\nevent: {event['type']}\n"
+                        f"data: {json.dumps(event, default=str)}\n\n".encode("utf-8")
+                    )
+                if not result["events"]:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+                since = result["cursor"]
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class TaskFlowHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a TaskFlowWebAPI instance"""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, web_api: TaskFlowWebAPI, verbose: bool = False):
+        super().__init__(server_address, TaskFlowRequestHandler)
+        self.web_api = web_api
+        self.verbose = verbose
+        self.shutting_down = False
+
+    def shutdown(self):
+        self.shutting_down = True
+        super().shutdown()
+
+
+def main():
+    """Run the TaskFlow HTTP API"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='TaskFlow HTTP API server')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on')
+    parser.add_argument('--mock', action='store_true', help='Use mock JIRA data')
+    parser.add_argument('--config', help='Path to JIRA configuration file')
+    parser.add_argument('--backend', choices=['jira', 'mock', 'sqlite'],
+                        help='Backend to serve from (default: jira, or mock with --mock)')
+    parser.add_argument('--db', help='SQLite database path for --backend sqlite')
+    parser.add_argument('--sync-interval', type=float, default=0,
+                        help='Seconds between background JIRA syncs (0 disables)')
+    parser.add_argument('--decision-log', help='Directory for the recommendation decision log')
+    parser.add_argument('--capacity-ceiling', type=float,
+                        help='Refuse assignments above this fraction of the assignee\'s capacity, e.g. 1.0 '
+                             '(also: TASKFLOW_CAPACITY_CEILING)')
+    parser.add_argument('--prewarm', action='store_true',
+                        help='Create the backend and connect to JIRA at startup instead of on first request')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Create the backend at startup and print a startup timing report '
+                             '(also: TASKFLOW_PROFILE_STARTUP=1)')
+    parser.add_argument('--trace-sample-rate', type=float,
+                        help='Fraction of requests to trace, 0-1 (also: TASKFLOW_TRACE_SAMPLE_RATE)')
+    parser.add_argument('--trace-file',
+                        help='Append finished traces to this JSON lines file (also: TASKFLOW_TRACE_FILE)')
+    parser.add_argument('--profile-sample-rate', type=float,
+                        help='Fraction of recommendation requests to profile, 0-1 '
+                             '(also: TASKFLOW_PROFILE_SAMPLE_RATE)')
+    parser.add_argument('--profile-mode', choices=PROFILE_MODES,
+                        help='What sampled requests capture (also: TASKFLOW_PROFILE_MODE)')
+    parser.add_argument('--profile-dir',
+                        help='Write request profiles here (also: TASKFLOW_PROFILE_DIR)')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+    try:
+        TRACER.configure(args.trace_sample_rate, args.trace_file)
+        PROFILING.configure(args.profile_sample_rate, args.profile_mode, args.profile_dir)
+    except ValueError as e:
+        parser.error(str(e))
+
+    web_api = TaskFlowWebAPI(use_real_jira=not args.mock, config_file=args.config,
+                             backend=args.backend, db_path=args.db, decision_log_dir=args.decision_log, prewarm=args.prewarm,
+                             capacity_ceiling=args.capacity_ceiling)
+    if args.sync_interval > 0:
+        web_api.service.start_background_sync(args.sync_interval)
+
+    server = TaskFlowHTTPServer((args.host, args.port), web_api, verbose=args.verbose)
+    if PROFILER.enabled:
+        web_api.service.api
+        PROFILER.print_report()
+    print(f"🚀 TaskFlow API listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
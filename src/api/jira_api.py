@@ -6,16 +6,51 @@ Provides actual JIRA integration for production use
 
 import json
 import datetime
+import importlib.util
 import os
-from typing import Dict, List, Optional
-from jira import JIRA
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
 
+from change_log import ChangeLog
+from locks import ReadWriteLock
+from task_query import (
+    InvalidQueryError, cursor_start, decode_cursor, encode_cursor, parse_limit, parse_sort, split_values,
+    task_matches
+)
+from task_version import conflict_result, is_stale
+from workload import WorkloadAggregates, build_workload, capacity_limit, over_capacity_result
+from startup_profiler import PROFILER
+from metrics import instrument_backend
+from tracing import TRACER
+from jira_scheduler import INTERACTIVE, JiraRateLimitError, JiraScheduler, call_priority
+
+# Seconds the per-user workload totals are trusted before they are rebuilt from
+# JIRA, so edits made directly in JIRA show up without background sync
+WORKLOAD_MAX_AGE = 60.0
+
+def jira_library_available() -> bool:
+    """Check for the jira package without importing it (importing it is slow)"""
+    return importlib.util.find_spec("jira") is not None
+
+@instrument_backend("jira")
 class JiraAPIService:
     def __init__(self, config_file=None):
         """Initialize JIRA API service with configuration"""
-        self.config = self.load_config(config_file)
+        with PROFILER.phase("config_load"):
+            self.config = self.load_config(config_file)
         self.jira_client = None
-        self.connect()
+        self.scheduler = JiraScheduler.from_config(self.config)
+        self.change_log = ChangeLog()
+        self.workloads = None
+        self.workload_max_age = float(self.config.get("workload_max_age", WORKLOAD_MAX_AGE))
+        self._workloads_built = None
+        self._workloads_lock = threading.Lock()
+        # Assignments hold the read side from their reservation to the final
+        # adjustment; swapping in rebuilt totals takes the write side
+        self._assignments_lock = ReadWriteLock()
+        with PROFILER.phase("jira_connect"):
+            self.connect()
     
     def load_config(self, config_file=None):
         """Load JIRA configuration from file or environment variables"""
@@ -34,9 +69,14 @@ class JiraAPIService:
     def connect(self):
         """Connect to JIRA using credentials"""
         try:
+            # Imported here so processes that never talk to JIRA don't pay for the jira package
+            with PROFILER.phase("jira_import"):
+                from jira import JIRA
             self.jira_client = JIRA(
                 server=self.config['server'],
-                basic_auth=(self.config['email'], self.config['api_token'])
+                basic_auth=(self.config['email'], self.config['api_token']),
+                # Retries and 429 handling are done by self.scheduler
+                max_retries=0
             )
             print(f"✅ Connected to JIRA: {self.config['server']}")
             return True
@@ -48,38 +88,67 @@ class JiraAPIService:
         """Check if JIRA connection is active"""
         return self.jira_client is not None
     
+    def _jira_call(self, operation: str, *args, **kwargs):
+        """
+        Call a jira_client method through the rate-limit scheduler, inside a
+        ``jira.<operation>`` trace span
+        
+        The span records the call's arguments and, for list results, how many
+        items came back. Outside a sampled trace it is skipped.
+        """
+        method = getattr(self.jira_client, operation)
+        if not TRACER.active():
+            return self.scheduler.call(operation, method, *args, **kwargs)
+        
+        with TRACER.span(f"jira.{operation}", args=", ".join(map(str, args)), **kwargs) as span:
+            result = self.scheduler.call(operation, method, *args, **kwargs)
+            if isinstance(result, list):
+                span.set(results=len(result))
+            return result
+    
     def get_users(self) -> List[Dict]:
         """Get all users from JIRA project"""
-        if not self.is_connected():
-            return []
-        
         try:
-            # Get project users
-            project = self.jira_client.project(self.config['project_key'])
-            users = []
-            
-            # Get assignable users for the project
-            assignable_users = self.jira_client.search_assignable_users_for_projects('', [project.key])
-            
-            for user in assignable_users:
-                user_data = {
-                    "id": user.key,
-                    "username": user.name,
-                    "displayName": user.displayName,
-                    "emailAddress": getattr(user, 'emailAddress', ''),
-                    "timeZone": getattr(user, 'timeZone', 'UTC'),
-                    "active": user.active,
-                    # Default skills - in real implementation, this would come from custom fields or external system
-                    "skills": self.get_user_skills(user.name),
-                    "capacity": self.get_user_capacity(user.name)
-                }
-                users.append(user_data)
-            
-            return users
+            return self.fetch_users()
+        except JiraRateLimitError:
+            raise
         except Exception as e:
             print(f"❌ Error fetching users: {e}")
             return []
     
+    def fetch_users(self) -> List[Dict]:
+        """
+        Get all users from JIRA project, raising on JIRA errors
+        
+        get_users() returns an empty list instead; callers that must tell an
+        empty project from a failed request use this.
+        """
+        if not self.is_connected():
+            return []
+        
+        # Get project users
+        project = self._jira_call('project', self.config['project_key'])
+        users = []
+        
+        # Get assignable users for the project
+        assignable_users = self._jira_call('search_assignable_users_for_projects', '', [project.key])
+        
+        for user in assignable_users:
+            user_data = {
+                "id": user.key,
+                "username": user.name,
+                "displayName": user.displayName,
+                "emailAddress": getattr(user, 'emailAddress', ''),
+                "timeZone": getattr(user, 'timeZone', 'UTC'),
+                "active": user.active,
+                # Default skills - in real implementation, this would come from custom fields or external system
+                "skills": self.get_user_skills(user.name),
+                "capacity": self.get_user_capacity(user.name)
+            }
+            users.append(user_data)
+        
+        return users
+    
     def get_user_skills(self, username: str) -> List[Dict]:
         """Get user skills - placeholder for custom implementation"""
         # In a real implementation, this would fetch from:
@@ -108,59 +177,154 @@ class JiraAPIService:
     
     def get_tasks(self, project_key: str = None, assignee: str = None, status: str = None) -> List[Dict]:
         """Get tasks from JIRA with optional filtering"""
-        if not self.is_connected():
-            return []
-        
         try:
-            # Build JQL query
-            jql_parts = []
-            
-            if project_key:
-                jql_parts.append(f'project = "{project_key}"')
-            else:
-                jql_parts.append(f'project = "{self.config["project_key"]}"')
-            
-            if assignee:
-                if assignee.lower() == 'unassigned':
-                    jql_parts.append('assignee is EMPTY')
-                else:
-                    jql_parts.append(f'assignee = "{assignee}"')
-            
-            if status:
-                jql_parts.append(f'status = "{status}"')
-            
-            jql = ' AND '.join(jql_parts)
-            
-            # Execute search
-            issues = self.jira_client.search_issues(jql, maxResults=100)
-            
-            tasks = []
-            for issue in issues:
-                task_data = {
-                    "key": issue.key,
-                    "summary": issue.fields.summary,
-                    "description": getattr(issue.fields, 'description', ''),
-                    "status": issue.fields.status.name,
-                    "priority": issue.fields.priority.name if issue.fields.priority else 'Medium',
-                    "assignee": issue.fields.assignee.name if issue.fields.assignee else None,
-                    "assigneeDisplayName": issue.fields.assignee.displayName if issue.fields.assignee else None,
-                    "reporter": issue.fields.reporter.name if issue.fields.reporter else None,
-                    "created": issue.fields.created,
-                    "updated": issue.fields.updated,
-                    "dueDate": getattr(issue.fields, 'duedate', None),
-                    "storyPoints": self.get_story_points(issue),
-                    "labels": issue.fields.labels,
-                    "project": issue.fields.project.key,
-                    "issueType": issue.fields.issuetype.name,
-                    "requiredSkills": self.extract_required_skills(issue)
-                }
-                tasks.append(task_data)
-            
-            return tasks
+            return list(self.iter_tasks(project_key, assignee, status))
+        except JiraRateLimitError:
+            raise
         except Exception as e:
             print(f"❌ Error fetching tasks: {e}")
             return []
     
+    def iter_tasks(self, project_key: str = None, assignee: str = None, status: str = None,
+                   page_size: int = 100) -> Iterator[Dict]:
+        """
+        Yield tasks from JIRA one search page at a time
+        
+        Unlike get_tasks() this raises on JIRA errors, and only holds one page
+        of issues in memory, so callers can stream arbitrarily large projects.
+        """
+        if not self.is_connected():
+            return
+        
+        jql = self.build_jql(project_key, assignee, status)
+        start_at = 0
+        
+        while True:
+            issues = self._jira_call('search_issues', jql, startAt=start_at, maxResults=page_size)
+            for issue in issues:
+                yield self.issue_to_task(issue)
+            
+            start_at += len(issues)
+            if len(issues) < page_size or start_at >= getattr(issues, 'total', start_at):
+                break
+    
+    def query_tasks(self, project_key: str = None, assignee: str = None, status: str = None,
+                    labels=None, priorities=None, skills=None, sort: str = None,
+                    cursor: str = None, limit: int = None) -> Dict:
+        """
+        Get one page of tasks with filtering and ordering done by JIRA via JQL
+        
+        Skills are derived from labels and summaries rather than stored in
+        JIRA, so the skill filter is approximated in JQL and then checked
+        exactly on the returned page (which may therefore be shorter than limit).
+        
+        Returns:
+            Dict: ``tasks`` for this page, ``nextCursor`` (None on the last page)
+            and ``total`` issues matched by the JQL query
+        """
+        field, descending = parse_sort(sort)
+        page_size = parse_limit(limit)
+        state = decode_cursor(cursor)
+        if state and state.get("sort") != sort:
+            raise InvalidQueryError("Cursor does not match the requested sort order")
+        start_at = cursor_start(state)
+        
+        skills = split_values(skills)
+        jql = self.build_jql(project_key, assignee, status, labels, priorities, skills)
+        jql += self.build_order_by(field, descending)
+        
+        issues = self._jira_call('search_issues', jql, startAt=start_at, maxResults=page_size)
+        tasks = [self.issue_to_task(issue) for issue in issues]
+        if skills:
+            tasks = [task for task in tasks if task_matches(task, skills=skills)]
+        
+        next_start = start_at + len(issues)
+        total = getattr(issues, 'total', next_start)
+        return {
+            "tasks": tasks,
+            "nextCursor": encode_cursor({"sort": sort, "startAt": next_start}) if issues and next_start < total else None,
+            "total": total
+        }
+    
+    def build_jql(self, project_key: str = None, assignee: str = None, status: str = None,
+                  labels=None, priorities=None, skills=None) -> str:
+        """Build the JQL query for a task search"""
+        jql_parts = []
+        
+        if project_key:
+            jql_parts.append(f'project = "{project_key}"')
+        else:
+            jql_parts.append(f'project = "{self.config["project_key"]}"')
+        
+        if assignee:
+            if assignee.lower() == 'unassigned':
+                jql_parts.append('assignee is EMPTY')
+            else:
+                jql_parts.append(f'assignee = "{assignee}"')
+        
+        if status:
+            jql_parts.append(f'status = "{status}"')
+        
+        labels = split_values(labels)
+        if labels:
+            jql_parts.append(f'labels in ({self._jql_list(labels)})')
+        
+        priorities = split_values(priorities)
+        if priorities:
+            jql_parts.append(f'priority in ({self._jql_list(priorities)})')
+        
+        skills = split_values(skills)
+        if skills:
+            # Mirrors extract_required_skills(): skills come from labels or summary keywords
+            lowered = [skill.lower() for skill in skills]
+            summary_terms = ' OR '.join(f'summary ~ {self._jql_quote(skill)}' for skill in lowered)
+            jql_parts.append(f'(labels in ({self._jql_list(lowered)}) OR {summary_terms})')
+        
+        return ' AND '.join(jql_parts)
+    
+    def build_order_by(self, field: str = None, descending: bool = False) -> str:
+        """Build the JQL ORDER BY clause for a sort field"""
+        if not field:
+            return ' ORDER BY key ASC'
+        
+        story_points_field = self.config.get('story_points_field', 'customfield_10016')
+        columns = {
+            "priority": "priority",
+            "dueDate": "duedate",
+            "storyPoints": f"cf[{story_points_field.rsplit('_', 1)[-1]}]"
+        }
+        return f' ORDER BY {columns[field]} {"DESC" if descending else "ASC"}, key ASC'
+    
+    @staticmethod
+    def _jql_quote(value: str) -> str:
+        """Quote a value for use in JQL"""
+        return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+    
+    def _jql_list(self, values: List[str]) -> str:
+        """Quote and join values for a JQL ``in (...)`` clause"""
+        return ', '.join(self._jql_quote(value) for value in values)
+    
+    def issue_to_task(self, issue) -> Dict:
+        """Convert a JIRA issue into a TaskFlow task dict"""
+        return {
+            "key": issue.key,
+            "summary": issue.fields.summary,
+            "description": getattr(issue.fields, 'description', ''),
+            "status": issue.fields.status.name,
+            "priority": issue.fields.priority.name if issue.fields.priority else 'Medium',
+            "assignee": issue.fields.assignee.name if issue.fields.assignee else None,
+            "assigneeDisplayName": issue.fields.assignee.displayName if issue.fields.assignee else None,
+            "reporter": issue.fields.reporter.name if issue.fields.reporter else None,
+            "created": issue.fields.created,
+            "updated": issue.fields.updated,
+            "dueDate": getattr(issue.fields, 'duedate', None),
+            "storyPoints": self.get_story_points(issue),
+            "labels": issue.fields.labels,
+            "project": issue.fields.project.key,
+            "issueType": issue.fields.issuetype.name,
+            "requiredSkills": self.extract_required_skills(issue)
+        }
+    
     def get_story_points(self, issue):
         """Extract story points from issue (field ID may vary)"""
         try:
@@ -212,63 +376,138 @@ class JiraAPIService:
         """Get all unassigned tasks"""
         return self.get_tasks(assignee='unassigned')
     
-    def assign_task(self, task_key: str, assignee_username: str) -> Dict:
-        """Assign a task to a user"""
+    def assign_task(self, task_key: str, assignee_username: str, expected_version=None,
+                    max_utilization: float = None) -> Dict:
+        """
+        Assign a task to a user
+        
+        Args:
+            expected_version: ``updated`` timestamp the caller last saw; the
+                assignment is rejected as a conflict if the issue has been
+                updated since. JIRA has no conditional update, so this narrows
+                the race to the time between reading and updating the issue.
+            max_utilization (float): Reject the assignment if it would put the
+                assignee above this fraction of their capacity. The points are
+                reserved in the workload totals before JIRA is updated, so
+                concurrent assignments from this process cannot overshoot.
+        """
         if not self.is_connected():
             return {"success": False, "message": "Not connected to JIRA"}
         
-        try:
-            issue = self.jira_client.issue(task_key)
-            
-            # Find user by username
-            users = self.jira_client.search_users(assignee_username)
-            if not users:
-                return {"success": False, "message": f"User {assignee_username} not found"}
-            
-            user = users[0]
-            
-            # Assign the task
-            issue.update(assignee={'name': user.name})
-            
-            return {
-                "success": True,
-                "message": f"Task {task_key} assigned to {user.displayName}",
-                "task": {
-                    "key": task_key,
-                    "assignee": user.name,
-                    "assigneeDisplayName": user.displayName
+        # A user is waiting on this; go ahead of background sync in the scheduler queue
+        with call_priority(INTERACTIVE):
+            try:
+                issue = self._jira_call('issue', task_key)
+                old_task = self.issue_to_task(issue)
+                if is_stale(old_task, expected_version):
+                    return conflict_result(task_key, old_task)
+                
+                # Find user by username
+                users = self._jira_call('search_users', assignee_username)
+                if not users:
+                    return {"success": False, "message": f"User {assignee_username} not found"}
+                
+                user = users[0]
+                
+                reserved = None
+                limit = capacity_limit({"capacity": self.get_user_capacity(user.name)}, max_utilization)
+                if limit is not None:
+                    # Any rebuild has to happen before the read side is taken
+                    self.current_workloads()
+                
+                # No rebuild can land between the reservation and the final adjustment
+                with self._assignments_lock.read():
+                    workloads = self.workloads
+                    if limit is not None:
+                        reserved = dict(old_task, assignee=user.name)
+                        if not workloads.apply(old_task, reserved, limit):
+                            return over_capacity_result(task_key, old_task,
+                                                        self._build_workload(user.name, workloads),
+                                                        max_utilization)
+                    
+                    # Assign the task (update() reloads the issue, so it reflects the new assignee)
+                    try:
+                        with TRACER.span("jira.update", issue=task_key):
+                            self.scheduler.call("update", issue.update, idempotent=False,
+                                                assignee={'name': user.name})
+                    except Exception:
+                        if reserved is not None:
+                            workloads.apply(reserved, old_task)
+                        raise
+                    task = self.issue_to_task(issue)
+                    self.change_log.record_upsert(task)
+                    if workloads is not None:
+                        workloads.apply(reserved or old_task, task)
+                
+                return {
+                    "success": True,
+                    "message": f"Task {task_key} assigned to {user.displayName}",
+                    "task": {
+                        "key": task_key,
+                        "assignee": user.name,
+                        "assigneeDisplayName": user.displayName,
+                        "status": task["status"],
+                        "updated": task["updated"]
+                    },
+                    "previousAssignee": old_task.get("assignee")
                 }
-            }
-        except Exception as e:
-            return {"success": False, "message": f"Error assigning task: {str(e)}"}
+            except JiraRateLimitError as e:
+                return {"success": False, "rateLimited": True, "retryAfter": e.retry_after, "message": str(e)}
+            except Exception as e:
+                return {"success": False, "message": f"Error assigning task: {str(e)}"}
+    
+    def refresh_workloads(self, tasks: List[Dict] = None):
+        """
+        Rebuild the per-user workload totals
+        
+        Args:
+            tasks (List[Dict]): Full project task list if the caller already
+                fetched one (e.g. during a sync); otherwise JIRA is searched once
+        """
+        if tasks is None:
+            tasks = list(self.iter_tasks())
+        with self._assignments_lock.write():
+            if self.workloads is None:
+                self.workloads = WorkloadAggregates(tasks)
+            else:
+                self.workloads.rebuild(tasks)
+            self._workloads_built = time.monotonic()
+    
+    def current_workloads(self) -> WorkloadAggregates:
+        """
+        The workload totals, rebuilt first if they are older than ``workload_max_age``
+        
+        Between rebuilds they follow this process's assignments (and syncs);
+        the max age bounds how long changes made directly in JIRA go unseen.
+        """
+        with self._workloads_lock:
+            if self.workloads is None or time.monotonic() - self._workloads_built >= self.workload_max_age:
+                self.refresh_workloads()
+            return self.workloads
     
     def get_user_workload(self, username: str) -> Dict:
-        """Calculate current workload for a user"""
+        """Get current workload for a user from the maintained per-user totals"""
         try:
-            assigned_tasks = self.get_tasks(assignee=username)
-            total_story_points = sum(task.get("storyPoints", 0) for task in assigned_tasks)
-            
-            # Get user capacity (would come from external system in real implementation)
-            capacity_info = self.get_user_capacity(username)
-            max_capacity = capacity_info.get("pointsPerSprint", 40)
-            utilization = (total_story_points / max_capacity) * 100 if max_capacity > 0 else 0
-            
-            return {
-                "username": username,
-                "assignedTasks": len(assigned_tasks),
-                "totalStoryPoints": total_story_points,
-                "maxCapacity": max_capacity,
-                "utilizationPercent": round(utilization, 1),
-                "availableCapacity": max_capacity - total_story_points
-            }
+            return self._build_workload(username, self.current_workloads())
+        except JiraRateLimitError:
+            raise
         except Exception as e:
             print(f"❌ Error calculating workload for {username}: {e}")
             return {"error": str(e)}
     
+    def _build_workload(self, username: str, workloads: WorkloadAggregates) -> Dict:
+        """Workload report for a user from the given totals"""
+        task_count, total_story_points = workloads.get(username)
+        
+        # Get user capacity (would come from external system in real implementation)
+        capacity_info = self.get_user_capacity(username)
+        return build_workload(username, task_count, total_story_points, capacity_info.get("pointsPerSprint", 40))
+    
     def get_team_capacity_overview(self) -> Dict:
         """Get capacity overview for entire team"""
         try:
-            users = self.get_users()
+            # A failed user fetch must show as an error, not as a team with no members
+            users = self.fetch_users()
             team_overview = {
                 "members": [],
                 "teamTotals": {
@@ -282,18 +521,20 @@ class JiraAPIService:
             
             for user in users:
                 workload = self.get_user_workload(user["username"])
-                if "error" not in workload:
-                    member_info = {
-                        "username": user["username"],
-                        "displayName": user["displayName"],
-                        "timeZone": user["timeZone"],
-                        "workload": workload
-                    }
-                    team_overview["members"].append(member_info)
-                    
-                    team_overview["teamTotals"]["totalCapacity"] += workload.get("maxCapacity", 0)
-                    team_overview["teamTotals"]["totalAssigned"] += workload.get("totalStoryPoints", 0)
-                    total_utilization += workload.get("utilizationPercent", 0)
+                if "error" in workload:
+                    # Dropping the member would pass off a partial team as the whole one
+                    return {"error": f"Workload for {user['username']} unavailable: {workload['error']}"}
+                member_info = {
+                    "username": user["username"],
+                    "displayName": user["displayName"],
+                    "timeZone": user["timeZone"],
+                    "workload": workload
+                }
+                team_overview["members"].append(member_info)
+                
+                team_overview["teamTotals"]["totalCapacity"] += workload.get("maxCapacity", 0)
+                team_overview["teamTotals"]["totalAssigned"] += workload.get("totalStoryPoints", 0)
+                total_utilization += workload.get("utilizationPercent", 0)
             
             if len(team_overview["members"]) > 0:
                 team_overview["teamTotals"]["averageUtilization"] = round(
@@ -301,6 +542,8 @@ class JiraAPIService:
                 )
             
             return team_overview
+        except JiraRateLimitError:
+            raise
         except Exception as e:
             print(f"❌ Error getting team capacity: {e}")
             return {"error": str(e)}
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+TaskFlow JIRA Request Scheduler
+Client-side rate limiting, prioritisation and retries for JIRA calls
+
+Every call to the JIRA client waits for a token from a shared bucket, so a
+burst of dashboard requests cannot trip JIRA's rate limit on its own. When
+JIRA answers 429 anyway, the bucket is paused for the ``Retry-After`` period
+(or until ``X-RateLimit-Reset``) and its refill rate is halved, recovering
+gradually on success. Idempotent reads are retried on throttling, 5xx and
+connection errors with jittered exponential backoff; writes are retried only
+on 429, which JIRA sends before doing any work.
+
+Callers waiting for a token are served by priority: interactive calls (an
+assignment a user is waiting on) go ahead of normal reads, which go ahead of
+background sync.
+"""
+
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from metrics import METRICS
+
+# Call priorities, lowest value served first
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+
+# Defaults for the "rate_limit" section of the JIRA config
+DEFAULT_RATE_LIMIT = {
+    "requests_per_second": 10.0,
+    "burst": 20,
+    "max_retries": 4,
+    "backoff_base": 0.5,
+    "backoff_max": 30.0,
+    "max_wait": 60.0
+}
+
+# Statuses worth retrying for idempotent reads
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Lowest fraction of the configured rate the bucket slows to after repeated 429s
+MIN_RATE_FRACTION = 0.1
+
+THROTTLED = METRICS.counter(
+    "taskflow_jira_throttled_total", "JIRA responses with status 429", ("operation",))
+RETRIES = METRICS.counter(
+    "taskflow_jira_retries_total", "JIRA calls retried after a transient failure", ("operation",))
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("taskflow_jira_priority", default=NORMAL)
+
+
+class JiraRateLimitError(Exception):
+    """JIRA kept throttling us, or asked us to wait longer than we are willing to"""
+
+    def __init__(self, operation: str, retry_after: float):
+        super().__init__(f"JIRA rate limit exceeded for {operation}; retry in {retry_after:.0f}s")
+        self.operation = operation
+        self.retry_after = retry_after
+
+
+@contextmanager
+def call_priority(priority: int):
+    """Run JIRA calls made inside the block (in this thread/context) at ``priority``"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """Token bucket whose waiters are served in priority order, then arrival order"""
+
+    def __init__(self, rate: float, burst: int, clock=time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate limit needs a positive rate and a burst of at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._clock = clock
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = NORMAL) -> float:
+        """Block until a token is available for this caller; returns the seconds waited"""
+        ticket = (priority, next(self._sequence))
+        start = self._clock()
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    self._refill(now)
+                    if self._waiters[0] == ticket:
+                        if now >= self._paused_until and self.tokens >= 1:
+                            self.tokens -= 1
+                            heapq.heappop(self._waiters)
+                            self._condition.notify_all()
+                            return self._clock() - start
+                        delay = max(self._paused_until - now, (1 - self.tokens) / self.rate)
+                        self._condition.wait(delay)
+                    else:
+                        self._condition.wait()
+            except BaseException:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._condition.notify_all()
+                raise
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for ``seconds`` (extends, never shortens, an earlier pause)"""
+        with self._condition:
+            now = self._clock()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + seconds)
+            self.tokens = 0.0
+            self._condition.notify_all()
+
+    def set_rate(self, rate: float):
+        with self._condition:
+            self._refill(self._clock())
+            self.rate = rate
+            self._condition.notify_all()
+
+
+class JiraScheduler:
+    """Runs JIRA calls through a priority token bucket with retries"""
+
+    def __init__(self, requests_per_second: float = 10.0, burst: int = 20, max_retries: int = 4,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0, max_wait: float = 60.0,
+                 sleep=time.sleep):
+        self.configured_rate = float(requests_per_second)
+        self.bucket = TokenBucket(self.configured_rate, int(burst))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_wait = max_wait
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "throttled": 0, "waitedSeconds": 0.0}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "JiraScheduler":
+        """Build a scheduler from the ``rate_limit`` section of the JIRA config"""
+        settings = dict(DEFAULT_RATE_LIMIT, **(config.get("rate_limit") or {}))
+        return cls(**{key: settings[key] for key in DEFAULT_RATE_LIMIT})
+
+    def call(self, operation: str, function, *args, idempotent: bool = True, **kwargs):
+        """
+        Call ``function(*args, **kwargs)`` once a token is available, retrying transient failures
+
+        Raises:
+            JiraRateLimitError: JIRA is still throttling after the last retry,
+                or its Retry-After exceeds ``max_wait``
+        """
+        priority = _priority.get()
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire(priority)
+            with self._lock:
+                self.stats["calls"] += 1
+                self.stats["waitedSeconds"] += waited
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                status = error_status(e)
+                if status == 429:
+                    delay = self._throttled(operation, e, attempt)
+                elif idempotent and (status in RETRYABLE_STATUSES or (status is None and isinstance(e, OSError))):
+                    delay = self._backoff(attempt)
+                else:
+                    raise
+                if attempt >= self.max_retries:
+                    if status == 429:
+                        raise JiraRateLimitError(operation, delay) from e
+                    raise
+                attempt += 1
+                with self._lock:
+                    self.stats["retries"] += 1
+                RETRIES.inc(operation)
+                if status != 429:
+                    # Throttling already paused the shared bucket; other failures back off only this call
+                    self._sleep(delay)
+                continue
+            self._recovered()
+            return result
+
+    def _throttled(self, operation: str, error: Exception, attempt: int) -> float:
+        """Pause the bucket and slow it down after a 429; returns the pause in seconds"""
+        with self._lock:
+            self.stats["throttled"] += 1
+        THROTTLED.inc(operation)
+        delay = retry_after(error_headers(error))
+        if delay is None:
+            delay = self._backoff(attempt)
+        if delay > self.max_wait:
+            raise JiraRateLimitError(operation, delay) from error
+        self.bucket.set_rate(max(self.bucket.rate / 2, self.configured_rate * MIN_RATE_FRACTION))
+        self.bucket.pause(delay)
+        return delay
+
+    def _recovered(self):
+        """Additively restore the rate after a successful call"""
+        if self.bucket.rate < self.configured_rate:
+            self.bucket.set_rate(min(self.configured_rate, self.bucket.rate + self.configured_rate / 20))
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status carried by a JIRAError, requests error or urllib HTTPError"""
+    for candidate in (error, getattr(error, 'response', None)):
+        if candidate is None:
+            continue
+        for attribute in ('status_code', 'code', 'status'):
+            value = getattr(candidate, attribute, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def error_headers(error: Exception) -> Dict:
+    """Response headers of a failed call (empty if the error carries none)"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None)
+    return headers or {}
+
+
+def retry_after(headers) -> Optional[float]:
+    """
+    Seconds to wait according to ``Retry-After`` (seconds or HTTP date) or
+    ``X-RateLimit-Reset`` (ISO 8601), or None if neither is present
+    """
+    value = headers.get('Retry-After')
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    value = headers.get('X-RateLimit-Reset')
+    if value:
+        try:
+            reset = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if reset.tzinfo is None:
+                reset = reset.replace(tzinfo=timezone.utc)
+            return max((reset - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except ValueError:
+            pass
+    return None
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON and compression helpers for TaskFlow list responses
+"""
+
+import json
+import zlib
+from typing import Dict, Iterable, Iterator, Optional
+
+# Flush encoded output once this many characters are buffered
+DEFAULT_CHUNK_SIZE = 16 * 1024
+
+# zlib window settings for each supported Content-Encoding
+_WBITS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS,
+}
+
+
+def iter_json_list_response(items: Iterable[Dict], message: str, extra: Optional[Dict] = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encode a ``{"status", "data", "message"}`` response while items are produced
+
+    Items are serialized one at a time and emitted in ``chunk_size`` batches, so
+    peak memory is bounded by one chunk rather than the whole list and the first
+    bytes can be sent before the backend has finished producing results.
+
+    Args:
+        items (Iterable[Dict]): Records to place in the ``data`` list
+        message (str): Response message; ``{count}`` is replaced with the item count
+        extra (Dict): Additional top-level fields appended after ``message``
+        chunk_size (int): Approximate number of characters per emitted chunk
+
+    Yields:
+        bytes: UTF-8 encoded fragments of the JSON document
+    """
+    encode = json.JSONEncoder(default=str).encode
+    buffer = ['{"status": "success", "data": [']
+    buffered = len(buffer[0])
+    count = 0
+
+    for item in items:
+        encoded = encode(item)
+        if count:
+            buffer.append(", ")
+        buffer.append(encoded)
+        buffered += len(encoded) + 2
+        count += 1
+
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            buffered = 0
+
+    buffer.append('], "message": ' + encode(message.format(count=count)))
+    for key, value in (extra or {}).items():
+        buffer.append(", " + encode(key) + ": " + encode(value))
+    buffer.append("}")
+    yield "".join(buffer).encode("utf-8")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a Content-Encoding from an Accept-Encoding header
+
+    Returns:
+        str: 'gzip' or 'deflate', or None when the response should be sent as-is
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        fields = part.strip().split(";")
+        name = fields[0].strip().lower()
+        quality = 1.0
+        for param in fields[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+
+    for encoding in ("gzip", "deflate"):
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def iter_compressed(chunks: Iterable[bytes], encoding: str, level: int = 6) -> Iterator[bytes]:
+    """
+    Compress a stream of chunks with gzip or deflate
+
+    Each input chunk is sync-flushed so the client can start decoding
+    immediately instead of waiting for the compressor's internal buffer.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+    for chunk in chunks:
+        compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if compressed:
+            yield compressed
+    yield compressor.flush(zlib.Z_FINISH)
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    """Compress a complete response body with gzip or deflate"""
+    return b"".join(iter_compressed([body], encoding, level))
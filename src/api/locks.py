@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Locks
+Reader-writer and striped locks for the in-memory task stores
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Hashable, List
+
+
+class ReadWriteLock:
+    """
+    Many concurrent readers or one writer
+
+    Writers are preferred: once a writer is waiting, new readers block until
+    it has run, so a steady stream of reads cannot starve a dataset swap.
+    Neither side is reentrant; a thread holding the read side must not ask
+    for it again while a writer may be queued.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        """Hold the shared (read) side for the block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Hold the exclusive (write) side for the block"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class StripedLock:
+    """
+    A fixed pool of locks shared out by key hash
+
+    Operations on different keys usually land on different stripes and run in
+    parallel, while memory stays bounded however many keys there are.
+    ``hold()`` takes several stripes in index order, so callers locking more
+    than one key cannot deadlock each other.
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+
+    def stripe(self, key: Hashable) -> int:
+        """Index of the stripe guarding ``key``"""
+        return hash(key) % len(self._locks)
+
+    def lock_for(self, key: Hashable) -> threading.Lock:
+        """The lock guarding ``key``"""
+        return self._locks[self.stripe(key)]
+
+    @contextmanager
+    def hold(self, *keys: Hashable):
+        """Hold the stripes of all ``keys`` (each once, in index order) for the block"""
+        locks = [self._locks[index] for index in sorted({self.stripe(key) for key in keys})]
+        acquired = []
+        try:
+            for lock in locks:
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Metrics
+Counters, gauges and HDR-style latency histograms exported in Prometheus text format
+
+Recording a sample is a dict lookup plus an increment under a lock (one
+per metric family for counters and gauges, one per series for histograms),
+so instrumentation stays on in production. Series are created on
+first use; label values must come from a small fixed set (endpoint paths,
+method names), never from user input.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tracing import TRACER
+
+# Prometheus content type for the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Cumulative bucket bounds (seconds) exported for each histogram
+EXPORT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 2.5, 5.0, 10.0)
+
+# Quantiles exported alongside each histogram, for comparing against latency budgets
+EXPORT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations with bounded relative error
+
+    Values are recorded in whole microseconds. Below ``2**SUB_BUCKET_BITS``
+    every value has its own bucket; above it each power of two is split into
+    ``2**(SUB_BUCKET_BITS - 1)`` linear sub-buckets, so a recorded value is
+    never more than ~3% from the true one, from a microsecond up to
+    ``MAX_MICROS`` (about 19 hours, beyond which values are clamped).
+    """
+
+    SUB_BUCKET_BITS = 6
+    MAX_MICROS = (1 << 36) - 1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: List[int] = [0] * (self._index(self.MAX_MICROS) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        """Bucket holding a value in microseconds"""
+        sub_count = 1 << cls.SUB_BUCKET_BITS
+        if micros < sub_count:
+            return micros
+        shift = micros.bit_length() - cls.SUB_BUCKET_BITS
+        half = sub_count >> 1
+        return sub_count + (shift - 1) * half + ((micros >> shift) - half)
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        """Largest value in microseconds that lands in a bucket"""
+        sub_count = 1 << cls.SUB_BUCKET_BITS
+        if index < sub_count:
+            return index
+        half = sub_count >> 1
+        shift, offset = divmod(index - sub_count, half)
+        shift += 1
+        return ((half + offset + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        """Add one duration"""
+        micros = min(max(int(seconds * 1_000_000), 0), self.MAX_MICROS)
+        index = self._index(micros)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_seconds += seconds
+            if seconds > self.max_seconds:
+                self.max_seconds = seconds
+
+    def percentile(self, quantile: float) -> float:
+        """Duration in seconds at or below which ``quantile`` of samples fall (0 if empty)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(1, round(quantile * self.count))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= target:
+                    return min(self._upper_bound(index) / 1_000_000, self.max_seconds)
+        return self.max_seconds
+
+    def cumulative_counts(self, bounds: Iterable[float]) -> List[int]:
+        """Samples at or below each bound (seconds), as Prometheus ``le`` buckets"""
+        with self._lock:
+            counts = list(self.counts)
+        result = []
+        seen = 0
+        position = 0
+        for bound in bounds:
+            last = self._index(min(int(bound * 1_000_000), self.MAX_MICROS))
+            while position <= last:
+                seen += counts[position]
+                position += 1
+            result.append(seen)
+        return result
+
+
+class _Metric:
+    """A metric family: one series per combination of label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, labels: Tuple[str, ...], factory):
+        """Series for a label tuple, created on first use"""
+        series = self._series.get(labels)
+        if series is None:
+            if len(labels) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+            with self._lock:
+                series = self._series.setdefault(labels, factory())
+        return series
+
+    def _label_text(self, labels: Tuple[str, ...], extra: Optional[Dict[str, str]] = None) -> str:
+        """Render ``{name="value",...}`` (empty when there are no labels)"""
+        pairs = list(zip(self.labelnames, labels)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels in sorted(self._series):
+            lines.extend(self._render_series(labels, self._series[labels]))
+        return lines
+
+    def _render_series(self, labels, series) -> List[str]:
+        return [f"{self.name}{self._label_text(labels)} {_number(series[0])}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        series = self._get(labels, lambda: [0])
+        with self._lock:
+            series[0] += amount
+
+    def value(self, *labels: str) -> float:
+        series = self._series.get(labels)
+        return series[0] if series else 0
+
+
+class Gauge(Counter):
+    """Value that goes up and down"""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        series = self._get(labels, lambda: [0])
+        with self._lock:
+            series[0] = value
+
+
+class Histogram(_Metric):
+    """Distribution of durations, one LatencyHistogram per label combination"""
+
+    kind = "histogram"
+
+    def observe(self, seconds: float, *labels: str):
+        self._get(labels, LatencyHistogram).record(seconds)
+
+    def histogram(self, *labels: str) -> Optional[LatencyHistogram]:
+        return self._series.get(labels)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        quantile_name = f"{self.name}_quantile"
+        lines.append(f"# HELP {quantile_name} {self.help} (quantiles)")
+        lines.append(f"# TYPE {quantile_name} gauge")
+        for labels in sorted(self._series):
+            histogram = self._series[labels]
+            for quantile in EXPORT_QUANTILES:
+                label_text = self._label_text(labels, {"quantile": str(quantile)})
+                lines.append(f"{quantile_name}{label_text} {_number(histogram.percentile(quantile))}")
+        return lines
+
+    def _render_series(self, labels, histogram: LatencyHistogram) -> List[str]:
+        lines = []
+        for bound, cumulative in zip(EXPORT_BUCKETS, histogram.cumulative_counts(EXPORT_BUCKETS)):
+            lines.append(f"{self.name}_bucket{self._label_text(labels, {'le': _number(bound)})} {cumulative}")
+        lines.append(f"{self.name}_bucket{self._label_text(labels, {'le': '+Inf'})} {histogram.count}")
+        lines.append(f"{self.name}_sum{self._label_text(labels)} {_number(histogram.total_seconds)}")
+        lines.append(f"{self.name}_count{self._label_text(labels)} {histogram.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metric families and their Prometheus exposition"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, help_text: str, labelnames: Tuple[str, ...]):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Process-wide registry served on /api/metrics
+METRICS = MetricsRegistry()
+
+REQUESTS = METRICS.counter(
+    "taskflow_requests_total", "API requests by endpoint, method and response status",
+    ("endpoint", "method", "status"))
+REQUEST_EXCEPTIONS = METRICS.counter(
+    "taskflow_request_exceptions_total", "Unhandled exceptions turned into error responses",
+    ("endpoint", "exception"))
+REQUEST_LATENCY = METRICS.histogram(
+    "taskflow_request_duration_seconds", "API request latency", ("endpoint", "method"))
+IN_FLIGHT = METRICS.gauge(
+    "taskflow_requests_in_flight", "API requests currently being handled", ("endpoint",))
+BACKEND_CALLS = METRICS.counter(
+    "taskflow_backend_calls_total", "Backend method calls", ("backend", "method"))
+BACKEND_ERRORS = METRICS.counter(
+    "taskflow_backend_errors_total", "Backend method calls that raised", ("backend", "method"))
+BACKEND_LATENCY = METRICS.histogram(
+    "taskflow_backend_call_duration_seconds", "Backend method latency", ("backend", "method"))
+
+# Backend interface methods instrument_backend() wraps by default; per-record
+# helpers (issue_to_task, build_jql, ...) stay unwrapped so a large list call
+# costs one metric update rather than one per record
+BACKEND_METHODS = (
+    "get_users", "fetch_users", "get_user", "get_task", "get_tasks", "iter_tasks", "query_tasks",
+    "get_unassigned_tasks", "assign_task", "get_user_workload", "get_team_capacity_overview",
+    "refresh_workloads", "sync_from", "replace_all"
+)
+
+
+@contextmanager
+def track_request(endpoint: str, method: str):
+    """
+    Time one request and count it
+
+    Yields a dict; set ``status`` in it to the response status before the
+    block ends (it defaults to "error" if the block raises).
+    """
+    outcome = {"status": "error"}
+    IN_FLIGHT.inc(endpoint)
+    start = time.perf_counter()
+    try:
+        yield outcome
+    finally:
+        REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint, method)
+        IN_FLIGHT.dec(endpoint)
+        REQUESTS.inc(endpoint, method, outcome["status"])
+
+
+def instrument_backend(backend: str, methods: Iterable[str] = BACKEND_METHODS):
+    """
+    Class decorator counting and timing calls to a backend's interface methods
+
+    Only the named ``methods`` the class defines are wrapped. Inside a sampled
+    trace each call also gets a ``<backend>.<method>`` span. Generator methods
+    are counted but not timed, since their work happens while the caller iterates.
+    """
+    def decorate(cls):
+        for name in methods:
+            attribute = vars(cls).get(name)
+            if inspect.isfunction(attribute):
+                setattr(cls, name, _instrumented(attribute, backend, name))
+        return cls
+    return decorate
+
+
+def _instrumented(function, backend: str, name: str):
+    if inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def counted(*args, **kwargs):
+            BACKEND_CALLS.inc(backend, name)
+            return function(*args, **kwargs)
+        return counted
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        BACKEND_CALLS.inc(backend, name)
+        start = time.perf_counter()
+        try:
+            with TRACER.span(f"{backend}.{name}"):
+                return function(*args, **kwargs)
+        except Exception:
+            BACKEND_ERRORS.inc(backend, name)
+            raise
+        finally:
+            BACKEND_LATENCY.observe(time.perf_counter() - start, backend, name)
+    return timed
@@ -5,15 +5,89 @@ Simulates JIRA REST API responses for TaskFlow testing without requiring actual
 """
 
 import json
+import bisect
 import datetime
 import os
-from typing import Dict, List, Optional
+import threading
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
 
+from change_log import ChangeLog
+from locks import ReadWriteLock, StripedLock
+from task_version import conflict_result, is_stale, task_version
+from task_query import (
+    InvalidQueryError, cursor_after, decode_cursor, encode_cursor, parse_limit, parse_sort, sort_value,
+    split_values
+)
+from workload import WorkloadAggregates, build_workload, capacity_limit, over_capacity_result
+from startup_profiler import PROFILER
+from metrics import instrument_backend
+from snapshot import SnapshotTable, load_snapshot, source_fingerprint, write_snapshot
+
+# File name of the columnar snapshot inside the snapshot directory
+SNAPSHOT_FILE = "mock_jira.snapshot"
+
+# Task fields with secondary indexes used by query_tasks()
+INDEXED_FIELDS = ("project", "assignee", "status", "priority", "labels", "skills")
+
+@instrument_backend("mock")
 class MockJiraAPI:
-    def __init__(self):
-        """Initialize mock JIRA API with sample data"""
+    """
+    In-memory JIRA stand-in that is safe to share between request threads
+    
+    Task records are never mutated in place: an assignment builds a new dict
+    and swaps it into the task list, so readers iterate lock-free and always
+    see a task either wholly before or wholly after a change. Writers take
+    the read side of ``_dataset_lock`` (only replacing ``tasks_data`` takes
+    the write side) plus the stripe of ``_task_locks`` for their task, so
+    assignments to different tasks run concurrently. ``_index_lock`` is held
+    only for the slot swap and the matching index and workload updates.
+    """
+    
+    def __init__(self, snapshot_dir: str = None):
+        """
+        Initialize mock JIRA API with sample data
+        
+        Args:
+            snapshot_dir (str): Directory for a columnar snapshot of the mock
+                data (default: $TASKFLOW_SNAPSHOT_DIR). When set, later starts
+                memory-map the snapshot instead of re-parsing the JSON files.
+        """
+        self.snapshot_dir = snapshot_dir or os.getenv('TASKFLOW_SNAPSHOT_DIR')
+        self._snapshot_fingerprint = None
+        self.change_log = ChangeLog()
+        self._dataset_lock = ReadWriteLock()
+        self._task_locks = StripedLock()
+        self._index_lock = threading.Lock()
+        self._indexes = None
+        self._workloads = None
+        self._positions = None
+        self._users_by_name = None
         self.load_mock_data()
     
+    @property
+    def users_data(self) -> Dict:
+        """Raw user dataset; assigning a new one drops the username lookup"""
+        return self._users_data
+    
+    @users_data.setter
+    def users_data(self, value: Dict):
+        self._users_data = value
+        self._users_by_name = None
+    
+    @property
+    def tasks_data(self) -> Dict:
+        """Raw task dataset; assigning a new one drops the query indexes and workload totals"""
+        return self._tasks_data
+    
+    @tasks_data.setter
+    def tasks_data(self, value: Dict):
+        with self._dataset_lock.write():
+            self._tasks_data = value
+            self._indexes = None
+            self._workloads = None
+            self._positions = None
+    
     def load_mock_data(self):
         """Load mock users and tasks from JSON files"""
         try:
@@ -22,88 +96,292 @@ class MockJiraAPI:
             users_path = os.path.join(script_dir, '../data/mock_jira_users.json')
             tasks_path = os.path.join(script_dir, '../data/mock_jira_tasks.json')
             
-            with open(users_path, 'r') as f:
-                self.users_data = json.load(f)
+            if self.snapshot_dir:
+                # The snapshot is only trusted while the JSON files it came from are unchanged
+                self._snapshot_fingerprint = source_fingerprint([users_path, tasks_path])
+                with PROFILER.phase("mock_snapshot_load"):
+                    loaded = load_snapshot(self.snapshot_path, self._snapshot_fingerprint)
+                if loaded:
+                    self.users_data, self.tasks_data = loaded
+                    print("✅ Mock JIRA data loaded from snapshot")
+                    return
             
-            with open(tasks_path, 'r') as f:
-                self.tasks_data = json.load(f)
+            with PROFILER.phase("mock_json_parse"):
+                with open(users_path, 'r') as f:
+                    self.users_data = json.load(f)
+                
+                with open(tasks_path, 'r') as f:
+                    self.tasks_data = json.load(f)
                 
             print("✅ Mock JIRA data loaded successfully")
+            
+            if self.snapshot_dir:
+                self.save_snapshot()
         except FileNotFoundError as e:
             print(f"❌ Error loading mock data: {e}")
             self.users_data = {"users": []}
             self.tasks_data = {"tasks": []}
     
+    @property
+    def snapshot_path(self) -> Optional[str]:
+        """Path of the columnar snapshot, or None when snapshots are disabled"""
+        return os.path.join(self.snapshot_dir, SNAPSHOT_FILE) if self.snapshot_dir else None
+    
+    def save_snapshot(self):
+        """Write the current users and tasks to the columnar snapshot"""
+        if not self.snapshot_dir:
+            return
+        try:
+            write_snapshot(self.snapshot_path, self.users_data, self.tasks_data, self._snapshot_fingerprint)
+        except OSError as e:
+            print(f"⚠️  Could not write snapshot: {e}")
+    
     def get_users(self) -> List[Dict]:
         """Get all users (simulates /rest/api/2/users/search)"""
-        return self.users_data.get("users", [])
+        # A list of dicts even when users come from a snapshot, so results stay JSON serializable
+        return list(self.users_data.get("users", []))
     
     def get_user(self, username: str) -> Optional[Dict]:
         """Get specific user by username"""
-        users = self.get_users()
-        for user in users:
-            if user["username"] == username:
-                return user
-        return None
+        if self._users_by_name is None:
+            self._users_by_name = {user["username"]: user for user in self.get_users()}
+        return self._users_by_name.get(username)
     
-    def get_tasks(self, project_key: str = None, assignee: str = None) -> List[Dict]:
+    def get_tasks(self, project_key: str = None, assignee: str = None, status: str = None) -> List[Dict]:
         """Get tasks with optional filtering (simulates /rest/api/2/search)"""
+        return list(self.iter_tasks(project_key, assignee, status))
+    
+    def iter_tasks(self, project_key: str = None, assignee: str = None, status: str = None) -> Iterator[Dict]:
+        """Yield matching tasks one at a time so large result sets can be streamed"""
         tasks = self.tasks_data.get("tasks", [])
+        if isinstance(tasks, SnapshotTable):
+            # Filter on the snapshot's columns so only matching records are built
+            criteria = {"project": project_key, "assignee": assignee, "status": status}
+            yield from tasks.find(**{field: value for field, value in criteria.items() if value})
+            return
+        
+        for task in tasks:
+            if project_key and task["project"] != project_key:
+                continue
+            if assignee and task.get("assignee") != assignee:
+                continue
+            if status and task.get("status") != status:
+                continue
+            yield task
+    
+    def query_tasks(self, project_key: str = None, assignee: str = None, status: str = None,
+                    labels=None, priorities=None, skills=None, sort: str = None,
+                    cursor: str = None, limit: int = None) -> Dict:
+        """
+        Get one page of tasks using the secondary indexes
+        
+        Filters on the same field are OR-ed and different fields are AND-ed.
+        Pages are keyset-paginated on the sort order, so a cursor stays valid
+        while tasks are being assigned.
         
-        if project_key:
-            tasks = [task for task in tasks if task["project"] == project_key]
+        Args:
+            labels, priorities, skills: Lists or comma-separated strings
+            sort (str): 'priority', 'dueDate' or 'storyPoints', '-' prefix for descending
+            cursor (str): ``nextCursor`` from the previous page
+            limit (int): Page size
         
-        if assignee:
-            tasks = [task for task in tasks if task.get("assignee") == assignee]
+        Returns:
+            Dict: ``tasks`` for this page, ``nextCursor`` (None on the last page)
+            and ``total`` matching tasks
+        """
+        field, descending = parse_sort(sort)
+        page_size = parse_limit(limit)
+        state = decode_cursor(cursor)
+        if state and state.get("sort") != sort:
+            raise InvalidQueryError("Cursor does not match the requested sort order")
+        
+        if assignee and assignee.lower() == 'unassigned':
+            assignee = None
+            unassigned_only = True
+        else:
+            unassigned_only = False
+        
+        filters = {
+            "project": [project_key] if project_key else [],
+            "assignee": [assignee] if assignee else ([None] if unassigned_only else []),
+            "status": [status] if status else [],
+            "priority": split_values(priorities),
+            "labels": split_values(labels),
+            "skills": [skill.lower() for skill in split_values(skills)]
+        }
+        
+        with self._index_lock:
+            indexes = self._get_indexes()
+            candidate_keys = None
+            for name, values in filters.items():
+                if not values:
+                    continue
+                keys = set()
+                for value in values:
+                    keys |= indexes[name].get(value, set())
+                candidate_keys = keys if candidate_keys is None else candidate_keys & keys
             
-        return tasks
+            if candidate_keys is None:
+                tasks = self.tasks_data.get("tasks", [])
+            else:
+                tasks = [indexes["by_key"][key] for key in candidate_keys]
+        
+        ordered = sorted(((sort_value(task, field, descending), task) for task in tasks), key=lambda pair: pair[0])
+        sort_keys = [pair[0] for pair in ordered]
+        after = cursor_after(state, field, descending)
+        
+        if descending:
+            end = bisect.bisect_left(sort_keys, after) if after else len(ordered)
+            start = max(0, end - page_size)
+            page = ordered[start:end][::-1]
+            has_more = start > 0
+        else:
+            start = bisect.bisect_right(sort_keys, after) if after else 0
+            page = ordered[start:start + page_size]
+            has_more = start + page_size < len(ordered)
+        
+        return {
+            "tasks": [task for _, task in page],
+            "nextCursor": encode_cursor({"sort": sort, "after": list(page[-1][0])}) if has_more and page else None,
+            "total": len(ordered)
+        }
+    
+    def _get_indexes(self) -> Dict:
+        """Build the per-field task key indexes on first use (call with _index_lock held)"""
+        if self._indexes is None:
+            indexes = {name: defaultdict(set) for name in INDEXED_FIELDS}
+            indexes["by_key"] = {}
+            for task in self.tasks_data.get("tasks", []):
+                indexes["by_key"][task["key"]] = task
+                for name, values in self._index_values(task).items():
+                    for value in values:
+                        indexes[name][value].add(task["key"])
+            self._indexes = indexes
+        return self._indexes
+    
+    def _reindex_task(self, old_task: Dict, task: Dict):
+        """Point the indexes at a task's replacement record (call with _index_lock held)"""
+        if self._indexes is None:
+            return
+        self._indexes["by_key"][task["key"]] = task
+        old_values = self._index_values(old_task)
+        for name, values in self._index_values(task).items():
+            if values != old_values[name]:
+                for value in old_values[name]:
+                    self._indexes[name][value].discard(task["key"])
+                for value in values:
+                    self._indexes[name][value].add(task["key"])
+    
+    @staticmethod
+    def _index_values(task: Dict) -> Dict:
+        """Values a task is indexed under for each indexed field"""
+        return {
+            "project": [task.get("project")],
+            "assignee": [task.get("assignee")],
+            "status": [task.get("status")],
+            "priority": [task.get("priority")],
+            "labels": list(task.get("labels") or []),
+            "skills": [skill.get("name", "").lower() for skill in task.get("requiredSkills") or []]
+        }
+    
+    def _get_workloads(self) -> WorkloadAggregates:
+        """Build the per-user workload totals on first use"""
+        if self._workloads is None:
+            with self._index_lock:
+                if self._workloads is None:
+                    tasks = self.tasks_data.get("tasks", [])
+                    if isinstance(tasks, SnapshotTable):
+                        table = tasks
+                        tasks = ({"assignee": table.value(i, "assignee"), "storyPoints": table.value(i, "storyPoints")}
+                                 for i in range(len(table)))
+                    self._workloads = WorkloadAggregates(tasks)
+        return self._workloads
+    
+    def _get_positions(self) -> Dict[str, int]:
+        """Map task keys to their slot in the task list, built on first use"""
+        if self._positions is None:
+            with self._index_lock:
+                if self._positions is None:
+                    tasks = self.tasks_data.get("tasks", [])
+                    positions = {}
+                    for i in range(len(tasks)):
+                        key = tasks.value(i, "key") if isinstance(tasks, SnapshotTable) else tasks[i]["key"]
+                        positions.setdefault(key, i)
+                    self._positions = positions
+        return self._positions
+    
+    def _find_position(self, tasks, task_key: str) -> Optional[int]:
+        """Slot of a task, rebuilding the lookup if the list was edited in place"""
+        position = self._get_positions().get(task_key)
+        if position is None or position >= len(tasks) or tasks[position]["key"] != task_key:
+            self._positions = None
+            position = self._get_positions().get(task_key)
+        return position
     
     def get_unassigned_tasks(self) -> List[Dict]:
         """Get all unassigned tasks"""
         return self.get_tasks(assignee=None)
     
-    def assign_task(self, task_key: str, assignee_username: str) -> Dict:
-        """Assign a task to a user (simulates PUT /rest/api/2/issue/{issueKey})"""
-        tasks = self.tasks_data.get("tasks", [])
+    def assign_task(self, task_key: str, assignee_username: str, expected_version=None,
+                    max_utilization: float = None) -> Dict:
+        """
+        Assign a task to a user (simulates PUT /rest/api/2/issue/{issueKey})
         
-        for task in tasks:
-            if task["key"] == task_key:
-                task["assignee"] = assignee_username
-                task["status"] = "In Progress"
-                task["updated"] = datetime.datetime.now().isoformat()
-                
+        Args:
+            expected_version: Version the caller last saw; the assignment is
+                rejected as a conflict if the task has changed since. The
+                check and the write happen under the task's stripe lock.
+            max_utilization (float): Reject the assignment if it would put the
+                assignee above this fraction of their capacity. Checked and
+                counted in one step against the workload totals.
+        """
+        limit = capacity_limit(self.get_user(assignee_username), max_utilization)
+        
+        with self._dataset_lock.read(), self._task_locks.hold(task_key):
+            if limit is not None:
+                self._get_workloads()
+            tasks = self.tasks_data.get("tasks", [])
+            position = self._find_position(tasks, task_key)
+            if position is None:
                 return {
-                    "success": True,
-                    "message": f"Task {task_key} assigned to {assignee_username}",
-                    "task": task
+                    "success": False,
+                    "message": f"Task {task_key} not found"
                 }
-        
-        return {
-            "success": False,
-            "message": f"Task {task_key} not found"
-        }
+            
+            old_task = tasks[position]
+            if is_stale(old_task, expected_version):
+                return conflict_result(task_key, old_task)
+            
+            task = dict(old_task)
+            task["assignee"] = assignee_username
+            task["status"] = "In Progress"
+            task["updated"] = datetime.datetime.now().isoformat()
+            task["version"] = task_version(old_task) + 1
+            
+            with self._index_lock:
+                if self._workloads is not None and not self._workloads.apply(old_task, task, limit):
+                    workload = self.get_user_workload(assignee_username)
+                    return over_capacity_result(task_key, task, workload, max_utilization)
+                tasks[position] = task
+                self._reindex_task(old_task, task)
+            self.change_log.record_upsert(task)
+            
+            return {
+                "success": True,
+                "message": f"Task {task_key} assigned to {assignee_username}",
+                "task": task,
+                "previousAssignee": old_task.get("assignee")
+            }
     
     def get_user_workload(self, username: str) -> Dict:
-        """Calculate current workload for a user"""
+        """Get current workload for a user from the maintained per-user totals"""
         user = self.get_user(username)
         if not user:
             return {"error": "User not found"}
         
-        assigned_tasks = self.get_tasks(assignee=username)
-        total_story_points = sum(task.get("storyPoints", 0) for task in assigned_tasks)
-        
+        task_count, total_story_points = self._get_workloads().get(username)
         capacity = user.get("capacity", {})
-        max_capacity = capacity.get("pointsPerSprint", 40)
-        utilization = (total_story_points / max_capacity) * 100 if max_capacity > 0 else 0
-        
-        return {
-            "username": username,
-            "assignedTasks": len(assigned_tasks),
-            "totalStoryPoints": total_story_points,
-            "maxCapacity": max_capacity,
-            "utilizationPercent": round(utilization, 1),
-            "availableCapacity": max_capacity - total_story_points
-        }
+        return build_workload(username, task_count, total_story_points, capacity.get("pointsPerSprint", 40))
     
     def get_team_capacity_overview(self) -> Dict:
         """Get capacity overview for entire team"""
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Request Profiling
+Opt-in stage timings and cProfile captures for the recommendation pipeline
+
+A request is profiled when it carries ``X-TaskFlow-Profile: timing`` (or
+``cprofile``), or when it is picked by the sample rate. Requests that ask
+for a profile get the report attached to their response; every report is
+also written to the profile directory when one is configured. Unprofiled
+requests pass ``None`` down the pipeline and pay nothing.
+
+Configuration (environment, or PROFILING.configure()):
+    TASKFLOW_PROFILE_SAMPLE_RATE  fraction of requests profiled (default 0)
+    TASKFLOW_PROFILE_MODE         mode for sampled requests: timing or cprofile
+    TASKFLOW_PROFILE_DIR          directory reports (and .prof files) are written to
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Header a client sends to profile one request
+PROFILE_HEADER = "X-TaskFlow-Profile"
+
+TIMING = "timing"
+CPROFILE = "cprofile"
+MODES = (TIMING, CPROFILE)
+
+# Functions listed per stage in a cProfile report, by cumulative time
+TOP_FUNCTIONS = 15
+
+# Only one cProfile.Profile can be enabled at a time; concurrent
+# cprofile requests fall back to timing instead of failing
+_cprofile_lock = threading.Lock()
+
+
+class StageProfiler:
+    """Collects the stages of one profiled request"""
+
+    def __init__(self, name: str, mode: str = TIMING, requested: bool = False):
+        self.name = name
+        self.mode = mode
+        self.requested = requested
+        self.note = None
+        self._start = time.perf_counter()
+        self._stages: Dict[str, Dict] = {}
+        self._profiles: Dict[str, cProfile.Profile] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage; repeated stages accumulate"""
+        profile = self._profiles.setdefault(name, cProfile.Profile()) if self.mode == CPROFILE else None
+        start = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            entry = self._stages.setdefault(name, {"name": name, "ms": 0.0, "calls": 0})
+            entry["ms"] += (time.perf_counter() - start) * 1000
+            entry["calls"] += 1
+
+    def report(self) -> Dict:
+        """Stage timings (and cProfile hot spots per stage) as a JSON-ready dict"""
+        report = {
+            "name": self.name,
+            "mode": self.mode,
+            "totalMs": round((time.perf_counter() - self._start) * 1000, 3),
+            "stages": [dict(entry, ms=round(entry["ms"], 3)) for entry in self._stages.values()]
+        }
+        if self.note:
+            report["note"] = self.note
+        if self._profiles:
+            report["functions"] = {
+                stage: _top_functions(profile) for stage, profile in self._profiles.items()
+            }
+        return report
+
+    def dump_stats(self, path: str) -> bool:
+        """Write the combined cProfile stats for pstats/snakeviz; False if there are none"""
+        profiles = list(self._profiles.values())
+        if not profiles:
+            return False
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+        return True
+
+
+class ProfilingHooks:
+    """Decides which requests are profiled and stores their reports"""
+
+    def __init__(self, sample_rate: float = 0.0, mode: str = TIMING, output_dir: str = None):
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.output_dir = output_dir
+
+    def configure(self, sample_rate: float = None, mode: str = None, output_dir: str = None):
+        """Change the sample rate, sampled mode and/or output directory"""
+        if sample_rate is not None:
+            if not 0 <= sample_rate <= 1:
+                raise ValueError("Profile sample rate must be between 0 and 1")
+            self.sample_rate = sample_rate
+        if mode is not None:
+            if mode not in MODES:
+                raise ValueError(f"Profile mode must be one of {', '.join(MODES)}")
+            self.mode = mode
+        if output_dir is not None:
+            self.output_dir = output_dir or None
+
+    def configure_from_env(self):
+        """Apply the TASKFLOW_PROFILE_* environment variables"""
+        rate = os.getenv('TASKFLOW_PROFILE_SAMPLE_RATE')
+        try:
+            self.configure(float(rate) if rate else None, os.getenv('TASKFLOW_PROFILE_MODE') or None,
+                           os.getenv('TASKFLOW_PROFILE_DIR'))
+        except ValueError as e:
+            print(f"⚠️ Ignoring profiling settings: {e}")
+
+    def begin(self, name: str, headers: Dict = None) -> Optional[StageProfiler]:
+        """A profiler for this request, or None when it isn't profiled"""
+        mode = requested_mode(headers)
+        requested = mode is not None
+        if not requested:
+            if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+                return None
+            mode = self.mode
+
+        profiler = StageProfiler(name, mode, requested)
+        if mode == CPROFILE and not _cprofile_lock.acquire(blocking=False):
+            profiler.mode = TIMING
+            profiler.note = "cProfile busy with another request; recorded timings only"
+        return profiler
+
+    def finish(self, profiler: StageProfiler) -> Dict:
+        """Build the report, write it to the profile directory if configured, and release cProfile"""
+        if profiler.mode == CPROFILE:
+            _cprofile_lock.release()
+        report = profiler.report()
+        if self.output_dir:
+            self._write(profiler, report)
+        return report
+
+    def _write(self, profiler: StageProfiler, report: Dict):
+        stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{profiler.name}-{uuid.uuid4().hex[:8]}"
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, stem + ".json")
+            if profiler.dump_stats(os.path.join(self.output_dir, stem + ".prof")):
+                report["statsFile"] = os.path.join(self.output_dir, stem + ".prof")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            report["reportFile"] = path
+        except OSError as e:
+            print(f"⚠️ Could not write profile to {self.output_dir}: {e}")
+
+
+def requested_mode(headers: Dict = None) -> Optional[str]:
+    """Mode asked for with the X-TaskFlow-Profile header (``1``/``true`` mean timing)"""
+    if not headers:
+        return None
+    value = next((v for k, v in headers.items() if k.lower() == PROFILE_HEADER.lower()), None)
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    if value in ('1', 'true', 'yes'):
+        return TIMING
+    return value if value in MODES else None
+
+
+@contextmanager
+def stage(profiler: Optional[StageProfiler], name: str):
+    """``profiler.stage(name)``, or nothing when the request isn't profiled"""
+    if profiler is None:
+        yield
+    else:
+        with profiler.stage(name):
+            yield
+
+
+def _top_functions(profile: cProfile.Profile) -> List[Dict]:
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+    return [
+        {
+            "function": f"{os.path.basename(filename)}:{line}({function})",
+            "calls": calls,
+            "totalMs": round(total * 1000, 3),
+            "cumulativeMs": round(cumulative * 1000, 3)
+        }
+        for (filename, line, function), (_, calls, total, cumulative, _) in rows
+    ]
+
+
+# Process-wide profiling settings
+PROFILING = ProfilingHooks()
+PROFILING.configure_from_env()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Recommendation Engine
+Scores team members for a task on skill fit and remaining capacity (mirrors integration.js)
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from profiling import stage
+
+
+class RecommendationEngine:
+    """Ranks assignee candidates for a task"""
+
+    def __init__(self, skill_weight: float = 0.7, capacity_weight: float = 0.3,
+                 capacity_threshold: float = 0.9):
+        """
+        Initialize the engine
+
+        Args:
+            skill_weight (float): Weight of the skill fit factor
+            capacity_weight (float): Weight of the load factor
+            capacity_threshold (float): Utilization at or above which a member
+                is excluded (hard constraint)
+        """
+        self.skill_weight = skill_weight
+        self.capacity_weight = capacity_weight
+        self.capacity_threshold = capacity_threshold
+
+    def calculate_skill_fit(self, user_skills: List[Dict], required_skills: List[Dict]) -> float:
+        """Calculate skill fit score (0-1)"""
+        if not required_skills:
+            return 1.0
+
+        levels = {skill["name"]: skill.get("level", 0) for skill in user_skills}
+        skill_matches = 0
+        for req_skill in required_skills:
+            level = levels.get(req_skill["name"])
+            if level is not None:
+                # Score based on how much user skill exceeds minimum requirement
+                skill_matches += min(level / req_skill.get("minLevel", 1), 1.0)
+
+        return skill_matches / len(required_skills)
+
+    def calculate_capacity_factor(self, current_load, max_capacity) -> float:
+        """Calculate capacity factor (0-1)"""
+        if not max_capacity or max_capacity <= 0:
+            return 0
+        return max(0, 1 - current_load / max_capacity)
+
+    def check_hard_constraints(self, user: Dict, task: Dict, current_load) -> Tuple[bool, str]:
+        """Check if user meets hard constraints for the task"""
+        levels = {skill["name"]: skill.get("level", 0) for skill in user.get("skills", [])}
+        for req_skill in task.get("requiredSkills", []):
+            if levels.get(req_skill["name"], 0) < req_skill.get("minLevel", 1):
+                return False, f"Missing required skill: {req_skill['name']} (level {req_skill.get('minLevel', 1)}+)"
+
+        max_capacity = user.get("capacity", {}).get("pointsPerSprint", 40)
+        if max_capacity <= 0 or current_load / max_capacity >= self.capacity_threshold:
+            return False, f"User at capacity limit ({round(self.capacity_threshold * 100)}%+)"
+
+        return True, "All constraints met"
+
+    def score_candidate(self, user: Dict, task: Dict, current_load,
+                        constraint: Optional[Tuple[bool, str]] = None) -> Dict:
+        """
+        Score one member for a task
+
+        Args:
+            constraint: Result of check_hard_constraints() if already computed
+
+        Returns:
+            Dict: Candidate with ``score``, the ``factors`` it was built from
+            and the hard-constraint outcome; excluded members score 0
+        """
+        max_capacity = user.get("capacity", {}).get("pointsPerSprint", 40)
+        factors = {
+            "skillFit": round(self.calculate_skill_fit(user.get("skills", []), task.get("requiredSkills", [])), 4),
+            "loadFactor": round(self.calculate_capacity_factor(current_load, max_capacity), 4)
+        }
+        meets_constraints, constraint_msg = constraint or self.check_hard_constraints(user, task, current_load)
+
+        score = 0.0
+        if meets_constraints:
+            score = min(self.skill_weight * factors["skillFit"] + self.capacity_weight * factors["loadFactor"], 1.0)
+
+        return {
+            "username": user["username"],
+            "displayName": user.get("displayName", user["username"]),
+            "score": round(score, 4),
+            "factors": factors,
+            "currentLoad": current_load,
+            "maxCapacity": max_capacity,
+            "excluded": not meets_constraints,
+            "constraintStatus": constraint_msg
+        }
+
+    def generate_recommendations(self, users: List[Dict], task: Dict, current_loads: Optional[Dict] = None,
+                                 max_recommendations: int = 3, profiler=None) -> List[Dict]:
+        """
+        Rank members for a task
+
+        Args:
+            users (List[Dict]): Team members
+            task (Dict): Task to staff
+            current_loads (Dict): Assigned story points per username; falls
+                back to each user's ``capacity.currentLoad``
+            max_recommendations (int): Number of candidates to return
+            profiler (StageProfiler): Times the constraint_check, scoring and
+                ranking stages when the request is being profiled
+
+        Returns:
+            List[Dict]: Top candidates by score, excluded members last
+        """
+        current_loads = current_loads or {}
+        loads = [current_loads.get(user["username"], user.get("capacity", {}).get("currentLoad", 0))
+                 for user in users]
+        with stage(profiler, "constraint_check"):
+            constraints = [self.check_hard_constraints(user, task, load) for user, load in zip(users, loads)]
+        with stage(profiler, "scoring"):
+            candidates = [self.score_candidate(user, task, load, constraint)
+                          for user, load, constraint in zip(users, loads, constraints)]
+        with stage(profiler, "ranking"):
+            candidates.sort(key=lambda candidate: candidate["score"], reverse=True)
+        return candidates[:max_recommendations]
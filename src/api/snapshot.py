@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Columnar Snapshots
+Binary, memory-mapped copies of the user and task datasets for fast warm starts
+
+A snapshot stores each table column by column: string fields as uint32 ids
+into a shared interned string table, numeric fields as float64 values with a
+one-byte type tag, and everything else (nested lists, rarely-read fields) as
+one JSON string per record. Opening a snapshot only parses a small JSON
+header; column arrays are zero-copy views over the mapped file, and record
+dicts are built the first time a row is actually requested.
+
+File layout (little-endian)::
+
+    b"TFSNAP01" | uint64 header length | header JSON | padding to 8 bytes
+    string offsets (uint32 x count + 1) | string bytes (UTF-8)
+    per table, per column: values array (uint32 or float64) [+ uint8 tags]
+"""
+
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"TFSNAP01"
+FORMAT_VERSION = 1
+
+# String-id sentinels for None and for a field the record does not have
+NULL_ID = 0xFFFFFFFF
+MISSING_ID = 0xFFFFFFFE
+
+# Type tags stored alongside numeric columns
+TAG_MISSING, TAG_NULL, TAG_INT, TAG_FLOAT = 0, 1, 2, 3
+
+# Column layout per table: string columns, numeric columns; all other fields go to the JSON "rest" column
+TABLE_COLUMNS = {
+    "users": {"strings": ("username", "displayName", "timeZone"), "numbers": ()},
+    "tasks": {"strings": ("key", "project", "assignee", "status", "priority", "dueDate"),
+              "numbers": ("storyPoints",)},
+}
+
+_HEADER = struct.Struct("<8sQ")
+
+
+def _pad(length: int) -> int:
+    """Bytes needed to bring ``length`` up to an 8-byte boundary"""
+    return -length % 8
+
+
+class SnapshotWriter:
+    """
+    Builds a snapshot file from record iterables
+
+    Records are consumed one at a time into column arrays, so the writer
+    never needs the source dataset as a list of dicts.
+    """
+
+    def __init__(self):
+        self._strings: Dict[str, int] = {}
+        self._offsets = array.array("I", [0])
+        self._blob = bytearray()
+        self._tables: Dict[str, Dict] = {}
+
+    def add_table(self, name: str, records: Iterable[Dict], extra: Optional[Dict] = None):
+        """
+        Add a table
+
+        Args:
+            name (str): 'users' or 'tasks' (selects the column layout)
+            records (Iterable[Dict]): Rows of the table
+            extra (Dict): Top-level fields stored next to the rows (e.g. metadata)
+        """
+        layout = TABLE_COLUMNS[name]
+        columns = {field: array.array("I") for field in layout["strings"]}
+        numbers = {field: (array.array("d"), array.array("B")) for field in layout["numbers"]}
+        rest_ids = array.array("I")
+        fields = None
+        column_fields = set(columns) | set(numbers)
+
+        for record in records:
+            if fields is None:
+                fields = list(record)
+            for field, values in columns.items():
+                if field not in record:
+                    values.append(MISSING_ID)
+                elif record[field] is None:
+                    values.append(NULL_ID)
+                else:
+                    values.append(self._intern(str(record[field])))
+            for field, (values, tags) in numbers.items():
+                value = record.get(field)
+                if field not in record:
+                    values.append(0.0)
+                    tags.append(TAG_MISSING)
+                elif value is None:
+                    values.append(0.0)
+                    tags.append(TAG_NULL)
+                else:
+                    values.append(float(value))
+                    tags.append(TAG_INT if isinstance(value, int) else TAG_FLOAT)
+            rest = {k: v for k, v in record.items() if k not in column_fields}
+            rest_ids.append(self._append_string(json.dumps(rest, separators=(",", ":"), default=str)))
+
+        self._tables[name] = {
+            "rows": len(rest_ids),
+            "fields": fields or [],
+            "extra": extra or {},
+            "strings": columns,
+            "numbers": numbers,
+            "rest": rest_ids
+        }
+
+    def write(self, path: str, fingerprint: Optional[str] = None):
+        """Write the snapshot atomically (temp file + rename)"""
+        sections: List[bytes] = []
+        offset = 0
+
+        def place(data: bytes) -> Dict:
+            nonlocal offset
+            entry = {"offset": offset, "length": len(data)}
+            sections.append(data)
+            sections.append(b"\0" * _pad(len(data)))
+            offset += len(data) + _pad(len(data))
+            return entry
+
+        layout = {
+            "version": FORMAT_VERSION,
+            "fingerprint": fingerprint,
+            "strings": {"count": len(self._offsets) - 1,
+                        "offsets": place(self._offsets.tobytes()),
+                        "blob": place(bytes(self._blob))},
+            "tables": {}
+        }
+        for name, table in self._tables.items():
+            layout["tables"][name] = {
+                "rows": table["rows"],
+                "fields": table["fields"],
+                "extra": table["extra"],
+                "strings": {field: place(values.tobytes()) for field, values in table["strings"].items()},
+                "numbers": {field: {"values": place(values.tobytes()), "tags": place(tags.tobytes())}
+                            for field, (values, tags) in table["numbers"].items()},
+                "rest": place(table["rest"].tobytes())
+            }
+
+        # Section offsets are relative to the end of the (padded) header
+        header = json.dumps(layout, separators=(",", ":")).encode("utf-8")
+        header += b" " * _pad(_HEADER.size + len(header))
+
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            for section in sections:
+                f.write(section)
+        os.replace(tmp_path, path)
+
+    def _intern(self, value: str) -> int:
+        """Id of a string in the table, adding it on first use"""
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = self._append_string(value)
+            self._strings[value] = string_id
+        return string_id
+
+    def _append_string(self, value: str) -> int:
+        """Append a string without interning it (used for per-record JSON)"""
+        self._blob += value.encode("utf-8")
+        self._offsets.append(len(self._blob))
+        return len(self._offsets) - 2
+
+
+class Snapshot:
+    """A memory-mapped snapshot opened for reading"""
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file
+
+        Raises:
+            ValueError: If the file is not a snapshot this version can read
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Snapshots are only supported on little-endian hosts")
+
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, header_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a TaskFlow snapshot")
+        self.layout = json.loads(bytes(self._view[_HEADER.size:_HEADER.size + header_length]))
+        if self.layout.get("version") != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {self.layout.get('version')}")
+        self._base = _HEADER.size + header_length
+
+        strings = self.layout["strings"]
+        self._string_offsets = self._section(strings["offsets"], "I")
+        self._string_blob = self._section(strings["blob"], "B")
+        self._string_cache: Dict[int, str] = {}
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """Identifier of the source data the snapshot was written from"""
+        return self.layout.get("fingerprint")
+
+    def table(self, name: str) -> "SnapshotTable":
+        """Lazy record sequence for a table"""
+        return SnapshotTable(self, name, self.layout["tables"][name])
+
+    def extra(self, name: str) -> Dict:
+        """Top-level fields stored next to a table's rows"""
+        return dict(self.layout["tables"][name]["extra"])
+
+    def string(self, string_id: int) -> Optional[str]:
+        """Decode an entry of the string table"""
+        if string_id >= MISSING_ID:
+            return None
+        value = self._string_cache.get(string_id)
+        if value is None:
+            start = self._string_offsets[string_id]
+            end = self._string_offsets[string_id + 1]
+            value = bytes(self._string_blob[start:end]).decode("utf-8")
+            self._string_cache[string_id] = value
+        return value
+
+    def close(self):
+        """Release the mapping (tables must not be used afterwards)"""
+        self._string_cache = {}
+        for name in ("_string_offsets", "_string_blob"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._view.release()
+        self._mmap.close()
+
+    def _section(self, entry: Dict, fmt: str) -> memoryview:
+        """Zero-copy typed view of a section"""
+        start = self._base + entry["offset"]
+        return self._view[start:start + entry["length"]].cast(fmt)
+
+
+class SnapshotTable(Sequence):
+    """
+    Read-only-until-touched sequence of records backed by snapshot columns
+
+    Indexing or iterating builds the record dict for that row once and keeps
+    it, so callers may mutate returned records in place just like rows of a
+    list loaded with json.load, or replace them by assigning to an index.
+    ``value()`` and ``find()`` read columns directly and only fall back to the
+    dict for rows already materialized.
+    """
+
+    def __init__(self, snapshot: Snapshot, name: str, layout: Dict):
+        self._snapshot = snapshot
+        self.name = name
+        self._rows = layout["rows"]
+        self._fields = layout["fields"]
+        self._strings = {field: snapshot._section(entry, "I") for field, entry in layout["strings"].items()}
+        self._numbers = {
+            field: (snapshot._section(entry["values"], "d"), snapshot._section(entry["tags"], "B"))
+            for field, entry in layout["numbers"].items()
+        }
+        self._rest = snapshot._section(layout["rest"], "I")
+        self._records: List[Optional[Dict]] = [None] * self._rows
+        self._records_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("snapshot table index out of range")
+
+        record = self._records[index]
+        if record is None:
+            record = self._materialize(index)
+            with self._records_lock:
+                # Keep a record stored meanwhile by another reader or by __setitem__
+                if self._records[index] is None:
+                    self._records[index] = record
+                else:
+                    record = self._records[index]
+        return record
+
+    def __setitem__(self, index: int, record: Dict):
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("snapshot table index out of range")
+        with self._records_lock:
+            self._records[index] = record
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(self._rows):
+            yield self[index]
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Fields that can be read without building records"""
+        return tuple(self._strings) + tuple(self._numbers)
+
+    def value(self, index: int, field: str, default=None):
+        """Read one field of a row from its column (or the record, once built)"""
+        record = self._records[index]
+        if record is not None:
+            return record.get(field, default)
+
+        if field in self._strings:
+            string_id = self._strings[field][index]
+            return default if string_id == MISSING_ID else self._snapshot.string(string_id)
+        if field in self._numbers:
+            values, tags = self._numbers[field]
+            tag = tags[index]
+            if tag == TAG_MISSING:
+                return default
+            if tag == TAG_NULL:
+                return None
+            return int(values[index]) if tag == TAG_INT else values[index]
+        return self[index].get(field, default)
+
+    def find(self, **criteria) -> Iterator[Dict]:
+        """Yield records whose column values equal all ``criteria``"""
+        for index in range(self._rows):
+            if all(self.value(index, field) == expected for field, expected in criteria.items()):
+                yield self[index]
+
+    def _materialize(self, index: int) -> Dict:
+        """Build the record dict for a row in its original field order"""
+        rest = json.loads(self._snapshot.string(self._rest[index]))
+        values = {}
+        for field in self._strings:
+            string_id = self._strings[field][index]
+            if string_id != MISSING_ID:
+                values[field] = self._snapshot.string(string_id)
+        for field, (numbers, tags) in self._numbers.items():
+            tag = tags[index]
+            if tag == TAG_NULL:
+                values[field] = None
+            elif tag == TAG_INT:
+                values[field] = int(numbers[index])
+            elif tag == TAG_FLOAT:
+                values[field] = numbers[index]
+
+        record = {}
+        for field in self._fields:
+            if field in values:
+                record[field] = values.pop(field)
+            elif field in rest:
+                record[field] = rest.pop(field)
+        record.update(values)
+        record.update(rest)
+        return record
+
+
+def source_fingerprint(paths: Iterable[str]) -> str:
+    """Identify source files by name, size and modification time"""
+    parts = []
+    for path in paths:
+        stat = os.stat(path)
+        parts.append(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def write_snapshot(path: str, users_data: Dict, tasks_data: Dict, fingerprint: Optional[str] = None):
+    """Write ``{"users": [...]}`` / ``{"tasks": [...]}`` datasets to a snapshot file"""
+    writer = SnapshotWriter()
+    writer.add_table("users", users_data.get("users", []),
+                     {k: v for k, v in users_data.items() if k != "users"})
+    writer.add_table("tasks", tasks_data.get("tasks", []),
+                     {k: v for k, v in tasks_data.items() if k != "tasks"})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer.write(path, fingerprint)
+
+
+def load_snapshot(path: str, fingerprint: Optional[str] = None) -> Optional[Tuple[Dict, Dict]]:
+    """
+    Open a snapshot as ``(users_data, tasks_data)`` with lazy record lists
+
+    Returns:
+        Tuple[Dict, Dict]: The datasets, or None when the file is missing,
+        unreadable, or was written from different source data
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        snapshot = Snapshot(path)
+    except (ValueError, OSError, struct.error) as e:
+        print(f"⚠️  Ignoring snapshot {path}: {e}")
+        return None
+
+    if fingerprint is not None and snapshot.fingerprint != fingerprint:
+        snapshot.close()
+        return None
+
+    users_data = snapshot.extra("users")
+    users_data["users"] = snapshot.table("users")
+    tasks_data = snapshot.extra("tasks")
+    tasks_data["tasks"] = snapshot.table("tasks")
+    return users_data, tasks_data
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+SQLite Task Store for TaskFlow
+Persistent, indexed local copy of users and tasks that survives restarts
+"""
+
+import json
+import sqlite3
+import datetime
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from change_log import ChangeLog
+from metrics import instrument_backend
+from task_query import (
+    PRIORITY_RANK, InvalidQueryError, cursor_after, decode_cursor, encode_cursor, parse_limit, parse_sort,
+    split_values
+)
+from task_version import conflict_result, is_stale, task_version
+from workload import admits, build_workload, over_capacity_result
+
+# Bumped whenever SCHEMA gains derived tables or columns that must be backfilled (PRAGMA user_version)
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    display_name TEXT,
+    time_zone TEXT,
+    points_per_sprint NUMERIC,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_skills (
+    username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    level INTEGER,
+    PRIMARY KEY (username, name)
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    key TEXT PRIMARY KEY,
+    project TEXT,
+    assignee TEXT,
+    status TEXT,
+    priority TEXT,
+    priority_rank INTEGER,
+    due_date TEXT,
+    story_points NUMERIC,
+    updated TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS task_required_skills (
+    task_key TEXT NOT NULL REFERENCES tasks(key) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    min_level INTEGER,
+    PRIMARY KEY (task_key, name)
+);
+
+CREATE TABLE IF NOT EXISTS task_labels (
+    task_key TEXT NOT NULL REFERENCES tasks(key) ON DELETE CASCADE,
+    label TEXT NOT NULL,
+    PRIMARY KEY (task_key, label)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee);
+CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority_rank ON tasks(priority_rank);
+CREATE INDEX IF NOT EXISTS idx_tasks_story_points ON tasks(story_points);
+CREATE INDEX IF NOT EXISTS idx_user_skills_name ON user_skills(name_lower, level);
+CREATE INDEX IF NOT EXISTS idx_task_required_skills_name ON task_required_skills(name_lower);
+CREATE INDEX IF NOT EXISTS idx_task_labels_label ON task_labels(label);
+
+-- Per-assignee totals kept in step with tasks by the triggers below, so
+-- workload reads are a primary-key lookup instead of an aggregate over tasks
+CREATE TABLE IF NOT EXISTS user_workload (
+    username TEXT PRIMARY KEY,
+    task_count INTEGER NOT NULL DEFAULT 0,
+    story_points NUMERIC NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_workload_insert AFTER INSERT ON tasks
+WHEN NEW.assignee IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO user_workload (username) VALUES (NEW.assignee);
+    UPDATE user_workload
+    SET task_count = task_count + 1, story_points = story_points + COALESCE(NEW.story_points, 0)
+    WHERE username = NEW.assignee;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_workload_delete AFTER DELETE ON tasks
+WHEN OLD.assignee IS NOT NULL
+BEGIN
+    UPDATE user_workload
+    SET task_count = task_count - 1, story_points = story_points - COALESCE(OLD.story_points, 0)
+    WHERE username = OLD.assignee;
+    DELETE FROM user_workload WHERE username = OLD.assignee AND task_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_workload_update AFTER UPDATE OF assignee, story_points ON tasks
+BEGIN
+    UPDATE user_workload
+    SET task_count = task_count - 1, story_points = story_points - COALESCE(OLD.story_points, 0)
+    WHERE username = OLD.assignee;
+    DELETE FROM user_workload WHERE username = OLD.assignee AND task_count <= 0;
+    INSERT OR IGNORE INTO user_workload (username) SELECT NEW.assignee WHERE NEW.assignee IS NOT NULL;
+    UPDATE user_workload
+    SET task_count = task_count + 1, story_points = story_points + COALESCE(NEW.story_points, 0)
+    WHERE username = NEW.assignee;
+END;
+"""
+
+# Task table column backing each sort key accepted by query_tasks()
+SORT_COLUMNS = {
+    "priority": "priority_rank",
+    "dueDate": "due_date",
+    "storyPoints": "story_points"
+}
+
+
+@instrument_backend("sqlite")
+class SQLiteTaskStore:
+    """Backend with the MockJiraAPI/JiraAPIService interface, stored in SQLite"""
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) a task store
+
+        Args:
+            db_path (str): Path to the SQLite database file. Each thread gets
+                its own connection, so use a file rather than ':memory:' when
+                the store is shared across threads.
+        """
+        self.db_path = db_path
+        self.change_log = ChangeLog()
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        if db_path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._migrate()
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it in WAL mode on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block inside BEGIN IMMEDIATE ... COMMIT"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def is_connected(self) -> bool:
+        """The local store is always available"""
+        return True
+
+    def is_empty(self) -> bool:
+        """True when no users or tasks have been loaded yet"""
+        conn = self._conn()
+        return (conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None
+                and conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def replace_all(self, users: Iterable[Dict], tasks: Iterable[Dict]):
+        """Replace the whole dataset in a single transaction"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM users")
+            conn.execute("DELETE FROM tasks")
+            self._insert_users(conn, users)
+            self._insert_tasks(conn, tasks)
+
+    def sync_from(self, users: List[Dict], tasks: List[Dict]):
+        """
+        Make the store match an upstream snapshot
+
+        Users and tasks are upserted and anything no longer upstream is
+        removed, all in one transaction so readers never see a half-synced
+        state.
+        """
+        with self._transaction() as conn:
+            keep_users = [user["username"] for user in users]
+            keep_tasks = [task["key"] for task in tasks]
+            self._delete_missing(conn, "users", "username", keep_users)
+            self._delete_missing(conn, "tasks", "key", keep_tasks)
+            self._insert_users(conn, users)
+            self._insert_tasks(conn, tasks)
+
+    def _migrate(self):
+        """Bring a database written by an older schema up to date"""
+        with self._transaction() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if "version" not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        self.rebuild_workloads()
+
+    def rebuild_workloads(self):
+        """Recompute the user_workload table from the tasks table"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM user_workload")
+            conn.execute(
+                "INSERT INTO user_workload (username, task_count, story_points) "
+                "SELECT assignee, COUNT(*), COALESCE(SUM(story_points), 0) FROM tasks "
+                "WHERE assignee IS NOT NULL GROUP BY assignee"
+            )
+
+    def upsert_tasks(self, tasks: Iterable[Dict]):
+        """Insert or replace individual tasks"""
+        with self._transaction() as conn:
+            self._insert_tasks(conn, tasks)
+
+    @staticmethod
+    def _delete_missing(conn: sqlite3.Connection, table: str, column: str, keep: List[str]):
+        """Delete rows whose key is not in ``keep``"""
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_keys (key TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM keep_keys")
+        conn.executemany("INSERT OR IGNORE INTO keep_keys VALUES (?)", ((key,) for key in keep))
+        conn.execute(f"DELETE FROM {table} WHERE {column} NOT IN (SELECT key FROM keep_keys)")
+
+    @staticmethod
+    def _insert_users(conn: sqlite3.Connection, users: Iterable[Dict]):
+        """Upsert users and their skills"""
+        position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM users").fetchone()[0]
+        for user in users:
+            existing = conn.execute("SELECT position FROM users WHERE username = ?", (user["username"],)).fetchone()
+            capacity = user.get("capacity") or {}
+            conn.execute(
+                "INSERT OR REPLACE INTO users (username, display_name, time_zone, points_per_sprint, position, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (user["username"], user.get("displayName"), user.get("timeZone"),
+                 capacity.get("pointsPerSprint", 40), existing[0] if existing else position, json.dumps(user))
+            )
+            if not existing:
+                position += 1
+            conn.execute("DELETE FROM user_skills WHERE username = ?", (user["username"],))
+            conn.executemany(
+                "INSERT OR REPLACE INTO user_skills (username, name, name_lower, level) VALUES (?, ?, ?, ?)",
+                ((user["username"], skill["name"], skill["name"].lower(), skill.get("level"))
+                 for skill in user.get("skills") or [])
+            )
+
+    @staticmethod
+    def _insert_tasks(conn: sqlite3.Connection, tasks: Iterable[Dict]):
+        """
+        Upsert tasks with their labels and required skills
+
+        Tasks identical to the stored row are skipped, so a sync leaves their
+        version alone and clients holding it can still assign them. Changed
+        tasks get the next version, which is also written into their data.
+        """
+        position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tasks").fetchone()[0]
+        for task in tasks:
+            existing = conn.execute(
+                "SELECT position, version, data FROM tasks WHERE key = ?", (task["key"],)
+            ).fetchone()
+            if existing:
+                stored = json.loads(existing["data"])
+                stored.pop("version", None)
+                if stored == {field: value for field, value in task.items() if field != "version"}:
+                    continue
+                version = existing["version"] + 1
+                task = dict(task, version=version)
+            else:
+                version = task_version(task)
+            # An upsert rather than INSERT OR REPLACE: REPLACE deletes the old
+            # row without firing the delete trigger, which would leave
+            # user_workload counting the task twice
+            conn.execute(
+                "INSERT INTO tasks (key, project, assignee, status, priority, priority_rank, "
+                "due_date, story_points, updated, version, position, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET project = excluded.project, assignee = excluded.assignee, "
+                "status = excluded.status, priority = excluded.priority, "
+                "priority_rank = excluded.priority_rank, due_date = excluded.due_date, "
+                "story_points = excluded.story_points, updated = excluded.updated, "
+                "version = excluded.version, data = excluded.data",
+                (task["key"], task.get("project"), task.get("assignee"), task.get("status"),
+                 task.get("priority"), PRIORITY_RANK.get(task.get("priority")), task.get("dueDate"),
+                 task.get("storyPoints", 0), task.get("updated"), version,
+                 existing["position"] if existing else position, json.dumps(task))
+            )
+            if not existing:
+                position += 1
+            conn.execute("DELETE FROM task_labels WHERE task_key = ?", (task["key"],))
+            conn.executemany(
+                "INSERT OR IGNORE INTO task_labels (task_key, label) VALUES (?, ?)",
+                ((task["key"], label) for label in task.get("labels") or [])
+            )
+            conn.execute("DELETE FROM task_required_skills WHERE task_key = ?", (task["key"],))
+            conn.executemany(
+                "INSERT OR REPLACE INTO task_required_skills (task_key, name, name_lower, min_level) "
+                "VALUES (?, ?, ?, ?)",
+                ((task["key"], skill["name"], skill["name"].lower(), skill.get("minLevel"))
+                 for skill in task.get("requiredSkills") or [])
+            )
+
+    # ------------------------------------------------------------------
+    # Backend interface
+    # ------------------------------------------------------------------
+
+    def get_users(self) -> List[Dict]:
+        """Get all users in their original order"""
+        rows = self._conn().execute("SELECT data FROM users ORDER BY position")
+        return [json.loads(row["data"]) for row in rows]
+
+    def get_user(self, username: str) -> Optional[Dict]:
+        """Get specific user by username"""
+        row = self._conn().execute("SELECT data FROM users WHERE username = ?", (username,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_task(self, task_key: str) -> Optional[Dict]:
+        """Get specific task by key"""
+        row = self._conn().execute("SELECT data FROM tasks WHERE key = ?", (task_key,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_tasks(self, project_key: str = None, assignee: str = None, status: str = None) -> List[Dict]:
+        """Get tasks with optional filtering"""
+        return list(self.iter_tasks(project_key, assignee, status))
+
+    def iter_tasks(self, project_key: str = None, assignee: str = None, status: str = None) -> Iterator[Dict]:
+        """Yield matching tasks straight from the cursor"""
+        where, params = self._build_where(project_key, assignee, status)
+        rows = self._conn().execute(f"SELECT data FROM tasks t {where} ORDER BY position", params)
+        for row in rows:
+            yield json.loads(row["data"])
+
+    def get_unassigned_tasks(self) -> List[Dict]:
+        """Get all unassigned tasks"""
+        return self.get_tasks(assignee='unassigned')
+
+    def query_tasks(self, project_key: str = None, assignee: str = None, status: str = None,
+                    labels=None, priorities=None, skills=None, sort: str = None,
+                    cursor: str = None, limit: int = None) -> Dict:
+        """
+        Get one page of tasks with filtering, ordering and keyset pagination in SQL
+
+        Returns:
+            Dict: ``tasks`` for this page, ``nextCursor`` (None on the last page)
+            and ``total`` matching tasks
+        """
+        field, descending = parse_sort(sort)
+        page_size = parse_limit(limit)
+        state = decode_cursor(cursor)
+        if state and state.get("sort") != sort:
+            raise InvalidQueryError("Cursor does not match the requested sort order")
+
+        where, params = self._build_where(project_key, assignee, status, labels, priorities, skills)
+        conn = self._conn()
+        total = conn.execute(f"SELECT COUNT(*) FROM tasks t {where}", params).fetchone()[0]
+
+        column = SORT_COLUMNS.get(field, "NULL")
+        missing = f"({column} IS NOT NULL)" if descending else f"({column} IS NULL)"
+        value = f"COALESCE({column}, 0)"
+        direction = "DESC" if descending else "ASC"
+        compare = "<" if descending else ">"
+
+        keyset = ""
+        keyset_params = []
+        after = cursor_after(state, field, descending)
+        if after:
+            after_missing, after_value, after_key = after
+            keyset = (f"{'AND' if where else 'WHERE'} ({missing} {compare} ? OR ({missing} = ? AND "
+                      f"({value} {compare} ? OR ({value} = ? AND t.key {compare} ?))))")
+            keyset_params = [after_missing, after_missing, after_value, after_value, after_key]
+
+        rows = conn.execute(
+            f"SELECT data, {missing} AS sort_missing, {value} AS sort_value FROM tasks t {where} {keyset} "
+            f"ORDER BY sort_missing {direction}, sort_value {direction}, t.key {direction} LIMIT ?",
+            params + keyset_params + [page_size + 1]
+        ).fetchall()
+
+        page = rows[:page_size]
+        next_cursor = None
+        if len(rows) > page_size:
+            last = page[-1]
+            key = json.loads(last["data"])["key"]
+            next_cursor = encode_cursor({"sort": sort, "after": [last["sort_missing"], last["sort_value"], key]})
+
+        return {
+            "tasks": [json.loads(row["data"]) for row in page],
+            "nextCursor": next_cursor,
+            "total": total
+        }
+
+    @staticmethod
+    def _build_where(project_key: str = None, assignee: str = None, status: str = None,
+                     labels=None, priorities=None, skills=None):
+        """Build an indexed WHERE clause and its parameters"""
+        clauses, params = [], []
+
+        if project_key:
+            clauses.append("t.project = ?")
+            params.append(project_key)
+
+        if assignee:
+            if assignee.lower() == 'unassigned':
+                clauses.append("t.assignee IS NULL")
+            else:
+                clauses.append("t.assignee = ?")
+                params.append(assignee)
+
+        if status:
+            clauses.append("t.status = ?")
+            params.append(status)
+
+        labels = split_values(labels)
+        if labels:
+            clauses.append(f"t.key IN (SELECT task_key FROM task_labels WHERE label IN ({', '.join('?' * len(labels))}))")
+            params.extend(labels)
+
+        priorities = split_values(priorities)
+        if priorities:
+            clauses.append(f"t.priority IN ({', '.join('?' * len(priorities))})")
+            params.extend(priorities)
+
+        skills = [skill.lower() for skill in split_values(skills)]
+        if skills:
+            clauses.append("t.key IN (SELECT task_key FROM task_required_skills "
+                           f"WHERE name_lower IN ({', '.join('?' * len(skills))}))")
+            params.extend(skills)
+
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def assign_task(self, task_key: str, assignee_username: str, expected_version=None,
+                    max_utilization: float = None) -> Dict:
+        """
+        Assign a task to a user in a single transaction
+
+        Args:
+            expected_version: Version the caller last saw; the assignment is
+                rejected as a conflict if the task has changed since.
+            max_utilization (float): Reject the assignment if it would put the
+                assignee above this fraction of their capacity.
+
+        BEGIN IMMEDIATE keeps both checks and the write atomic, even across
+        processes sharing the database.
+        """
+        with self._transaction() as conn:
+            task, version, rejection = self._vet_assignment(
+                conn, task_key, assignee_username, expected_version, max_utilization
+            )
+            if rejection:
+                return rejection
+
+            previous_assignee = task.get("assignee")
+            task["assignee"] = assignee_username
+            task["status"] = "In Progress"
+            task["updated"] = datetime.datetime.now().isoformat()
+            task["version"] = version + 1
+            conn.execute(
+                "UPDATE tasks SET assignee = ?, status = ?, updated = ?, version = ?, data = ? WHERE key = ?",
+                (task["assignee"], task["status"], task["updated"], task["version"], json.dumps(task), task_key)
+            )
+
+        self.change_log.record_upsert(task)
+        return {
+            "success": True,
+            "message": f"Task {task_key} assigned to {assignee_username}",
+            "task": task,
+            "previousAssignee": previous_assignee
+        }
+
+    def check_assignment(self, task_key: str, assignee_username: str, expected_version=None,
+                         max_utilization: float = None) -> Optional[Dict]:
+        """
+        Vet an assignment without making it (e.g. before writing it through to JIRA)
+
+        Returns:
+            Dict: The failed result assign_task() would return right now, or
+            None if the assignment would go through
+        """
+        return self._vet_assignment(self._conn(), task_key, assignee_username, expected_version, max_utilization)[2]
+
+    def _vet_assignment(self, conn: sqlite3.Connection, task_key: str, assignee_username: str,
+                        expected_version, max_utilization: Optional[float]):
+        """(task, version, None) for an admissible assignment, else (task, version, failed result)"""
+        row = conn.execute("SELECT data, version FROM tasks WHERE key = ?", (task_key,)).fetchone()
+        if row is None:
+            return None, None, {
+                "success": False,
+                "message": f"Task {task_key} not found"
+            }
+
+        task = json.loads(row["data"])
+        if is_stale(task, expected_version):
+            return task, row["version"], conflict_result(task_key, task)
+
+        if max_utilization is not None:
+            load = conn.execute(
+                "SELECT u.points_per_sprint, COALESCE(w.task_count, 0) AS task_count, "
+                "COALESCE(w.story_points, 0) AS points "
+                "FROM users u LEFT JOIN user_workload w ON w.username = u.username WHERE u.username = ?",
+                (assignee_username,)
+            ).fetchone()
+            if load:
+                workload = build_workload(assignee_username, load["task_count"], load["points"],
+                                          load["points_per_sprint"])
+                limit = workload["maxCapacity"] * max_utilization
+                if not admits(load["points"], task, dict(task, assignee=assignee_username), limit):
+                    return task, row["version"], over_capacity_result(task_key, task, workload, max_utilization)
+
+        return task, row["version"], None
+
+    def get_user_workload(self, username: str) -> Dict:
+        """Get current workload for a user from the trigger-maintained totals"""
+        row = self._conn().execute(
+            "SELECT u.points_per_sprint, COALESCE(w.task_count, 0) AS task_count, "
+            "COALESCE(w.story_points, 0) AS points "
+            "FROM users u LEFT JOIN user_workload w ON w.username = u.username WHERE u.username = ?",
+            (username,)
+        ).fetchone()
+        if not row:
+            return {"error": "User not found"}
+
+        return build_workload(username, row["task_count"], row["points"], row["points_per_sprint"])
+
+    def get_team_capacity_overview(self) -> Dict:
+        """Get capacity overview for entire team, reading one totals row per user"""
+        rows = self._conn().execute(
+            "SELECT u.username, u.display_name, u.time_zone, u.points_per_sprint, "
+            "COALESCE(w.task_count, 0) AS task_count, COALESCE(w.story_points, 0) AS points "
+            "FROM users u LEFT JOIN user_workload w ON w.username = u.username "
+            "ORDER BY u.position"
+        ).fetchall()
+
+        team_overview = {
+            "members": [],
+            "teamTotals": {
+                "totalCapacity": 0,
+                "totalAssigned": 0,
+                "averageUtilization": 0
+            }
+        }
+        total_utilization = 0
+
+        for row in rows:
+            workload = build_workload(row["username"], row["task_count"], row["points"], row["points_per_sprint"])
+            team_overview["members"].append({
+                "username": row["username"],
+                "displayName": row["display_name"],
+                "timeZone": row["time_zone"],
+                "workload": workload
+            })
+            team_overview["teamTotals"]["totalCapacity"] += workload["maxCapacity"]
+            team_overview["teamTotals"]["totalAssigned"] += workload["totalStoryPoints"]
+            total_utilization += workload["utilizationPercent"]
+
+        if rows:
+            team_overview["teamTotals"]["averageUtilization"] = round(total_utilization / len(rows), 1)
+
+        return team_overview
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Startup Profiler
+Per-phase and per-module-import timings for service cold starts
+
+Profiling is off unless TASKFLOW_PROFILE_STARTUP is set or the process was
+started with --profile-startup. When off, ``phase()`` is a no-op and the
+import hook is never installed, so instrumented code pays nothing.
+"""
+
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Most imports listed in the report, slowest first
+MAX_REPORTED_IMPORTS = 25
+
+
+class StartupProfiler:
+    """Records nested timing phases and first-time module imports"""
+
+    def __init__(self):
+        self.enabled = False
+        self.reported = False
+        self._origin = time.perf_counter()
+        self._phases: List[Dict] = []
+        self._depth = threading.local()
+        self._imports: Dict[str, Dict] = {}
+        self._import_stack: List[List] = []
+        self._original_import = None
+        self._lock = threading.RLock()
+
+    def enable(self):
+        """Start recording phases and hook module imports"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._origin = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def enable_if_requested(self, argv: Optional[List[str]] = None):
+        """Enable when TASKFLOW_PROFILE_STARTUP is set or --profile-startup was passed"""
+        argv = sys.argv if argv is None else argv
+        if os.getenv('TASKFLOW_PROFILE_STARTUP') or '--profile-startup' in argv:
+            self.enable()
+
+    def disable(self):
+        """Stop recording and restore the original import function"""
+        if self._original_import is not None and builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._original_import
+        self._original_import = None
+        self.enabled = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; phases started inside it are reported as its children"""
+        if not self.enabled:
+            yield
+            return
+
+        depth = getattr(self._depth, "value", 0)
+        entry = {"name": name, "depth": depth, "start": time.perf_counter() - self._origin, "seconds": None}
+        with self._lock:
+            self._phases.append(entry)
+        self._depth.value = depth + 1
+        try:
+            yield
+        finally:
+            self._depth.value = depth
+            entry["seconds"] = time.perf_counter() - self._origin - entry["start"]
+
+    def report(self) -> Dict:
+        """
+        Build the structured startup report
+
+        Returns:
+            Dict: ``totalSeconds`` since profiling started, ``phases`` in start
+            order with their nesting ``depth``, and the slowest ``imports``
+            with self time (excluding nested imports) and cumulative time
+        """
+        with self._lock:
+            phases = [
+                {"name": p["name"], "depth": p["depth"], "startSeconds": round(p["start"], 6),
+                 "seconds": round(p["seconds"], 6) if p["seconds"] is not None else None}
+                for p in self._phases
+            ]
+            imports = sorted(self._imports.values(), key=lambda i: i["self"], reverse=True)
+
+        return {
+            "totalSeconds": round(time.perf_counter() - self._origin, 6),
+            "phases": phases,
+            "imports": [
+                {"module": i["module"], "selfSeconds": round(i["self"], 6),
+                 "cumulativeSeconds": round(i["cumulative"], 6)}
+                for i in imports[:MAX_REPORTED_IMPORTS]
+            ],
+            "importCount": len(imports),
+            "importSeconds": round(sum(i["self"] for i in imports), 6)
+        }
+
+    def print_report(self, output_path: Optional[str] = None):
+        """
+        Print the report once (later calls are ignored)
+
+        Args:
+            output_path (str): Also write the JSON report here (default:
+                $TASKFLOW_PROFILE_STARTUP_OUTPUT), e.g. for CI to compare runs
+        """
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        report = self.report()
+
+        print("\n⏱️  Startup profile")
+        print(f"  Total: {report['totalSeconds'] * 1000:.1f} ms")
+        for phase in report["phases"]:
+            seconds = phase["seconds"]
+            duration = f"{seconds * 1000:.1f} ms" if seconds is not None else "running"
+            print(f"  {'  ' * phase['depth']}• {phase['name']}: {duration}")
+        print(f"  Imports: {report['importCount']} modules, {report['importSeconds'] * 1000:.1f} ms")
+        for entry in report["imports"][:10]:
+            print(f"    {entry['module']}: {entry['selfSeconds'] * 1000:.1f} ms "
+                  f"(cumulative {entry['cumulativeSeconds'] * 1000:.1f} ms)")
+
+        output_path = output_path or os.getenv('TASKFLOW_PROFILE_STARTUP_OUTPUT')
+        if output_path:
+            with open(output_path, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"  Report written to {output_path}")
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """builtins.__import__ replacement that times modules imported for the first time"""
+        if level != 0 or name in sys.modules or threading.current_thread() is not threading.main_thread():
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        frame = [name, 0.0]
+        self._import_stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1][1] += elapsed
+            if name not in self._imports:
+                self._imports[name] = {"module": name, "self": elapsed - frame[1], "cumulative": elapsed}
+
+
+# Process-wide profiler used by the service modules
+PROFILER = StartupProfiler()
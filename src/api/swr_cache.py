@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Stale-While-Revalidate Cache
+Keeps dashboards answering from the last good JIRA data while JIRA is slow or down
+
+Reads are answered from the last successful response for the same call.
+Once that response is older than ``fresh_seconds`` a refresh is started on a
+background thread, so a slow JIRA never sits on the request path after the
+first load. A circuit breaker counts failed (and very slow) JIRA calls; while
+it is open no refreshes are attempted and cached data keeps being served.
+Every answer records its age so the web API can mark stale responses.
+
+Enable it with a ``stale_while_revalidate`` section in the JIRA config, or
+with TASKFLOW_STALE_WHILE_REVALIDATE=1 for the defaults below.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, List, Optional
+
+from jira_scheduler import BACKGROUND, call_priority
+from metrics import METRICS
+
+# Defaults for the "stale_while_revalidate" section of the JIRA config
+DEFAULT_SWR = {
+    "fresh_seconds": 30.0,
+    "max_stale_seconds": 86400.0,
+    "failure_threshold": 5,
+    "reset_seconds": 30.0,
+    "slow_call_seconds": 10.0
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CACHE_LOOKUPS = METRICS.counter(
+    "taskflow_swr_lookups_total", "Stale-while-revalidate lookups by outcome (fresh, stale, miss, fallback)",
+    ("result",))
+CIRCUIT_OPEN = METRICS.gauge(
+    "taskflow_jira_circuit_open", "1 while the JIRA circuit breaker is open")
+
+_freshness: contextvars.ContextVar = contextvars.ContextVar("taskflow_freshness", default=None)
+
+
+class BackendUnavailableError(Exception):
+    """JIRA could not be reached and there is no cached copy to fall back to"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing dependency for a while
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    refuses calls for ``reset_seconds``. It then lets one trial call through
+    (half-open): success closes it, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """True if a call may go ahead (in half-open state, only the first caller)"""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a trial call through (0 when closed)"""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(self.reset_seconds - (self._clock() - self._opened_at), 0.0)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+        CIRCUIT_OPEN.set(value=0)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._trial_running = False
+                opened = True
+            else:
+                opened = False
+        if opened:
+            CIRCUIT_OPEN.set(value=1)
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "invalidated", "patched")
+
+    def __init__(self, value, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.invalidated = False
+        # Generation of the last patch() still waiting for a refresh to confirm it
+        self.patched = None
+
+
+class StaleWhileRevalidateCache:
+    """Last-good values per key, refreshed in the background behind a circuit breaker"""
+
+    def __init__(self, fresh_seconds: float = 30.0, max_stale_seconds: float = 86400.0,
+                 failure_threshold: int = 5, reset_seconds: float = 30.0, slow_call_seconds: float = 10.0,
+                 clock=time.monotonic, executor=None):
+        self.fresh_seconds = fresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds, clock)
+        self._clock = clock
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._refreshing = set()
+        self._patch_generation = 0
+        self._lock = threading.Lock()
+        self._executor = executor or ThreadPoolExecutor(max_workers=2, thread_name_prefix="taskflow-swr")
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional["StaleWhileRevalidateCache"]:
+        """Build a cache from the JIRA config, or None if stale-while-revalidate is off"""
+        settings = config.get("stale_while_revalidate")
+        if settings is None and os.getenv('TASKFLOW_STALE_WHILE_REVALIDATE', '').lower() in ('1', 'true', 'yes'):
+            settings = {}
+        if settings is None or settings is False or (isinstance(settings, dict) and settings.get("enabled") is False):
+            return None
+        settings = dict(DEFAULT_SWR, **(settings if isinstance(settings, dict) else {}))
+        return cls(**{key: settings[key] for key in DEFAULT_SWR})
+
+    def get(self, key: Hashable, loader: Callable):
+        """
+        Value for ``key``: cached if there is one, otherwise loaded now
+
+        Raises:
+            BackendUnavailableError: Nothing usable is cached and the loader
+                failed or the circuit breaker is open
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        now = self._clock()
+
+        if entry is not None and not entry.invalidated:
+            age = now - entry.fetched_at
+            if age < self.fresh_seconds and entry.patched is None:
+                CACHE_LOOKUPS.inc("fresh")
+                _note(age, stale=False)
+                return entry.value
+            if age < self.max_stale_seconds:
+                CACHE_LOOKUPS.inc("stale")
+                _note(age, stale=True)
+                self._refresh_in_background(key, loader)
+                return entry.value
+
+        # Missing, invalidated by a write, or too old to serve without trying JIRA first
+        if self.breaker.allow():
+            try:
+                value = self._load(key, loader)
+                CACHE_LOOKUPS.inc("miss")
+                _note(0.0, stale=False)
+                return value
+            except Exception as e:
+                error = e
+        else:
+            error = None
+        if entry is not None:
+            CACHE_LOOKUPS.inc("fallback")
+            _note(now - entry.fetched_at, stale=True)
+            return entry.value
+        message = f"JIRA unavailable: {error}" if error else "JIRA unavailable (circuit open)"
+        raise BackendUnavailableError(message, self.breaker.retry_after()) from error
+
+    def _load(self, key: Hashable, loader: Callable):
+        with self._lock:
+            generation = self._patch_generation
+        start = self._clock()
+        try:
+            value = loader()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        # A slow success still counts against JIRA's health, but its result is kept
+        if self._clock() - start >= self.slow_call_seconds:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        with self._lock:
+            current = self._entries.get(key)
+            # A load that started before the latest patch may predate the write; keep the patch
+            if current is None or current.patched is None or current.patched <= generation:
+                self._entries[key] = _Entry(value, self._clock())
+        return value
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        if not self.breaker.allow():
+            with self._lock:
+                self._refreshing.discard(key)
+            return
+
+        def refresh():
+            try:
+                with call_priority(BACKGROUND):
+                    self._load(key, loader)
+            except Exception as e:
+                print(f"⚠️ Background refresh of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(refresh)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] = None):
+        """Make matching entries (all by default) reload on next use, keeping them as a fallback"""
+        with self._lock:
+            for key, entry in self._entries.items():
+                if predicate is None or predicate(key):
+                    entry.invalidated = True
+
+    def values(self, predicate: Callable[[Hashable], bool]) -> List:
+        """Cached values whose keys match, without loading or refreshing anything"""
+        with self._lock:
+            return [entry.value for key, entry in self._entries.items() if predicate(key)]
+
+    def patch(self, predicate: Callable[[Hashable], bool], update: Callable[[Hashable, object], object]):
+        """
+        Apply a known write to matching entries and refresh them in the background
+
+        ``update(key, value)`` returns the patched value, or None when it
+        cannot tell; those entries are invalidated instead. Patched entries
+        are served as stale until a refresh started after the patch lands.
+        """
+        with self._lock:
+            self._patch_generation += 1
+            for key, entry in self._entries.items():
+                if not predicate(key):
+                    continue
+                value = update(key, entry.value)
+                if value is None:
+                    entry.invalidated = True
+                else:
+                    entry.value = value
+                    entry.patched = self._patch_generation
+
+
+def _note(age: float, stale: bool):
+    freshness = _freshness.get()
+    if freshness is not None:
+        freshness["ageSeconds"] = round(max(freshness["ageSeconds"], age), 3)
+        freshness["stale"] = freshness["stale"] or stale
+        freshness["cached"] = True
+
+
+@contextmanager
+def track_freshness():
+    """
+    Collect the age of cached data served inside the block
+
+    Yields a dict whose ``cached`` is True if any lookup happened, with the
+    oldest ``ageSeconds`` seen and ``stale`` if anything was past its fresh window.
+    """
+    freshness = {"cached": False, "ageSeconds": 0.0, "stale": False}
+    token = _freshness.set(freshness)
+    try:
+        yield freshness
+    finally:
+        _freshness.reset(token)
+
+
+class StaleWhileRevalidateAPI:
+    """
+    JiraAPIService wrapper answering dashboard reads from a StaleWhileRevalidateCache
+
+    Reads the dashboards poll (users, task lists, workloads, team capacity)
+    go through the cache; everything else passes straight through to the
+    wrapped service. A successful assignment is written into the cached task
+    lists and the task and capacity views are refreshed in the background, so
+    the next read neither waits for JIRA nor misses the assignment.
+    """
+
+    def __init__(self, api, cache: StaleWhileRevalidateCache):
+        self._api = api
+        self.cache = cache
+        if hasattr(api, "workload_max_age"):
+            # Rebuilds run as background cache refreshes, never on a request thread
+            api.workload_max_age = float("inf")
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+    def get_users(self):
+        return self.cache.get(("users",), self._api.fetch_users)
+
+    def get_tasks(self, project_key: str = None, assignee: str = None, status: str = None):
+        return self.cache.get(("tasks", project_key, assignee, status),
+                              lambda: list(self._api.iter_tasks(project_key, assignee, status)))
+
+    def iter_tasks(self, project_key: str = None, assignee: str = None, status: str = None, page_size: int = 100):
+        return iter(self.get_tasks(project_key, assignee, status))
+
+    def get_unassigned_tasks(self):
+        return self.get_tasks(assignee='unassigned')
+
+    def _workloads(self):
+        """Per-user totals, rebuilt from a full task scan behind the cache"""
+        def load():
+            self._api.refresh_workloads()
+            return self._api.workloads
+        return self.cache.get(("workloads",), load)
+
+    def get_user_workload(self, username: str):
+        return self._api._build_workload(username, self._workloads())
+
+    def get_team_capacity_overview(self):
+        # Keeps the totals behind the overview on the cache's refresh schedule
+        self._workloads()
+
+        def load():
+            overview = self._api.get_team_capacity_overview()
+            if "error" in overview:
+                raise BackendUnavailableError(overview["error"])
+            return overview
+        return self.cache.get(("capacity",), load)
+
+    def assign_task(self, task_key: str, assignee_username: str, *args, **kwargs):
+        if not self.cache.breaker.allow():
+            retry_after = self.cache.breaker.retry_after()
+            return {
+                "success": False,
+                "unavailable": True,
+                "retryAfter": retry_after,
+                "message": f"JIRA unavailable (circuit open); retry in {retry_after:.0f}s"
+            }
+        result = self._api.assign_task(task_key, assignee_username, *args, **kwargs)
+        if result.get("rateLimited") or result.get("message", "").startswith("Error assigning task"):
+            self.cache.breaker.record_failure()
+        else:
+            # JIRA answered, even if it was to refuse the assignment
+            self.cache.breaker.record_success()
+        if result.get("success"):
+            self._apply_assignment(task_key, result.get("task"))
+        return result
+
+    def _apply_assignment(self, task_key: str, assigned: Optional[Dict]):
+        """Patch cached task lists with an assignment JIRA confirmed"""
+        if not assigned:
+            self.cache.invalidate(lambda key: key[0] in ("tasks", "capacity"))
+            return
+
+        cached = (task for tasks in self.cache.values(lambda key: key[0] == "tasks")
+                  for task in tasks if task.get("key") == task_key)
+        task = next(cached, None)
+        if task is not None:
+            task = dict(task, **{field: value for field, value in assigned.items() if field != "key"})
+
+        def update(key, value):
+            if key[0] == "capacity":
+                # Served as stale until the background refresh recomputes it
+                return value
+            _, project_key, assignee, status = key
+            if assignee and assignee.lower() == "unassigned":
+                listed = not assigned.get("assignee")
+            else:
+                listed = not assignee or assigned.get("assignee") == assignee
+            tasks = [t for t in value if t.get("key") != task_key]
+            if not listed:
+                return tasks
+            if task is None:
+                # The task was in no cached list, so its other fields are unknown
+                return None
+            if (project_key and task.get("project") != project_key) or (status and task.get("status") != status):
+                return tasks
+            position = next((i for i, t in enumerate(value) if t.get("key") == task_key), len(tasks))
+            tasks.insert(position, task)
+            return tasks
+
+        self.cache.patch(lambda key: key[0] in ("tasks", "capacity"), update)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Task Query Helpers
+Shared sorting, filtering and cursor encoding for paginated task queries
+"""
+
+import base64
+import json
+from typing import Dict, List, Optional, Tuple
+
+# Relative rank of JIRA priorities; sorting by 'priority' is lowest first
+PRIORITY_RANK = {
+    "Lowest": 1,
+    "Low": 2,
+    "Medium": 3,
+    "High": 4,
+    "Highest": 5,
+    "Critical": 5,
+    "Blocker": 6
+}
+
+# Sortable task fields; prefix with '-' for descending order
+SORT_FIELDS = ("priority", "dueDate", "storyPoints")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Request parameters that switch /api/tasks into paginated query mode
+QUERY_PARAMS = ("cursor", "limit", "sort", "labels", "priority", "skill")
+
+
+class InvalidQueryError(ValueError):
+    """Raised for unknown sort keys or malformed cursors"""
+
+
+def split_values(value) -> List[str]:
+    """Normalize a filter given as a list or comma-separated string"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def parse_sort(sort: Optional[str]) -> Tuple[Optional[str], bool]:
+    """Split a sort parameter such as '-dueDate' into (field, descending)"""
+    if not sort:
+        return None, False
+    descending = sort.startswith("-")
+    field = sort.lstrip("-+")
+    if field not in SORT_FIELDS:
+        raise InvalidQueryError(f"Unsupported sort key '{field}' (use one of {', '.join(SORT_FIELDS)})")
+    return field, descending
+
+
+def parse_limit(limit) -> int:
+    """Clamp a requested page size to [1, MAX_PAGE_SIZE]"""
+    if limit in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        return max(1, min(int(limit), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise InvalidQueryError(f"Invalid limit '{limit}'")
+
+
+def sort_value(task: Dict, field: Optional[str], descending: bool = False) -> Tuple:
+    """
+    Comparable value of a task for a sort field
+
+    Missing values sort last in either direction: callers sort ascending on
+    this tuple and reverse the result for descending order. The task key is
+    always the final component so ordering is total and cursors are stable.
+    """
+    if field == "priority":
+        value = PRIORITY_RANK.get(task.get("priority"))
+    elif field:
+        value = task.get(field)
+    else:
+        value = None
+
+    if field == "storyPoints" and value is not None:
+        value = float(value)
+    missing = value is None
+    return (not missing if descending else missing, value if not missing else 0, task.get("key", ""))
+
+
+def encode_cursor(state: Dict) -> str:
+    """Encode pagination state as an opaque URL-safe cursor"""
+    raw = json.dumps(state, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Dict:
+    """Decode a cursor produced by encode_cursor()"""
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError):
+        raise InvalidQueryError("Invalid cursor")
+    if not isinstance(state, dict):
+        raise InvalidQueryError("Invalid cursor")
+    return state
+
+
+def cursor_after(state: Dict, field: Optional[str], descending: bool = False) -> Optional[Tuple]:
+    """
+    The sort_value() tuple a keyset cursor resumes after, or None on the first page
+
+    Raises:
+        InvalidQueryError: If ``after`` is not a (missing flag, value, task
+            key) triple of the types sort_value() produces for ``field``
+    """
+    after = state.get("after")
+    if after is None:
+        return None
+    if not (isinstance(after, list) and len(after) == 3 and isinstance(after[0], (bool, int))
+            and isinstance(after[2], str)):
+        raise InvalidQueryError("Invalid cursor")
+    flag, value, key = after
+    # Missing values are stored as 0; only present due dates are strings
+    missing = not flag if descending else bool(flag)
+    expected = str if field == "dueDate" and not missing else (int, float)
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise InvalidQueryError("Invalid cursor")
+    return (bool(flag), value, key)
+
+
+def cursor_start(state: Dict) -> int:
+    """The result offset an offset cursor resumes at (0 on the first page)"""
+    start = state.get("startAt", 0)
+    if isinstance(start, bool) or not isinstance(start, int) or start < 0:
+        raise InvalidQueryError("Invalid cursor")
+    return start
+
+
+def task_matches(task: Dict, labels: List[str] = None, priorities: List[str] = None,
+                 skills: List[str] = None) -> bool:
+    """Check a task against label, priority and required-skill filters"""
+    if labels and not set(labels) & set(task.get("labels") or []):
+        return False
+    if priorities and task.get("priority") not in priorities:
+        return False
+    if skills:
+        required = {skill.get("name", "").lower() for skill in task.get("requiredSkills") or []}
+        if not {skill.lower() for skill in skills} & required:
+            return False
+    return True
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Task Versions
+Per-task version tokens for optimistic concurrency on assignment
+"""
+
+from typing import Dict
+
+# Version of a task that has not been changed through TaskFlow yet
+INITIAL_VERSION = 1
+
+
+def task_version(task: Dict) -> int:
+    """Version number of a task; every write through TaskFlow increments it"""
+    return task.get("version") or INITIAL_VERSION
+
+
+def current_version(task: Dict):
+    """
+    Token a client sends back as ``expected_version``
+
+    This is the task's version number, or its ``updated`` timestamp for
+    tasks that carry none (JIRA issues have no version of their own).
+    """
+    if "version" not in task and task.get("updated"):
+        return task["updated"]
+    return task_version(task)
+
+
+def is_stale(task: Dict, expected_version) -> bool:
+    """True when ``expected_version`` was given and no longer matches the task"""
+    if expected_version is None or expected_version == "":
+        return False
+    return str(expected_version) != str(current_version(task))
+
+
+def conflict_result(task_key: str, task: Dict) -> Dict:
+    """Failed assignment result for a write based on an outdated copy of the task"""
+    return {
+        "success": False,
+        "conflict": True,
+        "message": f"Task {task_key} was changed by someone else; reload it and try again",
+        "currentVersion": current_version(task),
+        "task": task
+    }
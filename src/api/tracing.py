@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Tracing
+Per-request span trees for finding which outbound JIRA calls made a request slow
+
+A trace is started for each TaskFlowWebAPI request and child spans are
+opened around backend calls. Sampling is decided once per trace: an
+unsampled request costs one random draw, and spans inside it are no-ops.
+Finished traces are kept in a small in-memory ring and, when an output file
+is configured, appended to it as one JSON line per trace.
+
+Configuration (environment, or configure()):
+    TASKFLOW_TRACE_SAMPLE_RATE  fraction of requests traced (default 0)
+    TASKFLOW_TRACE_FILE         JSON lines file finished traces are appended to
+"""
+
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Header that forces a request to be traced regardless of the sample rate
+TRACE_HEADER = "X-TaskFlow-Trace"
+
+# Finished traces kept in memory for recent()
+RECENT_TRACES = 100
+
+# Longest attribute value stored on a span (JQL queries can be long)
+MAX_ATTRIBUTE_LENGTH = 200
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start", "duration_ms", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict):
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.duration_ms = None
+        self.error = None
+
+    def set(self, **attributes):
+        """Add attributes to the span"""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict:
+        return {
+            "spanId": self.span_id,
+            "parentId": self.parent_id,
+            "name": self.name,
+            "startMs": round((self.start - self.trace.start) * 1000, 3),
+            "durationMs": self.duration_ms,
+            "attributes": {key: _attribute(value) for key, value in self.attributes.items()},
+            "error": self.error
+        }
+
+
+class Trace:
+    """The spans recorded for one request"""
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict:
+        """The trace as a flat span list; ``parentId`` links spans into a tree"""
+        root = self.spans[0] if self.spans else None
+        return {
+            "traceId": self.trace_id,
+            "name": self.name,
+            "timestamp": self.started_at,
+            "durationMs": root.duration_ms if root else None,
+            "spans": [span.to_dict() for span in self.spans]
+        }
+
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("taskflow_span", default=None)
+
+
+class Tracer:
+    """Starts traces, records spans and exports finished traces"""
+
+    def __init__(self, sample_rate: float = 0.0, output_file: str = None):
+        self.sample_rate = sample_rate
+        self.output_file = output_file
+        self._recent = deque(maxlen=RECENT_TRACES)
+        self._write_lock = threading.Lock()
+
+    def configure(self, sample_rate: float = None, output_file: str = None):
+        """Change the sample rate and/or output file"""
+        if sample_rate is not None:
+            if not 0 <= sample_rate <= 1:
+                raise ValueError("Trace sample rate must be between 0 and 1")
+            self.sample_rate = sample_rate
+        if output_file is not None:
+            self.output_file = output_file or None
+
+    def configure_from_env(self):
+        """Apply TASKFLOW_TRACE_SAMPLE_RATE and TASKFLOW_TRACE_FILE"""
+        rate = os.getenv('TASKFLOW_TRACE_SAMPLE_RATE')
+        try:
+            self.configure(float(rate) if rate else None, os.getenv('TASKFLOW_TRACE_FILE'))
+        except ValueError:
+            print(f"⚠️ Ignoring invalid TASKFLOW_TRACE_SAMPLE_RATE: {rate}")
+
+    @contextmanager
+    def trace(self, name: str, force: bool = False, **attributes):
+        """
+        Start a trace with a root span, if this request is sampled
+
+        Inside an existing trace this opens a child span instead, so nested
+        entry points don't split one request into several traces. Yields the
+        root span, or None when the request is not traced.
+        """
+        if _current_span.get() is not None:
+            with self.span(name, **attributes) as span:
+                yield span
+            return
+        if not force and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            yield None
+            return
+
+        trace = Trace(name)
+        try:
+            with self._open(trace, name, None, attributes) as root:
+                yield root
+        finally:
+            self._finish(trace)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a block as a child of the current span (a no-op outside a sampled trace)"""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        with self._open(parent.trace, name, parent.span_id, attributes) as span:
+            yield span
+
+    @contextmanager
+    def _open(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict):
+        span = Span(trace, name, parent_id, attributes)
+        trace.add(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration_ms = round((time.perf_counter() - span.start) * 1000, 3)
+            _current_span.reset(token)
+
+    def active(self) -> bool:
+        """True inside a sampled trace"""
+        return _current_span.get() is not None
+
+    def _finish(self, trace: Trace):
+        record = trace.to_dict()
+        self._recent.append(record)
+        if not self.output_file:
+            return
+        line = json.dumps(record, default=str)
+        try:
+            with self._write_lock:
+                with open(self.output_file, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not write trace to {self.output_file}: {e}")
+
+    def recent(self, limit: int = None) -> List[Dict]:
+        """Most recently finished traces, newest last"""
+        traces = list(self._recent)
+        return traces[-limit:] if limit else traces
+
+    def clear(self):
+        """Forget the in-memory traces"""
+        self._recent.clear()
+
+
+def _attribute(value):
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    text = str(value)
+    return text if len(text) <= MAX_ATTRIBUTE_LENGTH else text[:MAX_ATTRIBUTE_LENGTH] + "…"
+
+
+def trace_forced(headers: Dict = None) -> bool:
+    """True when the request asked to be traced with the X-TaskFlow-Trace header"""
+    if not headers:
+        return False
+    value = next((v for k, v in headers.items() if k.lower() == TRACE_HEADER.lower()), None)
+    return str(value).strip().lower() in ('1', 'true', 'yes') if value is not None else False
+
+
+# Process-wide tracer
+TRACER = Tracer()
+TRACER.configure_from_env()
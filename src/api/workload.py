@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Workload Aggregates
+Per-user assigned-task counts and story-point totals kept up to date as tasks change
+"""
+
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def story_points(task: Optional[Dict]):
+    """Story points of a task, treating missing or null values as 0"""
+    if not task:
+        return 0
+    return task.get("storyPoints") or 0
+
+
+def build_workload(username: str, task_count: int, total_story_points, max_capacity) -> Dict:
+    """Shape workload numbers the way every backend reports them"""
+    max_capacity = max_capacity if max_capacity is not None else 40
+    utilization = (total_story_points / max_capacity) * 100 if max_capacity > 0 else 0
+    return {
+        "username": username,
+        "assignedTasks": task_count,
+        "totalStoryPoints": total_story_points,
+        "maxCapacity": max_capacity,
+        "utilizationPercent": round(utilization, 1),
+        "availableCapacity": max_capacity - total_story_points
+    }
+
+
+def capacity_limit(user: Optional[Dict], max_utilization: Optional[float]):
+    """
+    Most story points a user may hold under a capacity ceiling
+
+    Args:
+        user (Dict): Team member profile; None for unknown users
+        max_utilization (float): Ceiling as a fraction of ``pointsPerSprint``
+            (1.0 = 100%); None disables the ceiling
+
+    Returns:
+        The point limit, or None when there is no ceiling to enforce
+    """
+    if max_utilization is None or not user:
+        return None
+    max_capacity = user.get("capacity", {}).get("pointsPerSprint", 40)
+    return max_capacity * max_utilization
+
+
+def over_capacity_result(task_key: str, task: Dict, workload: Dict, max_utilization: float) -> Dict:
+    """Failed assignment result for a task that would push its assignee over the ceiling"""
+    return {
+        "success": False,
+        "overCapacity": True,
+        "message": (
+            f"Assigning {task_key} ({story_points(task)} points) would put {workload['username']} over "
+            f"the {round(max_utilization * 100)}% capacity ceiling "
+            f"({workload['totalStoryPoints']}/{workload['maxCapacity']} points assigned)"
+        ),
+        "workload": workload
+    }
+
+
+def admits(current_points, old_task: Optional[Dict], new_task: Dict, limit) -> bool:
+    """
+    Whether moving a task to ``new_task``'s assignee keeps them within ``limit``
+
+    ``current_points`` is the assignee's load before the change. A change
+    that does not add to their load (e.g. re-saving a task they already
+    hold) is always admitted, even if they are over the limit already.
+    """
+    if limit is None or not new_task.get("assignee"):
+        return True
+    projected = current_points + story_points(new_task)
+    if old_task and old_task.get("assignee") == new_task["assignee"]:
+        projected -= story_points(old_task)
+    return projected <= limit or projected <= current_points
+
+
+class WorkloadAggregates:
+    """Running totals of assigned tasks and story points per assignee"""
+
+    def __init__(self, tasks: Iterable[Dict] = ()):
+        """
+        Initialize the aggregates from a task list
+
+        Args:
+            tasks (Iterable[Dict]): Tasks to count; unassigned tasks are ignored
+        """
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Tuple[int, float]] = {}
+        self.rebuild(tasks)
+
+    def rebuild(self, tasks: Iterable[Dict]):
+        """Recount everything from scratch (e.g. after a full sync)"""
+        totals = {}
+        for task in tasks:
+            assignee = task.get("assignee")
+            if assignee:
+                count, points = totals.get(assignee, (0, 0))
+                totals[assignee] = (count + 1, points + story_points(task))
+
+        with self._lock:
+            self._totals = totals
+
+    def apply(self, old_task: Optional[Dict], new_task: Optional[Dict], limit=None) -> bool:
+        """
+        Move one task's contribution from its old state to its new state
+
+        Pass ``old_task=None`` for a newly created task and ``new_task=None``
+        for a removed one. Both sides are adjusted under one lock so readers
+        never see the task counted twice or not at all.
+
+        Args:
+            limit: Most story points the new assignee may end up with. The
+                check and the update happen under the same lock, so
+                concurrent assignments cannot together overshoot it.
+
+        Returns:
+            bool: False (and nothing changed) if the limit would be exceeded
+        """
+        with self._lock:
+            if new_task and limit is not None:
+                current_points = self._totals.get(new_task.get("assignee"), (0, 0))[1]
+                if not admits(current_points, old_task, new_task, limit):
+                    return False
+            if old_task and old_task.get("assignee"):
+                self._add(old_task["assignee"], -1, -story_points(old_task))
+            if new_task and new_task.get("assignee"):
+                self._add(new_task["assignee"], 1, story_points(new_task))
+            return True
+
+    def get(self, username: str) -> Tuple[int, float]:
+        """(assigned task count, total story points) for a user"""
+        return self._totals.get(username, (0, 0))
+
+    def _add(self, username: str, count: int, points):
+        """Adjust a user's totals, dropping them once nothing is assigned"""
+        old_count, old_points = self._totals.get(username, (0, 0))
+        if old_count + count <= 0:
+            self._totals.pop(username, None)
+        else:
+            self._totals[username] = (old_count + count, old_points + points)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator for TaskFlow Load Tests
+Seeded, streaming generation of large user and task sets
+
+Records are generated in fixed-size chunks, each from its own
+``random.Random`` seeded with (seed, kind, chunk number). The output
+therefore depends only on the seed, sizes and settings: chunks can be built
+by any number of worker processes and still concatenate to the same
+dataset, and no more than a few chunks are held in memory at a time.
+
+Output formats:
+
+- jsonl: ``users.jsonl`` and ``tasks.jsonl``, one record per line
+- snapshot: a columnar snapshot (``mock_jira.snapshot``) readable with
+  snapshot.load_snapshot()
+- sqlite: a SQLiteTaskStore database (``taskflow.db``) for ``--backend sqlite``
+
+Usage:
+    python tests/fixtures/data_generator.py --users 5000 --tasks 1000000 --output /tmp/taskflow-data
+    python tests/fixtures/data_generator.py --tasks 100000 --skill-distribution zipf --format snapshot
+    python tests/fixtures/data_generator.py --load overloaded --overloaded-fraction 0.3 --assigned-fraction 0.5
+"""
+
+import bisect
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+# Records per generation chunk; part of what the seed determines, so changing it changes the data
+CHUNK_SIZE = 10000
+
+SKILLS_POOL = [
+    "Python", "JavaScript", "Java", "React", "Angular", "Vue",
+    "Django", "Flask", "Spring", "Node.js", "PostgreSQL", "MySQL",
+    "AWS", "Docker", "Kubernetes", "Testing", "Selenium", "Jest"
+]
+
+TIME_ZONES = ["America/Los_Angeles", "America/New_York", "Europe/London", "Asia/Kolkata"]
+
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+
+# Generation settings; (low, high) pairs are inclusive integer ranges
+DEFAULT_SETTINGS = {
+    "project": "PERF",
+    "skill_count": len(SKILLS_POOL),
+    "skill_distribution": "uniform",
+    "zipf_exponent": 1.1,
+    "skills_per_user": (3, 6),
+    "skill_level": (2, 5),
+    "skills_per_task": (1, 3),
+    "min_level": (2, 4),
+    "story_points": (1, 13),
+    "points_per_sprint": (30, 50),
+    "load": "uniform",
+    "overloaded_fraction": 0.2,
+    "assigned_fraction": 0.0,
+    "start_date": "2025-01-06",
+    "sprint_days": 14
+}
+
+SKILL_DISTRIBUTIONS = ("uniform", "zipf")
+LOAD_PROFILES = ("uniform", "overloaded")
+
+# Share of assigned tasks that land on the overloaded group in the "overloaded" load profile
+OVERLOADED_ASSIGNMENT_SHARE = 0.8
+
+FORMATS = ("jsonl", "snapshot", "sqlite")
+
+
+class DataGenerator:
+    """
+    Builds users and tasks chunk by chunk
+
+    Skill popularity is uniform or Zipfian over the skill pool (skill ``r``
+    drawn with weight ``1 / r ** zipf_exponent``), for both user skills and
+    task requirements. In the "overloaded" load profile an evenly spread
+    ``overloaded_fraction`` of the team is at 90-130% of capacity and
+    receives most of the assigned tasks.
+    """
+
+    def __init__(self, num_users: int, num_tasks: int, seed: int = 0, chunk_size: int = CHUNK_SIZE, **settings):
+        unknown = set(settings) - set(DEFAULT_SETTINGS)
+        if unknown:
+            raise ValueError(f"Unknown generator settings: {', '.join(sorted(unknown))}")
+        self.settings = dict(DEFAULT_SETTINGS, **settings)
+        if self.settings["skill_distribution"] not in SKILL_DISTRIBUTIONS:
+            raise ValueError(f"skill_distribution must be one of {', '.join(SKILL_DISTRIBUTIONS)}")
+        if self.settings["load"] not in LOAD_PROFILES:
+            raise ValueError(f"load must be one of {', '.join(LOAD_PROFILES)}")
+        if num_users < 1 and self.settings["assigned_fraction"] > 0:
+            raise ValueError("Assigning tasks needs at least one user")
+        self.num_users = num_users
+        self.num_tasks = num_tasks
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+        self.skills = SKILLS_POOL[:self.settings["skill_count"]] + [
+            f"Skill-{i}" for i in range(len(SKILLS_POOL), self.settings["skill_count"])
+        ]
+        if self.settings["skill_distribution"] == "zipf":
+            weights = [1 / (rank ** self.settings["zipf_exponent"]) for rank in range(1, len(self.skills) + 1)]
+        else:
+            weights = [1.0] * len(self.skills)
+        self._cum_weights = list(itertools.accumulate(weights))
+
+        overloaded = 0
+        if self.settings["load"] == "overloaded":
+            overloaded = round(self.settings["overloaded_fraction"] * num_users)
+        self.overloaded_count = overloaded
+        start = date.fromisoformat(self.settings["start_date"])
+        self._due_dates = [(start + timedelta(days=day)).isoformat()
+                           for day in range(1, self.settings["sprint_days"] + 1)]
+
+    def arguments(self) -> tuple:
+        """Constructor arguments, for rebuilding the generator in a worker process"""
+        return self.num_users, self.num_tasks, self.seed, self.chunk_size, self.settings
+
+    def chunk_count(self, kind: str) -> int:
+        total = self.num_users if kind == "users" else self.num_tasks
+        return math.ceil(total / self.chunk_size)
+
+    def is_overloaded(self, index: int) -> bool:
+        """True for the ``overloaded_count`` users spread evenly through the team"""
+        return (index * self.overloaded_count) % self.num_users < self.overloaded_count
+
+    def overloaded_user(self, position: int) -> int:
+        """Index of the ``position``-th overloaded user"""
+        return -(-position * self.num_users // self.overloaded_count)
+
+    def chunk(self, kind: str, number: int) -> List[Dict]:
+        """Records of one chunk of ``users`` or ``tasks``"""
+        rng = random.Random(f"{self.seed}:{kind}:{number}")
+        total = self.num_users if kind == "users" else self.num_tasks
+        build = self._user if kind == "users" else self._task
+        start = number * self.chunk_size
+        return [build(rng, index) for index in range(start, min(start + self.chunk_size, total))]
+
+    def iter_records(self, kind: str, workers: int = 1) -> Iterator[Dict]:
+        """Stream all users or tasks in order, building chunks on ``workers`` processes"""
+        for records in _map_chunks(self, kind, workers, _chunk_records):
+            yield from records
+
+    def iter_lines(self, kind: str, workers: int = 1) -> Iterator[str]:
+        """Stream all users or tasks as JSON lines, one string per chunk"""
+        return _map_chunks(self, kind, workers, _chunk_lines)
+
+    def _sample_skills(self, rng: random.Random, count_range) -> List[str]:
+        count = min(_between(rng, count_range), len(self.skills))
+        if self.settings["skill_distribution"] == "uniform":
+            return rng.sample(self.skills, count)
+        chosen = []
+        total = self._cum_weights[-1]
+        while len(chosen) < count:
+            skill = self.skills[bisect.bisect(self._cum_weights, rng.random() * total)]
+            if skill not in chosen:
+                chosen.append(skill)
+        return chosen
+
+    def _user(self, rng: random.Random, index: int) -> Dict:
+        points = _between(rng, self.settings["points_per_sprint"])
+        if self.overloaded_count and self.is_overloaded(index):
+            load = _between(rng, (math.ceil(points * 0.9), math.floor(points * 1.3)))
+        else:
+            load = _between(rng, (0, math.floor(points * 0.85)))
+        return {
+            "id": f"perf_user_{index:03d}",
+            "username": f"user{index:03d}",
+            "displayName": f"User {index:03d}",
+            "timeZone": TIME_ZONES[int(rng.random() * len(TIME_ZONES))],
+            "skills": [{"name": skill, "level": _between(rng, self.settings["skill_level"])}
+                       for skill in self._sample_skills(rng, self.settings["skills_per_user"])],
+            "capacity": {
+                "pointsPerSprint": points,
+                "currentLoad": load
+            }
+        }
+
+    def _task(self, rng: random.Random, index: int) -> Dict:
+        skills = self._sample_skills(rng, self.settings["skills_per_task"])
+        assignee = None
+        if self.num_users and rng.random() < self.settings["assigned_fraction"]:
+            if self.overloaded_count and rng.random() < OVERLOADED_ASSIGNMENT_SHARE:
+                user = self.overloaded_user(int(rng.random() * self.overloaded_count))
+            else:
+                user = int(rng.random() * self.num_users)
+            assignee = f"user{user:03d}"
+        return {
+            "key": f"{self.settings['project']}-{index:03d}",
+            "project": self.settings["project"],
+            "summary": f"Performance test task {index:03d}",
+            "priority": PRIORITIES[int(rng.random() * len(PRIORITIES))],
+            "storyPoints": _between(rng, self.settings["story_points"]),
+            "dueDate": self._due_dates[int(rng.random() * len(self._due_dates))],
+            "labels": [skill.lower() for skill in skills],
+            "requiredSkills": [{"name": skill, "minLevel": _between(rng, self.settings["min_level"])}
+                               for skill in skills],
+            "assignee": assignee,
+            "status": "In Progress" if assignee else "To Do"
+        }
+
+
+def _between(rng: random.Random, bounds) -> int:
+    """Uniform integer in the inclusive range ``bounds`` (cheaper than randint for millions of draws)"""
+    low, high = bounds
+    return low + int(rng.random() * (high - low + 1))
+
+
+# Shared encoder: json.dumps() builds a new one per call when separators are given
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _chunk_records(generator: DataGenerator, kind: str, number: int) -> List[Dict]:
+    return generator.chunk(kind, number)
+
+
+def _chunk_lines(generator: DataGenerator, kind: str, number: int) -> str:
+    return "".join(_ENCODER.encode(record) + "\n" for record in generator.chunk(kind, number))
+
+
+_generators: Dict[str, DataGenerator] = {}
+
+
+def _call(job):
+    """Run one chunk job in a worker, building the generator once per process"""
+    function, arguments, kind, number = job
+    num_users, num_tasks, seed, chunk_size, settings = arguments
+    key = json.dumps(arguments, sort_keys=True)
+    if key not in _generators:
+        _generators.clear()
+        _generators[key] = DataGenerator(num_users, num_tasks, seed, chunk_size, **settings)
+    return function(_generators[key], kind, number)
+
+
+def _map_chunks(generator: DataGenerator, kind: str, workers: int, function) -> Iterator:
+    """Results of ``function`` for every chunk, in order, computed on up to ``workers`` processes"""
+    count = generator.chunk_count(kind)
+    if workers <= 1 or count <= 1:
+        for number in range(count):
+            yield function(generator, kind, number)
+        return
+    jobs = ((function, generator.arguments(), kind, number) for number in range(count))
+    with multiprocessing.Pool(min(workers, count)) as pool:
+        yield from pool.imap(_call, jobs)
+
+
+def write_jsonl(generator: DataGenerator, directory: str, workers: int = 1) -> List[str]:
+    """Write ``users.jsonl`` and ``tasks.jsonl``; returns their paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for kind in ("users", "tasks"):
+        path = os.path.join(directory, f"{kind}.jsonl")
+        with open(path, "w") as f:
+            for lines in generator.iter_lines(kind, workers):
+                f.write(lines)
+        paths.append(path)
+    return paths
+
+
+def write_snapshot(generator: DataGenerator, path: str, workers: int = 1) -> str:
+    """Write a columnar snapshot of the dataset"""
+    from snapshot import SnapshotWriter
+
+    writer = SnapshotWriter()
+    writer.add_table("users", generator.iter_records("users", workers))
+    writer.add_table("tasks", generator.iter_records("tasks", workers))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer.write(path)
+    return path
+
+
+def write_sqlite(generator: DataGenerator, path: str, workers: int = 1) -> str:
+    """Replace the contents of a SQLiteTaskStore database with the dataset"""
+    from sqlite_store import SQLiteTaskStore
+
+    store = SQLiteTaskStore(path)
+    try:
+        store.replace_all(generator.iter_records("users", workers), generator.iter_records("tasks", workers))
+    finally:
+        store.close()
+    return path
+
+
+def generate(num_users: int, num_tasks: int, output: str, fmt: str = "jsonl", seed: int = 0,
+             workers: Optional[int] = None, **settings) -> List[str]:
+    """
+    Generate a dataset into ``output`` (a directory)
+
+    Args:
+        fmt (str): 'jsonl', 'snapshot' or 'sqlite'
+        workers (int): Worker processes (default: one per CPU)
+        **settings: Overrides for DEFAULT_SETTINGS
+
+    Returns:
+        List[str]: Paths written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    generator = DataGenerator(num_users, num_tasks, seed, **settings)
+    workers = workers or os.cpu_count() or 1
+    if fmt == "jsonl":
+        return write_jsonl(generator, output, workers)
+    if fmt == "snapshot":
+        from mock_jira_api import SNAPSHOT_FILE
+        return [write_snapshot(generator, os.path.join(output, SNAPSHOT_FILE), workers)]
+    return [write_sqlite(generator, os.path.join(output, "taskflow.db"), workers)]
+
+
+def _int_range(value: str) -> tuple:
+    """Parse ``N`` or ``LOW-HIGH`` into an inclusive range"""
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate seeded TaskFlow users and tasks')
+    parser.add_argument('--users', type=int, default=500, help='Number of users')
+    parser.add_argument('--tasks', type=int, default=10000, help='Number of tasks')
+    parser.add_argument('--seed', type=int, default=0, help='Seed; the same seed gives the same data')
+    parser.add_argument('--format', choices=FORMATS, default='jsonl', help='Output format')
+    parser.add_argument('--output', default='generated_data', help='Output directory')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--project', default=DEFAULT_SETTINGS["project"], help='Project key for the tasks')
+    parser.add_argument('--skills', type=int, default=DEFAULT_SETTINGS["skill_count"],
+                        help='Size of the skill pool')
+    parser.add_argument('--skill-distribution', choices=SKILL_DISTRIBUTIONS,
+                        default=DEFAULT_SETTINGS["skill_distribution"], help='Skill popularity')
+    parser.add_argument('--zipf-exponent', type=float, default=DEFAULT_SETTINGS["zipf_exponent"],
+                        help='Skew of the zipf skill distribution')
+    parser.add_argument('--skills-per-user', type=_int_range, default=DEFAULT_SETTINGS["skills_per_user"],
+                        help='Skills per user, e.g. 3-6')
+    parser.add_argument('--skills-per-task', type=_int_range, default=DEFAULT_SETTINGS["skills_per_task"],
+                        help='Required skills per task, e.g. 1-3')
+    parser.add_argument('--points-per-sprint', type=_int_range, default=DEFAULT_SETTINGS["points_per_sprint"],
+                        help='Sprint capacity per user, e.g. 30-50')
+    parser.add_argument('--load', choices=LOAD_PROFILES, default=DEFAULT_SETTINGS["load"],
+                        help='Team load profile')
+    parser.add_argument('--overloaded-fraction', type=float, default=DEFAULT_SETTINGS["overloaded_fraction"],
+                        help='Share of the team over capacity with --load overloaded')
+    parser.add_argument('--assigned-fraction', type=float, default=DEFAULT_SETTINGS["assigned_fraction"],
+                        help='Share of tasks that already have an assignee')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = generate(
+        args.users, args.tasks, args.output, args.format, args.seed, args.workers,
+        project=args.project, skill_count=args.skills, skill_distribution=args.skill_distribution,
+        zipf_exponent=args.zipf_exponent, skills_per_user=args.skills_per_user,
+        skills_per_task=args.skills_per_task, points_per_sprint=args.points_per_sprint, load=args.load,
+        overloaded_fraction=args.overloaded_fraction, assigned_fraction=args.assigned_fraction
+    )
+    print(f"✅ Generated {args.users} users and {args.tasks} tasks in {time.perf_counter() - start:.1f}s")
+    for path in paths:
+        print(f"   - {path}")
+
+
+if __name__ == '__main__':
+    main()
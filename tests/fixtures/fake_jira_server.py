@@ -0,0 +1,833 @@
+#!/usr/bin/env python3
+"""
+Fake JIRA REST Server for TaskFlow Tests
+Local JIRA REST API v2 stand-in for benchmarking and load-testing JiraAPIService offline
+
+Serves users and tasks from the mock JSON files, from JSON lines written by
+data_generator.py, or straight from a DataGenerator. It implements the
+endpoints TaskFlow (through the jira package) calls:
+
+- GET  /rest/api/2/serverInfo, /rest/api/2/field
+- GET  /rest/api/2/project/{key}
+- GET/POST /rest/api/2/search (JQL subset, ``startAt``/``maxResults``)
+- GET/PUT  /rest/api/2/issue/{key}, PUT /rest/api/2/issue/{key}/assignee
+- GET  /rest/api/2/user/assignable/multiProjectSearch, /rest/api/2/user/search, /rest/api/2/user
+
+``maxResults`` is capped like JIRA Cloud's (100 by default), so the client's
+paging loop is exercised for real. Every REST request can be delayed
+(latency plus random jitter), rate limited (429 with Retry-After, either
+above ``requests_per_second`` or for a random share of requests) or failed
+(a random share answered with ``error_status``). Per-endpoint request counts
+are kept so N+1 patterns show up in numbers.
+
+Control endpoints (never delayed or failed):
+
+- GET  /_fake/stats   request counts by endpoint, throttled and failed counts
+- POST /_fake/reset   zero the counts
+- POST /_fake/faults  change fault settings, e.g. {"latency_ms": 50}
+
+Usage:
+    python tests/fixtures/fake_jira_server.py --port 8089
+    python tests/fixtures/fake_jira_server.py --users 500 --tasks 100000 --latency-ms 80 --jitter-ms 40
+    python tests/fixtures/fake_jira_server.py --users-file /tmp/data/users.jsonl --tasks-file /tmp/data/tasks.jsonl \\
+        --requests-per-second 20 --error-rate 0.01
+    JIRA_SERVER=http://127.0.0.1:8089 JIRA_PROJECT_KEY=TASK python src/api/http_server.py
+"""
+
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Defaults for the fault settings
+DEFAULT_FAULTS = {
+    "latency_ms": 0.0,
+    "jitter_ms": 0.0,
+    "requests_per_second": 0.0,
+    "throttle_rate": 0.0,
+    "retry_after": 1,
+    "error_rate": 0.0,
+    "error_status": 503
+}
+
+# Largest page the search and user endpoints return, whatever maxResults asks for
+MAX_RESULTS = 100
+
+STORY_POINTS_FIELD = "customfield_10016"
+
+# Creation/update time for records that carry none
+DEFAULT_TIMESTAMP = "2025-01-06T09:00:00.000+0000"
+
+PRIORITY_ORDER = {"Lowest": 1, "Low": 2, "Medium": 3, "High": 4, "Highest": 5, "Critical": 5, "Blocker": 6}
+
+MOCK_DATA_DIR = os.path.join(os.path.dirname(__file__), '../../src/data')
+
+
+class JQLError(ValueError):
+    """The query uses syntax or fields the fake server does not understand"""
+
+
+# ----------------------------------------------------------------------
+# JQL subset
+# ----------------------------------------------------------------------
+
+_TOKEN = re.compile(r'\s*(?:"((?:[^"\\]|\\.)*)"|(!=|!~|=|~|\(|\)|,)|(cf\[\d+\]|[\w.\-]+))')
+
+# JQL field name -> task dict field
+FIELDS = {
+    "project": "project",
+    "key": "key",
+    "issuekey": "key",
+    "assignee": "assignee",
+    "reporter": "reporter",
+    "status": "status",
+    "priority": "priority",
+    "labels": "labels",
+    "summary": "summary",
+    "description": "description",
+    "duedate": "dueDate",
+    "type": "issueType",
+    "issuetype": "issueType",
+    "cf[10016]": "storyPoints",
+    "storypoints": "storyPoints"
+}
+
+
+def _tokenize(jql: str) -> List[Tuple[str, str]]:
+    """Split JQL into ("string", value), ("op", value) and ("word", value) tokens"""
+    tokens = []
+    position = 0
+    jql = jql.rstrip()
+    while position < len(jql):
+        match = _TOKEN.match(jql, position)
+        if not match:
+            raise JQLError(f"Error in the JQL Query: unexpected character at position {position}")
+        string, operator, word = match.groups()
+        if string is not None:
+            tokens.append(("string", re.sub(r'\\(.)', r'\1', string)))
+        elif operator is not None:
+            tokens.append(("op", operator))
+        else:
+            tokens.append(("word", word))
+        position = match.end()
+    return tokens
+
+
+def _key_order(key: str):
+    """Sort issue keys by project, then issue number"""
+    project, _, number = key.rpartition("-")
+    return (project, int(number)) if number.isdigit() else (key, 0)
+
+
+def _sort_value(task: Dict, field: str):
+    value = task.get(field)
+    if field == "key":
+        return _key_order(value)
+    if field == "priority":
+        return PRIORITY_ORDER.get(value, 0)
+    return value
+
+
+class JQLQuery:
+    """
+    Parsed JQL: a filter and an ORDER BY
+
+    Supports AND/OR/NOT with parentheses; ``=``, ``!=``, ``~`` and ``!~``;
+    ``in``/``not in`` lists; ``is EMPTY``/``is not EMPTY``; and ORDER BY on
+    any known field. That covers every query JiraAPIService builds.
+    """
+
+    def __init__(self, jql: str):
+        self.jql = jql
+        self._tokens = _tokenize(jql)
+        self._position = 0
+        self.order_by: List[Tuple[str, bool]] = []
+        if self._peek() is None or self._peek_word() == "order":
+            self.matches = lambda task: True
+        else:
+            self.matches = self._or()
+        if self._peek_word() == "order":
+            self._order_by()
+        if self._position < len(self._tokens):
+            raise JQLError(f"Error in the JQL Query: unexpected '{self._tokens[self._position][1]}'")
+
+    def sort(self, tasks: List[Dict]) -> List[Dict]:
+        """Tasks in ORDER BY order (by key when there is none)"""
+        tasks = sorted(tasks, key=lambda task: _key_order(task["key"]))
+        for field, descending in reversed(self.order_by):
+            present = [task for task in tasks if task.get(field) is not None]
+            missing = [task for task in tasks if task.get(field) is None]
+            present.sort(key=lambda task: _sort_value(task, field), reverse=descending)
+            tasks = present + missing
+        return tasks
+
+    # Parser ---------------------------------------------------------------
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _peek_word(self) -> Optional[str]:
+        token = self._peek()
+        return token[1].lower() if token and token[0] == "word" else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise JQLError("Error in the JQL Query: the query ended unexpectedly")
+        self._position += 1
+        return token
+
+    def _expect(self, value: str):
+        token = self._next()
+        if token[1].lower() != value:
+            raise JQLError(f"Error in the JQL Query: expected '{value}' but got '{token[1]}'")
+
+    def _or(self) -> Callable:
+        clauses = [self._and()]
+        while self._peek_word() == "or":
+            self._next()
+            clauses.append(self._and())
+        return clauses[0] if len(clauses) == 1 else lambda task: any(clause(task) for clause in clauses)
+
+    def _and(self) -> Callable:
+        clauses = [self._not()]
+        while self._peek_word() == "and":
+            self._next()
+            clauses.append(self._not())
+        return clauses[0] if len(clauses) == 1 else lambda task: all(clause(task) for clause in clauses)
+
+    def _not(self) -> Callable:
+        if self._peek_word() == "not":
+            self._next()
+            clause = self._not()
+            return lambda task: not clause(task)
+        if self._peek() == ("op", "("):
+            self._next()
+            clause = self._or()
+            self._expect(")")
+            return clause
+        return self._clause()
+
+    def _field(self) -> str:
+        kind, name = self._next()
+        field = FIELDS.get(name.lower())
+        if field is None:
+            raise JQLError(f"Field '{name}' does not exist or you do not have permission to view it.")
+        return field
+
+    def _value(self) -> str:
+        kind, value = self._next()
+        if kind == "op":
+            raise JQLError(f"Error in the JQL Query: expected a value but got '{value}'")
+        return value
+
+    def _clause(self) -> Callable:
+        field = self._field()
+        kind, operator = self._next()
+        operator = operator.lower()
+
+        if operator == "is":
+            negate = self._peek_word() == "not"
+            if negate:
+                self._next()
+            if self._next()[1].lower() not in ("empty", "null"):
+                raise JQLError("Error in the JQL Query: expected EMPTY or NULL")
+            return lambda task: _is_empty(task.get(field)) != negate
+
+        if operator == "not":
+            self._expect("in")
+            values = self._list()
+            return lambda task: not _equals_any(task.get(field), values)
+        if operator == "in":
+            values = self._list()
+            return lambda task: _equals_any(task.get(field), values)
+
+        value = self._value()
+        if operator == "=":
+            return lambda task: _equals_any(task.get(field), [value])
+        if operator == "!=":
+            return lambda task: not _equals_any(task.get(field), [value])
+        if operator in ("~", "!~"):
+            needle = value.lower()
+            negate = operator == "!~"
+            return lambda task: (needle in str(task.get(field) or "").lower()) != negate
+        raise JQLError(f"Error in the JQL Query: unsupported operator '{operator}'")
+
+    def _list(self) -> List[str]:
+        self._expect("(")
+        values = [self._value()]
+        while self._peek() == ("op", ","):
+            self._next()
+            values.append(self._value())
+        self._expect(")")
+        return values
+
+    def _order_by(self):
+        self._expect("order")
+        self._expect("by")
+        while True:
+            field = self._field()
+            descending = False
+            if self._peek_word() in ("asc", "desc"):
+                descending = self._next()[1].lower() == "desc"
+            self.order_by.append((field, descending))
+            if self._peek() != ("op", ","):
+                break
+            self._next()
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _equals_any(value, candidates: List[str]) -> bool:
+    """JQL equality: case-insensitive, and list fields match if any element does"""
+    lowered = {str(candidate).lower() for candidate in candidates}
+    values = value if isinstance(value, list) else [value]
+    for item in values:
+        if item is None:
+            continue
+        if isinstance(item, float) and item.is_integer():
+            item = int(item)
+        if str(item).lower() in lowered:
+            return True
+    return False
+
+
+# ----------------------------------------------------------------------
+# Server
+# ----------------------------------------------------------------------
+
+def _timestamp() -> str:
+    now = datetime.now(timezone.utc)
+    return now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}+0000"
+
+
+def _read_records(path: str, key: str) -> List[Dict]:
+    """Records from a ``{"users": [...]}`` style JSON file or a JSON lines file"""
+    with open(path, 'r') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)[key]
+
+
+class FakeJiraServer:
+    """A fake JIRA REST server running on a background thread"""
+
+    def __init__(self, users: Iterable[Dict], tasks: Iterable[Dict], project_key: str = None,
+                 host: str = '127.0.0.1', port: int = 0, max_results: int = MAX_RESULTS, seed: int = 0,
+                 verbose: bool = False, **faults):
+        """
+        Args:
+            users (Iterable[Dict]): TaskFlow user records
+            tasks (Iterable[Dict]): TaskFlow task records
+            project_key (str): Project served (default: the first task's project)
+            port (int): Port to listen on (0 picks a free one)
+            max_results (int): Largest page returned by search and user endpoints
+            seed (int): Seed for jitter and random fault injection
+            **faults: Overrides for DEFAULT_FAULTS
+        """
+        self.users = {user["username"]: user for user in users}
+        self.tasks = [dict(task) for task in tasks]
+        self.project_key = project_key or (self.tasks[0].get("project") if self.tasks else "TASK")
+        self.projects = {task.get("project") for task in self.tasks if task.get("project")} | {self.project_key}
+        self.max_results = max_results
+        self.faults = dict(DEFAULT_FAULTS)
+        self.configure(**faults)
+
+        self._positions = {task["key"]: index for index, task in enumerate(self.tasks)}
+        self._data_lock = threading.Lock()
+        self._data_version = 0
+        self._search_cache: "OrderedDict[str, Tuple[int, List[Dict]]]" = OrderedDict()
+        self._fault_lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._tokens = 0.0
+        self._refilled = time.monotonic()
+        self._stats_lock = threading.Lock()
+        self._stats = Counter()
+        self._thread = None
+
+        self.httpd = ThreadingHTTPServer((host, port), FakeJiraHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.httpd.verbose = verbose
+
+    @classmethod
+    def from_mock_data(cls, **kwargs) -> "FakeJiraServer":
+        """Server seeded from src/data/mock_jira_users.json and mock_jira_tasks.json"""
+        return cls.from_files(os.path.join(MOCK_DATA_DIR, 'mock_jira_users.json'),
+                              os.path.join(MOCK_DATA_DIR, 'mock_jira_tasks.json'), **kwargs)
+
+    @classmethod
+    def from_files(cls, users_path: str, tasks_path: str, **kwargs) -> "FakeJiraServer":
+        """Server seeded from JSON (``{"users": [...]}``) or JSON lines files"""
+        return cls(_read_records(users_path, "users"), _read_records(tasks_path, "tasks"), **kwargs)
+
+    @classmethod
+    def from_generator(cls, num_users: int, num_tasks: int, seed: int = 0, generator_settings: Dict = None,
+                       **kwargs) -> "FakeJiraServer":
+        """Server seeded with a DataGenerator dataset"""
+        from data_generator import DataGenerator
+
+        generator = DataGenerator(num_users, num_tasks, seed, **(generator_settings or {}))
+        return cls(generator.iter_records("users"), generator.iter_records("tasks"), seed=seed, **kwargs)
+
+    # Lifecycle ------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeJiraServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-jira", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def client_config(self) -> Dict:
+        """JiraAPIService configuration pointing at this server"""
+        return {
+            "server": self.url,
+            "email": "taskflow@example.com",
+            "api_token": "fake-token",
+            "project_key": self.project_key
+        }
+
+    # Faults and stats -----------------------------------------------------
+
+    def configure(self, **faults):
+        """Change fault settings (see DEFAULT_FAULTS)"""
+        unknown = set(faults) - set(DEFAULT_FAULTS)
+        if unknown:
+            raise ValueError(f"Unknown fault settings: {', '.join(sorted(unknown))}")
+        self.faults.update(faults)
+
+    def stats(self) -> Dict:
+        """Request counts by endpoint, plus ``throttled`` and ``failed`` totals"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {
+            "requests": {name[9:]: count for name, count in stats.items() if name.startswith("endpoint:")},
+            "total": sum(count for name, count in stats.items() if name.startswith("endpoint:")),
+            "throttled": stats.get("throttled", 0),
+            "failed": stats.get("failed", 0)
+        }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def inject_faults(self) -> Optional[Tuple[int, Dict, Dict]]:
+        """
+        Delay the request, then decide whether it is throttled or failed
+
+        Returns:
+            Tuple: (status, body, headers) to answer instead, or None to serve it
+        """
+        faults = self.faults
+        with self._fault_lock:
+            delay = faults["latency_ms"] + self._random.uniform(0, faults["jitter_ms"])
+            throttled = self._random.random() < faults["throttle_rate"]
+            failed = self._random.random() < faults["error_rate"]
+            retry_after = faults["retry_after"]
+            rate = faults["requests_per_second"]
+            if rate > 0 and not throttled:
+                now = time.monotonic()
+                self._tokens = min(rate, self._tokens + (now - self._refilled) * rate)
+                self._refilled = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                else:
+                    throttled = True
+                    retry_after = max(1, math.ceil((1 - self._tokens) / rate))
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if throttled:
+            self._count("throttled")
+            return 429, {"errorMessages": ["Rate limit exceeded."]}, {
+                "Retry-After": str(retry_after),
+                "X-RateLimit-Limit": str(int(rate)) if rate else "0",
+                "X-RateLimit-Remaining": "0"
+            }
+        if failed:
+            self._count("failed")
+            return faults["error_status"], {"errorMessages": ["Injected failure from the fake JIRA server"]}, {}
+        return None
+
+    # Data -----------------------------------------------------------------
+
+    def search(self, jql: str) -> List[Dict]:
+        """Tasks matching ``jql`` in result order; repeated pages of a query reuse the result"""
+        with self._data_lock:
+            version = self._data_version
+            cached = self._search_cache.get(jql)
+            if cached and cached[0] == version:
+                self._search_cache.move_to_end(jql)
+                return cached[1]
+            tasks = list(self.tasks)
+        query = JQLQuery(jql)
+        result = query.sort([task for task in tasks if query.matches(task)])
+        with self._data_lock:
+            self._search_cache[jql] = (version, result)
+            while len(self._search_cache) > 32:
+                self._search_cache.popitem(last=False)
+        return result
+
+    def get_task(self, key: str) -> Optional[Dict]:
+        position = self._positions.get(key)
+        return self.tasks[position] if position is not None else None
+
+    def update_task(self, key: str, changes: Dict):
+        """Apply field changes to a task and bump its ``updated`` time"""
+        with self._data_lock:
+            position = self._positions[key]
+            self.tasks[position] = dict(self.tasks[position], updated=_timestamp(), **changes)
+            self._data_version += 1
+
+    def find_users(self, text: str) -> List[Dict]:
+        """Users whose username, display name or email contains ``text`` (all users for '')"""
+        text = (text or "").lower()
+        return [user for user in self.users.values()
+                if not text or any(text in str(user.get(field) or "").lower()
+                                   for field in ("username", "displayName", "emailAddress"))]
+
+    # JSON shapes ----------------------------------------------------------
+
+    def user_json(self, username: Optional[str]) -> Optional[Dict]:
+        if username is None:
+            return None
+        user = self.users.get(username, {"username": username, "displayName": username})
+        return {
+            "self": f"{self.url}/rest/api/2/user?username={username}",
+            "key": username,
+            "name": username,
+            "accountId": user.get("id", username),
+            "displayName": user.get("displayName", username),
+            "emailAddress": user.get("emailAddress", f"{username}@example.com"),
+            "timeZone": user.get("timeZone", "UTC"),
+            "active": user.get("active", True)
+        }
+
+    def issue_json(self, task: Dict) -> Dict:
+        position = self._positions[task["key"]]
+        issue_id = str(10000 + position)
+        return {
+            "expand": "renderedFields,names,schema,operations,editmeta,changelog",
+            "id": issue_id,
+            "self": f"{self.url}/rest/api/2/issue/{issue_id}",
+            "key": task["key"],
+            "fields": {
+                "summary": task.get("summary", ""),
+                "description": task.get("description", ""),
+                "status": {"name": task.get("status", "To Do")},
+                "priority": {"name": task["priority"]} if task.get("priority") else None,
+                "assignee": self.user_json(task.get("assignee")),
+                "reporter": self.user_json(task.get("reporter")),
+                "created": task.get("created", DEFAULT_TIMESTAMP),
+                "updated": task.get("updated", DEFAULT_TIMESTAMP),
+                "duedate": task.get("dueDate"),
+                STORY_POINTS_FIELD: task.get("storyPoints"),
+                "labels": list(task.get("labels") or []),
+                "project": {"key": task.get("project", self.project_key), "name": task.get("project", self.project_key)},
+                "issuetype": {"name": task.get("issueType", "Task")}
+            }
+        }
+
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    """Routes JIRA REST requests to the FakeJiraServer"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeJIRA/1.0"
+
+    ROUTES = [
+        ("GET", re.compile(r"/rest/api/2/serverInfo"), "serverInfo", "_server_info"),
+        ("GET", re.compile(r"/rest/api/2/field"), "field", "_fields"),
+        ("GET", re.compile(r"/rest/api/2/project/(?P<key>[^/]+)"), "project", "_project"),
+        ("GET", re.compile(r"/rest/api/2/search"), "search", "_search"),
+        ("POST", re.compile(r"/rest/api/2/search"), "search", "_search"),
+        ("GET", re.compile(r"/rest/api/2/issue/(?P<key>[^/]+)"), "issue", "_get_issue"),
+        ("PUT", re.compile(r"/rest/api/2/issue/(?P<key>[^/]+)"), "issue.update", "_update_issue"),
+        ("PUT", re.compile(r"/rest/api/2/issue/(?P<key>[^/]+)/assignee"), "issue.assignee", "_assign_issue"),
+        ("GET", re.compile(r"/rest/api/2/user/assignable/multiProjectSearch"), "user.assignable", "_assignable"),
+        ("GET", re.compile(r"/rest/api/2/user/assignable/search"), "user.assignable", "_assignable"),
+        ("GET", re.compile(r"/rest/api/2/user/search"), "user.search", "_user_search"),
+        ("GET", re.compile(r"/rest/api/2/user"), "user", "_user"),
+        ("GET", re.compile(r"/_fake/stats"), None, "_fake_stats"),
+        ("POST", re.compile(r"/_fake/reset"), None, "_fake_reset"),
+        ("POST", re.compile(r"/_fake/faults"), None, "_fake_faults"),
+    ]
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    @property
+    def fake(self) -> FakeJiraServer:
+        return self.server.fake
+
+    def _dispatch(self, method: str):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            self.body = json.loads(raw) if raw else {}
+        except ValueError:
+            self._send(400, {"errorMessages": ["Invalid JSON body"]})
+            return
+
+        for route_method, pattern, endpoint, handler in self.ROUTES:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                break
+        else:
+            self._send(404, {"errorMessages": [f"No fake JIRA route for {method} {path}"]})
+            return
+
+        if endpoint is not None:
+            self.fake._count(f"endpoint:{endpoint}")
+            fault = self.fake.inject_faults()
+            if fault:
+                self._send(*fault)
+                return
+        try:
+            getattr(self, handler)(**match.groupdict())
+        except JQLError as e:
+            self._send(400, {"errorMessages": [str(e)], "errors": {}})
+
+    def _send(self, status: int, body=None, headers: Dict = None):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _page(self, items: List, params: Dict) -> Tuple[int, int, List]:
+        """startAt, effective maxResults and the items on that page"""
+        try:
+            start_at = max(int(params.get("startAt", 0)), 0)
+            max_results = int(params.get("maxResults", 50))
+        except (TypeError, ValueError):
+            raise JQLError("startAt and maxResults must be integers")
+        max_results = min(max_results, self.fake.max_results) if max_results >= 0 else self.fake.max_results
+        return start_at, max_results, items[start_at:start_at + max_results]
+
+    # REST handlers ----------------------------------------------------------
+
+    def _server_info(self):
+        self._send(200, {
+            "baseUrl": self.fake.url,
+            "version": "9.12.0",
+            "versionNumbers": [9, 12, 0],
+            "deploymentType": "Server",
+            "buildNumber": 9120000,
+            "serverTitle": "TaskFlow Fake JIRA"
+        })
+
+    def _fields(self):
+        self._send(200, [
+            {"id": field, "key": field, "name": field.title(), "custom": False, "navigable": True,
+             "searchable": True, "clauseNames": [field]}
+            for field in ("summary", "description", "status", "priority", "assignee", "reporter", "created",
+                          "updated", "duedate", "labels", "project", "issuetype")
+        ] + [{"id": STORY_POINTS_FIELD, "key": STORY_POINTS_FIELD, "name": "Story Points", "custom": True,
+              "navigable": True, "searchable": True, "clauseNames": ["cf[10016]", "Story Points"]}])
+
+    def _project(self, key: str):
+        if key not in self.fake.projects:
+            self._send(404, {"errorMessages": [f"No project could be found with key '{key}'."], "errors": {}})
+            return
+        self._send(200, {"id": str(10000 + sorted(self.fake.projects).index(key)), "key": key, "name": key,
+                         "self": f"{self.fake.url}/rest/api/2/project/{key}"})
+
+    def _search(self):
+        params = dict(self.query, **self.body)
+        tasks = self.fake.search(params.get("jql") or "")
+        start_at, max_results, page = self._page(tasks, params)
+        self._send(200, {
+            "expand": "schema,names",
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(tasks),
+            "issues": [self.fake.issue_json(task) for task in page]
+        })
+
+    def _issue_not_found(self):
+        self._send(404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."],
+                         "errors": {}})
+
+    def _get_issue(self, key: str):
+        task = self.fake.get_task(key) or self._task_by_id(key)
+        if task is None:
+            self._issue_not_found()
+            return
+        self._send(200, self.fake.issue_json(task))
+
+    def _task_by_id(self, issue_id: str) -> Optional[Dict]:
+        """Issues are also addressed by numeric id (the ``self`` link uses it)"""
+        if issue_id.isdigit() and 0 <= int(issue_id) - 10000 < len(self.fake.tasks):
+            return self.fake.tasks[int(issue_id) - 10000]
+        return None
+
+    def _update_issue(self, key: str):
+        task = self.fake.get_task(key) or self._task_by_id(key)
+        if task is None:
+            self._issue_not_found()
+            return
+        fields = self.body.get("fields") or {}
+        changes = {}
+        if "assignee" in fields:
+            assignee = fields["assignee"]
+            name = (assignee.get("name") or assignee.get("accountId")) if assignee else None
+            if name is not None and name not in self.fake.users:
+                self._send(400, {"errorMessages": [], "errors": {"assignee": f"User '{name}' does not exist."}})
+                return
+            changes["assignee"] = name
+            if name and task.get("status") == "To Do":
+                changes["status"] = "In Progress"
+        for field in ("summary", "description", "labels"):
+            if field in fields:
+                changes[field] = fields[field]
+        if STORY_POINTS_FIELD in fields:
+            changes["storyPoints"] = fields[STORY_POINTS_FIELD]
+        self.fake.update_task(task["key"], changes)
+        self._send(204)
+
+    def _assign_issue(self, key: str):
+        self.body = {"fields": {"assignee": self.body or None}}
+        self._update_issue(key)
+
+    def _users_page(self, users: List[Dict]):
+        _, _, page = self._page(users, self.query)
+        self._send(200, [self.fake.user_json(user["username"]) for user in page])
+
+    def _assignable(self):
+        projects = [key for key in self.query.get("projectKeys", self.query.get("project", "")).split(",") if key]
+        unknown = [key for key in projects if key not in self.fake.projects]
+        if unknown:
+            self._send(404, {"errorMessages": [f"No project could be found with key '{unknown[0]}'."], "errors": {}})
+            return
+        self._users_page(self.fake.find_users(self.query.get("username", self.query.get("query", ""))))
+
+    def _user_search(self):
+        self._users_page(self.fake.find_users(self.query.get("username", self.query.get("query", ""))))
+
+    def _user(self):
+        username = self.query.get("username") or self.query.get("key") or self.query.get("accountId")
+        if username not in self.fake.users:
+            self._send(404, {"errorMessages": [f"The user named '{username}' does not exist"], "errors": {}})
+            return
+        self._send(200, self.fake.user_json(username))
+
+    # Control endpoints --------------------------------------------------------
+
+    def _fake_stats(self):
+        self._send(200, self.fake.stats())
+
+    def _fake_reset(self):
+        self.fake.reset_stats()
+        self._send(204)
+
+    def _fake_faults(self):
+        try:
+            self.fake.configure(**self.body)
+        except ValueError as e:
+            self._send(400, {"errorMessages": [str(e)]})
+            return
+        self._send(200, self.fake.faults)
+
+
+def main():
+    """Run a fake JIRA server until interrupted"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fake JIRA REST server for TaskFlow load tests')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8089, help='Port to listen on')
+    parser.add_argument('--users-file', help='Users as JSON ({"users": [...]}) or JSON lines')
+    parser.add_argument('--tasks-file', help='Tasks as JSON ({"tasks": [...]}) or JSON lines')
+    parser.add_argument('--users', type=int, help='Generate this many users instead of loading files')
+    parser.add_argument('--tasks', type=int, help='Generate this many tasks instead of loading files')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for generated data, jitter and injected faults')
+    parser.add_argument('--project', help='Project key to serve')
+    parser.add_argument('--max-results', type=int, default=MAX_RESULTS, help='Largest page size returned')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every REST request')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Extra random delay, 0 to this many ms')
+    parser.add_argument('--requests-per-second', type=float, default=0,
+                        help='Answer 429 above this rate (0 = no limit)')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='Share of requests answered 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds on injected 429s')
+    parser.add_argument('--error-rate', type=float, default=0, help='Share of requests answered with an error')
+    parser.add_argument('--error-status', type=int, default=503, help='Status of injected errors')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    options = dict(project_key=args.project, host=args.host, port=args.port, max_results=args.max_results,
+                   seed=args.seed, verbose=args.verbose, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                   requests_per_second=args.requests_per_second, throttle_rate=args.throttle_rate,
+                   retry_after=args.retry_after, error_rate=args.error_rate, error_status=args.error_status)
+    if args.users is not None or args.tasks is not None:
+        server = FakeJiraServer.from_generator(args.users or 100, args.tasks or 1000, **options)
+    elif args.users_file or args.tasks_file:
+        if not (args.users_file and args.tasks_file):
+            parser.error("--users-file and --tasks-file go together")
+        server = FakeJiraServer.from_files(args.users_file, args.tasks_file, **options)
+    else:
+        server = FakeJiraServer.from_mock_data(**options)
+
+    print(f"🚀 Fake JIRA serving {len(server.users)} users and {len(server.tasks)} tasks "
+          f"(project {server.project_key}) on {server.url}")
+    print(f"   JIRA_SERVER={server.url} JIRA_PROJECT_KEY={server.project_key}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Fake JIRA stopped")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
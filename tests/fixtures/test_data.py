@@ -5,8 +5,21 @@ Provides consistent test data across all test modules
 """
 
 import json
+import os
+import pickle
+import random
+import sys
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(__file__))
+
+from data_generator import DataGenerator
+
+# Seeded performance datasets kept per process (pickled, so every caller gets its own copy)
+DATASET_CACHE_SIZE = 4
+_dataset_cache = OrderedDict()
+
 
 class TestDataFixtures:
     """Centralized test data fixtures for TaskFlow testing"""
@@ -314,80 +327,58 @@ class TestDataFixtures:
         }
     
     @staticmethod
-    def get_performance_test_data(num_users=100, num_tasks=500):
-        """Generate large dataset for performance testing"""
-        users = []
-        tasks = []
+    def get_performance_test_data(num_users=100, num_tasks=500, seed=None, **settings):
+        """
+        Generate large dataset for performance testing
         
-        skills_pool = [
-            "Python", "JavaScript", "Java", "React", "Angular", "Vue",
-            "Django", "Flask", "Spring", "Node.js", "PostgreSQL", "MySQL",
-            "AWS", "Docker", "Kubernetes", "Testing", "Selenium", "Jest"
-        ]
+        Args:
+            seed (int): Seed for the generator; the same seed and sizes
+                always produce the same users and tasks (random if omitted)
+            **settings: DataGenerator settings, e.g. skill_distribution='zipf'
+                or load='overloaded'
         
-        # Generate users
-        for i in range(num_users):
-            user_skills = []
-            # Each user gets 3-6 random skills
-            import random
-            selected_skills = random.sample(skills_pool, random.randint(3, 6))
-            
-            for skill in selected_skills:
-                user_skills.append({
-                    "name": skill,
-                    "level": random.randint(2, 5)
-                })
-            
-            users.append({
-                "id": f"perf_user_{i:03d}",
-                "username": f"user{i:03d}",
-                "displayName": f"User {i:03d}",
-                "skills": user_skills,
-                "capacity": {
-                    "pointsPerSprint": random.randint(30, 50),
-                    "currentLoad": random.randint(0, 35)
-                }
-            })
+        Seeded datasets are cached for the rest of the process, so test
+        classes asking for the same data (e.g. in one parallel test worker)
+        only generate it once. Each call returns a fresh copy.
+        """
+        if seed is None:
+            return TestDataFixtures._generate_performance_test_data(
+                num_users, num_tasks, random.randrange(2 ** 32), settings)
         
-        # Generate tasks
-        for i in range(num_tasks):
-            # Each task requires 1-3 random skills
-            import random
-            required_skills = []
-            selected_skills = random.sample(skills_pool, random.randint(1, 3))
-            
-            for skill in selected_skills:
-                required_skills.append({
-                    "name": skill,
-                    "minLevel": random.randint(2, 4)
-                })
-            
-            tasks.append({
-                "key": f"PERF-{i:03d}",
-                "summary": f"Performance test task {i:03d}",
-                "priority": random.choice(["Low", "Medium", "High", "Critical"]),
-                "storyPoints": random.randint(1, 13),
-                "requiredSkills": required_skills,
-                "assignee": None,
-                "status": "To Do"
-            })
+        key = (num_users, num_tasks, seed, tuple(sorted(settings.items())))
+        if key in _dataset_cache:
+            _dataset_cache.move_to_end(key)
+        else:
+            data = TestDataFixtures._generate_performance_test_data(num_users, num_tasks, seed, settings)
+            _dataset_cache[key] = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+            if len(_dataset_cache) > DATASET_CACHE_SIZE:
+                _dataset_cache.popitem(last=False)
+        return pickle.loads(_dataset_cache[key])
+    
+    @staticmethod
+    def _generate_performance_test_data(num_users, num_tasks, seed, settings):
+        generator = DataGenerator(num_users, num_tasks, seed, **settings)
         
         return {
-            "users": users,
-            "tasks": tasks,
+            "users": list(generator.iter_records("users")),
+            "tasks": list(generator.iter_records("tasks")),
             "metadata": {
                 "generated": datetime.now().isoformat(),
                 "purpose": "Performance testing",
                 "userCount": num_users,
-                "taskCount": num_tasks
+                "taskCount": num_tasks,
+                "seed": seed
             }
         }
     
     @staticmethod
-    def save_test_data_to_files(base_path="tests/fixtures"):
-        """Save test data to JSON files for use in tests"""
-        import os
+    def save_test_data_to_files(base_path="tests/fixtures", perf_users=50, perf_tasks=200, seed=0):
+        """
+        Save test data to JSON files for use in tests
         
+        The performance files hold ``perf_users`` x ``perf_tasks`` seeded
+        records; use data_generator.py for datasets too large to build in memory.
+        """
         # Ensure directory exists
         os.makedirs(base_path, exist_ok=True)
         
@@ -406,7 +397,7 @@ class TestDataFixtures:
             json.dump(TestDataFixtures.get_edge_case_tasks(), f, indent=2)
         
         # Save performance test data
-        perf_data = TestDataFixtures.get_performance_test_data(50, 200)
+        perf_data = TestDataFixtures.get_performance_test_data(perf_users, perf_tasks, seed=seed)
         with open(f"{base_path}/performance_users.json", "w") as f:
             json.dump({"users": perf_data["users"]}, f, indent=2)
         
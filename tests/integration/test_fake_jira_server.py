@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Integration Tests for the Fake JIRA Server
+Tests paging, the JQL TaskFlow builds, assignments and injected latency, 429s and errors
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+# Add src and fixture directories to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../fixtures'))
+
+from fake_jira_server import FakeJiraServer, JQLError, JQLQuery
+from jira_api import JiraAPIService, jira_library_available
+from jira_scheduler import JiraScheduler
+
+
+class TestFakeJiraServer(unittest.TestCase):
+    """Test the fake JIRA REST endpoints over HTTP"""
+
+    def setUp(self):
+        """Start a fake JIRA with a generated project on an ephemeral port"""
+        self.server = FakeJiraServer.from_generator(
+            20, 250, seed=1, generator_settings={"project": "LOAD", "assigned_fraction": 0.4}
+        ).start()
+        with patch.object(JiraAPIService, 'connect', return_value=False):
+            self.service = JiraAPIService()
+        self.service.config["project_key"] = "LOAD"
+
+    def tearDown(self):
+        """Stop the server"""
+        self.server.stop()
+
+    def request(self, path, method="GET", body=None, **params):
+        url = f"{self.server.url}{path}" + (f"?{urlencode(params)}" if params else "")
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            payload = response.read()
+            return json.loads(payload) if payload else None
+
+    def search_all(self, jql):
+        """Page through a search the way JiraAPIService.iter_tasks does"""
+        keys, start_at = [], 0
+        while True:
+            page = self.request('/rest/api/2/search', jql=jql, startAt=start_at, maxResults=1000)
+            keys += [issue["key"] for issue in page["issues"]]
+            start_at += len(page["issues"])
+            if not page["issues"] or start_at >= page["total"]:
+                return keys, page["total"]
+
+    def test_search_pages_capped(self):
+        """Test that maxResults is capped at 100 so clients have to page"""
+        page = self.request('/rest/api/2/search', jql='project = "LOAD"', maxResults=1000)
+        keys, total = self.search_all('project = "LOAD"')
+
+        self.assertEqual(page["maxResults"], 100)
+        self.assertEqual(len(page["issues"]), 100)
+        self.assertEqual(total, 250)
+        self.assertEqual(keys, [f"LOAD-{i:03d}" for i in range(250)])
+        self.assertEqual(self.server.stats()["requests"]["search"], 4)
+
+    def test_taskflow_jql(self):
+        """Test that the JQL JiraAPIService builds filters and orders like JIRA"""
+        tasks = {task["key"]: task for task in self.server.tasks}
+        jql = self.service.build_jql(assignee='unassigned', priorities='High,Critical')
+        jql += self.service.build_order_by('storyPoints', descending=True)
+
+        keys, _ = self.search_all(jql)
+
+        expected = [task for task in tasks.values()
+                    if task["assignee"] is None and task["priority"] in ("High", "Critical")]
+        self.assertEqual(sorted(keys), sorted(task["key"] for task in expected))
+        points = [tasks[key]["storyPoints"] for key in keys]
+        self.assertEqual(points, sorted(points, reverse=True))
+
+        skill = self.server.tasks[0]["requiredSkills"][0]["name"]
+        keys, _ = self.search_all(self.service.build_jql(skills=skill))
+        self.assertIn(self.server.tasks[0]["key"], keys)
+
+    def test_jql_errors(self):
+        """Test that unknown fields and broken queries are 400s"""
+        with self.assertRaises(JQLError):
+            JQLQuery('sprint = 5')
+        with self.assertRaises(JQLError):
+            JQLQuery('project = "LOAD" AND (status = "Done"')
+
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self.request('/rest/api/2/search', jql='sprint = 5')
+        self.assertEqual(raised.exception.code, 400)
+
+    def test_assign_issue(self):
+        """Test that an assignee update is visible on the issue with a new updated time"""
+        key = next(task["key"] for task in self.server.tasks if task["assignee"] is None)
+        before = self.request(f'/rest/api/2/issue/{key}')
+
+        self.request(f'/rest/api/2/issue/{key}', "PUT", {"fields": {"assignee": {"name": "user003"}}})
+        after = self.request(f'/rest/api/2/issue/{key}')
+
+        self.assertEqual(after["fields"]["assignee"]["name"], "user003")
+        self.assertNotEqual(after["fields"]["updated"], before["fields"]["updated"])
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self.request(f'/rest/api/2/issue/{key}', "PUT", {"fields": {"assignee": {"name": "nobody"}}})
+        self.assertEqual(raised.exception.code, 400)
+
+    def test_user_endpoints(self):
+        """Test assignable-user paging and user search"""
+        users = self.request('/rest/api/2/user/assignable/multiProjectSearch', username='', projectKeys='LOAD',
+                             maxResults=5)
+        found = self.request('/rest/api/2/user/search', username='user007')
+
+        self.assertEqual([user["name"] for user in users], [f"user{i:03d}" for i in range(5)])
+        self.assertEqual(found[0]["displayName"], "User 007")
+
+    def test_injected_latency(self):
+        """Test that latency is added to REST calls but not to the control endpoints"""
+        self.server.configure(latency_ms=60, jitter_ms=20)
+        start = time.monotonic()
+        self.request('/rest/api/2/issue/LOAD-001')
+        elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.06)
+        start = time.monotonic()
+        self.request('/_fake/stats')
+        self.assertLess(time.monotonic() - start, 0.05)
+
+    def test_injected_errors_and_throttling(self):
+        """Test injected 503s and 429s with Retry-After"""
+        self.request('/_fake/faults', "POST", {"error_rate": 1.0})
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self.request('/rest/api/2/issue/LOAD-001')
+        self.assertEqual(raised.exception.code, 503)
+
+        self.server.configure(error_rate=0.0, throttle_rate=1.0, retry_after=7)
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self.request('/rest/api/2/issue/LOAD-001')
+        self.assertEqual(raised.exception.code, 429)
+        self.assertEqual(raised.exception.headers["Retry-After"], "7")
+        self.assertEqual(self.server.stats()["throttled"], 1)
+
+    def test_scheduler_rides_out_rate_limit(self):
+        """Test that JiraScheduler gets every call through the server's requests_per_second limit"""
+        self.server.configure(requests_per_second=20)
+        scheduler = JiraScheduler(requests_per_second=100, burst=50, max_retries=10)
+
+        for _ in range(40):
+            scheduler.call("issue", self.request, '/rest/api/2/issue/LOAD-001')
+
+        stats = self.server.stats()
+        self.assertGreater(stats["throttled"], 0)
+        self.assertEqual(stats["requests"]["issue"] - stats["throttled"], 40)
+
+
+@unittest.skipUnless(jira_library_available(), "the jira package is not installed")
+class TestJiraServiceAgainstFakeJira(unittest.TestCase):
+    """Run JiraAPIService's real client paths against the fake server"""
+
+    def setUp(self):
+        """Start the fake server seeded from the mock data and connect a JiraAPIService to it"""
+        self.server = FakeJiraServer.from_mock_data().start()
+        self.tmpdir = tempfile.mkdtemp()
+        config_file = os.path.join(self.tmpdir, 'jira_config.json')
+        with open(config_file, 'w') as f:
+            json.dump(self.server.client_config(), f)
+        self.service = JiraAPIService(config_file)
+
+    def tearDown(self):
+        """Stop the server"""
+        self.server.stop()
+        for name in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, name))
+        os.rmdir(self.tmpdir)
+
+    def test_reads_and_assignment(self):
+        """Test users, paged tasks, capacity and an assignment through the jira client"""
+        users = self.service.get_users()
+        tasks = self.service.get_tasks()
+        task = next(task for task in tasks if task["assignee"] is None)
+
+        result = self.service.assign_task(task["key"], users[0]["username"])
+
+        self.assertEqual(len(users), len(self.server.users))
+        self.assertEqual(len(tasks), len(self.server.tasks))
+        self.assertTrue(result["success"], result)
+        self.assertEqual(self.server.get_task(task["key"])["assignee"], users[0]["username"])
+        self.assertIn("members", self.service.get_team_capacity_overview())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Integration Tests for the TaskFlow HTTP Server
+Tests the HTTP front-end over a real socket against the mock backend
+"""
+
+import unittest
+import gzip
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from api_service import TaskFlowWebAPI, reset_shared_services
+from http_server import TaskFlowHTTPServer
+from tracing import TRACER
+from jira_scheduler import JiraRateLimitError
+
+
+class TestTaskFlowHTTPServer(unittest.TestCase):
+    """Integration tests for TaskFlowHTTPServer"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the server on an ephemeral port"""
+        reset_shared_services()
+        cls.server = TaskFlowHTTPServer(('127.0.0.1', 0), TaskFlowWebAPI(use_real_jira=False))
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the server"""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def request(self, path, headers=None, body=None):
+        """Send a request and return (status, headers, raw body)"""
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers or {})
+        try:
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                return resp.status, resp.headers, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def request_raw(self, path, body, headers):
+        """POST a body as-is, without urllib filling in Content-Length"""
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=5)
+        try:
+            connection.putrequest('POST', path)
+            if body is not None:
+                headers = dict(headers, **{'Content-Length': str(len(body))})
+            for name, value in headers.items():
+                connection.putheader(name, value)
+            connection.endheaders(body)
+            response = connection.getresponse()
+            return response.status, response.headers, response.read()
+        finally:
+            connection.close()
+
+    def test_streamed_tasks_match_handle_request(self):
+        """Test that the chunked stream carries the same tasks as the dict API"""
+        status, headers, body = self.request('/api/tasks')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Transfer-Encoding"], "chunked")
+        expected = self.server.web_api.handle_request('/api/tasks')
+        self.assertEqual(json.loads(body)["data"], expected["data"])
+
+    def test_gzip_negotiation(self):
+        """Test that list responses are gzip-compressed when accepted"""
+        status, headers, body = self.request('/api/tasks', {'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(body))["status"], "success")
+
+    def test_conditional_get_returns_304(self):
+        """Test that a matching If-None-Match yields an empty 304"""
+        _, headers, _ = self.request('/api/users')
+
+        status, _, body = self.request('/api/users', {'If-None-Match': headers["ETag"]})
+
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b"")
+
+    def test_query_parameters_and_post(self):
+        """Test query-string filters and JSON POST bodies"""
+        status, _, body = self.request('/api/tasks?project_key=NOPE')
+        self.assertEqual(json.loads(body)["data"], [])
+
+        status, _, body = self.request('/api/assign', body={'task_key': 'TASK-105', 'assignee': 'maya.patel'})
+        self.assertEqual(status, 200)
+        self.assertTrue(json.loads(body)["data"]["success"])
+
+    def test_malformed_post_bodies_are_400(self):
+        """Test that JSON bodies that are not objects and bad Content-Length headers get HTTP 400"""
+        for body in (b'[1]', b'"x"', b'3', b'{'):
+            status, _, response = self.request_raw('/api/assign', body, {'Content-Type': 'application/json'})
+
+            self.assertEqual(status, 400, body)
+            self.assertEqual(json.loads(response)["message"], "Invalid JSON body")
+
+        status, _, response = self.request_raw('/api/assign', None, {'Content-Length': 'abc'})
+        self.assertEqual(status, 400)
+        self.assertEqual(json.loads(response)["message"], "Invalid Content-Length")
+
+    def test_stale_assignment_is_409(self):
+        """Test that an outdated expected_version maps to HTTP 409"""
+        _, _, body = self.request('/api/assign', body={'task_key': 'TASK-104', 'assignee': 'maya.patel'})
+        version = json.loads(body)["data"]["task"]["version"]
+
+        status, _, body = self.request('/api/assign', body={
+            'task_key': 'TASK-104', 'assignee': 'stacey.johnson', 'expected_version': version - 1
+        })
+
+        self.assertEqual(status, 409)
+        self.assertEqual(json.loads(body)["data"]["currentVersion"], version)
+
+    def test_metrics_exposition(self):
+        """Test that /api/metrics is served as Prometheus text, including streamed requests"""
+        self.request('/api/tasks')
+
+        status, headers, body = self.request('/api/metrics')
+
+        self.assertEqual(status, 200)
+        self.assertTrue(headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn(b'taskflow_request_duration_seconds_count{endpoint="/api/tasks",method="GET"}', body)
+
+    def test_streamed_request_traced(self):
+        """Test that X-TaskFlow-Trace traces streamed list responses too"""
+        TRACER.clear()
+
+        status, _, _ = self.request('/api/tasks/unassigned', headers={'X-TaskFlow-Trace': '1'})
+
+        # The trace finishes on the server thread just after the last chunk is sent
+        deadline = time.monotonic() + 2
+        while not TRACER.recent() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(status, 200)
+        self.assertEqual([trace["name"] for trace in TRACER.recent()], ["GET /api/tasks/unassigned"])
+
+    def test_rate_limited_backend_is_503(self):
+        """Test that JIRA throttling reaches the client as 503 with Retry-After"""
+        service = self.server.web_api.service
+        with patch.object(service, 'get_team_capacity_overview',
+                          side_effect=JiraRateLimitError("search_issues", 12.2)):
+            status, headers, body = self.request('/api/capacity')
+
+        self.assertEqual(status, 503)
+        self.assertEqual(headers["Retry-After"], "13")
+        self.assertEqual(json.loads(body)["retryAfter"], 12.2)
+
+    def test_unknown_endpoint_is_404(self):
+        """Test that unknown endpoints map to HTTP 404"""
+        status, _, _ = self.request('/api/unknown')
+
+        self.assertEqual(status, 404)
+
+    def test_invalid_event_ids_are_400(self):
+        """Test that non-numeric event ids and revisions are rejected with HTTP 400"""
+        for path, headers in (('/api/events?since=abc', None),
+                              ('/api/tasks/changes?since=abc', None),
+                              ('/api/events', {'Accept': 'text/event-stream', 'Last-Event-ID': 'abc'})):
+            status, _, body = self.request(path, headers)
+
+            self.assertEqual(status, 400, path)
+            self.assertIn("abc", json.loads(body)["message"])
+
+
+if __name__ == '__main__':
+    unittest.main()
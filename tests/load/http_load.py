@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+TaskFlow HTTP Load Test
+Drives the TaskFlow HTTP API with a mix of dashboard reads, recommendations and assignments
+
+The target is either a running server (``--url``) or one started in this
+process on the mock backend (optionally with a generated dataset) or on the
+JIRA backend pointed at the local fake JIRA server.
+
+Each operation in the mix is one thing a dashboard user does:
+
+- dashboard: a refresh, i.e. GET /api/capacity and GET /api/tasks/unassigned,
+  sent with If-None-Match from the client's previous response like a polling page
+- recommendation: GET /api/recommendations for a random unassigned task
+- assignment: POST /api/assign of a random task to a random user
+
+Load is either closed-loop (``--concurrency`` clients issuing operations
+back to back) or open-loop (``--rate`` operations per second arriving on a
+seeded Poisson schedule, served by up to ``--concurrency`` clients). In
+open-loop mode latency is measured from the scheduled arrival, so time spent
+waiting for a free client counts, as it would for a real user. Arrivals
+still queued when the duration is up are not sent: each is recorded as an
+``Unsent`` error on the operation's first endpoint, with the time it spent
+queued as its latency, and counted in ``unsent``. Any mean the target could
+not keep up with the rate.
+
+The report gives throughput, p50/p95/p99 latency and error rates per endpoint
+and in total. Responses with status 400 or above and connection failures
+count as errors.
+
+Usage:
+    python tests/load/http_load.py --concurrency 20 --duration 30
+    python tests/load/http_load.py --rate 50 --mix dashboard=80,recommendation=20 --users 500 --tasks 10000
+    python tests/load/http_load.py --backend fake-jira --jira-latency-ms 120 --concurrency 10
+    python tests/load/http_load.py --url http://127.0.0.1:8080 --concurrency 50
+"""
+
+import http.client
+import json
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../fixtures'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../performance'))
+
+from benchmark_recommendations import build_service, percentiles
+from test_data import TestDataFixtures
+from api_service import TaskFlowAPIService, TaskFlowWebAPI
+from http_server import TaskFlowHTTPServer
+
+OPERATIONS = ('dashboard', 'recommendation', 'assignment')
+# Endpoint an operation's first request goes to; unsent arrivals are recorded against it
+OPERATION_ENDPOINTS = {'dashboard': 'GET /api/capacity', 'recommendation': 'GET /api/recommendations',
+                       'assignment': 'POST /api/assign'}
+DEFAULT_MIX = {'dashboard': 70, 'recommendation': 25, 'assignment': 5}
+
+DEFAULT_SEED = 4900
+DEFAULT_DURATION = 10.0
+DEFAULT_CONCURRENCY = 10
+REQUEST_TIMEOUT = 30.0
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse ``dashboard=70,recommendation=25,assignment=5`` into operation weights"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' (use {', '.join(OPERATIONS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for '{name}': '{weight}'")
+        if mix[name] < 0:
+            raise ValueError(f"Weight for '{name}' must not be negative")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one operation with a positive weight")
+    return mix
+
+
+class LoadRecorder:
+    """Thread-safe latency, status and error samples per endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+
+    def record(self, endpoint: str, seconds: float, status):
+        """Record one request; ``status`` is the HTTP status or an exception name"""
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][str(status)] += 1
+            if not isinstance(status, int) or status >= 400:
+                self.errors[endpoint] += 1
+
+    def report(self, elapsed: float) -> Dict:
+        """Throughput, latency percentiles and error rates per endpoint and in total"""
+        with self._lock:
+            endpoints = {endpoint: self._summary(samples, self.errors[endpoint], elapsed,
+                                                 dict(self.statuses[endpoint]))
+                         for endpoint, samples in sorted(self.latencies.items())}
+            samples = [sample for latencies in self.latencies.values() for sample in latencies]
+            total = self._summary(samples, sum(self.errors.values()), elapsed) if samples else {"requests": 0}
+        return {"total": total, "endpoints": endpoints}
+
+    @staticmethod
+    def _summary(samples: List[float], errors: int, elapsed: float, statuses: Dict = None) -> Dict:
+        summary = {
+            "requests": len(samples),
+            "throughputRps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+            "errors": errors,
+            "errorRate": round(errors / len(samples), 4)
+        }
+        summary.update(percentiles(samples))
+        if statuses is not None:
+            summary["statuses"] = statuses
+        return summary
+
+
+class LoadClient:
+    """One simulated dashboard user with its own keep-alive connection and ETags"""
+
+    def __init__(self, base_url: str, recorder: LoadRecorder, task_keys: List[str], usernames: List[str],
+                 rng: random.Random):
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.recorder = recorder
+        self.task_keys = task_keys
+        self.usernames = usernames
+        self.rng = rng
+        self.etags = {}
+        self.connection = None
+
+    def run(self, operation: str, started: float = None):
+        """Perform one operation; latency counts from ``started`` when given (open-loop arrivals)"""
+        if operation == 'dashboard':
+            self.get('/api/capacity', started=started, conditional=True)
+            self.get('/api/tasks/unassigned', conditional=True)
+        elif operation == 'recommendation':
+            self.get('/api/recommendations', {"task_key": self.rng.choice(self.task_keys)}, started)
+        elif operation == 'assignment':
+            self.post('/api/assign', {"task_key": self.rng.choice(self.task_keys),
+                                      "assignee": self.rng.choice(self.usernames)}, started)
+
+    def skip(self, operation: str, started: float):
+        """Record an open-loop arrival that was never sent as an error, timed from its arrival"""
+        self.recorder.record(OPERATION_ENDPOINTS[operation], time.perf_counter() - started, "Unsent")
+
+    def get(self, path: str, params: Dict = None, started: float = None, conditional: bool = False):
+        headers = {"Accept-Encoding": "gzip"}
+        if conditional and path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+        target = f"{path}?{urlencode(params)}" if params else path
+        response = self._send("GET", target, path, None, headers, started)
+        if response is not None and conditional and response.getheader("ETag"):
+            self.etags[path] = response.getheader("ETag")
+
+    def post(self, path: str, body: Dict, started: float = None):
+        headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+        self._send("POST", path, path, json.dumps(body).encode("utf-8"), headers, started)
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def _send(self, method: str, target: str, path: str, body: Optional[bytes], headers: Dict,
+              started: float = None) -> Optional[http.client.HTTPResponse]:
+        """Send a request on the kept-alive connection, reconnecting after failures"""
+        start = started if started is not None else time.perf_counter()
+        endpoint = f"{method} {path}"
+        try:
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+            self.connection.request(method, target, body, headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self.recorder.record(endpoint, time.perf_counter() - start, type(e).__name__)
+            self.close()
+            return None
+        self.recorder.record(endpoint, time.perf_counter() - start, response.status)
+        if response.getheader("Connection", "").lower() == "close":
+            self.close()
+        return response
+
+
+def fetch_json(base_url: str, path: str) -> Dict:
+    """GET a JSON response outside the measured load"""
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=REQUEST_TIMEOUT)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def run_load(base_url: str, mix: Dict[str, float] = None, concurrency: int = DEFAULT_CONCURRENCY,
+             duration: float = DEFAULT_DURATION, rate: float = None, seed: int = DEFAULT_SEED) -> Dict:
+    """
+    Run one load test against a TaskFlow HTTP server
+
+    Args:
+        base_url (str): Server URL, e.g. http://127.0.0.1:8080
+        mix (Dict): Operation -> relative weight (default DEFAULT_MIX)
+        concurrency (int): Clients; in open-loop mode the most requests in flight
+        duration (float): Seconds to generate load for
+        rate (float): Operations per second for an open-loop run; closed-loop if None
+        seed (int): Seed for the operation mix, chosen tasks/users and arrival times
+
+    Returns:
+        Dict: Run settings, ``total`` and per-endpoint results (see LoadRecorder.report)
+    """
+    mix = mix or DEFAULT_MIX
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be positive")
+
+    task_keys = [task["key"] for task in fetch_json(base_url, '/api/tasks/unassigned')["data"]]
+    task_keys = task_keys or [task["key"] for task in fetch_json(base_url, '/api/tasks')["data"]]
+    usernames = [user["username"] for user in fetch_json(base_url, '/api/users')["data"]]
+    if not task_keys or not usernames:
+        raise ValueError(f"{base_url} has no tasks or users to run the mix against")
+
+    operations, weights = zip(*mix.items())
+    recorder = LoadRecorder()
+    clients = [LoadClient(base_url, recorder, task_keys, usernames, random.Random(f"{seed}:{i}"))
+               for i in range(concurrency)]
+    start = time.perf_counter()
+    deadline = start + duration
+
+    if rate is None:
+        def closed_loop(client):
+            while time.perf_counter() < deadline:
+                client.run(client.rng.choices(operations, weights)[0])
+        threads = [threading.Thread(target=closed_loop, args=(client,), daemon=True) for client in clients]
+    else:
+        arrivals = queue.Queue()
+        unsent = []
+
+        def open_loop(client):
+            while True:
+                arrival = arrivals.get()
+                if arrival is None:
+                    return
+                if time.perf_counter() >= deadline:
+                    unsent.append(arrival)
+                    client.skip(*arrival)
+                    continue
+                client.run(*arrival)
+        threads = [threading.Thread(target=open_loop, args=(client,), daemon=True) for client in clients]
+
+    for thread in threads:
+        thread.start()
+    if rate is not None:
+        # Poisson arrivals on a fixed schedule, independent of how fast requests complete
+        rng = random.Random(f"{seed}:arrivals")
+        arrival_time = start + rng.expovariate(rate)
+        while arrival_time < deadline:
+            delay = arrival_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            arrivals.put((rng.choices(operations, weights)[0], arrival_time))
+            arrival_time += rng.expovariate(rate)
+        for _ in threads:
+            arrivals.put(None)
+    for thread in threads:
+        thread.join()
+    for client in clients:
+        client.close()
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "target": base_url,
+        "mode": "closed" if rate is None else "open",
+        "concurrency": concurrency,
+        "rate": rate,
+        "mix": dict(mix),
+        "seed": seed,
+        "durationSeconds": round(elapsed, 3)
+    }
+    if rate is not None:
+        report["unsent"] = len(unsent)
+    report.update(recorder.report(elapsed))
+    return report
+
+
+def check_thresholds(report: Dict, max_error_rate: float = None, max_p95_ms: float = None) -> List[str]:
+    """Endpoints whose error rate or p95 latency is over the given limits"""
+    problems = []
+    for endpoint, result in report["endpoints"].items():
+        if max_error_rate is not None and result["errorRate"] > max_error_rate:
+            problems.append(f"{endpoint} error rate {result['errorRate']:.2%} exceeds {max_error_rate:.2%}")
+        if max_p95_ms is not None and result["p95Ms"] > max_p95_ms:
+            problems.append(f"{endpoint} p95 {result['p95Ms']:.2f}ms exceeds {max_p95_ms:.0f}ms")
+    return problems
+
+
+@contextmanager
+def serve(backend: str = 'mock', num_users: int = None, num_tasks: int = None, seed: int = DEFAULT_SEED,
+          jira_faults: Dict = None) -> Iterator[Dict]:
+    """
+    Start a TaskFlow HTTP server in this process for the duration of a load test
+
+    Args:
+        backend (str): 'mock', or 'fake-jira' for the JIRA backend against a local FakeJiraServer
+        num_users (int), num_tasks (int): Generate a seeded dataset of this size
+            (default: the bundled mock data)
+        jira_faults (Dict): Latency and fault settings for the fake JIRA server
+
+    Yields:
+        Dict: ``url`` of the TaskFlow server and, for fake-jira, the ``jira`` server
+    """
+    if backend not in ('mock', 'fake-jira'):
+        raise ValueError(f"Unknown backend '{backend}' (use mock or fake-jira)")
+    generated = num_users is not None or num_tasks is not None
+    num_users, num_tasks = num_users or 100, num_tasks or 1000
+    jira = config_dir = None
+
+    if backend == 'mock':
+        if generated:
+            service = build_service(TestDataFixtures.get_performance_test_data(num_users, num_tasks, seed=seed))
+        else:
+            service = TaskFlowAPIService(use_real_jira=False, backend='mock')
+        web_api = TaskFlowWebAPI(use_real_jira=False, backend='mock', shared=False)
+        web_api.service = service
+    else:
+        from jira_api import jira_library_available
+        from fake_jira_server import FakeJiraServer
+
+        if not jira_library_available():
+            raise RuntimeError("The fake-jira backend needs the jira package (pip install jira)")
+        if generated:
+            jira = FakeJiraServer.from_generator(num_users, num_tasks, seed, **(jira_faults or {}))
+        else:
+            jira = FakeJiraServer.from_mock_data(seed=seed, **(jira_faults or {}))
+        jira.start()
+        config_dir = tempfile.TemporaryDirectory()
+        config_file = os.path.join(config_dir.name, 'jira_config.json')
+        with open(config_file, 'w') as f:
+            json.dump(jira.client_config(), f)
+        web_api = TaskFlowWebAPI(use_real_jira=True, config_file=config_file, shared=False)
+
+    # Build the backend (and connect to JIRA) before any request is timed
+    web_api.service.api
+    server = TaskFlowHTTPServer(('127.0.0.1', 0), web_api)
+    thread = threading.Thread(target=server.serve_forever, name="taskflow-load-target", daemon=True)
+    thread.start()
+    try:
+        yield {"url": f"http://127.0.0.1:{server.server_address[1]}", "jira": jira}
+    finally:
+        server.shutdown()
+        server.server_close()
+        if jira:
+            jira.stop()
+        if config_dir:
+            config_dir.cleanup()
+
+
+def print_report(report: Dict):
+    """Print the per-endpoint results as a table"""
+    mode = (f"open loop at {report['rate']:g} op/s" if report["mode"] == "open"
+            else f"closed loop with {report['concurrency']} clients")
+    print(f"\n📊 {report['target']}: {mode} for {report['durationSeconds']:.1f}s")
+    print(f"   {'endpoint':<28} {'requests':>8} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'errors':>7}")
+    rows = list(report["endpoints"].items())
+    if report["total"]["requests"]:
+        rows.append(("total", report["total"]))
+    for endpoint, result in rows:
+        print(f"   {endpoint:<28} {result['requests']:>8} {result['throughputRps']:>8.1f} "
+              f"{result['p50Ms']:>9.2f} {result['p95Ms']:>9.2f} {result['p99Ms']:>9.2f} "
+              f"{result['errorRate']:>7.2%}")
+        for status, count in sorted(result.get("statuses", {}).items()):
+            if not status.isdigit() or int(status) >= 400:
+                print(f"      {status}: {count}")
+
+
+def main():
+    """Run a load test and fail when a threshold is exceeded"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='TaskFlow HTTP load test')
+    parser.add_argument('--url', help='Load test a running TaskFlow server instead of starting one')
+    parser.add_argument('--backend', choices=['mock', 'fake-jira'], default='mock',
+                        help='Backend of the server started in this process')
+    parser.add_argument('--users', type=int, help='Generate this many users for the started server')
+    parser.add_argument('--tasks', type=int, help='Generate this many tasks for the started server')
+    parser.add_argument('--mix', default=','.join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+                        help='Operation weights (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Clients (closed loop) or most requests in flight (open loop)')
+    parser.add_argument('--rate', type=float, help='Open-loop arrival rate in operations per second')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help='Seconds to generate load for')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed for data, mix and arrivals')
+    parser.add_argument('--jira-latency-ms', type=float, default=0, help='Fake JIRA latency per request')
+    parser.add_argument('--jira-jitter-ms', type=float, default=0, help='Fake JIRA extra random latency')
+    parser.add_argument('--jira-requests-per-second', type=float, default=0,
+                        help='Fake JIRA rate limit; excess requests get 429')
+    parser.add_argument('--jira-throttle-rate', type=float, default=0, help='Share of fake JIRA requests answered 429')
+    parser.add_argument('--jira-error-rate', type=float, default=0, help='Share of fake JIRA requests that fail')
+    parser.add_argument('--max-error-rate', type=float, help='Fail if any endpoint has a higher error rate')
+    parser.add_argument('--max-p95-ms', type=float, help='Fail if any endpoint has a slower p95')
+    parser.add_argument('--output', help='Also write the report to this JSON file')
+    args = parser.parse_args()
+
+    try:
+        run_args = dict(mix=parse_mix(args.mix), concurrency=args.concurrency, duration=args.duration,
+                        rate=args.rate, seed=args.seed)
+        if args.url:
+            report = run_load(args.url.rstrip('/'), **run_args)
+        else:
+            jira_faults = {"latency_ms": args.jira_latency_ms, "jitter_ms": args.jira_jitter_ms,
+                           "requests_per_second": args.jira_requests_per_second,
+                           "throttle_rate": args.jira_throttle_rate, "error_rate": args.jira_error_rate}
+            with serve(args.backend, args.users, args.tasks, args.seed, jira_faults) as target:
+                report = run_load(target["url"], **run_args)
+                if target["jira"]:
+                    report["jira"] = target["jira"].stats()
+    except (ValueError, RuntimeError, OSError) as e:
+        parser.error(str(e))
+
+    print_report(report)
+    if report.get("unsent"):
+        print(f"\n⚠️  {report['unsent']} arrivals were still queued at the end: the target cannot sustain "
+              f"{report['rate']:g} op/s")
+    if "jira" in report:
+        print(f"\n🔗 Fake JIRA: {json.dumps(report['jira'])}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.output}")
+
+    problems = check_thresholds(report, args.max_error_rate, args.max_p95_ms)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ Load test complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Test Harness Tests
+Tests the operation mix, closed- and open-loop runs and the report against an in-process server
+"""
+
+import unittest
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add the load test module to path (it adds the src, fixture and performance directories)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from http_load import LoadClient, LoadRecorder, check_thresholds, parse_mix, run_load, serve
+from jira_api import jira_library_available
+
+
+class TestLoadHarness(unittest.TestCase):
+    """Test cases for the load test helpers"""
+
+    def test_parse_mix(self):
+        """Test operation weights and rejected mixes"""
+        self.assertEqual(parse_mix("dashboard=3, recommendation=1"), {"dashboard": 3.0, "recommendation": 1.0})
+        for mix in ("search=1", "dashboard=lots", "dashboard=-1", "dashboard=0"):
+            with self.assertRaises(ValueError):
+                parse_mix(mix)
+
+    def test_recorder_report(self):
+        """Test throughput, error rates and status counts per endpoint and in total"""
+        recorder = LoadRecorder()
+        for _ in range(8):
+            recorder.record("GET /api/capacity", 0.01, 200)
+        recorder.record("GET /api/capacity", 0.01, 503)
+        recorder.record("POST /api/assign", 0.02, "ConnectionResetError")
+
+        report = recorder.report(elapsed=2.0)
+
+        capacity = report["endpoints"]["GET /api/capacity"]
+        self.assertEqual(capacity["requests"], 9)
+        self.assertEqual(capacity["throughputRps"], 4.5)
+        self.assertEqual(capacity["statuses"], {"200": 8, "503": 1})
+        self.assertEqual(report["endpoints"]["POST /api/assign"]["errorRate"], 1.0)
+        self.assertEqual(report["total"]["errors"], 2)
+        self.assertEqual(report["total"]["requests"], 10)
+
+    def test_thresholds(self):
+        """Test that endpoints over the error rate or p95 limit are reported"""
+        report = {"endpoints": {"GET /api/users": {"errorRate": 0.1, "p95Ms": 20.0},
+                                "GET /api/capacity": {"errorRate": 0.0, "p95Ms": 80.0}}}
+
+        problems = check_thresholds(report, max_error_rate=0.05, max_p95_ms=50)
+
+        self.assertEqual(len(problems), 2)
+        self.assertTrue(problems[0].startswith("GET /api/users error rate"))
+        self.assertTrue(problems[1].startswith("GET /api/capacity p95"))
+        self.assertEqual(check_thresholds(report), [])
+
+
+class TestLoadRuns(unittest.TestCase):
+    """Short load tests against a mock-backed server started in process"""
+
+    def test_closed_loop(self):
+        """Test that every operation in the mix reaches its endpoints without errors"""
+        with serve('mock', num_users=20, num_tasks=100, seed=1) as target:
+            report = run_load(target["url"], concurrency=4, duration=0.5, seed=1)
+
+        self.assertEqual(report["mode"], "closed")
+        self.assertEqual(set(report["endpoints"]), {"GET /api/capacity", "GET /api/tasks/unassigned",
+                                                    "GET /api/recommendations", "POST /api/assign"})
+        self.assertEqual(report["total"]["errors"], 0, report["endpoints"])
+        capacity = report["endpoints"]["GET /api/capacity"]
+        self.assertEqual(capacity["requests"], report["endpoints"]["GET /api/tasks/unassigned"]["requests"])
+        self.assertIn("304", capacity["statuses"])
+        self.assertLessEqual(capacity["p50Ms"], capacity["p99Ms"])
+
+    def test_open_loop(self):
+        """Test that an open-loop run sends about rate x duration operations"""
+        with serve('mock') as target:
+            report = run_load(target["url"], {"recommendation": 1}, concurrency=4, duration=1.0, rate=40, seed=2)
+
+        requests = report["endpoints"]["GET /api/recommendations"]["requests"]
+        self.assertEqual(report["mode"], "open")
+        self.assertEqual(report["unsent"], 0)
+        self.assertGreater(requests, 15)
+        self.assertLess(requests, 80)
+
+    def test_unsent_arrivals_count_as_errors(self):
+        """Test that arrivals a saturated target never received show up in the errors and latencies"""
+        with serve('mock') as target, \
+                patch.object(LoadClient, 'run', lambda client, operation, started=None: time.sleep(0.05)):
+            report = run_load(target["url"], {"assignment": 1}, concurrency=1, duration=0.3, rate=200, seed=3)
+
+        assign = report["endpoints"]["POST /api/assign"]
+        self.assertGreater(report["unsent"], 0)
+        self.assertEqual(assign["statuses"], {"Unsent": report["unsent"]})
+        self.assertEqual(assign["errors"], report["unsent"])
+        self.assertGreater(assign["p99Ms"], 50)
+
+    @unittest.skipUnless(jira_library_available(), "the jira package is not installed")
+    def test_fake_jira_backend(self):
+        """Test a run through the JIRA backend against the fake JIRA server"""
+        with serve('fake-jira', jira_faults={"latency_ms": 5}) as target:
+            report = run_load(target["url"], {"dashboard": 1}, concurrency=2, duration=0.5)
+            jira_requests = target["jira"].stats()["total"]
+
+        self.assertEqual(report["total"]["errors"], 0, report["endpoints"])
+        self.assertGreater(jira_requests, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
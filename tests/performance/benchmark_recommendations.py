@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+TaskFlow Recommendation Benchmarks
+Times recommendations, sprint scoring and capacity overviews on seeded spec-scale datasets
+
+Each scenario builds a seeded dataset with TestDataFixtures.get_performance_test_data
+(users x tasks), loads it into the mock backend and measures:
+
+- recommendation: TaskFlowAPIService.get_recommendations for one task,
+  including the task lookup and workload reads
+- sprint_scoring: ranking every member for each task of one sprint
+  (the first ``sprint_tasks`` tasks), one sample per task
+- capacity_overview: the team capacity overview
+
+Latencies are reported as p50/p95/p99 in milliseconds. Peak memory is the
+largest tracemalloc peak over a few extra calls, run separately so tracing
+does not inflate the timings. Results are compared against a stored baseline
+and the TECHNICAL_SPEC latency limits; any regression makes the run fail.
+
+Usage:
+    python tests/performance/benchmark_recommendations.py
+    python tests/performance/benchmark_recommendations.py --users 100 --tasks 1000
+    python tests/performance/benchmark_recommendations.py --update-baseline
+"""
+
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../fixtures'))
+
+from test_data import TestDataFixtures
+from api_service import TaskFlowAPIService
+from mock_jira_api import MockJiraAPI
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Spec-scale grid: team sizes x task volumes
+USER_COUNTS = (100, 500, 5000)
+TASK_COUNTS = (1000, 10000)
+
+DEFAULT_SEED = 4600
+DEFAULT_REPEAT = 50
+DEFAULT_SPRINT_TASKS = 1000
+MEMORY_SAMPLES = 3
+
+# Allowed slowdown / growth over the baseline before a result counts as a regression
+LATENCY_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+# Absolute slack so sub-millisecond timings and small allocations do not flap
+LATENCY_SLACK_MS = 1.0
+MEMORY_SLACK_KB = 64.0
+
+# TECHNICAL_SPEC "Performance Requirements": benchmark -> (largest team it applies to, p95 limit in ms)
+SPEC_LIMITS = {
+    "recommendation": (100, 2000.0),
+    "capacity_overview": (500, 1000.0)
+}
+
+
+def scenario_name(num_users: int, num_tasks: int) -> str:
+    return f"{num_users}x{num_tasks}"
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of latency samples in seconds, returned in milliseconds"""
+    if len(samples) == 1:
+        p50 = p95 = p99 = samples[0]
+    else:
+        cuts = statistics.quantiles(samples, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    return {"p50Ms": round(p50 * 1000, 3), "p95Ms": round(p95 * 1000, 3), "p99Ms": round(p99 * 1000, 3)}
+
+
+def peak_memory_kb(call, samples: int = MEMORY_SAMPLES) -> float:
+    """Largest tracemalloc peak, in KiB, over ``samples`` calls"""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            call()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def build_service(data: Dict) -> TaskFlowAPIService:
+    """Mock-backed service serving the generated users and tasks"""
+    backend = MockJiraAPI()
+    backend.users_data = {"users": data["users"]}
+    backend.tasks_data = {"tasks": data["tasks"]}
+    service = TaskFlowAPIService(use_real_jira=False, backend='mock')
+    service._api = backend
+    return service
+
+
+def run_scenario(num_users: int, num_tasks: int, seed: int = DEFAULT_SEED, repeat: int = DEFAULT_REPEAT,
+                 sprint_tasks: int = DEFAULT_SPRINT_TASKS) -> Dict[str, Dict]:
+    """
+    Benchmark one dataset size
+
+    Returns:
+        Dict: Benchmark name -> ``samples``, p50/p95/p99 and ``peakMemoryKb``
+    """
+    data = TestDataFixtures.get_performance_test_data(num_users, num_tasks, seed=seed)
+    service = build_service(data)
+    engine = service.recommender
+    rng = random.Random(seed)
+    task_keys = [task["key"] for task in rng.sample(data["tasks"], min(repeat, num_tasks))]
+    sprint = data["tasks"][:sprint_tasks]
+    users = service.api.get_users()
+    loads = {user["username"]: service.api.get_user_workload(user["username"])["totalStoryPoints"]
+             for user in users}
+
+    def recommend(task_key):
+        service.get_recommendations(task_key)
+
+    def score(task):
+        engine.generate_recommendations(users, task, loads)
+
+    def capacity(_):
+        service.api.get_team_capacity_overview()
+
+    results = {}
+    for name, call, inputs in (("recommendation", recommend, task_keys),
+                               ("sprint_scoring", score, sprint),
+                               ("capacity_overview", capacity, range(repeat))):
+        samples = []
+        for value in inputs:
+            start = time.perf_counter()
+            call(value)
+            samples.append(time.perf_counter() - start)
+        result = {"samples": len(samples)}
+        result.update(percentiles(samples))
+        if name == "sprint_scoring":
+            result["totalSeconds"] = round(sum(samples), 3)
+        first = inputs[0]
+        result["peakMemoryKb"] = peak_memory_kb(lambda: call(first))
+        results[name] = result
+    return results
+
+
+def run_benchmarks(user_counts=USER_COUNTS, task_counts=TASK_COUNTS, seed: int = DEFAULT_SEED,
+                   repeat: int = DEFAULT_REPEAT, sprint_tasks: int = DEFAULT_SPRINT_TASKS,
+                   verbose: bool = True) -> Dict[str, Dict]:
+    """Run every users x tasks scenario; returns scenario name -> benchmark results"""
+    results = {}
+    for num_users in user_counts:
+        for num_tasks in task_counts:
+            name = scenario_name(num_users, num_tasks)
+            if verbose:
+                print(f"⏱️  {name}: {num_users} users, {num_tasks} tasks")
+            results[name] = run_scenario(num_users, num_tasks, seed, repeat, sprint_tasks)
+            if verbose:
+                for benchmark, result in results[name].items():
+                    print(f"   {benchmark:<18} p50 {result['p50Ms']:>9.2f}ms  p95 {result['p95Ms']:>9.2f}ms  "
+                          f"p99 {result['p99Ms']:>9.2f}ms  peak {result['peakMemoryKb']:>9.1f}KiB")
+    return results
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, latency_tolerance: float = LATENCY_TOLERANCE,
+                        memory_tolerance: float = MEMORY_TOLERANCE) -> List[str]:
+    """
+    Results slower or larger than the baseline allows
+
+    Scenarios or benchmarks missing from the baseline are not compared.
+
+    Returns:
+        List[str]: One message per regression (empty if none)
+    """
+    regressions = []
+    for scenario, benchmarks in results.items():
+        for benchmark, result in benchmarks.items():
+            reference = baseline.get("results", {}).get(scenario, {}).get(benchmark)
+            if not reference:
+                continue
+            for metric in ("p50Ms", "p95Ms"):
+                limit = reference[metric] * (1 + latency_tolerance) + LATENCY_SLACK_MS
+                if result[metric] > limit:
+                    regressions.append(f"{scenario} {benchmark} {metric} {result[metric]:.2f} > "
+                                       f"{limit:.2f} (baseline {reference[metric]:.2f})")
+            limit = reference["peakMemoryKb"] * (1 + memory_tolerance) + MEMORY_SLACK_KB
+            if result["peakMemoryKb"] > limit:
+                regressions.append(f"{scenario} {benchmark} peakMemoryKb {result['peakMemoryKb']:.1f} > "
+                                   f"{limit:.1f} (baseline {reference['peakMemoryKb']:.1f})")
+    return regressions
+
+
+def check_spec_limits(results: Dict) -> List[str]:
+    """Results breaking the TECHNICAL_SPEC latency limits for the team sizes they cover"""
+    violations = []
+    for scenario, benchmarks in results.items():
+        num_users = int(scenario.split("x")[0])
+        for benchmark, (max_users, limit_ms) in SPEC_LIMITS.items():
+            result = benchmarks.get(benchmark)
+            if result and num_users <= max_users and result["p95Ms"] > limit_ms:
+                violations.append(f"{scenario} {benchmark} p95 {result['p95Ms']:.2f}ms exceeds the "
+                                  f"{limit_ms:.0f}ms spec limit")
+    return violations
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict:
+    """Stored baseline, or an empty one if the file does not exist yet"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"results": {}}
+
+
+def save_baseline(results: Dict, seed: int, repeat: int, sprint_tasks: int, path: str = BASELINE_FILE,
+                  previous: Dict = None):
+    """Write results as the new baseline, keeping stored scenarios that were not re-run"""
+    merged = dict((previous or {}).get("results", {}))
+    merged.update(results)
+    baseline = {
+        "generated": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "repeat": repeat,
+        "sprintTasks": sprint_tasks,
+        "results": merged
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    """Run the benchmarks and fail on regressions"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='TaskFlow recommendation benchmarks')
+    parser.add_argument('--users', type=int, nargs='+', default=list(USER_COUNTS), help='Team sizes to benchmark')
+    parser.add_argument('--tasks', type=int, nargs='+', default=list(TASK_COUNTS), help='Task counts to benchmark')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Dataset seed')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='Samples per recommendation and capacity benchmark')
+    parser.add_argument('--sprint-tasks', type=int, default=DEFAULT_SPRINT_TASKS,
+                        help='Tasks per sprint for the sprint scoring benchmark')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline file to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--latency-tolerance', type=float, default=LATENCY_TOLERANCE,
+                        help='Allowed p50/p95 slowdown over the baseline, e.g. 0.5 for +50%%')
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE,
+                        help='Allowed peak memory growth over the baseline')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.users, args.tasks, args.seed, args.repeat, args.sprint_tasks)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    problems = check_spec_limits(results)
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        save_baseline(results, args.seed, args.repeat, args.sprint_tasks, args.baseline, baseline)
+        print(f"✅ Baseline written to {args.baseline}")
+    else:
+        problems += compare_to_baseline(results, baseline, args.latency_tolerance, args.memory_tolerance)
+
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
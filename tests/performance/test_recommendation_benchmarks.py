@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Recommendation Benchmark Tests
+Tests the benchmark helpers and, with TASKFLOW_BENCHMARKS=1, runs the spec-scale grid against the baseline
+"""
+
+import unittest
+import os
+import sys
+
+# Add the benchmark module to path (it adds the src and fixture directories)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from benchmark_recommendations import (
+    DEFAULT_REPEAT, DEFAULT_SEED, DEFAULT_SPRINT_TASKS, TASK_COUNTS, USER_COUNTS, check_spec_limits,
+    compare_to_baseline, load_baseline, percentiles, run_benchmarks, run_scenario
+)
+from test_data import TestDataFixtures
+
+
+def result(p50=10.0, p95=20.0, memory=1000.0):
+    return {"samples": 50, "p50Ms": p50, "p95Ms": p95, "p99Ms": p95, "peakMemoryKb": memory}
+
+
+class TestBenchmarkHelpers(unittest.TestCase):
+    """Test cases for the benchmark helpers"""
+
+    def test_seeded_data_repeats(self):
+        """Test that the same seed generates the same dataset and another seed does not"""
+        first = TestDataFixtures.get_performance_test_data(20, 50, seed=7)
+        second = TestDataFixtures.get_performance_test_data(20, 50, seed=7)
+        other = TestDataFixtures.get_performance_test_data(20, 50, seed=8)
+
+        self.assertEqual(first["users"], second["users"])
+        self.assertEqual(first["tasks"], second["tasks"])
+        self.assertNotEqual(first["users"], other["users"])
+
+    def test_percentiles(self):
+        """Test p50/p95/p99 in milliseconds"""
+        samples = [i / 1000 for i in range(1, 101)]
+
+        self.assertEqual(percentiles(samples), {"p50Ms": 50.5, "p95Ms": 95.05, "p99Ms": 99.01})
+        self.assertEqual(percentiles([0.002])["p99Ms"], 2.0)
+
+    def test_regressions_detected(self):
+        """Test that slower or larger results than the baseline allows are reported"""
+        baseline = {"results": {"100x1000": {"recommendation": result()}}}
+
+        self.assertEqual(compare_to_baseline({"100x1000": {"recommendation": result(p95=30.0)}}, baseline), [])
+        slower = compare_to_baseline({"100x1000": {"recommendation": result(p95=40.0)}}, baseline)
+        larger = compare_to_baseline({"100x1000": {"recommendation": result(memory=2000.0)}}, baseline)
+        unknown = compare_to_baseline({"200x1000": {"recommendation": result(p95=400.0)}}, baseline)
+
+        self.assertEqual(len(slower), 1)
+        self.assertIn("p95Ms", slower[0])
+        self.assertIn("peakMemoryKb", larger[0])
+        self.assertEqual(unknown, [])
+
+    def test_spec_limits(self):
+        """Test that the 2s recommendation limit applies to teams of up to 100 members only"""
+        results = {
+            "100x1000": {"recommendation": result(p95=2500.0)},
+            "500x1000": {"recommendation": result(p95=2500.0)}
+        }
+
+        violations = check_spec_limits(results)
+
+        self.assertEqual(len(violations), 1)
+        self.assertTrue(violations[0].startswith("100x1000 recommendation"))
+
+    def test_small_scenario(self):
+        """Test that a scenario reports every benchmark with percentiles and peak memory"""
+        results = run_scenario(20, 50, repeat=5, sprint_tasks=10)
+
+        self.assertEqual(set(results), {"recommendation", "sprint_scoring", "capacity_overview"})
+        self.assertEqual(results["sprint_scoring"]["samples"], 10)
+        for benchmark in results.values():
+            self.assertLessEqual(benchmark["p50Ms"], benchmark["p99Ms"])
+            self.assertGreater(benchmark["peakMemoryKb"], 0)
+
+
+@unittest.skipUnless(os.getenv('TASKFLOW_BENCHMARKS'), "set TASKFLOW_BENCHMARKS=1 to run the spec-scale benchmarks")
+class TestSpecScaleBenchmarks(unittest.TestCase):
+    """Run the users x tasks grid and compare it with tests/performance/baseline.json"""
+
+    def test_no_regressions(self):
+        """Test that every scenario meets the spec limits and stays within the baseline"""
+        baseline = load_baseline()
+        results = run_benchmarks(USER_COUNTS, TASK_COUNTS, seed=baseline.get("seed", DEFAULT_SEED),
+                                 repeat=baseline.get("repeat", DEFAULT_REPEAT),
+                                 sprint_tasks=baseline.get("sprintTasks", DEFAULT_SPRINT_TASKS))
+
+        problems = check_spec_limits(results) + compare_to_baseline(results, baseline)
+
+        self.assertEqual(problems, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
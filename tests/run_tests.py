@@ -2,12 +2,20 @@
 """
 TaskFlow Backend Test Runner
 Comprehensive test runner for all backend unit and integration tests
+
+--parallel discovers every test class under tests/unit, tests/integration,
+tests/performance and tests/load and runs the classes across worker
+processes, reporting per-test timings and the slowest tests.
 """
 
 import unittest
 import sys
 import os
 import time
+import importlib
+import json
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from io import StringIO
 
 # Add project paths
@@ -19,6 +27,120 @@ from tests.unit.test_mock_jira_api import TestMockJiraAPI, TestMockJiraAPIIntegr
 from tests.unit.test_recommendation_engine import TestRecommendationEngine
 from tests.integration.test_task_assignment_workflow import TestTaskAssignmentWorkflow
 
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Directories searched by --parallel (test_*.py files)
+TEST_DIRS = {
+    'unit': os.path.join(TESTS_DIR, 'unit'),
+    'integration': os.path.join(TESTS_DIR, 'integration'),
+    'performance': os.path.join(TESTS_DIR, 'performance'),
+    'load': os.path.join(TESTS_DIR, 'load')
+}
+DEFAULT_SLOWEST = 10
+
+
+class TimedTestResult(unittest.TestResult):
+    """Test result that records the outcome and duration of every test"""
+    
+    def __init__(self):
+        super().__init__()
+        # Keep test output (and the prints from setUpClass) out of the worker's stdout
+        self.buffer = True
+        self.timings = []
+        self._started = {}
+    
+    def startTest(self, test):
+        self._started[test.id()] = time.perf_counter()
+        super().startTest(test)
+    
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, 'passed')
+    
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, 'failed', self.failures[-1][1])
+    
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(test, 'error', self.errors[-1][1])
+    
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, 'skipped', reason)
+    
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._record(test, 'passed')
+    
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._record(test, 'failed', 'Unexpected success')
+    
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            failures = self.failures if issubclass(err[0], test.failureException) else self.errors
+            self._record(subtest, 'failed' if failures is self.failures else 'error', failures[-1][1],
+                         self._started.get(test.id()))
+    
+    def _record(self, test, outcome, details=None, started=None):
+        started = started or self._started.pop(test.id(), None)
+        self.timings.append({
+            'test': test.id(),
+            'outcome': outcome,
+            'seconds': round(time.perf_counter() - started, 4) if started else 0.0,
+            'details': details
+        })
+
+
+def discover_test_classes(directories):
+    """
+    Find the test classes in test_*.py files under the given directories
+    
+    Returns:
+        tuple: ([((directory, module, class), test count)], suite of modules that failed to import)
+    """
+    classes = {}
+    broken = unittest.TestSuite()
+    
+    def collect(suite, directory):
+        for test in suite:
+            if isinstance(test, unittest.TestSuite):
+                collect(test, directory)
+            elif type(test).__module__ == 'unittest.loader':
+                broken.addTest(test)
+            else:
+                key = (directory, type(test).__module__, type(test).__name__)
+                classes[key] = classes.get(key, 0) + 1
+    
+    for directory in directories:
+        collect(unittest.TestLoader().discover(directory, pattern='test_*.py', top_level_dir=directory), directory)
+    return list(classes.items()), broken
+
+
+def run_test_class(test_class):
+    """Run one (directory, module, class) in this process; used by the --parallel workers"""
+    directory, module_name, class_name = test_class
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    
+    start = time.perf_counter()
+    result = TimedTestResult()
+    try:
+        test_case = getattr(importlib.import_module(module_name), class_name)
+    except Exception:
+        result.timings.append({'test': f"{module_name}.{class_name}", 'outcome': 'error', 'seconds': 0.0,
+                               'details': traceback.format_exc()})
+    else:
+        unittest.TestLoader().loadTestsFromTestCase(test_case).run(result)
+    return {
+        'name': f"{module_name}.{class_name}",
+        'worker': os.getpid(),
+        'seconds': round(time.perf_counter() - start, 4),
+        'tests': result.timings
+    }
+
+
 
 class TaskFlowTestRunner:
     """Custom test runner for TaskFlow backend tests"""
@@ -211,6 +333,113 @@ class TaskFlowTestRunner:
         result = runner.run(suite)
         
         return result.wasSuccessful()
+    
+    def run_parallel_tests(self, workers=None, suites=None, verbose=True, slowest=DEFAULT_SLOWEST,
+                           timings_file=None):
+        """
+        Run every discovered test class across worker processes
+        
+        Each class runs whole in one worker, so setUpClass fixtures and the
+        per-process caches (e.g. seeded performance datasets) are shared by
+        the classes a worker runs.
+        
+        Args:
+            workers (int): Worker processes (default: one per CPU)
+            suites (list): TEST_DIRS keys to run, e.g. ['unit'] (default: all)
+            slowest (int): Number of slowest tests to list
+            timings_file (str): Also write every test's timing to this JSON file
+        """
+        test_classes, broken = discover_test_classes([TEST_DIRS[name] for name in (suites or TEST_DIRS)])
+        # Largest classes first, so a long class is not the last one started
+        test_classes.sort(key=lambda item: item[1], reverse=True)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(test_classes)))
+        
+        print(f"⚡ Running {sum(count for _, count in test_classes)} tests in {len(test_classes)} classes "
+              f"on {workers} workers")
+        print("=" * 60)
+        
+        start_time = time.time()
+        results = []
+        if broken.countTestCases():
+            result = TimedTestResult()
+            broken.run(result)
+            results.append({'name': 'Import errors', 'worker': os.getpid(), 'seconds': 0.0, 'tests': result.timings})
+        # Executor workers are not daemonic, so tests can start processes of their own
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(run_test_class, key) for key, _ in test_classes]
+            for future in as_completed(futures):
+                class_result = future.result()
+                results.append(class_result)
+                if verbose:
+                    self.print_class_result(class_result)
+        end_time = time.time()
+        
+        tests = [test for class_result in results for test in class_result['tests']]
+        total_tests = len(tests)
+        total_failures = sum(test['outcome'] == 'failed' for test in tests)
+        total_errors = sum(test['outcome'] == 'error' for test in tests)
+        
+        self.test_results['parallel'] = {'workers': workers, 'classes': results}
+        self.test_results['summary'] = {
+            'test_classes': len(results),
+            'workers': workers,
+            'total_tests': total_tests,
+            'total_failures': total_failures,
+            'total_errors': total_errors,
+            'total_skipped': sum(test['outcome'] == 'skipped' for test in tests),
+            'overall_success_rate': ((total_tests - total_failures - total_errors) / total_tests * 100) if total_tests > 0 else 0,
+            'total_execution_time': end_time - start_time,
+            'total_test_time': sum(class_result['seconds'] for class_result in results),
+            'overall_successful': total_failures == 0 and total_errors == 0
+        }
+        
+        self.print_parallel_summary(tests, slowest)
+        
+        if timings_file:
+            with open(timings_file, 'w') as f:
+                json.dump({'summary': self.test_results['summary'],
+                           'tests': sorted(tests, key=lambda test: test['seconds'], reverse=True)}, f, indent=2)
+            print(f"\n💾 Test timings written to {timings_file}")
+        
+        return self.test_results['summary']['overall_successful']
+    
+    def print_class_result(self, class_result):
+        """Print one finished test class with the timing of each of its tests"""
+        passed = all(test['outcome'] in ('passed', 'skipped') for test in class_result['tests'])
+        print(f"{'✅' if passed else '❌'} {class_result['name']}: {len(class_result['tests'])} tests "
+              f"in {class_result['seconds']:.2f}s (worker {class_result['worker']})")
+        for test in class_result['tests']:
+            print(f"   {test['seconds']:>8.3f}s  {test['test'].rsplit('.', 1)[-1]} ... {test['outcome']}")
+    
+    def print_parallel_summary(self, tests, slowest=DEFAULT_SLOWEST):
+        """Print the parallel run summary, failure details and the slowest tests"""
+        summary = self.test_results['summary']
+        
+        problems = [test for test in tests if test['outcome'] in ('failed', 'error')]
+        if problems:
+            print("\n❌ Failures and Errors")
+            print("=" * 60)
+            for test in problems:
+                print(f"{'FAIL' if test['outcome'] == 'failed' else 'ERROR'}: {test['test']}")
+                print(test['details'])
+        
+        print("\n📊 Parallel Test Summary")
+        print("=" * 60)
+        print(f"   Test Classes: {summary['test_classes']}")
+        print(f"   Workers: {summary['workers']}")
+        print(f"   Tests Run: {summary['total_tests']}")
+        print(f"   Failures: {summary['total_failures']}")
+        print(f"   Errors: {summary['total_errors']}")
+        print(f"   Skipped: {summary['total_skipped']}")
+        print(f"   Success Rate: {summary['overall_success_rate']:.1f}%")
+        print(f"   Execution Time: {summary['total_execution_time']:.2f}s "
+              f"({summary['total_test_time']:.2f}s of test time)")
+        print(f"   Final Status: {'✅ ALL TESTS PASSED' if summary['overall_successful'] else '❌ SOME TESTS FAILED'}")
+        
+        if slowest:
+            print(f"\n🐢 Slowest {min(slowest, len(tests))} Tests:")
+            for test in sorted(tests, key=lambda test: test['seconds'], reverse=True)[:slowest]:
+                print(f"   {test['seconds']:>8.3f}s  {test['test']}")
 
 
 def main():
@@ -223,6 +452,11 @@ def main():
     parser.add_argument('--test', type=str, help='Run specific test class')
     parser.add_argument('--quiet', action='store_true', help='Run tests in quiet mode')
     parser.add_argument('--generate-fixtures', action='store_true', help='Generate test fixture files')
+    parser.add_argument('--parallel', type=int, nargs='?', const=0, metavar='WORKERS',
+                        help='Run all test classes across worker processes (default: one per CPU)')
+    parser.add_argument('--slowest', type=int, default=DEFAULT_SLOWEST,
+                        help='Number of slowest tests to list with --parallel')
+    parser.add_argument('--timings-file', help='Write per-test timings from --parallel to this JSON file')
     
     args = parser.parse_args()
     
@@ -242,6 +476,12 @@ def main():
         success = runner.run_specific_test(args.test, verbose)
         return 0 if success else 1
     
+    # Run everything (or the selected test types) in parallel
+    if args.parallel is not None:
+        suites = [name for name, selected in (('unit', args.unit), ('integration', args.integration)) if selected]
+        success = runner.run_parallel_tests(args.parallel, suites, verbose, args.slowest, args.timings_file)
+        return 0 if success else 1
+    
     # Run specific test types
     if args.unit:
         success = runner.run_unit_tests(verbose)
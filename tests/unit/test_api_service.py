@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for TaskFlow API Service
+Tests the unified service and web API wrapper running against mock data
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from api_service import TaskFlowAPIService, TaskFlowWebAPI, get_shared_service, reset_shared_services
+
+
+class TestTaskFlowEvents(unittest.TestCase):
+    """Test cases for assignment and capacity change events"""
+
+    def setUp(self):
+        """Set up a mock-backed service"""
+        self.service = TaskFlowAPIService(use_real_jira=False)
+        self.service.api.users_data = {"users": [
+            {"username": "stacey.johnson", "displayName": "Stacey", "timeZone": "UTC",
+             "capacity": {"pointsPerSprint": 40}},
+            {"username": "maya.patel", "displayName": "Maya", "timeZone": "UTC",
+             "capacity": {"pointsPerSprint": 45}}
+        ]}
+        self.service.api.tasks_data = {"tasks": [
+            {"key": "TASK-101", "project": "TASK", "assignee": None, "storyPoints": 8, "status": "To Do"},
+            {"key": "TASK-102", "project": "TASK", "assignee": None, "storyPoints": 13, "status": "To Do"}
+        ]}
+
+    def test_assign_publishes_assignment_and_workload_events(self):
+        """Test that assign_task publishes task_assigned then workload_changed"""
+        self.service.assign_task("TASK-101", "stacey.johnson")
+
+        events = self.service.get_events(since=0)["events"]
+
+        self.assertEqual([e["type"] for e in events], ["task_assigned", "workload_changed"])
+        self.assertEqual(events[0]["data"]["assignee"], "stacey.johnson")
+        self.assertEqual(events[1]["data"]["workload"]["totalStoryPoints"], 8)
+
+    def test_reassign_updates_both_workloads(self):
+        """Test that reassignment reports the previous assignee's workload too"""
+        self.service.sync()
+        self.service.assign_task("TASK-101", "stacey.johnson")
+        cursor = self.service.events.last_id
+
+        self.service.assign_task("TASK-101", "maya.patel")
+        events = self.service.get_events(since=cursor)["events"]
+
+        self.assertEqual(events[0]["data"]["previousAssignee"], "stacey.johnson")
+        workloads = {e["data"]["username"]: e["data"]["workload"] for e in events[1:]}
+        self.assertEqual(workloads["stacey.johnson"]["totalStoryPoints"], 0)
+        self.assertEqual(workloads["maya.patel"]["totalStoryPoints"], 8)
+
+    def test_reassign_before_first_sync(self):
+        """Test that the previous assignee is known even before sync has filled the snapshot"""
+        self.service.api.tasks_data["tasks"][0]["assignee"] = "stacey.johnson"
+
+        self.service.assign_task("TASK-101", "maya.patel")
+        events = self.service.get_events(since=0)["events"]
+
+        self.assertEqual(events[0]["data"]["previousAssignee"], "stacey.johnson")
+        self.assertEqual({e["data"]["username"] for e in events[1:]}, {"stacey.johnson", "maya.patel"})
+
+    def test_first_sync_primes_without_events(self):
+        """Test that the initial sync does not replay the whole dataset"""
+        summary = self.service.sync()
+
+        self.assertEqual(summary["tasks"], 2)
+        self.assertEqual(summary["eventsPublished"], 0)
+
+    def test_sync_detects_external_changes(self):
+        """Test that sync publishes events for changes made outside the service"""
+        self.service.sync()
+
+        tasks = self.service.api.tasks_data["tasks"]
+        tasks[1]["assignee"] = "maya.patel"
+        tasks.append({"key": "TASK-103", "project": "TASK", "assignee": None, "storyPoints": 5})
+
+        self.service.sync()
+        types = [e["type"] for e in self.service.get_events(since=0)["events"]]
+
+        self.assertIn("task_assigned", types)
+        self.assertIn("new_unassigned_task", types)
+        self.assertIn("workload_changed", types)
+
+    def test_events_endpoint(self):
+        """Test long-poll endpoint returns events after the cursor"""
+        web_api = TaskFlowWebAPI(use_real_jira=False)
+        web_api.service = self.service
+        self.service.assign_task("TASK-101", "stacey.johnson")
+
+        response = web_api.handle_request('/api/events', 'GET', {'since': 1, 'timeout': 0})
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(len(response["data"]["events"]), 1)
+        self.assertEqual(response["data"]["cursor"], 2)
+
+
+class TestTaskFlowRecommendations(unittest.TestCase):
+    """Test cases for /api/recommendations and the decision log it feeds"""
+
+    def setUp(self):
+        """Set up a mock-backed web API logging decisions to a temp directory"""
+        reset_shared_services()
+        self.tmpdir = tempfile.mkdtemp()
+        self.web_api = TaskFlowWebAPI(use_real_jira=False, decision_log_dir=self.tmpdir)
+        self.service = self.web_api.service
+
+    def tearDown(self):
+        """Stop the decision log writer and remove its directory"""
+        reset_shared_services()
+        shutil.rmtree(self.tmpdir)
+
+    def test_recommendations_ranked_by_score(self):
+        """Test that candidates come back best first with their factors"""
+        response = self.web_api.handle_request('/api/recommendations', 'GET', {'task_key': 'TASK-102'})
+
+        candidates = response["data"]["candidates"]
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(len(candidates), 3)
+        self.assertEqual(candidates[0]["username"], "maya.patel")
+        self.assertEqual([c["score"] for c in candidates], sorted((c["score"] for c in candidates), reverse=True))
+        self.assertIn("skillFit", candidates[0]["factors"])
+
+    def test_unknown_task(self):
+        """Test recommendations for a missing task"""
+        response = self.web_api.handle_request('/api/recommendations', 'GET', {'task_key': 'NOPE-1'})
+
+        self.assertEqual(response["status"], "error")
+        self.assertIn("not found", response["message"])
+
+    def test_assignment_logged_against_recommendation(self):
+        """Test that assigning after a recommendation records the selection and feedback"""
+        recommended = self.web_api.handle_request('/api/recommendations', 'POST', {'task_key': 'TASK-102'})
+        top = recommended["data"]["candidates"][0]["username"]
+
+        self.web_api.handle_request('/api/assign', 'POST', {
+            'task_key': 'TASK-102', 'assignee': top, 'approver': 'lead'
+        })
+        self.service.decision_log.flush()
+
+        entries = list(self.service.decision_log.read())
+        self.assertEqual([e["type"] for e in entries], ["recommendation", "assignment"])
+        self.assertEqual(entries[1]["recommendationId"], recommended["data"]["recommendationId"])
+        self.assertTrue(entries[1]["feedback"]["accepted"])
+
+
+class TestTaskFlowLazyBackend(unittest.TestCase):
+    """Test cases for deferred backend creation"""
+
+    def test_backend_created_on_first_use(self):
+        """Test that construction and /api/info leave the backend unbuilt"""
+        service = TaskFlowAPIService(use_real_jira=False)
+
+        info = service.get_api_info()
+
+        self.assertIsNone(service._api)
+        self.assertFalse(info["initialized"])
+        self.assertTrue(info["connected"])
+        self.assertGreater(len(service.get_users()), 0)
+        self.assertTrue(service.get_api_info()["initialized"])
+
+    def test_prewarm_builds_in_background(self):
+        """Test that prewarm creates the backend without a request"""
+        service = TaskFlowAPIService(use_real_jira=False)
+
+        service.prewarm().join(timeout=5)
+
+        self.assertIsNotNone(service._api)
+
+    def test_jira_package_not_imported(self):
+        """Test that importing the service does not import the jira package"""
+        self.assertNotIn('jira', sys.modules)
+
+
+class TestSharedServices(unittest.TestCase):
+    """Test cases for the process-wide service registry"""
+
+    def setUp(self):
+        """Start every test with an empty registry and a temp config file"""
+        reset_shared_services()
+        self.tmpdir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.tmpdir, "jira_config.json")
+        with open(self.config_file, 'w') as f:
+            f.write('{"project_key": "TASK"}')
+
+    def tearDown(self):
+        """Clear the registry and remove the temp directory"""
+        reset_shared_services()
+        shutil.rmtree(self.tmpdir)
+
+    def test_web_apis_share_one_service(self):
+        """Test that web APIs with the same configuration share a backend"""
+        first = TaskFlowWebAPI(use_real_jira=False)
+        second = TaskFlowWebAPI(use_real_jira=False)
+
+        first.handle_request('/api/assign', 'POST', {'task_key': 'TASK-101', 'assignee': 'stacey.johnson'})
+
+        self.assertIs(first.service, second.service)
+        self.assertIs(first.service.api, second.service.api)
+        tasks = second.handle_request('/api/tasks', 'GET', {'assignee': 'stacey.johnson'})["data"]
+        self.assertEqual([t["key"] for t in tasks], ["TASK-101"])
+
+    def test_private_and_distinct_configurations(self):
+        """Test that shared=False and different configs get their own services"""
+        shared = TaskFlowWebAPI(use_real_jira=False)
+        private = TaskFlowWebAPI(use_real_jira=False, shared=False)
+        configured = TaskFlowWebAPI(use_real_jira=False, config_file=self.config_file)
+
+        self.assertIsNot(shared.service, private.service)
+        self.assertIsNot(shared.service, configured.service)
+
+    def test_config_change_reinitializes(self):
+        """Test that editing the config file swaps in a new service that keeps the event bus"""
+        web_api = TaskFlowWebAPI(use_real_jira=False, config_file=self.config_file)
+        original = web_api.service
+
+        with open(self.config_file, 'w') as f:
+            f.write('{"project_key": "OTHER", "changed": true}')
+        with patch('api_service.CONFIG_CHECK_INTERVAL', 0):
+            replacement = web_api.service
+            self.assertIs(get_shared_service(False, self.config_file), replacement)
+
+        self.assertIsNot(replacement, original)
+        self.assertIs(replacement.events, original.events)
+
+    def test_service_resolved_once_per_request(self):
+        """Test that a request looks the shared service up once for its ETag and its data"""
+        web_api = TaskFlowWebAPI(use_real_jira=False)
+
+        with patch('api_service.get_shared_service', wraps=get_shared_service) as lookup:
+            response = web_api.handle_request('/api/tasks', 'GET', {'assignee': 'stacey.johnson'})
+
+        self.assertEqual(response["status"], "success")
+        self.assertIn("etag", response)
+        self.assertEqual(lookup.call_count, 1)
+
+
+class TestTaskFlowOptimisticAssignment(unittest.TestCase):
+    """Test cases for expected_version on /api/assign"""
+
+    def setUp(self):
+        """Set up a mock-backed web API"""
+        reset_shared_services()
+        self.web_api = TaskFlowWebAPI(use_real_jira=False)
+
+    def test_second_assignment_from_same_version_conflicts(self):
+        """Test that two managers assigning from the same copy can't both win"""
+        first = self.web_api.handle_request('/api/assign', 'POST', {
+            'task_key': 'TASK-101', 'assignee': 'stacey.johnson', 'expected_version': 1
+        })
+        events_before = self.web_api.service.events.last_id
+
+        second = self.web_api.handle_request('/api/assign', 'POST', {
+            'task_key': 'TASK-101', 'assignee': 'maya.patel', 'expected_version': 1
+        })
+
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(second["status"], "error")
+        self.assertTrue(second["data"]["conflict"])
+        self.assertEqual(second["data"]["task"]["assignee"], "stacey.johnson")
+        self.assertEqual(self.web_api.service.events.last_id, events_before)
+
+    def test_assignment_without_version_still_succeeds(self):
+        """Test that expected_version is optional"""
+        self.web_api.handle_request('/api/assign', 'POST', {'task_key': 'TASK-101', 'assignee': 'stacey.johnson'})
+        response = self.web_api.handle_request('/api/assign', 'POST', {
+            'task_key': 'TASK-101', 'assignee': 'maya.patel'
+        })
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(response["data"]["task"]["version"], 3)
+
+
+class TestTaskFlowCapacityCeiling(unittest.TestCase):
+    """Test cases for capacity_ceiling admission on /api/assign"""
+
+    def setUp(self):
+        """Set up a mock-backed web API with a 50% capacity ceiling"""
+        reset_shared_services()
+        self.web_api = TaskFlowWebAPI(use_real_jira=False, capacity_ceiling=0.5)
+
+    def test_assignment_over_capacity_refused(self):
+        """Test that the ceiling refuses overload and leaves the task and events untouched"""
+        service = self.web_api.service
+        first = self.web_api.handle_request('/api/assign', 'POST', {
+            'task_key': 'TASK-102', 'assignee': 'stacey.johnson'
+        })
+        events_before = service.events.last_id
+
+        # 13 + 8 points is over half of Stacey's 40
+        response = self.web_api.handle_request('/api/assign', 'POST', {
+            'task_key': 'TASK-101', 'assignee': 'stacey.johnson'
+        })
+
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(response["status"], "error")
+        self.assertTrue(response["data"]["overCapacity"])
+        self.assertEqual(response["data"]["workload"]["totalStoryPoints"], 13)
+        self.assertEqual(service.events.last_id, events_before)
+        self.assertIsNone(next(t for t in service.get_tasks() if t["key"] == "TASK-101")["assignee"])
+
+    def test_ceiling_is_part_of_shared_service_key(self):
+        """Test that web APIs with different ceilings get different services"""
+        other = TaskFlowWebAPI(use_real_jira=False)
+
+        self.assertIsNot(other.service, self.web_api.service)
+        self.assertEqual(self.web_api.service.capacity_ceiling, 0.5)
+
+
+class TestTaskFlowDeltaSync(unittest.TestCase):
+    """Test cases for the /api/tasks/changes delta endpoint"""
+
+    def setUp(self):
+        """Set up a mock-backed web API"""
+        reset_shared_services()
+        self.web_api = TaskFlowWebAPI(use_real_jira=False)
+
+    def test_full_fetch_then_delta(self):
+        """Test resyncing from the revision returned by a full fetch"""
+        revision = self.web_api.handle_request('/api/tasks')["revision"]
+        self.web_api.handle_request('/api/assign', 'POST', {
+            'task_key': 'TASK-101', 'assignee': 'stacey.johnson'
+        })
+
+        response = self.web_api.handle_request('/api/tasks/changes', 'GET', {'since': revision})
+
+        changes = response["data"]
+        self.assertEqual(len(changes["upserts"]), 1)
+        self.assertEqual(changes["upserts"][0]["assignee"], "stacey.johnson")
+        self.assertEqual(changes["revision"], revision + 1)
+
+    def test_sync_records_external_changes(self):
+        """Test that sync() appends upserts and deletions for backend changes"""
+        service = self.web_api.service
+        service.sync()
+        revision = service.get_task_revision()
+
+        tasks = service.api.tasks_data["tasks"]
+        removed = tasks.pop()
+        tasks[0]["status"] = "Done"
+        service.sync()
+
+        changes = service.get_task_changes(revision)
+        self.assertEqual(changes["deletions"], [removed["key"]])
+        self.assertEqual([t["key"] for t in changes["upserts"]], [tasks[0]["key"]])
+
+
+class TestTaskFlowTaskQueries(unittest.TestCase):
+    """Test cases for paginated /api/tasks requests"""
+
+    def setUp(self):
+        """Set up a mock-backed web API"""
+        reset_shared_services()
+        self.web_api = TaskFlowWebAPI(use_real_jira=False)
+
+    def test_paginated_response(self):
+        """Test that query parameters switch /api/tasks to a single page"""
+        response = self.web_api.handle_request('/api/tasks', 'GET', {'limit': '2', 'sort': '-storyPoints'})
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(len(response["data"]), 2)
+        self.assertIsNotNone(response["pagination"]["nextCursor"])
+        self.assertGreaterEqual(response["data"][0]["storyPoints"], response["data"][1]["storyPoints"])
+
+    def test_invalid_sort_is_client_error(self):
+        """Test that unsupported sort keys return an error response"""
+        response = self.web_api.handle_request('/api/tasks', 'GET', {'sort': 'summary'})
+
+        self.assertEqual(response["status"], "error")
+        self.assertIn("Unsupported sort key", response["message"])
+
+
+class TestTaskFlowConditionalRequests(unittest.TestCase):
+    """Test cases for ETag / If-None-Match handling on list endpoints"""
+
+    def setUp(self):
+        """Set up a mock-backed web API"""
+        reset_shared_services()
+        self.web_api = TaskFlowWebAPI(use_real_jira=False)
+
+    def test_list_endpoints_return_etag(self):
+        """Test that cacheable endpoints carry an ETag"""
+        for endpoint in ('/api/users', '/api/tasks', '/api/capacity'):
+            response = self.web_api.handle_request(endpoint)
+            self.assertEqual(response["status"], "success")
+            self.assertTrue(response["etag"].startswith('"'))
+
+    def test_matching_if_none_match_returns_not_modified(self):
+        """Test that a matching ETag short-circuits without data"""
+        etag = self.web_api.handle_request('/api/tasks')["etag"]
+
+        response = self.web_api.handle_request('/api/tasks', headers={'If-None-Match': etag})
+
+        self.assertEqual(response["status"], "not_modified")
+        self.assertIsNone(response["data"])
+        self.assertEqual(response["etag"], etag)
+
+    def test_weak_and_listed_etags_match(self):
+        """Test that weak validators and ETag lists are accepted"""
+        etag = self.web_api.handle_request('/api/users')["etag"]
+
+        response = self.web_api.handle_request(
+            '/api/users', headers={'if-none-match': f'"other", W/{etag}'}
+        )
+
+        self.assertEqual(response["status"], "not_modified")
+
+    def test_assignment_invalidates_task_etag(self):
+        """Test that a mutation bumps the revision behind the ETag"""
+        tasks_etag = self.web_api.handle_request('/api/tasks')["etag"]
+        users_etag = self.web_api.handle_request('/api/users')["etag"]
+
+        self.web_api.handle_request('/api/assign', 'POST', {
+            'task_key': 'TASK-101', 'assignee': 'stacey.johnson'
+        })
+
+        tasks_response = self.web_api.handle_request('/api/tasks', headers={'If-None-Match': tasks_etag})
+        users_response = self.web_api.handle_request('/api/users', headers={'If-None-Match': users_etag})
+
+        self.assertEqual(tasks_response["status"], "success")
+        self.assertNotEqual(tasks_response["etag"], tasks_etag)
+        self.assertEqual(users_response["status"], "not_modified")
+
+    def test_query_parameters_are_part_of_etag(self):
+        """Test that differently filtered task lists get different ETags"""
+        all_tasks = self.web_api.handle_request('/api/tasks')["etag"]
+        filtered = self.web_api.handle_request('/api/tasks', 'GET', {'project_key': 'TASK'})["etag"]
+
+        self.assertNotEqual(all_tasks, filtered)
+
+    def test_jira_etags_expire_without_sync(self):
+        """Test that JIRA-backed ETags roll over with the workload max age unless sync is running"""
+        service = TaskFlowAPIService(use_real_jira=False)
+        service.backend = 'jira'
+        service._api = SimpleNamespace(workload_max_age=60.0)
+        self.web_api.service = service
+
+        with patch('api_service.time.time', return_value=1020.0):
+            etag = self.web_api.get_etag('/api/tasks')
+        with patch('api_service.time.time', return_value=1050.0):
+            self.assertEqual(self.web_api.get_etag('/api/tasks'), etag)
+        with patch('api_service.time.time', return_value=1090.0):
+            self.assertNotEqual(self.web_api.get_etag('/api/tasks'), etag)
+
+        service._sync_thread = SimpleNamespace(is_alive=lambda: True)
+        self.assertEqual(service.etag_scope(), "")
+        service._sync_thread = None
+        service._api.workload_max_age = 0
+        self.assertIsNone(self.web_api.handle_request('/api/users').get("etag"))
+
+
+if __name__ == '__main__':
+    unittest.main()
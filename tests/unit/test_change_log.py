@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Change Log
+Tests delta queries, per-key collapsing and client-driven compaction
+"""
+
+import unittest
+import os
+import sys
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from change_log import ChangeLog
+
+
+class TestChangeLog(unittest.TestCase):
+    """Test cases for ChangeLog class"""
+
+    def setUp(self):
+        """Set up a change log with a few recorded changes"""
+        self.log = ChangeLog()
+        self.log.record_upsert({"key": "TASK-101", "assignee": "stacey.johnson"})
+        self.log.record_upsert({"key": "TASK-102", "assignee": None})
+        self.log.record_upsert({"key": "TASK-101", "assignee": "maya.patel"})
+
+    def test_revision_increments_per_change(self):
+        """Test that every change advances the revision"""
+        self.assertEqual(self.log.revision, 3)
+        self.assertEqual(self.log.record_delete("TASK-102"), 4)
+
+    def test_changes_since_collapses_to_latest_per_task(self):
+        """Test that a task changed twice is returned once, in its latest state"""
+        changes = self.log.changes_since(0)
+
+        self.assertFalse(changes["reset"])
+        self.assertEqual(changes["revision"], 3)
+        upserts = {task["key"]: task for task in changes["upserts"]}
+        self.assertEqual(len(upserts), 2)
+        self.assertEqual(upserts["TASK-101"]["assignee"], "maya.patel")
+
+    def test_changes_since_only_returns_newer_entries(self):
+        """Test that entries at or before the cursor are skipped"""
+        changes = self.log.changes_since(2)
+
+        self.assertEqual([t["key"] for t in changes["upserts"]], ["TASK-101"])
+        self.assertEqual(changes["deletions"], [])
+
+    def test_deletion_supersedes_upsert(self):
+        """Test that a deleted task is reported only as a deletion"""
+        self.log.record_delete("TASK-102")
+
+        changes = self.log.changes_since(0)
+
+        self.assertEqual(changes["deletions"], ["TASK-102"])
+        self.assertNotIn("TASK-102", [t["key"] for t in changes["upserts"]])
+
+    def test_upsert_stores_a_copy(self):
+        """Test that later mutation of the task dict does not rewrite history"""
+        task = {"key": "TASK-103", "assignee": None}
+        self.log.record_upsert(task)
+        task["assignee"] = "supraja.reddy"
+
+        changes = self.log.changes_since(3)
+
+        self.assertIsNone(changes["upserts"][0]["assignee"])
+
+    def test_compaction_waits_for_all_clients(self):
+        """Test that entries are kept until every known client has moved past them"""
+        self.log.changes_since(0, client_id="dashboard-a")
+        self.log.changes_since(3, client_id="dashboard-b")
+        self.assertEqual(len(self.log), 3)
+
+        self.log.changes_since(2, client_id="dashboard-a")
+
+        self.assertEqual(self.log.floor, 2)
+        self.assertEqual(len(self.log), 1)
+
+    def test_reset_when_cursor_was_compacted(self):
+        """Test that clients behind the compacted floor must reload"""
+        self.log.changes_since(3, client_id="dashboard-a")
+
+        changes = self.log.changes_since(1)
+
+        self.assertTrue(changes["reset"])
+
+    def test_max_entries_bounds_log(self):
+        """Test that the hard cap compacts the oldest entries"""
+        log = ChangeLog(max_entries=5)
+        for i in range(12):
+            log.record_upsert({"key": f"TASK-{i}"})
+
+        self.assertEqual(len(log), 5)
+        self.assertEqual(log.floor, 7)
+        self.assertEqual(len(log.changes_since(7)["upserts"]), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
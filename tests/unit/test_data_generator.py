@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Synthetic Data Generator
+Tests seeding, parallel generation, skill and load distributions and the output formats
+"""
+
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from unittest.mock import patch
+
+# Add src and fixture directories to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../fixtures'))
+
+from data_generator import DataGenerator, generate
+from snapshot import load_snapshot
+from sqlite_store import SQLiteTaskStore
+from test_data import TestDataFixtures
+
+
+class TestDataGenerator(unittest.TestCase):
+    """Test cases for DataGenerator"""
+
+    def setUp(self):
+        """Create an output directory"""
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the output directory"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_seeded_and_independent_of_workers(self):
+        """Test that a seed fixes the data whether chunks are built in one process or several"""
+        generator = DataGenerator(30, 250, seed=3, chunk_size=40)
+
+        sequential = list(generator.iter_records("tasks"))
+        parallel = list(generator.iter_records("tasks", workers=2))
+
+        self.assertEqual(len(sequential), 250)
+        self.assertEqual(sequential, parallel)
+        self.assertEqual(sequential, list(DataGenerator(30, 250, seed=3, chunk_size=40).iter_records("tasks")))
+        self.assertNotEqual(sequential, list(DataGenerator(30, 250, seed=4, chunk_size=40).iter_records("tasks")))
+
+    def test_zipf_skill_popularity(self):
+        """Test that zipf makes the first skills far more common than the last"""
+        generator = DataGenerator(0, 2000, seed=1, skill_distribution="zipf", zipf_exponent=1.5)
+
+        counts = Counter(skill["name"] for task in generator.iter_records("tasks")
+                         for skill in task["requiredSkills"])
+
+        self.assertGreater(counts["Python"], 5 * counts.get("Jest", 0))
+
+    def test_overloaded_team(self):
+        """Test that the overloaded group is over 90% loaded and takes most assignments"""
+        generator = DataGenerator(50, 1000, seed=2, load="overloaded", overloaded_fraction=0.2,
+                                  assigned_fraction=1.0)
+        users = list(generator.iter_records("users"))
+        overloaded = {user["username"] for user in users
+                      if user["capacity"]["currentLoad"] >= 0.9 * user["capacity"]["pointsPerSprint"]}
+
+        assignees = Counter(task["assignee"] for task in generator.iter_records("tasks"))
+
+        self.assertEqual(len(overloaded), 10)
+        self.assertEqual(overloaded, {f"user{generator.overloaded_user(i):03d}" for i in range(10)})
+        self.assertGreater(sum(assignees[name] for name in overloaded), 0.75 * 1000)
+
+    def test_invalid_settings(self):
+        """Test that unknown settings and distributions are rejected"""
+        with self.assertRaises(ValueError):
+            DataGenerator(10, 10, skew=2)
+        with self.assertRaises(ValueError):
+            DataGenerator(10, 10, skill_distribution="normal")
+
+    def test_output_formats(self):
+        """Test that JSON lines, snapshot and SQLite outputs hold the same records"""
+        expected = list(DataGenerator(20, 120, seed=5).iter_records("tasks"))
+
+        users_path, tasks_path = generate(20, 120, self.tmpdir, "jsonl", seed=5, workers=1)
+        with open(tasks_path) as f:
+            self.assertEqual([json.loads(line) for line in f], expected)
+
+        snapshot_path, = generate(20, 120, self.tmpdir, "snapshot", seed=5, workers=1)
+        users_data, tasks_data = load_snapshot(snapshot_path)
+        self.assertEqual(len(users_data["users"]), 20)
+        self.assertEqual(tasks_data["tasks"][7], expected[7])
+
+        db_path, = generate(20, 120, self.tmpdir, "sqlite", seed=5, workers=1)
+        store = SQLiteTaskStore(db_path)
+        self.assertEqual(len(store.get_users()), 20)
+        self.assertEqual(store.get_task(expected[7]["key"])["requiredSkills"], expected[7]["requiredSkills"])
+        store.close()
+
+    def test_performance_fixture_uses_generator(self):
+        """Test that the performance fixture is seeded and keeps its shape"""
+        data = TestDataFixtures.get_performance_test_data(10, 40, seed=9)
+
+        self.assertEqual(data, dict(TestDataFixtures.get_performance_test_data(10, 40, seed=9),
+                                    metadata=data["metadata"]))
+        self.assertEqual(data["tasks"][0]["key"], "PERF-000")
+        self.assertEqual(data["metadata"]["seed"], 9)
+        self.assertIn("pointsPerSprint", data["users"][0]["capacity"])
+
+    def test_seeded_performance_data_cached(self):
+        """Test that seeded datasets are generated once and every caller gets its own copy"""
+        with patch('test_data.DataGenerator', wraps=DataGenerator) as generator:
+            first = TestDataFixtures.get_performance_test_data(10, 40, seed=11)
+            first["tasks"][0]["assignee"] = "changed"
+            second = TestDataFixtures.get_performance_test_data(10, 40, seed=11)
+            TestDataFixtures.get_performance_test_data(10, 40)
+
+        self.assertEqual(generator.call_count, 2)
+        self.assertNotEqual(second["tasks"][0]["assignee"], "changed")
+        self.assertEqual(second["users"], first["users"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Decision Log
+Tests batched background writes, daily segments and retention pruning
+"""
+
+import unittest
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from decision_log import DecisionLog
+
+
+class TestDecisionLog(unittest.TestCase):
+    """Test cases for DecisionLog"""
+
+    def setUp(self):
+        """Open a log in a temporary directory"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.log = DecisionLog(self.tmpdir)
+        self.candidates = [
+            {"username": "maya.patel", "score": 0.9, "factors": {"skillFit": 1.0, "loadFactor": 0.6}},
+            {"username": "stacey.johnson", "score": 0.5, "factors": {"skillFit": 0.5, "loadFactor": 0.5}},
+            {"username": "supraja.reddy", "score": 0.0, "factors": {"skillFit": 0.2, "loadFactor": 0.1},
+             "excluded": True}
+        ]
+
+    def tearDown(self):
+        """Stop the writer and remove the log directory"""
+        self.log.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_entries_written_in_order(self):
+        """Test that flushed entries are readable in the order logged"""
+        recommendation_id = self.log.log_recommendation("TASK-101", self.candidates)
+        self.log.log_assignment("TASK-101", "maya.patel",
+                                {"id": recommendation_id, "candidates": self.candidates}, approver="lead")
+
+        self.assertTrue(self.log.flush())
+        entries = list(self.log.read())
+
+        self.assertEqual([e["type"] for e in entries], ["recommendation", "assignment"])
+        self.assertEqual(entries[0]["candidates"][0]["factors"]["skillFit"], 1.0)
+        self.assertEqual(entries[1]["recommendationId"], recommendation_id)
+        self.assertEqual(entries[1]["approver"], "lead")
+        self.assertEqual(entries[1]["feedback"], {"accepted": True, "reason": None})
+
+    def test_assignment_feedback(self):
+        """Test feedback when the recommendation is overridden"""
+        recommendation = {"id": "r1", "candidates": self.candidates}
+        self.log.log_assignment("TASK-101", "stacey.johnson", recommendation)
+        self.log.log_assignment("TASK-101", "supraja.reddy", recommendation)
+        self.log.log_assignment("TASK-102", "maya.patel")
+        self.log.flush()
+
+        feedback = [e["feedback"] for e in self.log.read()]
+
+        self.assertEqual(feedback[0], {"accepted": False, "reason": "Chose candidate ranked #2"})
+        self.assertEqual(feedback[1]["reason"], "Chose a member outside the recommendations")
+        self.assertIsNone(feedback[2])
+
+    def test_segments_partitioned_by_day(self):
+        """Test that entries land in the segment for their UTC date"""
+        self.log.log_recommendation("TASK-101", self.candidates)
+        self.log.flush()
+
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+
+        self.assertEqual(self.log.segments(), [self.log.segment_path(today)])
+
+    def test_prune_drops_whole_expired_segments(self):
+        """Test that retention removes old segment files and keeps recent ones"""
+        today = datetime.date(2025, 6, 1)
+        old = self.log.segment_path(today - datetime.timedelta(days=400))
+        recent = self.log.segment_path(today - datetime.timedelta(days=30))
+        for path in (old, recent):
+            with open(path, 'w') as f:
+                f.write('{"type": "recommendation"}\n')
+
+        removed = self.log.prune(today)
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(self.log.segments(), [recent])
+
+    def test_read_date_range(self):
+        """Test that read() only opens segments inside the range"""
+        day = datetime.date(2025, 1, 15)
+        with open(self.log.segment_path(day), 'w') as f:
+            f.write('{"type": "assignment", "taskKey": "TASK-1"}\n')
+
+        self.assertEqual(len(list(self.log.read(start=day, end=day))), 1)
+        self.assertEqual(list(self.log.read(start=day + datetime.timedelta(days=1), end=day + datetime.timedelta(days=2))), [])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that logging never blocks the caller when the writer falls behind"""
+        log = DecisionLog(os.path.join(self.tmpdir, "small"), max_queue=1)
+        log.close()
+
+        log.log_recommendation("TASK-101", self.candidates)
+        log.log_recommendation("TASK-102", self.candidates)
+
+        self.assertEqual(log.dropped, 1)
+
+    def test_flush_gives_up_on_a_full_queue(self):
+        """Test that flush returns False instead of blocking when the queue stays full"""
+        log = DecisionLog(os.path.join(self.tmpdir, "small"), max_queue=1)
+        log.close()
+        log.log_recommendation("TASK-101", self.candidates)
+
+        self.assertFalse(log.flush(timeout=0.05))
+        self.assertTrue(log.close())
+
+
+if __name__ == '__main__':
+    unittest.main()
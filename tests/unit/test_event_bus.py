@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Event Bus
+Tests event ordering, long-poll waiting and buffer overflow handling
+"""
+
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from event_bus import EventBus, TASK_ASSIGNED, WORKLOAD_CHANGED
+
+
+class TestEventBus(unittest.TestCase):
+    """Test cases for EventBus class"""
+
+    def setUp(self):
+        """Set up a fresh event bus for each test"""
+        self.bus = EventBus(max_events=5)
+
+    def test_publish_assigns_increasing_ids(self):
+        """Test that events get monotonically increasing ids"""
+        first = self.bus.publish(TASK_ASSIGNED, {"taskKey": "TASK-101"})
+        second = self.bus.publish(WORKLOAD_CHANGED, {"username": "maya.patel"})
+
+        self.assertEqual(first["id"], 1)
+        self.assertEqual(second["id"], 2)
+        self.assertEqual(self.bus.last_id, 2)
+
+    def test_get_events_since_cursor(self):
+        """Test that only events after the cursor are returned"""
+        for i in range(3):
+            self.bus.publish(TASK_ASSIGNED, {"taskKey": f"TASK-{i}"})
+
+        result = self.bus.get_events(since=1)
+
+        self.assertEqual([e["id"] for e in result["events"]], [2, 3])
+        self.assertEqual(result["cursor"], 3)
+        self.assertFalse(result["reset"])
+
+    def test_get_events_returns_immediately_without_timeout(self):
+        """Test that polling with no timeout does not block"""
+        result = self.bus.get_events(since=0)
+
+        self.assertEqual(result["events"], [])
+        self.assertEqual(result["cursor"], 0)
+
+    def test_long_poll_wakes_on_publish(self):
+        """Test that a waiting consumer is released by a new event"""
+        def publish_later():
+            time.sleep(0.05)
+            self.bus.publish(TASK_ASSIGNED, {"taskKey": "TASK-101"})
+
+        publisher = threading.Thread(target=publish_later)
+        publisher.start()
+
+        start = time.time()
+        result = self.bus.get_events(since=0, timeout=5)
+        publisher.join()
+
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual(len(result["events"]), 1)
+        self.assertEqual(result["events"][0]["data"]["taskKey"], "TASK-101")
+
+    def test_reset_when_events_dropped(self):
+        """Test that consumers behind the buffer are told to reload"""
+        for i in range(8):
+            self.bus.publish(TASK_ASSIGNED, {"taskKey": f"TASK-{i}"})
+
+        result = self.bus.get_events(since=1)
+
+        self.assertTrue(result["reset"])
+        self.assertEqual(len(result["events"]), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the JIRA Request Scheduler
+Tests the priority token bucket, Retry-After handling and retries against a local 429 server
+"""
+
+import unittest
+import os
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from jira_scheduler import (
+    BACKGROUND, INTERACTIVE, JiraRateLimitError, JiraScheduler, TokenBucket, call_priority, retry_after
+)
+from jira_api import JiraAPIService
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers 429 with Retry-After for the first ``throttle`` requests, then 200"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            throttled = server.requests <= server.throttle
+        if throttled:
+            self.send_response(429)
+            self.send_header("Retry-After", server.retry_after)
+            body = b'{"errorMessages": ["Rate limit exceeded"]}'
+        else:
+            self.send_response(200)
+            body = b'{"issues": []}'
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HTTPStatusError(Exception):
+    """Stand-in for JIRAError: a status code and the response headers"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for TokenBucket"""
+
+    def test_burst_then_rate(self):
+        """Test that a full bucket serves its burst at once and then refills at the rate"""
+        bucket = TokenBucket(rate=50, burst=2)
+
+        self.assertLess(bucket.acquire() + bucket.acquire(), 0.01)
+        self.assertGreaterEqual(bucket.acquire(), 0.01)
+
+    def test_interactive_served_before_background(self):
+        """Test that a later interactive caller goes ahead of a waiting background one"""
+        bucket = TokenBucket(rate=20, burst=1)
+        bucket.acquire()
+        order = []
+
+        def waiter(priority, name):
+            bucket.acquire(priority)
+            order.append(name)
+
+        background = threading.Thread(target=waiter, args=(BACKGROUND, "sync"))
+        background.start()
+        time.sleep(0.01)
+        interactive = threading.Thread(target=waiter, args=(INTERACTIVE, "assign"))
+        interactive.start()
+        background.join(2)
+        interactive.join(2)
+
+        self.assertEqual(order, ["assign", "sync"])
+
+    def test_pause_blocks_all_callers(self):
+        """Test that no token is handed out until a pause ends"""
+        bucket = TokenBucket(rate=1000, burst=10)
+        bucket.pause(0.05)
+
+        self.assertGreaterEqual(bucket.acquire(), 0.04)
+
+    def test_invalid_settings(self):
+        """Test that a bucket needs a positive rate and burst"""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, burst=1)
+
+
+class TestRetryAfter(unittest.TestCase):
+    """Test cases for rate-limit header parsing"""
+
+    def test_seconds_and_dates(self):
+        """Test Retry-After seconds, Retry-After HTTP dates and X-RateLimit-Reset"""
+        later = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        self.assertEqual(retry_after({"Retry-After": "7"}), 7.0)
+        self.assertAlmostEqual(retry_after({"Retry-After": format_datetime(later, usegmt=True)}), 30, delta=2)
+        self.assertAlmostEqual(retry_after({"X-RateLimit-Reset": later.isoformat()}), 30, delta=2)
+        self.assertIsNone(retry_after({}))
+
+
+class TestJiraScheduler(unittest.TestCase):
+    """Test JiraScheduler against a local server that throttles"""
+
+    def setUp(self):
+        """Start a throttling server on an ephemeral port"""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.throttle = 2
+        self.server.retry_after = "0.05"
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/rest/api/2/search"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        """Stop the server"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch(self):
+        with urllib.request.urlopen(self.url, timeout=5) as response:
+            return response.read()
+
+    def test_429s_retried_after_retry_after(self):
+        """Test that throttled reads wait out Retry-After, slow the bucket and then succeed"""
+        scheduler = JiraScheduler(requests_per_second=100, burst=5)
+        start = time.monotonic()
+
+        body = scheduler.call("search_issues", self.fetch)
+
+        self.assertEqual(body, b'{"issues": []}')
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(scheduler.stats["throttled"], 2)
+        self.assertLess(scheduler.bucket.rate, 100)
+
+    def test_gives_up_after_max_retries(self):
+        """Test that persistent throttling surfaces as JiraRateLimitError"""
+        self.server.throttle = 100
+        scheduler = JiraScheduler(requests_per_second=100, burst=5, max_retries=2)
+
+        with self.assertRaises(JiraRateLimitError):
+            scheduler.call("search_issues", self.fetch)
+        self.assertEqual(self.server.requests, 3)
+
+    def test_long_retry_after_not_waited_out(self):
+        """Test that a Retry-After beyond max_wait fails fast instead of blocking the request"""
+        self.server.retry_after = "120"
+        scheduler = JiraScheduler(max_wait=10)
+
+        with self.assertRaises(JiraRateLimitError) as raised:
+            scheduler.call("search_issues", self.fetch)
+        self.assertEqual(raised.exception.retry_after, 120)
+        self.assertEqual(self.server.requests, 1)
+
+
+class TestJiraSchedulerRetries(unittest.TestCase):
+    """Test JiraScheduler retry decisions"""
+
+    def test_server_errors_retried_for_reads_only(self):
+        """Test that 5xx responses are retried with backoff for reads but not for writes"""
+        sleeps = []
+        scheduler = JiraScheduler(sleep=sleeps.append)
+        read = MagicMock(side_effect=[HTTPStatusError(503), HTTPStatusError(502), "ok"])
+        write = MagicMock(side_effect=HTTPStatusError(503))
+
+        self.assertEqual(scheduler.call("issue", read), "ok")
+        with self.assertRaises(HTTPStatusError):
+            scheduler.call("update", write, idempotent=False)
+
+        self.assertEqual(len(sleeps), 2)
+        self.assertTrue(all(0 <= delay <= scheduler.backoff_max for delay in sleeps))
+        self.assertEqual(write.call_count, 1)
+
+    def test_client_errors_not_retried(self):
+        """Test that errors like 404 are raised immediately"""
+        scheduler = JiraScheduler()
+        call = MagicMock(side_effect=HTTPStatusError(404))
+
+        with self.assertRaises(HTTPStatusError):
+            scheduler.call("issue", call)
+        self.assertEqual(call.call_count, 1)
+
+    def test_from_config(self):
+        """Test that the rate_limit config section overrides the defaults"""
+        scheduler = JiraScheduler.from_config({"rate_limit": {"requests_per_second": 3, "burst": 4}})
+
+        self.assertEqual(scheduler.bucket.rate, 3)
+        self.assertEqual(scheduler.bucket.burst, 4)
+        self.assertEqual(scheduler.max_retries, 4)
+
+
+class TestJiraServiceRateLimits(unittest.TestCase):
+    """Test that JiraAPIService surfaces throttling instead of returning empty data"""
+
+    def setUp(self):
+        """Create a JiraAPIService whose client is always throttled"""
+        with patch.object(JiraAPIService, 'connect', return_value=False):
+            self.service = JiraAPIService()
+        self.service.scheduler = JiraScheduler(requests_per_second=1000, burst=10, max_retries=1)
+        throttled = HTTPStatusError(429, {"Retry-After": "0"})
+        self.service.jira_client = MagicMock()
+        self.service.jira_client.project.side_effect = throttled
+        self.service.jira_client.search_issues.side_effect = throttled
+        self.service.jira_client.issue.side_effect = throttled
+
+    def test_reads_raise_rather_than_return_empty(self):
+        """Test that a throttled team/task read raises instead of showing an empty team"""
+        with self.assertRaises(JiraRateLimitError):
+            self.service.get_users()
+        with self.assertRaises(JiraRateLimitError):
+            self.service.get_team_capacity_overview()
+        with self.assertRaises(JiraRateLimitError):
+            self.service.get_tasks()
+
+    def test_assignment_reports_rate_limit(self):
+        """Test that a throttled assignment fails with a retry hint"""
+        result = self.service.assign_task("SCRUM-1", "alice")
+
+        self.assertFalse(result["success"])
+        self.assertTrue(result["rateLimited"])
+        self.assertEqual(result["retryAfter"], 0)
+
+    def test_call_priority_scoped(self):
+        """Test that call_priority only applies inside its block"""
+        from jira_scheduler import NORMAL, _priority
+
+        with call_priority(BACKGROUND):
+            self.assertEqual(_priority.get(), BACKGROUND)
+        self.assertEqual(_priority.get(), NORMAL)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Streaming JSON Encoding
+Tests incremental list encoding and gzip/deflate negotiation
+"""
+
+import unittest
+import gzip
+import json
+import os
+import sys
+import zlib
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from json_stream import iter_json_list_response, negotiate_encoding, iter_compressed, compress
+
+
+class TestStreamingJSON(unittest.TestCase):
+    """Test cases for iter_json_list_response"""
+
+    def setUp(self):
+        """Set up sample task records"""
+        self.tasks = [
+            {"key": f"TASK-{i}", "summary": f"Task {i}", "description": "x" * 200, "storyPoints": i}
+            for i in range(100)
+        ]
+
+    def test_stream_matches_regular_encoding(self):
+        """Test that the streamed document parses to the same response"""
+        body = b"".join(iter_json_list_response(iter(self.tasks), "Retrieved {count} tasks", {"revision": 7}))
+
+        response = json.loads(body)
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(response["data"], self.tasks)
+        self.assertEqual(response["message"], "Retrieved 100 tasks")
+        self.assertEqual(response["revision"], 7)
+
+    def test_stream_emits_multiple_chunks(self):
+        """Test that large lists are split into bounded chunks"""
+        chunks = list(iter_json_list_response(iter(self.tasks), "{count}", chunk_size=1024))
+
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(len(chunk) < 2048 for chunk in chunks))
+
+    def test_stream_consumes_items_lazily(self):
+        """Test that items are pulled from the generator as chunks are produced"""
+        produced = []
+
+        def generate():
+            for task in self.tasks:
+                produced.append(task["key"])
+                yield task
+
+        chunks = iter_json_list_response(generate(), "{count}", chunk_size=1024)
+        next(chunks)
+
+        self.assertLess(len(produced), len(self.tasks))
+
+    def test_empty_list(self):
+        """Test encoding of an empty result"""
+        response = json.loads(b"".join(iter_json_list_response(iter([]), "Retrieved {count} users")))
+
+        self.assertEqual(response["data"], [])
+        self.assertEqual(response["message"], "Retrieved 0 users")
+
+
+class TestCompression(unittest.TestCase):
+    """Test cases for Accept-Encoding negotiation and compression"""
+
+    def test_negotiate_prefers_gzip(self):
+        """Test that gzip is chosen when both encodings are accepted"""
+        self.assertEqual(negotiate_encoding("deflate, gzip"), "gzip")
+        self.assertEqual(negotiate_encoding("gzip;q=0, deflate"), "deflate")
+        self.assertEqual(negotiate_encoding("*"), "gzip")
+
+    def test_negotiate_identity(self):
+        """Test that no compression is used when nothing suitable is accepted"""
+        self.assertIsNone(negotiate_encoding(None))
+        self.assertIsNone(negotiate_encoding("br, identity"))
+        self.assertIsNone(negotiate_encoding("gzip;q=0"))
+
+    def test_gzip_stream_round_trip(self):
+        """Test that chunk-wise gzip output decompresses to the original"""
+        chunks = [b'{"data": [', b'1, 2, 3', b']}']
+
+        body = b"".join(iter_compressed(chunks, "gzip"))
+
+        self.assertEqual(gzip.decompress(body), b"".join(chunks))
+
+    def test_deflate_round_trip(self):
+        """Test that deflate output is a zlib stream"""
+        body = b'{"status": "success"}' * 100
+
+        self.assertEqual(zlib.decompress(compress(body, "deflate")), body)
+
+
+if __name__ == '__main__':
+    unittest.main()
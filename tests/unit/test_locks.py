@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Store Locking
+Tests the reader-writer and striped locks and hammers MockJiraAPI from many threads
+"""
+
+import unittest
+import os
+import random
+import sys
+import threading
+import time
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from locks import ReadWriteLock, StripedLock
+from mock_jira_api import MockJiraAPI
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test cases for ReadWriteLock"""
+
+    def test_readers_share(self):
+        """Test that several readers hold the lock at once"""
+        lock = ReadWriteLock()
+        both_inside = threading.Barrier(2, timeout=2)
+
+        def reader():
+            with lock.read():
+                both_inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertFalse(both_inside.broken)
+
+    def test_writer_excludes_readers(self):
+        """Test that a reader waits for the writer to finish"""
+        lock = ReadWriteLock()
+        events = []
+
+        def reader_body():
+            with lock.read():
+                events.append("read")
+
+        lock.acquire_write()
+        reader = threading.Thread(target=reader_body)
+        reader.start()
+        time.sleep(0.05)
+        events.append("write done")
+        lock.release_write()
+        reader.join(2)
+
+        self.assertEqual(events, ["write done", "read"])
+
+    def test_waiting_writer_blocks_new_readers(self):
+        """Test that readers arriving after a queued writer run after it"""
+        lock = ReadWriteLock()
+        events = []
+
+        lock.acquire_read()
+        writer = threading.Thread(target=lambda: (lock.acquire_write(), events.append("write"), lock.release_write()))
+        writer.start()
+        time.sleep(0.05)
+        reader = threading.Thread(target=lambda: (lock.acquire_read(), events.append("read"), lock.release_read()))
+        reader.start()
+        time.sleep(0.05)
+        lock.release_read()
+        writer.join(2)
+        reader.join(2)
+
+        self.assertEqual(events, ["write", "read"])
+
+
+class TestStripedLock(unittest.TestCase):
+    """Test cases for StripedLock"""
+
+    def test_same_key_same_stripe(self):
+        """Test that a key always maps to the same lock"""
+        locks = StripedLock(8)
+
+        self.assertIs(locks.lock_for("TASK-1"), locks.lock_for("TASK-1"))
+        self.assertLess(locks.stripe("TASK-1"), 8)
+
+    def test_hold_takes_each_stripe_once(self):
+        """Test that keys sharing a stripe don't self-deadlock and are all released"""
+        locks = StripedLock(1)
+
+        with locks.hold("a", "b", "c"):
+            self.assertTrue(locks.lock_for("a").locked())
+        self.assertFalse(locks.lock_for("a").locked())
+
+    def test_opposite_order_does_not_deadlock(self):
+        """Test that holders naming keys in opposite orders both finish"""
+        locks = StripedLock(64)
+        keys = ["alice", "bob"]
+
+        def worker(order):
+            for _ in range(2000):
+                with locks.hold(*order):
+                    pass
+
+        threads = [threading.Thread(target=worker, args=(keys,)),
+                   threading.Thread(target=worker, args=(keys[::-1],))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+
+    def test_invalid_stripe_count(self):
+        """Test that a lock needs at least one stripe"""
+        with self.assertRaises(ValueError):
+            StripedLock(0)
+
+
+class TestMockJiraConcurrency(unittest.TestCase):
+    """Stress MockJiraAPI with concurrent assignments and reads"""
+
+    WRITERS = 8
+    READERS = 4
+    ASSIGNS_PER_WRITER = 400
+
+    def setUp(self):
+        """Create a larger dataset and shorten the thread switch interval"""
+        self.api = MockJiraAPI()
+        self.api.users_data = {"users": [
+            {"username": f"user{i}", "displayName": f"User {i}", "timeZone": "UTC",
+             "capacity": {"pointsPerSprint": 40}}
+            for i in range(20)
+        ]}
+        self.api.tasks_data = {"tasks": [
+            {"key": f"T-{i}", "project": "T", "assignee": None, "status": "To Do",
+             "priority": "High" if i % 2 else "Low", "storyPoints": i % 8 + 1, "labels": []}
+            for i in range(500)
+        ]}
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        """Restore the thread switch interval"""
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_concurrent_assigns_and_reads(self):
+        """Test that readers never see half-applied assignments and totals stay exact"""
+        usernames = [user["username"] for user in self.api.get_users()]
+        errors = []
+        writers_done = threading.Event()
+
+        def writer(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(self.ASSIGNS_PER_WRITER):
+                    result = self.api.assign_task(f"T-{rng.randrange(500)}", rng.choice(usernames))
+                    if not result["success"]:
+                        errors.append(result["message"])
+            except Exception as e:
+                errors.append(repr(e))
+
+        def reader(seed):
+            rng = random.Random(seed)
+            try:
+                while not writers_done.is_set():
+                    for task in self.api.get_tasks():
+                        # assignee and status change together, so they must agree
+                        if (task["assignee"] is None) != (task["status"] == "To Do"):
+                            errors.append(f"torn read of {task['key']}")
+                    username = rng.choice(usernames)
+                    page = self.api.query_tasks(assignee=username, priorities="High", limit=50)
+                    if any(task["priority"] != "High" for task in page["tasks"]):
+                        errors.append("index returned a task outside the filter")
+                    self.api.get_user_workload(username)
+                    self.api.get_team_capacity_overview()
+            except Exception as e:
+                errors.append(repr(e))
+
+        writers = [threading.Thread(target=writer, args=(i,)) for i in range(self.WRITERS)]
+        readers = [threading.Thread(target=reader, args=(100 + i,)) for i in range(self.READERS)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join(60)
+        writers_done.set()
+        for thread in readers:
+            thread.join(60)
+
+        self.assertEqual(errors, [])
+
+        tasks = self.api.get_tasks()
+        for username in usernames:
+            assigned = [task for task in tasks if task["assignee"] == username]
+            workload = self.api.get_user_workload(username)
+            self.assertEqual(workload["assignedTasks"], len(assigned))
+            self.assertEqual(workload["totalStoryPoints"], sum(task["storyPoints"] for task in assigned))
+            self.assertEqual(self.api.query_tasks(assignee=username, limit=500)["total"], len(assigned))
+        self.assertEqual(self.api.query_tasks(assignee="unassigned", limit=500)["total"],
+                         sum(1 for task in tasks if task["assignee"] is None))
+        self.assertEqual(self.api.change_log.revision, self.WRITERS * self.ASSIGNS_PER_WRITER)
+
+    def test_capacity_ceiling_under_contention(self):
+        """Test that concurrent assignments to one user stop exactly at the ceiling"""
+        results = []
+
+        def writer(offset):
+            for i in range(offset, 500, self.WRITERS):
+                results.append(self.api.assign_task(f"T-{i}", "user0", max_utilization=1.0))
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(self.WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+
+        assigned = self.api.get_tasks(assignee="user0")
+        points = sum(task["storyPoints"] for task in assigned)
+        self.assertLessEqual(points, 40)
+        self.assertEqual(self.api.get_user_workload("user0")["totalStoryPoints"], points)
+        self.assertEqual(sum(1 for result in results if result["success"]), len(assigned))
+        self.assertTrue(all(result.get("overCapacity") for result in results if not result["success"]))
+
+    def test_dataset_swap_during_assigns(self):
+        """Test that replacing tasks_data waits for in-flight assignments"""
+        replacement = {"tasks": [{"key": "T-0", "project": "T", "assignee": None, "status": "To Do",
+                                  "storyPoints": 1}]}
+        errors = []
+
+        def writer():
+            try:
+                for i in range(300):
+                    self.api.assign_task("T-0", f"user{i % 20}")
+            except Exception as e:
+                errors.append(repr(e))
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        self.api.tasks_data = replacement
+        thread.join(30)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.api.get_tasks()), 1)
+        assignee = self.api.get_tasks()[0]["assignee"]
+        for user in self.api.get_users():
+            expected = 1 if user["username"] == assignee else 0
+            self.assertEqual(self.api.get_user_workload(user["username"])["assignedTasks"], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
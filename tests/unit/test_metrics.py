@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Metrics
+Tests latency histograms, the Prometheus exposition and request/backend instrumentation
+"""
+
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from metrics import (
+    BACKEND_CALLS, BACKEND_ERRORS, REQUEST_EXCEPTIONS, REQUEST_LATENCY, REQUESTS,
+    LatencyHistogram, MetricsRegistry, instrument_backend
+)
+from api_service import TaskFlowWebAPI, reset_shared_services
+from jira_api import JiraAPIService
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for LatencyHistogram"""
+
+    def test_percentiles_within_relative_error(self):
+        """Test that percentiles land within the bucket precision of the true value"""
+        histogram = LatencyHistogram()
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000)
+
+        for quantile, expected in ((0.5, 0.5), (0.9, 0.9), (0.99, 0.99)):
+            self.assertAlmostEqual(histogram.percentile(quantile), expected, delta=expected * 0.035)
+        self.assertEqual(histogram.percentile(1.0), 1.0)
+        self.assertEqual(histogram.count, 1000)
+
+    def test_empty_and_clamped(self):
+        """Test an empty histogram and values past the tracked range"""
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.percentile(0.99), 0.0)
+
+        histogram.record(10 ** 9)
+        histogram.record(-1)
+
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.counts[-1], 1)
+        self.assertEqual(histogram.counts[0], 1)
+
+    def test_cumulative_counts(self):
+        """Test Prometheus-style cumulative buckets"""
+        histogram = LatencyHistogram()
+        for seconds in (0.0005, 0.003, 0.003, 0.2, 3.0):
+            histogram.record(seconds)
+
+        self.assertEqual(histogram.cumulative_counts((0.001, 0.005, 0.25, 2.0)), [1, 3, 4, 4])
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for MetricsRegistry and its text exposition"""
+
+    def test_prometheus_text_format(self):
+        """Test counter, gauge and histogram rendering"""
+        registry = MetricsRegistry()
+        requests = registry.counter("demo_requests_total", "Requests", ("endpoint",))
+        in_flight = registry.gauge("demo_in_flight", "In flight")
+        latency = registry.histogram("demo_seconds", "Latency", ("endpoint",))
+
+        requests.inc('/api/"quoted"')
+        requests.inc('/api/"quoted"', amount=2)
+        in_flight.inc()
+        in_flight.dec()
+        latency.observe(0.003, "/api/capacity")
+
+        text = registry.render()
+        self.assertIn("# TYPE demo_requests_total counter", text)
+        self.assertIn('demo_requests_total{endpoint="/api/\\"quoted\\""} 3', text)
+        self.assertIn("demo_in_flight 0", text)
+        self.assertIn('demo_seconds_bucket{endpoint="/api/capacity",le="0.0025"} 0', text)
+        self.assertIn('demo_seconds_bucket{endpoint="/api/capacity",le="0.005"} 1', text)
+        self.assertIn('demo_seconds_bucket{endpoint="/api/capacity",le="+Inf"} 1', text)
+        self.assertIn('demo_seconds_count{endpoint="/api/capacity"} 1', text)
+        self.assertIn('demo_seconds_quantile{endpoint="/api/capacity",quantile="0.99"}', text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_conflicting_registration_rejected(self):
+        """Test that a name can't be reused with another type or label set"""
+        registry = MetricsRegistry()
+        counter = registry.counter("demo_total", "Demo", ("a",))
+
+        self.assertIs(registry.counter("demo_total", "Demo", ("a",)), counter)
+        with self.assertRaises(ValueError):
+            registry.gauge("demo_total", "Demo", ("a",))
+        with self.assertRaises(ValueError):
+            counter.inc("x", "y")
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test request and backend instrumentation"""
+
+    def setUp(self):
+        """Set up a mock-backed web API"""
+        reset_shared_services()
+        self.web_api = TaskFlowWebAPI(use_real_jira=False)
+
+    def test_backend_calls_counted_by_method(self):
+        """Test that the listed backend methods count calls and errors and helpers are left alone"""
+        @instrument_backend("demo", methods=("ok", "fail", "missing"))
+        class Backend:
+            def ok(self):
+                return 1
+
+            def fail(self):
+                raise RuntimeError("boom")
+
+            def helper(self):
+                return 2
+
+        backend = Backend()
+        backend.ok()
+        backend.helper()
+        with self.assertRaises(RuntimeError):
+            backend.fail()
+
+        self.assertEqual(BACKEND_CALLS.value("demo", "ok"), 1)
+        self.assertEqual(BACKEND_CALLS.value("demo", "helper"), 0)
+        self.assertEqual(BACKEND_ERRORS.value("demo", "fail"), 1)
+
+    def test_per_record_helpers_not_instrumented(self):
+        """Test that JIRA's per-issue helpers are plain methods and the interface is wrapped"""
+        for name in ("issue_to_task", "get_story_points", "extract_required_skills", "build_jql",
+                     "get_user_skills", "get_user_capacity"):
+            self.assertFalse(hasattr(getattr(JiraAPIService, name), "__wrapped__"), name)
+        self.assertTrue(hasattr(JiraAPIService.query_tasks, "__wrapped__"))
+
+    def test_requests_timed_per_endpoint(self):
+        """Test that handle_request records latency, status and backend calls"""
+        before = REQUESTS.value('/api/capacity', 'GET', 'success')
+        calls_before = BACKEND_CALLS.value("mock", "get_team_capacity_overview")
+
+        self.web_api.handle_request('/api/capacity')
+        self.web_api.handle_request('/api/nope')
+
+        self.assertEqual(REQUESTS.value('/api/capacity', 'GET', 'success'), before + 1)
+        self.assertGreaterEqual(REQUESTS.value('unmatched', 'GET', 'error'), 1)
+        self.assertGreaterEqual(REQUEST_LATENCY.histogram('/api/capacity', 'GET').count, 1)
+        self.assertEqual(BACKEND_CALLS.value("mock", "get_team_capacity_overview"), calls_before + 1)
+
+    def test_templated_endpoints_share_a_label(self):
+        """Test that per-user requests are counted under one templated endpoint label"""
+        before = REQUESTS.value('/api/users/{username}', 'GET', 'success')
+
+        self.web_api.handle_request('/api/users/stacey.johnson')
+        self.web_api.handle_request('/api/users/maya.patel')
+
+        self.assertEqual(REQUESTS.value('/api/users/{username}', 'GET', 'success'), before + 2)
+        self.assertEqual(self.web_api.metrics_label('/api/users/'), 'unmatched')
+
+    def test_exceptions_counted(self):
+        """Test that swallowed exceptions are counted by type"""
+        before = REQUEST_EXCEPTIONS.value('/api/users', 'KeyError')
+
+        with patch.object(self.web_api.service, 'get_users', side_effect=KeyError('x')):
+            response = self.web_api.handle_request('/api/users')
+
+        self.assertEqual(response["status"], "error")
+        self.assertEqual(REQUEST_EXCEPTIONS.value('/api/users', 'KeyError'), before + 1)
+
+    def test_metrics_endpoint(self):
+        """Test that /api/metrics returns the exposition text"""
+        self.web_api.handle_request('/api/users')
+
+        response = self.web_api.handle_request('/api/metrics')
+
+        self.assertEqual(response["status"], "success")
+        self.assertIn('taskflow_requests_total{endpoint="/api/users",method="GET",status="success"}',
+                      response["data"])
+        self.assertIn('taskflow_backend_calls_total{backend="mock",method="get_users"}', response["data"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -171,6 +171,22 @@ class TestMockJiraAPI(unittest.TestCase):
         self.assertEqual(result["task"]["status"], "In Progress")
         self.assertIn("updated", result["task"])
 
+    def test_assign_task_with_expected_version(self):
+        """Test that assignments bump the version and stale versions are rejected"""
+        api = MockJiraAPI()
+        api.tasks_data = self.sample_tasks_data
+        
+        first = api.assign_task("TEST-001", "test.user", expected_version=1)
+        stale = api.assign_task("TEST-001", "other.user", expected_version=1)
+        
+        self.assertTrue(first["success"])
+        self.assertEqual(first["task"]["version"], 2)
+        self.assertFalse(stale["success"])
+        self.assertTrue(stale["conflict"])
+        self.assertEqual(stale["currentVersion"], 2)
+        self.assertEqual(api.get_tasks()[0]["assignee"], "test.user")
+        self.assertTrue(api.assign_task("TEST-001", "other.user", expected_version="2")["success"])
+
     def test_assign_task_not_found(self):
         """Test assignment of non-existent task"""
         api = MockJiraAPI()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Parallel Test Runner
+Tests class discovery, per-test timings and the parallel run summary of tests/run_tests.py
+"""
+
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add the tests directory to path for the runner (it adds the project paths)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import run_tests
+from run_tests import TaskFlowTestRunner, discover_test_classes, run_test_class
+
+SAMPLE_TESTS = '''
+import time
+import unittest
+
+
+class TestSample(unittest.TestCase):
+    def test_passes(self):
+        pass
+
+    def test_fails(self):
+        self.assertEqual(1, 2)
+
+    @unittest.skip("not today")
+    def test_skipped(self):
+        pass
+
+    def test_slow(self):
+        time.sleep(0.05)
+
+
+class TestOther(unittest.TestCase):
+    def test_passes(self):
+        pass
+'''
+
+
+class TestParallelRunner(unittest.TestCase):
+    """Test cases for the --parallel mode of run_tests.py"""
+
+    def setUp(self):
+        """Write a sample test module to a temporary directory"""
+        self.tmpdir = tempfile.mkdtemp()
+        with open(os.path.join(self.tmpdir, 'test_parallel_sample.py'), 'w') as f:
+            f.write(SAMPLE_TESTS)
+        with open(os.path.join(self.tmpdir, 'test_parallel_broken.py'), 'w') as f:
+            f.write("import module_that_does_not_exist\n")
+
+    def tearDown(self):
+        """Remove the sample tests"""
+        shutil.rmtree(self.tmpdir)
+        for name in ('test_parallel_sample', 'test_parallel_broken'):
+            sys.modules.pop(name, None)
+
+    def test_discovery(self):
+        """Test that classes are found with their test counts and import errors are kept apart"""
+        classes, broken = discover_test_classes([self.tmpdir])
+
+        self.assertEqual(sorted(classes), [((self.tmpdir, 'test_parallel_sample', 'TestOther'), 1),
+                                           ((self.tmpdir, 'test_parallel_sample', 'TestSample'), 4)])
+        self.assertEqual(broken.countTestCases(), 1)
+
+    def test_class_timings(self):
+        """Test the outcome, duration and failure details of every test in a class"""
+        result = run_test_class((self.tmpdir, 'test_parallel_sample', 'TestSample'))
+        tests = {test['test'].rsplit('.', 1)[-1]: test for test in result['tests']}
+
+        self.assertEqual(result['name'], 'test_parallel_sample.TestSample')
+        self.assertEqual({name: test['outcome'] for name, test in tests.items()},
+                         {'test_passes': 'passed', 'test_fails': 'failed', 'test_skipped': 'skipped',
+                          'test_slow': 'passed'})
+        self.assertGreaterEqual(tests['test_slow']['seconds'], 0.05)
+        self.assertIn('AssertionError', tests['test_fails']['details'])
+        self.assertEqual(tests['test_skipped']['details'], 'not today')
+
+    def test_missing_class(self):
+        """Test that a class that cannot be loaded is reported as an error"""
+        result = run_test_class((self.tmpdir, 'test_parallel_sample', 'TestMissing'))
+
+        self.assertEqual(result['tests'][0]['outcome'], 'error')
+        self.assertIn('AttributeError', result['tests'][0]['details'])
+
+    def test_parallel_run(self):
+        """Test a run over two workers: summary, import errors and the timings file"""
+        timings_file = os.path.join(self.tmpdir, 'timings.json')
+        runner = TaskFlowTestRunner()
+
+        with patch.dict(run_tests.TEST_DIRS, {'sample': self.tmpdir}, clear=True):
+            success = runner.run_parallel_tests(2, verbose=False, slowest=3, timings_file=timings_file)
+
+        summary = runner.test_results['summary']
+        self.assertFalse(success)
+        self.assertEqual(summary['total_tests'], 6)
+        self.assertEqual(summary['total_failures'], 1)
+        self.assertEqual(summary['total_errors'], 1)
+        self.assertEqual(summary['total_skipped'], 1)
+        with open(timings_file) as f:
+            timings = json.load(f)
+        self.assertEqual(timings['tests'][0]['test'], 'test_parallel_sample.TestSample.test_slow')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Request Profiling
+Tests stage timings, cProfile capture and the recommendation profiling hooks
+"""
+
+import unittest
+import json
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from profiling import CPROFILE, PROFILING, TIMING, ProfilingHooks, StageProfiler, requested_mode
+from api_service import TaskFlowWebAPI, reset_shared_services
+
+PIPELINE_STAGES = ["candidate_generation", "constraint_check", "scoring", "ranking"]
+
+
+class TestStageProfiler(unittest.TestCase):
+    """Test cases for StageProfiler and ProfilingHooks"""
+
+    def setUp(self):
+        """Create a profile directory"""
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the profile directory"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_timing_stages_accumulate(self):
+        """Test that repeated stages add up and keep first-seen order"""
+        profiler = StageProfiler("demo")
+        for _ in range(3):
+            with profiler.stage("scoring"):
+                pass
+        with profiler.stage("ranking"):
+            pass
+
+        report = profiler.report()
+        self.assertEqual([entry["name"] for entry in report["stages"]], ["scoring", "ranking"])
+        self.assertEqual(report["stages"][0]["calls"], 3)
+        self.assertNotIn("functions", report)
+
+    def test_cprofile_report_and_stats_file(self):
+        """Test that cprofile mode lists hot functions and writes a loadable .prof"""
+        hooks = ProfilingHooks(output_dir=self.tmpdir)
+        profiler = hooks.begin("demo", {"X-TaskFlow-Profile": "cprofile"})
+        with profiler.stage("scoring"):
+            sorted(range(1000), key=lambda n: -n)
+
+        report = hooks.finish(profiler)
+
+        self.assertEqual(report["mode"], CPROFILE)
+        self.assertTrue(any("sorted" in row["function"] for row in report["functions"]["scoring"]))
+        with open(report["reportFile"]) as f:
+            self.assertEqual(json.load(f)["name"], "demo")
+        self.assertGreater(pstats.Stats(report["statsFile"]).total_calls, 0)
+
+    def test_concurrent_cprofile_falls_back_to_timing(self):
+        """Test that a second cprofile request records timings while the first holds cProfile"""
+        hooks = ProfilingHooks()
+        first = hooks.begin("a", {"X-TaskFlow-Profile": "cprofile"})
+        second = hooks.begin("b", {"X-TaskFlow-Profile": "cprofile"})
+
+        self.assertEqual(second.mode, TIMING)
+        self.assertIn("busy", second.note)
+        hooks.finish(second)
+        hooks.finish(first)
+        third = hooks.begin("c", {"X-TaskFlow-Profile": "cprofile"})
+        self.assertEqual(third.mode, CPROFILE)
+        hooks.finish(third)
+
+    def test_sampling(self):
+        """Test that unrequested requests are profiled only when sampled"""
+        hooks = ProfilingHooks()
+        self.assertIsNone(hooks.begin("demo"))
+
+        hooks.configure(sample_rate=1.0)
+        profiler = hooks.begin("demo")
+        self.assertFalse(profiler.requested)
+        self.assertEqual(profiler.mode, TIMING)
+
+        with self.assertRaises(ValueError):
+            hooks.configure(mode="flamegraph")
+
+    def test_requested_mode(self):
+        """Test the X-TaskFlow-Profile header values"""
+        self.assertEqual(requested_mode({"x-taskflow-profile": "1"}), TIMING)
+        self.assertEqual(requested_mode({"X-TaskFlow-Profile": "CProfile"}), CPROFILE)
+        self.assertIsNone(requested_mode({"X-TaskFlow-Profile": "bogus"}))
+        self.assertIsNone(requested_mode(None))
+
+
+class TestRecommendationProfiling(unittest.TestCase):
+    """Test profiling hooks around the recommendation pipeline"""
+
+    def setUp(self):
+        """Set up a mock-backed web API"""
+        reset_shared_services()
+        self.web_api = TaskFlowWebAPI(use_real_jira=False)
+        self.task_key = self.web_api.service.get_unassigned_tasks()[0]["key"]
+
+    def tearDown(self):
+        """Restore the default profiling settings"""
+        PROFILING.configure(sample_rate=0.0, mode=TIMING, output_dir="")
+
+    def test_profile_attached_when_requested(self):
+        """Test that the header attaches stage timings for every pipeline stage"""
+        response = self.web_api.handle_request('/api/recommendations', 'GET', {'task_key': self.task_key},
+                                               headers={'X-TaskFlow-Profile': 'timing'})
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual([entry["name"] for entry in response["profile"]["stages"]], PIPELINE_STAGES)
+
+    def test_unprofiled_requests_unchanged(self):
+        """Test that ordinary requests carry no profile"""
+        response = self.web_api.handle_request('/api/recommendations', 'GET', {'task_key': self.task_key})
+
+        self.assertNotIn("profile", response)
+
+    def test_sampled_requests_written_to_directory(self):
+        """Test that sampled profiles go to the profile directory, not the response"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        PROFILING.configure(sample_rate=1.0, mode=CPROFILE, output_dir=tmpdir)
+
+        response = self.web_api.handle_request('/api/recommendations', 'GET', {'task_key': self.task_key})
+
+        self.assertNotIn("profile", response)
+        files = sorted(os.listdir(tmpdir))
+        self.assertEqual([name.rsplit(".", 1)[1] for name in files], ["json", "prof"])
+        with open(os.path.join(tmpdir, files[0])) as f:
+            report = json.load(f)
+        self.assertEqual(sorted(report["functions"]), sorted(PIPELINE_STAGES))
+
+    def test_profile_file_name_sanitized(self):
+        """Test that a task key cannot steer the profile file outside the profile directory"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        PROFILING.configure(sample_rate=1.0, mode=TIMING, output_dir=os.path.join(tmpdir, "profiles"))
+
+        self.web_api.handle_request('/api/recommendations', 'GET', {'task_key': '../../TASK/1'})
+
+        self.assertEqual(os.listdir(tmpdir), ["profiles"])
+        name, = os.listdir(os.path.join(tmpdir, "profiles"))
+        self.assertIn("-recommendations-______TASK_1-", name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Columnar Snapshots
+Tests round-tripping datasets through the memory-mapped snapshot format
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import json
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from snapshot import SnapshotTable, load_snapshot, write_snapshot
+from mock_jira_api import MockJiraAPI
+from api_service import TaskFlowWebAPI
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test cases for snapshot writing and lazy reading"""
+
+    def setUp(self):
+        """Write a small snapshot to a temporary directory"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "data.snapshot")
+        self.users_data = {
+            "users": [{"username": "stacey.johnson", "displayName": "Stacey", "timeZone": "UTC",
+                       "skills": [{"name": "React", "level": 4}]}],
+            "metadata": {"version": "1.0"}
+        }
+        self.tasks_data = {
+            "projects": [{"key": "TASK"}],
+            "tasks": [
+                {"key": "TASK-101", "summary": "Ünïcode ✓", "project": "TASK", "assignee": None,
+                 "status": "To Do", "storyPoints": 8, "labels": ["ui"]},
+                {"key": "TASK-102", "summary": "Half", "project": "TASK", "assignee": "stacey.johnson",
+                 "status": "In Progress", "storyPoints": 0.5},
+                {"key": "TASK-103", "project": "OTHER", "status": "To Do", "storyPoints": None}
+            ]
+        }
+        write_snapshot(self.path, self.users_data, self.tasks_data, "fp-1")
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip(self):
+        """Test that records, extras and field order survive a round trip"""
+        users_data, tasks_data = load_snapshot(self.path, "fp-1")
+
+        self.assertEqual(list(users_data["users"]), self.users_data["users"])
+        self.assertEqual(list(tasks_data["tasks"]), self.tasks_data["tasks"])
+        self.assertEqual(list(tasks_data["tasks"][0]), list(self.tasks_data["tasks"][0]))
+        self.assertEqual(tasks_data["projects"], [{"key": "TASK"}])
+        self.assertEqual(users_data["metadata"], {"version": "1.0"})
+        self.assertIsInstance(tasks_data["tasks"][0]["storyPoints"], int)
+        self.assertNotIn("assignee", tasks_data["tasks"][2])
+
+    def test_fingerprint_mismatch_ignored(self):
+        """Test that a snapshot from different source data is not used"""
+        self.assertIsNone(load_snapshot(self.path, "fp-2"))
+        self.assertIsNone(load_snapshot(os.path.join(self.tmpdir, "missing.snapshot")))
+
+    def test_corrupt_file_ignored(self):
+        """Test that a file that is not a snapshot is not used"""
+        with open(self.path, 'wb') as f:
+            f.write(b"not a snapshot at all")
+
+        self.assertIsNone(load_snapshot(self.path))
+
+    def test_columns_read_without_building_records(self):
+        """Test column reads and filtering leave unmatched rows unbuilt"""
+        tasks = load_snapshot(self.path)[1]["tasks"]
+
+        self.assertEqual(tasks.value(1, "storyPoints"), 0.5)
+        self.assertIsNone(tasks.value(0, "assignee"))
+        self.assertEqual([t["key"] for t in tasks.find(project="TASK", status="To Do")], ["TASK-101"])
+        self.assertEqual(tasks._records.count(None), 2)
+
+    def test_mutations_visible_through_columns(self):
+        """Test that edits to a built record win over the stored column"""
+        tasks = load_snapshot(self.path)[1]["tasks"]
+
+        tasks[0]["assignee"] = "maya.patel"
+
+        self.assertIs(tasks[0], tasks[0])
+        self.assertEqual(tasks.value(0, "assignee"), "maya.patel")
+        self.assertEqual([t["key"] for t in tasks.find(assignee="maya.patel")], ["TASK-101"])
+
+    def test_replaced_record_visible_through_columns(self):
+        """Test that a record assigned to an index replaces the stored row"""
+        tasks = load_snapshot(self.path)[1]["tasks"]
+
+        tasks[-3] = dict(tasks[0], assignee="maya.patel")
+
+        self.assertEqual(tasks.value(0, "assignee"), "maya.patel")
+        self.assertEqual(tasks[0]["summary"], "Ünïcode ✓")
+        with self.assertRaises(IndexError):
+            tasks[3] = {}
+
+
+class TestMockJiraSnapshot(unittest.TestCase):
+    """Test MockJiraAPI warm starts from a snapshot"""
+
+    def setUp(self):
+        """Create a snapshot directory"""
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the snapshot directory"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_second_start_uses_snapshot(self):
+        """Test that the first start writes a snapshot and the second maps it"""
+        cold = MockJiraAPI(snapshot_dir=self.tmpdir)
+        warm = MockJiraAPI(snapshot_dir=self.tmpdir)
+
+        self.assertTrue(os.path.exists(cold.snapshot_path))
+        self.assertIsInstance(warm.tasks_data["tasks"], SnapshotTable)
+        self.assertEqual(warm.get_tasks(), cold.get_tasks())
+        self.assertEqual(warm.get_team_capacity_overview(), cold.get_team_capacity_overview())
+
+    def test_saved_assignments_survive_restart(self):
+        """Test that save_snapshot() persists in-process assignments"""
+        api = MockJiraAPI(snapshot_dir=self.tmpdir)
+        api.assign_task("TASK-101", "stacey.johnson")
+        api.save_snapshot()
+
+        restarted = MockJiraAPI(snapshot_dir=self.tmpdir)
+
+        self.assertEqual(restarted.get_tasks(assignee="stacey.johnson")[0]["key"], "TASK-101")
+
+    def test_users_from_snapshot_serialize(self):
+        """Test that /api/users and the sync fingerprint see plain user dicts after a warm start"""
+        MockJiraAPI(snapshot_dir=self.tmpdir)
+        with patch.dict(os.environ, {'TASKFLOW_SNAPSHOT_DIR': self.tmpdir}):
+            web_api = TaskFlowWebAPI(use_real_jira=False, shared=False)
+            response = web_api.handle_request('/api/users')
+        service = web_api.service
+        self.assertIsInstance(service.api.users_data["users"], SnapshotTable)
+
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(json.loads(json.dumps(response))["data"][0]["username"], response["data"][0]["username"])
+
+        service.sync()
+        service.api.get_users()[0]["displayName"] = "Renamed"
+        service.sync()
+        self.assertEqual(service.get_revision("users"), 1)
+
+    def test_sync_does_not_persist_assignments(self):
+        """Test that the snapshot keeps the JSON data after in-process assignments are synced"""
+        with patch.dict(os.environ, {'TASKFLOW_SNAPSHOT_DIR': self.tmpdir}):
+            web_api = TaskFlowWebAPI(use_real_jira=False, shared=False)
+            service = web_api.service
+            service.sync()
+            service.api.assign_task("TASK-101", "stacey.johnson")
+            service.sync()
+
+            restarted = MockJiraAPI()
+
+        self.assertNotIn("TASK-101", [task["key"] for task in restarted.get_tasks(assignee="stacey.johnson")])
+
+
+if __name__ == '__main__':
+    unittest.main()
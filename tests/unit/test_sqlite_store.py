@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SQLite Task Store
+Tests persistence, indexed queries and parity with the mock backend
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from sqlite_store import SQLiteTaskStore
+from task_query import InvalidQueryError, encode_cursor
+from api_service import TaskFlowAPIService
+
+
+class TestSQLiteTaskStore(unittest.TestCase):
+    """Test cases for SQLiteTaskStore"""
+
+    def setUp(self):
+        """Create a store in a temporary directory"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "taskflow.db")
+        self.store = SQLiteTaskStore(self.db_path)
+        self.users = [
+            {"username": "stacey.johnson", "displayName": "Stacey", "timeZone": "America/New_York",
+             "skills": [{"name": "React", "level": 4}], "capacity": {"pointsPerSprint": 40}},
+            {"username": "maya.patel", "displayName": "Maya", "timeZone": "America/Los_Angeles",
+             "skills": [{"name": "Python", "level": 5}], "capacity": {"pointsPerSprint": 45}}
+        ]
+        self.tasks = [
+            {"key": "TASK-101", "project": "TASK", "assignee": None, "status": "To Do", "priority": "High",
+             "storyPoints": 8, "dueDate": "2025-08-20", "labels": ["frontend", "ui"],
+             "requiredSkills": [{"name": "React", "minLevel": 3}]},
+            {"key": "TASK-102", "project": "TASK", "assignee": None, "status": "To Do", "priority": "Critical",
+             "storyPoints": 13, "dueDate": "2025-08-18", "labels": ["backend", "api"],
+             "requiredSkills": [{"name": "Python", "minLevel": 4}]},
+            {"key": "TASK-103", "project": "TASK", "assignee": None, "status": "To Do", "priority": "Medium",
+             "storyPoints": 5, "dueDate": None, "labels": ["testing"],
+             "requiredSkills": [{"name": "Testing", "minLevel": 4}]}
+        ]
+        self.store.replace_all(self.users, self.tasks)
+
+    def tearDown(self):
+        """Remove the temporary database"""
+        self.store.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip_preserves_records(self):
+        """Test that users and tasks come back exactly as stored, in order"""
+        self.assertEqual(self.store.get_users(), self.users)
+        self.assertEqual(self.store.get_tasks(), self.tasks)
+        self.assertEqual(self.store.get_user("maya.patel")["displayName"], "Maya")
+        self.assertIsNone(self.store.get_user("nobody"))
+
+    def test_data_survives_reopen(self):
+        """Test that a new store on the same file starts warm"""
+        self.store.assign_task("TASK-101", "stacey.johnson")
+        self.store.close()
+
+        reopened = SQLiteTaskStore(self.db_path)
+
+        self.assertFalse(reopened.is_empty())
+        self.assertEqual(reopened.get_tasks(assignee="stacey.johnson")[0]["key"], "TASK-101")
+        reopened.close()
+
+    def test_wal_mode_enabled(self):
+        """Test that the database uses write-ahead logging"""
+        mode = self.store._conn().execute("PRAGMA journal_mode").fetchone()[0]
+
+        self.assertEqual(mode, "wal")
+
+    def test_assignee_query_uses_index(self):
+        """Test that assignee lookups are index searches, not table scans"""
+        plan = self.store._conn().execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM tasks t WHERE t.assignee = ?", ("maya.patel",)
+        ).fetchall()
+
+        self.assertTrue(any("idx_tasks_assignee" in row[-1] for row in plan))
+
+    def test_workload_and_capacity(self):
+        """Test aggregates match the mock backend's shape and numbers"""
+        self.store.assign_task("TASK-101", "stacey.johnson")
+        self.store.assign_task("TASK-102", "maya.patel")
+
+        workload = self.store.get_user_workload("stacey.johnson")
+        overview = self.store.get_team_capacity_overview()
+
+        self.assertEqual(workload["assignedTasks"], 1)
+        self.assertEqual(workload["totalStoryPoints"], 8)
+        self.assertEqual(workload["utilizationPercent"], 20.0)
+        self.assertEqual(overview["teamTotals"]["totalCapacity"], 85)
+        self.assertEqual(overview["teamTotals"]["totalAssigned"], 21)
+        self.assertEqual([m["username"] for m in overview["members"]], ["stacey.johnson", "maya.patel"])
+        self.assertEqual(self.store.get_user_workload("nobody"), {"error": "User not found"})
+
+    def test_workload_totals_follow_sync_and_reopen(self):
+        """Test that trigger-maintained totals survive upserts, deletes and schema backfill"""
+        self.store.assign_task("TASK-101", "stacey.johnson")
+        self.store.assign_task("TASK-102", "stacey.johnson")
+        self.store.sync_from(self.users, [dict(self.tasks[0], assignee="stacey.johnson", storyPoints=3),
+                                          dict(self.tasks[2], assignee="maya.patel")])
+
+        self.assertEqual(self.store.get_user_workload("stacey.johnson")["totalStoryPoints"], 3)
+        self.assertEqual(self.store.get_user_workload("maya.patel")["assignedTasks"], 1)
+
+        conn = self.store._conn()
+        conn.execute("DELETE FROM user_workload")
+        conn.execute("PRAGMA user_version = 0")
+        self.store.close()
+
+        reopened = SQLiteTaskStore(self.db_path)
+        self.assertEqual(reopened.get_user_workload("maya.patel")["totalStoryPoints"], 5)
+        reopened.close()
+
+    def test_unassigned_tasks(self):
+        """Test that only tasks without an assignee are returned"""
+        self.store.assign_task("TASK-101", "stacey.johnson")
+
+        keys = [t["key"] for t in self.store.get_unassigned_tasks()]
+
+        self.assertEqual(keys, ["TASK-102", "TASK-103"])
+
+    def test_query_pagination_and_filters(self):
+        """Test keyset pagination over a sorted, filtered query"""
+        first = self.store.query_tasks(sort="-dueDate", limit=2)
+        second = self.store.query_tasks(sort="-dueDate", limit=2, cursor=first["nextCursor"])
+
+        self.assertEqual([t["key"] for t in first["tasks"]], ["TASK-101", "TASK-102"])
+        self.assertEqual([t["key"] for t in second["tasks"]], ["TASK-103"])
+        self.assertIsNone(second["nextCursor"])
+        self.assertEqual(first["total"], 3)
+
+        filtered = self.store.query_tasks(labels="backend,testing", skills="python")
+        self.assertEqual([t["key"] for t in filtered["tasks"]], ["TASK-102"])
+
+    def test_malformed_cursor_rejected(self):
+        """Test that keyset cursors with the wrong shape are rejected, not unpacked"""
+        for after in (5, "x", [1, 2], [0, "2025-08-20", "TASK-101"], [1, 3, None]):
+            with self.assertRaises(InvalidQueryError):
+                self.store.query_tasks(sort="storyPoints", cursor=encode_cursor({"sort": "storyPoints", "after": after}))
+
+    def test_sync_from_removes_missing_tasks(self):
+        """Test that syncing from upstream upserts and deletes"""
+        changed = dict(self.tasks[0], status="Done")
+        self.store.sync_from(self.users[:1], [changed])
+
+        self.assertEqual([t["key"] for t in self.store.get_tasks()], ["TASK-101"])
+        self.assertEqual(self.store.get_tasks()[0]["status"], "Done")
+        self.assertEqual(len(self.store.get_users()), 1)
+
+    def test_assign_rejects_stale_version(self):
+        """Test that assignments compare and bump the task version"""
+        first = self.store.assign_task("TASK-101", "stacey.johnson", expected_version=1)
+        stale = self.store.assign_task("TASK-101", "maya.patel", expected_version=1)
+
+        self.assertEqual(first["task"]["version"], 2)
+        self.assertTrue(stale["conflict"])
+        self.assertEqual(stale["task"]["assignee"], "stacey.johnson")
+        self.assertEqual(self.store.get_task("TASK-101")["assignee"], "stacey.johnson")
+        self.assertEqual(self.store.get_user_workload("maya.patel")["assignedTasks"], 0)
+
+    def test_sync_bumps_version_only_for_changed_tasks(self):
+        """Test that an unchanged upstream task keeps the version clients hold"""
+        self.store.sync_from(self.users, [dict(self.tasks[0], status="Done")] + self.tasks[1:])
+
+        self.assertEqual(self.store.get_task("TASK-101")["version"], 2)
+        self.assertNotIn("version", self.store.get_task("TASK-102"))
+        self.assertTrue(self.store.assign_task("TASK-102", "maya.patel", expected_version=1)["success"])
+
+    def test_capacity_ceiling(self):
+        """Test that max_utilization is checked against the stored workload totals"""
+        self.store.assign_task("TASK-102", "stacey.johnson")
+
+        refused = self.store.assign_task("TASK-101", "stacey.johnson", max_utilization=0.5)
+        vetted = self.store.check_assignment("TASK-101", "stacey.johnson", max_utilization=1.0)
+        admitted = self.store.assign_task("TASK-101", "stacey.johnson", max_utilization=1.0)
+
+        self.assertTrue(refused["overCapacity"])
+        self.assertEqual(refused["workload"]["totalStoryPoints"], 13)
+        self.assertIsNone(vetted)
+        self.assertTrue(admitted["success"])
+        self.assertEqual(self.store.get_user_workload("stacey.johnson")["totalStoryPoints"], 21)
+
+    def test_version_column_added_to_old_database(self):
+        """Test that opening a schema 2 database adds the version column"""
+        conn = self.store._conn()
+        conn.execute("ALTER TABLE tasks DROP COLUMN version")
+        conn.execute("PRAGMA user_version = 2")
+        self.store.close()
+
+        reopened = SQLiteTaskStore(self.db_path)
+
+        self.assertTrue(reopened.assign_task("TASK-101", "maya.patel", expected_version=1)["success"])
+        self.assertEqual(reopened.get_task("TASK-101")["version"], 2)
+        reopened.close()
+
+
+class TestSQLiteBackedService(unittest.TestCase):
+    """Test cases for TaskFlowAPIService running on the SQLite backend"""
+
+    def setUp(self):
+        """Point the service at a temporary database"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "taskflow.db")
+
+    def tearDown(self):
+        """Remove the temporary database"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_seeds_from_mock_and_restarts_warm(self):
+        """Test that the first start seeds the store and later starts reuse it"""
+        service = TaskFlowAPIService(use_real_jira=False, backend='sqlite', db_path=self.db_path)
+        self.assertEqual(service.get_api_info()["type"], "sqlite")
+        self.assertGreater(len(service.get_users()), 0)
+
+        service.assign_task("TASK-101", "stacey.johnson")
+        restarted = TaskFlowAPIService(use_real_jira=False, backend='sqlite', db_path=self.db_path)
+
+        self.assertEqual(restarted.get_tasks(assignee="stacey.johnson")[0]["key"], "TASK-101")
+
+    def test_unknown_backend_rejected(self):
+        """Test that an invalid backend name raises"""
+        with self.assertRaises(ValueError):
+            TaskFlowAPIService(use_real_jira=False, backend='postgres')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Startup Profiler
+Tests phase timing, import timing and the structured report
+"""
+
+import unittest
+import builtins
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from startup_profiler import StartupProfiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test cases for StartupProfiler"""
+
+    def setUp(self):
+        """Create a private profiler and a directory for throwaway modules"""
+        self.profiler = StartupProfiler()
+        self.tmpdir = tempfile.mkdtemp()
+        sys.path.insert(0, self.tmpdir)
+
+    def tearDown(self):
+        """Restore the import hook and module search path"""
+        self.profiler.disable()
+        sys.path.remove(self.tmpdir)
+        sys.modules.pop("taskflow_profiled_module", None)
+        shutil.rmtree(self.tmpdir)
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test that phases are no-ops and imports are untouched when disabled"""
+        original_import = builtins.__import__
+
+        with self.profiler.phase("imports"):
+            pass
+
+        self.assertEqual(self.profiler.report()["phases"], [])
+        self.assertIs(builtins.__import__, original_import)
+
+    def test_nested_phases(self):
+        """Test that phases record their nesting depth and duration"""
+        self.profiler.enable()
+
+        with self.profiler.phase("backend_init"):
+            with self.profiler.phase("mock_json_parse"):
+                pass
+
+        phases = self.profiler.report()["phases"]
+        self.assertEqual([(p["name"], p["depth"]) for p in phases], [("backend_init", 0), ("mock_json_parse", 1)])
+        self.assertGreaterEqual(phases[0]["seconds"], phases[1]["seconds"])
+
+    def test_first_import_timed(self):
+        """Test that a module imported for the first time appears in the report"""
+        with open(os.path.join(self.tmpdir, "taskflow_profiled_module.py"), 'w') as f:
+            f.write("VALUE = 1\n")
+        self.profiler.enable()
+
+        import taskflow_profiled_module  # noqa: F401
+
+        modules = [entry["module"] for entry in self.profiler.report()["imports"]]
+        self.assertIn("taskflow_profiled_module", modules)
+
+    def test_report_written_once(self):
+        """Test that the JSON report is written and later calls are ignored"""
+        output_path = os.path.join(self.tmpdir, "startup.json")
+        self.profiler.enable()
+        with self.profiler.phase("web_api_init"):
+            pass
+
+        with redirect_stdout(io.StringIO()) as printed:
+            self.profiler.print_report(output_path)
+            self.profiler.print_report(output_path)
+
+        with open(output_path) as f:
+            report = json.load(f)
+        self.assertEqual(report["phases"][0]["name"], "web_api_init")
+        self.assertEqual(printed.getvalue().count("Startup profile"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
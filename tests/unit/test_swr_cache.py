@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Stale-While-Revalidate Cache
+Tests the circuit breaker, cache refresh rules and the JIRA read wrapper
+"""
+
+import unittest
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from swr_cache import (
+    CLOSED, HALF_OPEN, OPEN, BackendUnavailableError, CircuitBreaker, StaleWhileRevalidateAPI,
+    StaleWhileRevalidateCache, track_freshness
+)
+from http_server import freshness_headers
+from api_service import TaskFlowWebAPI
+from jira_api import JiraAPIService
+from workload import WorkloadAggregates
+
+
+class FakeClock:
+    """Monotonic clock the test moves by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class ManualExecutor:
+    """Collects background refreshes so the test decides when they run"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, job):
+        self.jobs.append(job)
+
+    def run_all(self):
+        jobs, self.jobs = self.jobs, []
+        for job in jobs:
+            job()
+
+
+class FakeJira:
+    """JiraAPIService stand-in whose reads can be made to fail"""
+
+    def __init__(self):
+        self.failing = False
+        self.calls = 0
+        self.users = [{"username": "alice", "displayName": "Alice", "timeZone": "UTC"}]
+        self.tasks = [{"key": "SCRUM-1", "assignee": None, "storyPoints": 3}]
+
+    def _call(self, value):
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError("JIRA unreachable")
+        return value
+
+    def fetch_users(self):
+        return self._call(list(self.users))
+
+    def iter_tasks(self, project_key=None, assignee=None, status=None):
+        return iter(self._call(list(self.tasks)))
+
+    def get_team_capacity_overview(self):
+        if self.failing:
+            return {"error": "JIRA unreachable"}
+        return {"members": [{"username": "alice"}], "teamTotals": {}}
+
+    def assign_task(self, task_key, assignee, expected_version=None, max_utilization=None):
+        self.tasks = [dict(self.tasks[0], assignee=assignee)]
+        return {"success": True, "message": f"Task {task_key} assigned to {assignee}",
+                "task": {"key": task_key, "assignee": assignee, "assigneeDisplayName": assignee.title()}}
+
+    def refresh_workloads(self):
+        self.workloads = WorkloadAggregates(self._call(list(self.tasks)))
+
+    def _build_workload(self, username, workloads):
+        return {"username": username, "taskCount": workloads.get(username)[0]}
+
+
+class TestJiraWorkloadsThroughCache(unittest.TestCase):
+    """Test that JIRA workload totals are rebuilt behind the cache"""
+
+    def setUp(self):
+        """Wrap an unconnected JiraAPIService serving tasks from a list"""
+        with patch.object(JiraAPIService, 'connect', return_value=False):
+            self.jira = JiraAPIService()
+        self.tasks = [{"key": "SCRUM-1", "assignee": "alice", "storyPoints": 5}]
+        self.failing = False
+
+        def iter_tasks(*args):
+            if self.failing:
+                raise ConnectionError("JIRA unreachable")
+            return iter(list(self.tasks))
+        patcher = patch.object(self.jira, 'iter_tasks', side_effect=iter_tasks)
+        self.iter_tasks = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.clock = FakeClock()
+        self.executor = ManualExecutor()
+        self.cache = StaleWhileRevalidateCache(fresh_seconds=30, clock=self.clock, executor=self.executor)
+        self.api = StaleWhileRevalidateAPI(self.jira, self.cache)
+
+    def test_stale_totals_served_while_rebuilt_in_background(self):
+        """Test that expired totals are answered at once and rebuilt off the request path"""
+        self.assertEqual(self.api.get_user_workload("alice")["totalStoryPoints"], 5)
+        self.tasks.append({"key": "SCRUM-2", "assignee": "alice", "storyPoints": 3})
+        self.clock.advance(60)
+
+        with patch('jira_api.time.monotonic', return_value=time.monotonic() + 86400):
+            self.assertEqual(self.api.get_user_workload("alice")["totalStoryPoints"], 5)
+            self.api.get_team_capacity_overview()
+        self.assertEqual(self.iter_tasks.call_count, 1)
+
+        self.executor.run_all()
+        self.assertEqual(self.iter_tasks.call_count, 2)
+        self.assertEqual(self.api.get_user_workload("alice")["totalStoryPoints"], 8)
+
+    def test_outage_keeps_last_good_totals(self):
+        """Test that a failed rebuild counts against the breaker and keeps the old totals"""
+        self.api.get_user_workload("alice")
+        self.failing = True
+        self.clock.advance(60)
+
+        self.assertEqual(self.api.get_user_workload("alice")["totalStoryPoints"], 5)
+        self.executor.run_all()
+
+        self.assertEqual(self.cache.breaker._failures, 1)
+        self.assertEqual(self.api.get_user_workload("alice")["totalStoryPoints"], 5)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for CircuitBreaker"""
+
+    def test_opens_after_threshold_and_half_opens(self):
+        """Test closed → open → half-open (one trial) → closed"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=clock)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.retry_after(), 10)
+
+        clock.advance(10)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_failed_trial_reopens(self):
+        """Test that a failing half-open trial opens the breaker again"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=5, clock=clock)
+        breaker.record_failure()
+        clock.advance(5)
+
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, OPEN)
+
+
+class TestStaleWhileRevalidateCache(unittest.TestCase):
+    """Test cases for StaleWhileRevalidateCache"""
+
+    def setUp(self):
+        """Create a cache on a fake clock with manually run refreshes"""
+        self.clock = FakeClock()
+        self.executor = ManualExecutor()
+        self.cache = StaleWhileRevalidateCache(fresh_seconds=30, max_stale_seconds=3600, failure_threshold=2,
+                                               reset_seconds=60, slow_call_seconds=5,
+                                               clock=self.clock, executor=self.executor)
+        self.value = "v1"
+        self.loads = 0
+        self.failing = False
+
+    def loader(self):
+        self.loads += 1
+        if self.failing:
+            raise ConnectionError("down")
+        return self.value
+
+    def test_fresh_values_served_without_loading(self):
+        """Test that a value inside its fresh window is not reloaded"""
+        self.assertEqual(self.cache.get("k", self.loader), "v1")
+        self.clock.advance(10)
+
+        with track_freshness() as freshness:
+            self.assertEqual(self.cache.get("k", self.loader), "v1")
+
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(freshness, {"cached": True, "ageSeconds": 10, "stale": False})
+
+    def test_stale_value_served_while_one_refresh_runs(self):
+        """Test that stale reads return immediately and share one background refresh"""
+        self.cache.get("k", self.loader)
+        self.clock.advance(45)
+        self.value = "v2"
+
+        with track_freshness() as freshness:
+            self.assertEqual(self.cache.get("k", self.loader), "v1")
+            self.assertEqual(self.cache.get("k", self.loader), "v1")
+        self.assertTrue(freshness["stale"])
+        self.assertEqual(freshness["ageSeconds"], 45)
+        self.assertEqual(len(self.executor.jobs), 1)
+
+        self.executor.run_all()
+        self.assertEqual(self.cache.get("k", self.loader), "v2")
+
+    def test_patched_value_served_until_a_later_refresh(self):
+        """Test that a patch is served stale and only a refresh started after it replaces it"""
+        self.cache.get("k", self.loader)
+        self.clock.advance(45)
+
+        def racing_loader():
+            # The write lands while this refresh is already reading the old data
+            self.cache.patch(lambda key: True, lambda key, value: "patched")
+            return self.loader()
+
+        self.cache.get("k", racing_loader)
+        self.executor.run_all()
+        with track_freshness() as freshness:
+            self.assertEqual(self.cache.get("k", self.loader), "patched")
+        self.assertTrue(freshness["stale"])
+
+        self.value = "v2"
+        self.executor.run_all()
+        self.assertEqual(self.cache.get("k", self.loader), "v2")
+        self.assertEqual(self.loads, 3)
+
+    def test_failures_fall_back_and_open_the_breaker(self):
+        """Test that failed loads serve the last good value and stop calling JIRA once open"""
+        self.cache.get("k", self.loader)
+        self.failing = True
+
+        for _ in range(2):
+            self.cache.invalidate()
+            self.assertEqual(self.cache.get("k", self.loader), "v1")
+        self.assertEqual(self.cache.breaker.state, OPEN)
+
+        loads = self.loads
+        self.cache.invalidate()
+        self.assertEqual(self.cache.get("k", self.loader), "v1")
+        self.clock.advance(45)
+        self.assertEqual(self.cache.get("k", self.loader), "v1")
+        self.assertEqual(self.executor.jobs, [])
+        self.assertEqual(self.loads, loads)
+
+    def test_nothing_cached_raises(self):
+        """Test that a failed first load is an error, with a retry hint once the breaker opens"""
+        self.failing = True
+
+        with self.assertRaises(BackendUnavailableError):
+            self.cache.get("k", self.loader)
+        with self.assertRaises(BackendUnavailableError):
+            self.cache.get("k", self.loader)
+        with self.assertRaises(BackendUnavailableError) as raised:
+            self.cache.get("k", self.loader)
+        self.assertEqual(raised.exception.retry_after, 60)
+
+    def test_slow_calls_count_as_failures(self):
+        """Test that loads slower than slow_call_seconds trip the breaker but keep their result"""
+        def slow_loader():
+            self.clock.advance(6)
+            return "slow"
+
+        self.assertEqual(self.cache.get("a", slow_loader), "slow")
+        self.assertEqual(self.cache.get("b", slow_loader), "slow")
+
+        self.assertEqual(self.cache.breaker.state, OPEN)
+
+    def test_from_config(self):
+        """Test that the cache is off unless configured"""
+        self.assertIsNone(StaleWhileRevalidateCache.from_config({}))
+        self.assertIsNone(StaleWhileRevalidateCache.from_config({"stale_while_revalidate": {"enabled": False}}))
+
+        cache = StaleWhileRevalidateCache.from_config({"stale_while_revalidate": {"fresh_seconds": 5}})
+        self.assertEqual(cache.fresh_seconds, 5)
+        self.assertEqual(cache.breaker.failure_threshold, 5)
+
+    def test_freshness_headers(self):
+        """Test the Age and Warning headers for cached responses"""
+        self.assertEqual(freshness_headers({"ageSeconds": 12.7, "stale": False}), {"Age": "12"})
+        self.assertIn("Warning", freshness_headers({"ageSeconds": 40, "stale": True}))
+
+
+class TestStaleWhileRevalidateAPI(unittest.TestCase):
+    """Test the JIRA read wrapper"""
+
+    def setUp(self):
+        """Wrap a fake JIRA service"""
+        self.jira = FakeJira()
+        self.cache = StaleWhileRevalidateCache(fresh_seconds=0, failure_threshold=2, reset_seconds=60)
+        self.api = StaleWhileRevalidateAPI(self.jira, self.cache)
+
+    def tearDown(self):
+        """Wait for background refreshes to finish"""
+        self.cache._executor.shutdown(wait=True)
+
+    def test_reads_survive_outage(self):
+        """Test that users, tasks and capacity keep answering while JIRA is down"""
+        users = self.api.get_users()
+        tasks = self.api.get_tasks()
+        capacity = self.api.get_team_capacity_overview()
+        self.jira.failing = True
+
+        self.assertEqual(self.api.get_users(), users)
+        self.assertEqual(list(self.api.iter_tasks()), tasks)
+        self.assertEqual(self.api.get_team_capacity_overview(), capacity)
+        self.assertEqual(self.api.get_user_workload("alice"), {"username": "alice", "taskCount": 0})
+
+    def test_latency_flat_when_jira_slow_and_failing(self):
+        """Test that cached reads stay fast while every JIRA call hangs and fails"""
+        self.api.get_users()
+
+        def hanging():
+            time.sleep(0.2)
+            raise ConnectionError("timeout")
+        self.jira.fetch_users = hanging
+
+        latencies = []
+        for _ in range(20):
+            start = time.perf_counter()
+            self.api.get_users()
+            latencies.append(time.perf_counter() - start)
+
+        self.assertLess(max(latencies), 0.05)
+
+    def test_assignment_invalidates_task_views(self):
+        """Test that the next task read after an assignment reflects it"""
+        self.cache.fresh_seconds = 3600
+        self.api.get_tasks()
+
+        self.api.assign_task("SCRUM-1", "alice")
+
+        self.assertEqual(self.api.get_tasks()[0]["assignee"], "alice")
+
+    def test_assignment_patches_cached_views(self):
+        """Test that reads after an assignment see it without waiting for JIRA"""
+        executor = ManualExecutor()
+        api = StaleWhileRevalidateAPI(self.jira, StaleWhileRevalidateCache(fresh_seconds=3600, executor=executor))
+        api.get_tasks()
+        api.get_unassigned_tasks()
+        api.get_tasks(assignee="alice")
+        capacity = api.get_team_capacity_overview()
+        calls = self.jira.calls
+
+        api.assign_task("SCRUM-1", "alice")
+        self.jira.failing = True
+
+        self.assertEqual(api.get_tasks()[0]["assigneeDisplayName"], "Alice")
+        self.assertEqual(api.get_unassigned_tasks(), [])
+        self.assertEqual([t["key"] for t in api.get_tasks(assignee="alice")], ["SCRUM-1"])
+        self.assertEqual(api.get_team_capacity_overview(), capacity)
+        self.assertEqual(self.jira.calls, calls)
+        self.assertEqual(len(executor.jobs), 4)
+
+    def test_assignment_refused_while_circuit_open(self):
+        """Test that writes fail fast with a retry hint while JIRA is failing"""
+        self.cache.breaker.record_failure()
+        self.cache.breaker.record_failure()
+
+        result = self.api.assign_task("SCRUM-1", "alice")
+
+        self.assertFalse(result["success"])
+        self.assertTrue(result["unavailable"])
+        self.assertGreater(result["retryAfter"], 0)
+
+    def test_web_api_marks_cached_responses(self):
+        """Test that handle_request reports the age of cached data and 503s without any"""
+        web_api = TaskFlowWebAPI(use_real_jira=False, shared=False)
+        web_api.service._api = self.api
+
+        first = web_api.handle_request('/api/users')
+        second = web_api.handle_request('/api/users')
+        self.jira.failing = True
+        capacity = web_api.handle_request('/api/capacity')
+
+        self.assertEqual(first["cache"]["ageSeconds"], 0)
+        self.assertTrue(second["cache"]["stale"])
+        self.assertEqual(capacity["status"], "error")
+        self.assertIn("retryAfter", capacity)
+
+
+if __name__ == '__main__':
+    unittest.main()
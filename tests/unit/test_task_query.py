@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Paginated Task Queries
+Tests filtering, sorting and cursor pagination of MockJiraAPI.query_tasks
+"""
+
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from mock_jira_api import MockJiraAPI
+from jira_api import JiraAPIService
+from task_query import InvalidQueryError, decode_cursor, encode_cursor
+
+
+class TestMockTaskQuery(unittest.TestCase):
+    """Test cases for MockJiraAPI.query_tasks"""
+
+    def setUp(self):
+        """Set up a mock API with a spread of priorities, dates and skills"""
+        priorities = ["Low", "Medium", "High", "Critical"]
+        self.api = MockJiraAPI()
+        self.api.tasks_data = {"tasks": [
+            {
+                "key": f"TASK-{i:03d}",
+                "project": "TASK" if i % 5 else "OTHER",
+                "assignee": None if i % 3 else "maya.patel",
+                "status": "To Do",
+                "priority": priorities[i % 4],
+                "storyPoints": (i * 7) % 13 + 1,
+                "dueDate": None if i % 10 == 9 else f"2025-08-{(i % 28) + 1:02d}",
+                "labels": ["backend"] if i % 2 else ["frontend", "ui"],
+                "requiredSkills": [{"name": "Python" if i % 2 else "React", "minLevel": 3}]
+            }
+            for i in range(40)
+        ]}
+
+    def collect(self, **kwargs):
+        """Follow cursors until the last page and return all tasks"""
+        tasks, cursor = [], None
+        while True:
+            page = self.api.query_tasks(cursor=cursor, **kwargs)
+            tasks.extend(page["tasks"])
+            cursor = page["nextCursor"]
+            if not cursor:
+                return tasks
+
+    def test_pages_cover_all_tasks_once(self):
+        """Test that cursor pagination visits every task exactly once"""
+        tasks = self.collect(sort="storyPoints", limit=7)
+
+        self.assertEqual(len(tasks), 40)
+        self.assertEqual(len({t["key"] for t in tasks}), 40)
+        points = [t["storyPoints"] for t in tasks]
+        self.assertEqual(points, sorted(points))
+
+    def test_descending_sort_keeps_missing_values_last(self):
+        """Test descending due dates with undated tasks at the end"""
+        tasks = self.collect(sort="-dueDate", limit=6)
+
+        dates = [t["dueDate"] for t in tasks]
+        dated = [d for d in dates if d]
+        self.assertEqual(dated, sorted(dated, reverse=True))
+        self.assertTrue(all(d is None for d in dates[len(dated):]))
+
+    def test_priority_sort_uses_rank(self):
+        """Test that priority sorts by rank, not alphabetically"""
+        tasks = self.collect(sort="-priority", limit=50)
+
+        self.assertEqual(tasks[0]["priority"], "Critical")
+        self.assertEqual(tasks[-1]["priority"], "Low")
+
+    def test_filters_combine(self):
+        """Test label, priority, skill and project filters together"""
+        page = self.api.query_tasks(project_key="TASK", labels="backend", priorities=["High", "Critical"],
+                                    skills="python", limit=100)
+
+        self.assertGreater(page["total"], 0)
+        for task in page["tasks"]:
+            self.assertEqual(task["project"], "TASK")
+            self.assertIn("backend", task["labels"])
+            self.assertIn(task["priority"], ("High", "Critical"))
+
+    def test_unassigned_filter_and_index_update(self):
+        """Test that assignments move tasks between index buckets"""
+        before = self.api.query_tasks(assignee="unassigned", limit=100)["total"]
+        key = self.api.query_tasks(assignee="unassigned", limit=1)["tasks"][0]["key"]
+
+        self.api.assign_task(key, "stacey.johnson")
+
+        self.assertEqual(self.api.query_tasks(assignee="unassigned", limit=100)["total"], before - 1)
+        assigned = self.api.query_tasks(assignee="stacey.johnson")["tasks"]
+        self.assertEqual([t["key"] for t in assigned], [key])
+
+    def test_get_tasks_filters_by_status(self):
+        """Test that get_tasks now honors the status filter"""
+        self.api.assign_task("TASK-001", "stacey.johnson")
+
+        in_progress = self.api.get_tasks(status="In Progress")
+
+        self.assertEqual([t["key"] for t in in_progress], ["TASK-001"])
+
+    def test_invalid_sort_and_cursor(self):
+        """Test that bad sort keys and mismatched cursors are rejected"""
+        with self.assertRaises(InvalidQueryError):
+            self.api.query_tasks(sort="summary")
+
+        cursor = self.api.query_tasks(sort="priority", limit=1)["nextCursor"]
+        with self.assertRaises(InvalidQueryError):
+            self.api.query_tasks(sort="dueDate", cursor=cursor)
+
+    def test_malformed_cursor_positions(self):
+        """Test that cursors whose position has the wrong shape or types are rejected"""
+        for after in (5, "x", [], [True, 4], [True, "x", "TASK-001"], [False, 4, 7]):
+            cursor = encode_cursor({"sort": "priority", "after": after})
+            with self.assertRaises(InvalidQueryError):
+                self.api.query_tasks(sort="priority", cursor=cursor)
+
+        cursor = encode_cursor({"sort": "dueDate", "after": [False, 3, "TASK-001"]})
+        with self.assertRaises(InvalidQueryError):
+            self.api.query_tasks(sort="dueDate", cursor=cursor)
+
+    def test_cursor_round_trip(self):
+        """Test that cursors are opaque but reversible"""
+        state = {"sort": "-priority", "after": [True, 4, "TASK-001"]}
+
+        self.assertEqual(decode_cursor(encode_cursor(state)), state)
+        with self.assertRaises(InvalidQueryError):
+            decode_cursor("not a cursor!")
+        with self.assertRaises(InvalidQueryError):
+            decode_cursor(encode_cursor([1, 2]))
+
+
+
+class TestJiraTaskQuery(unittest.TestCase):
+    """Test cursor checks in JiraAPIService.query_tasks"""
+
+    def test_malformed_start_rejected_before_searching(self):
+        """Test that offset cursors must hold a non-negative integer"""
+        with patch.object(JiraAPIService, 'connect', return_value=False):
+            api = JiraAPIService()
+
+        with patch.object(api, '_jira_call') as jira_call:
+            for start in ("x", -1, 2.5, True, [3]):
+                with self.assertRaises(InvalidQueryError):
+                    api.query_tasks(cursor=encode_cursor({"sort": None, "startAt": start}))
+
+        jira_call.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Tracing
+Tests span trees, sampling, JSON lines export and JIRA call spans
+"""
+
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from tracing import TRACER, Tracer, trace_forced
+from jira_api import JiraAPIService
+from api_service import TaskFlowWebAPI, reset_shared_services
+
+
+class TestTracer(unittest.TestCase):
+    """Test cases for Tracer"""
+
+    def setUp(self):
+        """Create a tracer writing to a temporary file"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "traces.jsonl")
+        self.tracer = Tracer(sample_rate=1.0, output_file=self.path)
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmpdir)
+
+    def test_span_tree_exported_as_json_line(self):
+        """Test that nested spans link to their parents and the trace is written as one line"""
+        with self.tracer.trace("GET /api/capacity", endpoint="/api/capacity") as root:
+            with self.tracer.span("jira.get_users") as users:
+                with self.tracer.span("jira.project", args="SCRUM"):
+                    pass
+            with self.tracer.span("jira.search_issues") as search:
+                search.set(results=3)
+
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        trace = json.loads(lines[0])
+        spans = {span["name"]: span for span in trace["spans"]}
+
+        self.assertEqual(trace["name"], "GET /api/capacity")
+        self.assertIsNone(spans["GET /api/capacity"]["parentId"])
+        self.assertEqual(spans["jira.get_users"]["parentId"], root.span_id)
+        self.assertEqual(spans["jira.project"]["parentId"], users.span_id)
+        self.assertEqual(spans["jira.search_issues"]["attributes"], {"results": 3})
+        self.assertGreaterEqual(trace["durationMs"], spans["jira.get_users"]["durationMs"])
+        self.assertEqual(self.tracer.recent(), [trace])
+
+    def test_errors_recorded_on_span(self):
+        """Test that an exception marks the span and still finishes the trace"""
+        with self.assertRaises(RuntimeError):
+            with self.tracer.trace("GET /api/users"):
+                with self.tracer.span("jira.project"):
+                    raise RuntimeError("JIRA down")
+
+        spans = self.tracer.recent()[0]["spans"]
+        self.assertEqual(spans[1]["error"], "RuntimeError: JIRA down")
+        self.assertEqual(spans[0]["error"], "RuntimeError: JIRA down")
+
+    def test_unsampled_requests_record_nothing(self):
+        """Test that spans are no-ops unless the request is sampled or forced"""
+        self.tracer.configure(sample_rate=0.0)
+
+        with self.tracer.trace("GET /api/users") as root:
+            with self.tracer.span("jira.project") as span:
+                self.assertFalse(self.tracer.active())
+        self.assertIsNone(root)
+        self.assertIsNone(span)
+        self.assertEqual(self.tracer.recent(), [])
+
+        with self.tracer.trace("GET /api/users", force=True):
+            pass
+        self.assertEqual(len(self.tracer.recent()), 1)
+
+    def test_nested_traces_join_the_outer_one(self):
+        """Test that a trace started inside another becomes a child span"""
+        with self.tracer.trace("outer"):
+            with self.tracer.trace("inner"):
+                pass
+
+        self.assertEqual(len(self.tracer.recent()), 1)
+        self.assertEqual([span["name"] for span in self.tracer.recent()[0]["spans"]], ["outer", "inner"])
+
+    def test_invalid_sample_rate(self):
+        """Test that sample rates outside 0-1 are rejected"""
+        with self.assertRaises(ValueError):
+            self.tracer.configure(sample_rate=1.5)
+
+    def test_trace_header(self):
+        """Test the X-TaskFlow-Trace header check"""
+        self.assertTrue(trace_forced({"x-taskflow-trace": "1"}))
+        self.assertFalse(trace_forced({"X-TaskFlow-Trace": "0"}))
+        self.assertFalse(trace_forced(None))
+
+
+class TestRequestTracing(unittest.TestCase):
+    """Test traces started by TaskFlowWebAPI and spans around JIRA calls"""
+
+    def setUp(self):
+        """Reset the process-wide tracer"""
+        reset_shared_services()
+        TRACER.clear()
+
+    def test_jira_calls_traced(self):
+        """Test that every jira_client call inside a trace gets its own span"""
+        with patch.object(JiraAPIService, 'connect', return_value=False):
+            service = JiraAPIService()
+        service.jira_client = MagicMock()
+        service.jira_client.project.return_value = SimpleNamespace(key="SCRUM")
+        service.jira_client.search_assignable_users_for_projects.return_value = [
+            SimpleNamespace(key="u1", name="alice", displayName="Alice", active=True)
+        ]
+
+        with TRACER.trace("GET /api/users", force=True):
+            users = service.get_users()
+
+        self.assertEqual(users[0]["username"], "alice")
+        spans = TRACER.recent()[-1]["spans"]
+        by_name = {span["name"]: span for span in spans}
+        self.assertEqual(by_name["jira.fetch_users"]["parentId"], by_name["jira.get_users"]["spanId"])
+        self.assertEqual(by_name["jira.project"]["parentId"], by_name["jira.fetch_users"]["spanId"])
+        self.assertEqual(by_name["jira.project"]["attributes"]["args"], "SCRUM")
+        self.assertEqual(by_name["jira.search_assignable_users_for_projects"]["attributes"]["results"], 1)
+
+    def test_forced_request_traced(self):
+        """Test that the trace header traces a request and /api/traces returns it"""
+        web_api = TaskFlowWebAPI(use_real_jira=False)
+
+        web_api.handle_request('/api/capacity', headers={'X-TaskFlow-Trace': '1'})
+        web_api.handle_request('/api/users')
+        response = web_api.handle_request('/api/traces', data={'limit': '1'})
+
+        self.assertEqual(len(response["data"]), 1)
+        trace = response["data"][0]
+        self.assertEqual(trace["name"], "GET /api/capacity")
+        self.assertEqual(trace["spans"][0]["attributes"]["status"], "success")
+        self.assertIn("mock.get_team_capacity_overview", [span["name"] for span in trace["spans"]])
+
+    def test_invalid_trace_limit(self):
+        """Test that a non-numeric or non-positive limit is a client error"""
+        web_api = TaskFlowWebAPI(use_real_jira=False)
+
+        for limit in ('abc', '-2', '0'):
+            response = web_api.handle_request('/api/traces', data={'limit': limit})
+
+            self.assertEqual(response["status"], "error")
+            self.assertEqual(response["message"], f"Invalid limit '{limit}'")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Workload Aggregates
+Tests the maintained per-user totals behind /api/workload and /api/capacity
+"""
+
+import unittest
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src/api'))
+
+from workload import WorkloadAggregates, build_workload, capacity_limit
+from mock_jira_api import MockJiraAPI
+from jira_api import JiraAPIService
+
+
+class TestWorkloadAggregates(unittest.TestCase):
+    """Test cases for WorkloadAggregates"""
+
+    def setUp(self):
+        """Set up a small assigned task list"""
+        self.tasks = [
+            {"key": "T-1", "assignee": "alice", "storyPoints": 5},
+            {"key": "T-2", "assignee": "alice", "storyPoints": 3},
+            {"key": "T-3", "assignee": "bob", "storyPoints": None},
+            {"key": "T-4", "assignee": None, "storyPoints": 8}
+        ]
+
+    def test_initial_totals(self):
+        """Test that unassigned tasks are ignored and null points count as 0"""
+        workloads = WorkloadAggregates(self.tasks)
+
+        self.assertEqual(workloads.get("alice"), (2, 8))
+        self.assertEqual(workloads.get("bob"), (1, 0))
+        self.assertEqual(workloads.get("nobody"), (0, 0))
+
+    def test_apply_reassignment(self):
+        """Test moving a task between users adjusts both totals"""
+        workloads = WorkloadAggregates(self.tasks)
+
+        workloads.apply(self.tasks[0], dict(self.tasks[0], assignee="bob"))
+
+        self.assertEqual(workloads.get("alice"), (1, 3))
+        self.assertEqual(workloads.get("bob"), (2, 5))
+
+    def test_apply_create_and_delete(self):
+        """Test that None on either side means a created or removed task"""
+        workloads = WorkloadAggregates(self.tasks)
+
+        workloads.apply(None, {"key": "T-5", "assignee": "carol", "storyPoints": 2})
+        workloads.apply(self.tasks[2], None)
+
+        self.assertEqual(workloads.get("carol"), (1, 2))
+        self.assertEqual(workloads.get("bob"), (0, 0))
+
+    def test_apply_with_limit(self):
+        """Test that a limit refuses moves that add load beyond it and changes nothing"""
+        workloads = WorkloadAggregates(self.tasks)
+
+        refused = workloads.apply(self.tasks[3], dict(self.tasks[3], assignee="alice"), limit=15)
+        admitted = workloads.apply(self.tasks[3], dict(self.tasks[3], assignee="alice"), limit=16)
+        resaved = workloads.apply(self.tasks[0], dict(self.tasks[0]), limit=1)
+
+        self.assertFalse(refused)
+        self.assertTrue(admitted)
+        self.assertTrue(resaved)
+        self.assertEqual(workloads.get("alice"), (3, 16))
+
+    def test_limit_holds_under_concurrent_applies(self):
+        """Test that concurrent admissions never overshoot the limit together"""
+        workloads = WorkloadAggregates()
+        admitted = []
+
+        def assign(i):
+            if workloads.apply(None, {"key": f"N-{i}", "assignee": "alice", "storyPoints": 5}, limit=40):
+                admitted.append(i)
+
+        threads = [threading.Thread(target=assign, args=(i,)) for i in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(admitted), 8)
+        self.assertEqual(workloads.get("alice"), (8, 40))
+
+    def test_capacity_limit(self):
+        """Test the point limit derived from a ceiling"""
+        user = {"capacity": {"pointsPerSprint": 40}}
+
+        self.assertEqual(capacity_limit(user, 0.9), 36)
+        self.assertEqual(capacity_limit({"username": "alice"}, 1.0), 40)
+        self.assertIsNone(capacity_limit(user, None))
+        self.assertIsNone(capacity_limit(None, 1.0))
+
+    def test_build_workload_shape(self):
+        """Test the shared workload response shape"""
+        workload = build_workload("alice", 2, 8, 40)
+
+        self.assertEqual(workload, {
+            "username": "alice",
+            "assignedTasks": 2,
+            "totalStoryPoints": 8,
+            "maxCapacity": 40,
+            "utilizationPercent": 20.0,
+            "availableCapacity": 32
+        })
+        self.assertEqual(build_workload("alice", 0, 0, 0)["utilizationPercent"], 0)
+
+
+class TestMockJiraWorkloads(unittest.TestCase):
+    """Test that MockJiraAPI keeps its totals in step with assignments"""
+
+    def setUp(self):
+        """Load the bundled mock dataset"""
+        self.api = MockJiraAPI()
+
+    def recount(self, username):
+        """Workload computed the slow way, straight from the task list"""
+        tasks = self.api.get_tasks(assignee=username)
+        return len(tasks), sum(task.get("storyPoints") or 0 for task in tasks)
+
+    def test_totals_follow_assignments(self):
+        """Test that reassigning tasks updates the maintained totals"""
+        self.api.get_team_capacity_overview()
+        unassigned = self.api.get_unassigned_tasks()[:2]
+        for task in unassigned:
+            self.api.assign_task(task["key"], "stacey.johnson")
+        self.api.assign_task(unassigned[0]["key"], "maya.patel")
+
+        for username in ("stacey.johnson", "maya.patel"):
+            workload = self.api.get_user_workload(username)
+            self.assertEqual((workload["assignedTasks"], workload["totalStoryPoints"]), self.recount(username))
+
+    def test_replacing_dataset_resets_totals(self):
+        """Test that assigning tasks_data discards stale totals"""
+        self.api.get_user_workload("stacey.johnson")
+
+        self.api.tasks_data = {"tasks": [{"key": "X-1", "assignee": "stacey.johnson", "storyPoints": 4}]}
+
+        self.assertEqual(self.api.get_user_workload("stacey.johnson")["totalStoryPoints"], 4)
+
+    def test_capacity_ceiling_refuses_overload(self):
+        """Test that max_utilization stops assignments past the assignee's capacity"""
+        self.api.tasks_data = {"tasks": [
+            {"key": f"X-{i}", "assignee": None, "status": "To Do", "storyPoints": 8} for i in range(6)
+        ]}
+        capacity = self.api.get_user("stacey.johnson")["capacity"]["pointsPerSprint"]
+
+        results = [self.api.assign_task(f"X-{i}", "stacey.johnson", max_utilization=1.0) for i in range(6)]
+
+        admitted = [result for result in results if result["success"]]
+        self.assertEqual(len(admitted), capacity // 8)
+        self.assertTrue(results[-1]["overCapacity"])
+        self.assertIsNone(self.api.get_tasks()[-1]["assignee"])
+        self.assertEqual(self.api.get_user_workload("stacey.johnson")["totalStoryPoints"], 8 * len(admitted))
+        self.assertEqual(results[-1]["workload"]["totalStoryPoints"], 8 * len(admitted))
+
+
+
+class TestJiraWorkloads(unittest.TestCase):
+    """Test that JiraAPIService rebuilds its totals once they pass their max age"""
+
+    def setUp(self):
+        """Create an unconnected JiraAPIService serving tasks from a list"""
+        with patch.object(JiraAPIService, 'connect', return_value=False):
+            self.api = JiraAPIService()
+        self.tasks = [{"key": "S-1", "assignee": "alice", "storyPoints": 5}]
+        patcher = patch.object(self.api, 'iter_tasks', side_effect=lambda *args: iter(list(self.tasks)))
+        self.iter_tasks = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_totals_reused_within_max_age(self):
+        """Test that reads inside the max age share one JIRA search"""
+        self.api.get_user_workload("alice")
+        self.tasks.append({"key": "S-2", "assignee": "alice", "storyPoints": 3})
+
+        self.assertEqual(self.api.get_user_workload("alice")["totalStoryPoints"], 5)
+        self.assertEqual(self.iter_tasks.call_count, 1)
+
+    def test_edits_in_jira_seen_after_max_age(self):
+        """Test that totals older than workload_max_age are rebuilt from JIRA"""
+        self.api.get_user_workload("alice")
+        self.tasks.append({"key": "S-2", "assignee": "alice", "storyPoints": 3})
+
+        with patch('jira_api.time.monotonic', return_value=time.monotonic() + self.api.workload_max_age):
+            workload = self.api.get_user_workload("alice")
+
+        self.assertEqual(workload["totalStoryPoints"], 8)
+        self.assertEqual(self.iter_tasks.call_count, 2)
+
+    def test_rebuild_waits_for_an_assignment_in_flight(self):
+        """Test that totals rebuilt while JIRA applies an assignment do not count it twice"""
+        self.api.get_user_workload("alice")
+        task = {"key": "S-2", "assignee": None, "storyPoints": 3, "status": "To Do", "updated": "1"}
+        rebuild = threading.Thread(target=self.api.refresh_workloads)
+
+        def update(assignee):
+            # JIRA has the new assignee; a sync rebuilds the totals before assign_task adjusts them
+            task["assignee"] = assignee["name"]
+            self.tasks.append(dict(task))
+            rebuild.start()
+            rebuild.join(0.1)
+
+        self.api.jira_client = MagicMock()
+        self.api.jira_client.issue.return_value = SimpleNamespace(key="S-2", update=update)
+        self.api.jira_client.search_users.return_value = [SimpleNamespace(name="alice", displayName="Alice")]
+        with patch.object(self.api, 'issue_to_task', side_effect=lambda issue: dict(task)):
+            result = self.api.assign_task("S-2", "alice")
+        rebuild.join()
+
+        self.assertTrue(result["success"], result)
+        self.assertEqual(self.api.get_user_workload("alice")["totalStoryPoints"], 8)
+
+    def test_capacity_reports_failed_workloads(self):
+        """Test that a member whose workload cannot be read fails the overview instead of vanishing"""
+        users = [{"username": "alice", "displayName": "Alice", "timeZone": "UTC"}]
+        self.iter_tasks.side_effect = ConnectionError("JIRA unreachable")
+
+        with patch.object(self.api, 'fetch_users', return_value=users):
+            overview = self.api.get_team_capacity_overview()
+
+        self.assertIn("alice", overview["error"])
+        self.assertNotIn("members", overview)
+
+
+if __name__ == '__main__':
+    unittest.main()